@@ -12,6 +12,8 @@ from flask_jwt_extended import (
     get_jwt_identity,
 )
 from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.datastructures import ContentRange
+import io
 import os
 import sys
 from datetime import datetime, timedelta
@@ -19,11 +21,35 @@ from datetime import datetime, timedelta
 # Add parent directory to path to import modules from iot-meeting-minutes
 sys.path.append(os.path.join(os.path.dirname(__file__), "..", "iot-meeting-minutes"))
 
-from database import db, User, Recording
+from database import (
+    db, User, Recording,
+    sqlite_engine_options, sqlite_pragmas, apply_sqlite_pragmas, migrate_db,
+)
 from recording_service import RecordingService
+from lazy_service import LazyService
 from pdf_generator import PDFGenerator
+from pdf_cache import PDFCache, PDF_KINDS
+from pdf_batch import iter_pdf_jobs, render_batch
+from zip_export import ZipExporter, EXPORT_PARTS
+from chunked_upload import ChunkedUploadStore, UploadError
+from worker_pool import FairWorkerPool
+from session_registry import SessionRegistry, RouteError, DEFAULT_SOCKET_DIR
+from search_index import create_search_schema, search as search_recordings, remove_recording as remove_from_search
+from related_index import related_index, index_recording as index_related, DEFAULT_RELATED
+from response_compression import compress_response
+from recording_listing import list_recordings, parse_fields, parse_date, DEFAULT_PAGE_SIZE
 from file_upload_service import FileUploadService
+from content_store import ContentStore, DEFAULT_CONTENT_DIR
+from summarizer import insights_file_for, load_chapters
+from stt_engine import load_model
+import summarizer_backends
+import json
 import yaml
+import uuid
+import time
+import hashlib
+import threading
+from collections import namedtuple
 
 # -----------------------------------------------------------------------------
 # Flask & Config
@@ -43,11 +69,31 @@ app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(hours=24)
 app.config["UPLOAD_FOLDER"] = os.path.join(os.path.dirname(__file__), "uploads")
 app.config["MAX_CONTENT_LENGTH"] = 500 * 1024 * 1024  # 500 MB
 
+# Load config for file upload service
+config_path = os.path.join(
+    os.path.dirname(__file__),
+    '..',
+    'iot-meeting-minutes',
+    'configs',
+    'recorder_config.yml'
+)
+with open(config_path, 'r') as f:
+    upload_config = yaml.safe_load(f)
+
 # Database
 db_path = os.path.join(os.path.dirname(__file__), "..", "data", "meeting_transcriber.db")
-app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL") or f"sqlite:///{db_path}"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
+# One pooled connection per upload worker, plus these for request threads
+# and the PDF/recording background threads
+DB_REQUEST_CONNECTIONS = 8
+upload_workers = int(upload_config.get('upload_workers', 2))
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = sqlite_engine_options(
+    int(upload_config.get('db_pool_size', 0)) or upload_workers + DB_REQUEST_CONNECTIONS,
+    int(upload_config.get('db_pool_overflow', 10))
+)
+
 # -----------------------------------------------------------------------------
 # Extensions
 # -----------------------------------------------------------------------------
@@ -59,33 +105,111 @@ CORS(
     app,
     origins=["http://localhost:5173", "http://localhost:3000"],
     supports_credentials=True,
-    allow_headers=["Content-Type", "Authorization"],
-    methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization", "Upload-Offset"],
+    expose_headers=["Upload-Offset", "Upload-Length"],
+    methods=["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
 )
 
-# Create tables on startup
+# Create tables and apply migrations on startup
 with app.app_context():
+    apply_sqlite_pragmas(db.engine, sqlite_pragmas(upload_config))
     db.create_all()
+    migrate_db()
+    create_search_schema(db.engine)
 
-# Load config for file upload service
-config_path = os.path.join(
-    os.path.dirname(__file__),
-    '..',
-    'iot-meeting-minutes',
-    'configs',
-    'recorder_config.yml'
+# Services (built on first use or by warm_up(), so importing the app stays fast)
+recording_service = LazyService("recording_service", lambda: RecordingService(upload_config))
+pdf_generator = PDFGenerator()
+pdf_cache_dir = upload_config.get('pdf_cache_dir') or os.path.join(
+    os.path.dirname(__file__), '..', 'data', 'cache', 'pdfs'
+)
+pdf_cache_max_bytes = int(upload_config.get('pdf_cache_max_mb', 256)) * 1024 * 1024
+pdf_cache = PDFCache(pdf_generator, pdf_cache_dir, pdf_cache_max_bytes)
+zip_exporter = ZipExporter(pdf_cache)
+
+# Batch PDF render progress, keyed by batch id; finished batches are kept
+# for PDF_BATCH_TTL seconds so clients can read the final counts
+pdf_batches = {}
+pdf_batches_lock = threading.Lock()
+PDF_BATCH_TTL = 3600
+PDFSource = namedtuple('PDFSource', ['session_id', 'transcript_file_path', 'summary_file_path'])
+file_upload_service = LazyService(
+    "file_upload_service", lambda: FileUploadService(app.config["UPLOAD_FOLDER"], upload_config)
+)
+content_store = ContentStore(upload_config.get('content_store_dir') or DEFAULT_CONTENT_DIR)
+chunked_uploads = ChunkedUploadStore(
+    upload_config.get('upload_chunk_dir') or os.path.join(app.config["UPLOAD_FOLDER"], 'partial'),
+    int(upload_config.get('upload_max_mb', 2048)) * 1024 * 1024,
+    float(upload_config.get('upload_ttl_hours', 24)) * 3600
 )
-with open(config_path, 'r') as f:
-    upload_config = yaml.safe_load(f)
 
-# Services
-recording_service = RecordingService()
-pdf_generator = PDFGenerator()
-file_upload_service = FileUploadService(app.config["UPLOAD_FOLDER"], upload_config)
+# Chunk size suggested to clients; each PATCH stays far below MAX_CONTENT_LENGTH
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Batch uploads are transcribed in the background, round-robin across users
+upload_pool = FairWorkerPool(upload_workers, app.app_context)
+upload_batches = {}
+
+# Live sessions and batch progress exist only in the process that started
+# them; with several server workers (serve.py), requests are routed there
+session_registry = SessionRegistry(
+    upload_config.get('server_socket_dir') or DEFAULT_SOCKET_DIR,
+    hashlib.sha256(app.config["SECRET_KEY"].encode("utf-8")).digest(),
+    app.app_context
+)
+session_registry.handle("stop_session", lambda *args: recording_service.stop_session(*args))
+session_registry.handle("get_transcript", lambda *args: recording_service.get_transcript(*args))
+# Chunked uploads keep their lock, running hash and early transcriber in one worker
+session_registry.handle(
+    "upload_append",
+    lambda upload_id, user_id, offset, body: chunked_uploads.append(upload_id, user_id, offset, io.BytesIO(body))
+)
+session_registry.handle("upload_finalize", chunked_uploads.finalize)
+session_registry.handle("upload_abort", chunked_uploads.abort)
 
 # Ensure upload folder exists
 os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 
+# Warm-up progress reported by /api/ready: component -> state
+warmup_state = {}
+warmup_lock = threading.Lock()
+
+
+def warm_up():
+    """
+    Construct services and load models ahead of the first request
+
+    Each step is recorded in warmup_state as pending, loading, ready or
+    failed; a failed step (e.g. no Vosk model) does not stop the others.
+    """
+    steps = [
+        ("recording_service", recording_service.get),
+        ("file_upload_service", file_upload_service.get),
+        ("summarizer", lambda: summarizer_backends.get_backend(upload_config.get("summarizer", "textrank"))),
+        ("vosk_model", lambda: load_model(upload_config["model_path"])),
+    ]
+    for name, _ in steps:
+        warmup_state[name] = {"state": "pending"}
+
+    for name, step in steps:
+        started = time.perf_counter()
+        warmup_state[name] = {"state": "loading"}
+        try:
+            step()
+            warmup_state[name] = {"state": "ready", "seconds": round(time.perf_counter() - started, 2)}
+        except Exception as e:
+            print(f"[Startup] Warning: {name} failed to warm up: {e}")
+            warmup_state[name] = {"state": "failed", "error": str(e)}
+
+
+def start_warm_up():
+    """Run warm_up() once per process in a background thread"""
+    with warmup_lock:
+        if warmup_state:
+            return
+        warmup_state["recording_service"] = {"state": "pending"}
+    threading.Thread(target=warm_up, daemon=True).start()
+
 # -----------------------------------------------------------------------------
 # Helpers
 # -----------------------------------------------------------------------------
@@ -154,6 +278,12 @@ def log_request_info():
             print("Authorization header: NOT FOUND")
 
 
+@app.after_request
+def compress_json(response):
+    """gzip/brotli-encode large JSON bodies for clients that accept it"""
+    return compress_response(response, request.accept_encodings)
+
+
 # -----------------------------------------------------------------------------
 # Health Check
 # -----------------------------------------------------------------------------
@@ -162,6 +292,21 @@ def health_check():
     return jsonify({"status": "healthy", "message": "API is running"}), 200
 
 
+@app.route("/api/ready", methods=["GET"])
+def readiness_check():
+    """
+    Readiness (unlike /api/health, which only reports liveness)
+
+    503 until services are built and models are warmed up; the first
+    probe starts the warm-up if the server did not.
+    """
+    start_warm_up()
+    components = {name: dict(state) for name, state in warmup_state.items()}
+    ready = all(c["state"] in ("ready", "failed") for c in components.values())
+    degraded = any(c["state"] == "failed" for c in components.values())
+    return jsonify({"ready": ready, "degraded": degraded, "components": components}), 200 if ready else 503
+
+
 # Simple endpoint to test token manually if needed
 @app.route("/api/debug/token", methods=["GET"])
 @jwt_required()
@@ -316,6 +461,7 @@ def start_recording():
         )
 
         session_id = recording_service.start_session(user_id, title)
+        session_registry.register("recording", session_id, user_id)
 
         return jsonify({"message": "Recording started", "session_id": session_id}), 200
 
@@ -330,21 +476,29 @@ def start_recording():
 @app.route("/api/recordings/<session_id>/stop", methods=["POST"])
 @jwt_required()
 def stop_recording(session_id):
-    """Stop recording and process transcription + summary + PDFs"""
+    """Stop recording and process transcription + summary"""
     try:
         user_id = get_current_user_id()
         if not user_id:
             return jsonify({"error": "Invalid token"}), 401
 
         try:
-            result = recording_service.stop_session(session_id, user_id)
+            result = session_registry.call("recording", session_id, "stop_session", session_id, user_id)
+        except RouteError as e:
+            print("[STOP SESSION ERROR]", e)
+            return jsonify({"error": f"Recording worker unavailable: {e}"}), 503
         except Exception as e:
             import traceback
 
             print("[STOP SESSION ERROR]", e)
             traceback.print_exc()
+            # A failed stop still ends the session
+            session_registry.unregister("recording", session_id)
             return jsonify({"error": f"Error stopping recording: {e}"}), 500
 
+        if result:
+            session_registry.unregister("recording", session_id)
+
         if not result:
             return jsonify(
                 {
@@ -352,35 +506,14 @@ def stop_recording(session_id):
                 }
             ), 404
 
-        transcript_pdf = None
-        summary_pdf = None
-
-        # Create transcript PDF if transcript file exists
-        if result.get("transcript_file") and os.path.exists(result["transcript_file"]):
-            try:
-                transcript_pdf = pdf_generator.create_transcript_pdf(
-                    result["transcript_file"], result["session_name"]
-                )
-            except Exception as e:
-                print("[TRANSCRIPT PDF ERROR]", e)
-
-        # Create summary PDF if summary file exists
-        if result.get("summary_file") and os.path.exists(result["summary_file"]):
-            try:
-                summary_pdf = pdf_generator.create_summary_pdf(
-                    result["summary_file"], result["session_name"]
-                )
-            except Exception as e:
-                print("[SUMMARY PDF ERROR]", e)
+        # PDFs are rendered on first download (or prewarmed in the background)
+        if upload_config.get('pdf_prewarm', False):
+            if result.get("transcript_file") and os.path.exists(result["transcript_file"]):
+                pdf_cache.prewarm("transcript", result["transcript_file"], session_id)
+            if result.get("summary_file") and os.path.exists(result["summary_file"]):
+                pdf_cache.prewarm("summary", result["summary_file"], session_id)
 
-        # Update DB with PDF paths
         recording = Recording.query.filter_by(session_id=session_id).first()
-        if recording:
-            if transcript_pdf:
-                recording.transcript_pdf_path = transcript_pdf
-            if summary_pdf:
-                recording.summary_pdf_path = summary_pdf
-            db.session.commit()
 
         return (
             jsonify(
@@ -389,8 +522,6 @@ def stop_recording(session_id):
                     "recording": {
                         "id": recording.id if recording else None,
                         "session_id": session_id,
-                        "transcript_pdf": transcript_pdf,
-                        "summary_pdf": summary_pdf,
                         "has_transcript": result.get("transcript_file") is not None,
                         "has_summary": result.get("summary_file") is not None,
                     },
@@ -419,7 +550,7 @@ def get_transcript(session_id):
         if not user_id:
             return jsonify({"error": "Invalid token"}), 401
 
-        transcript = recording_service.get_transcript(session_id, user_id)
+        transcript = session_registry.call("recording", session_id, "get_transcript", session_id, user_id)
         if transcript is None:
             return jsonify({"error": "Session not found or unauthorized"}), 404
 
@@ -433,35 +564,43 @@ def get_transcript(session_id):
 @app.route("/api/recordings", methods=["GET"])
 @jwt_required()
 def get_recordings():
-    """List all recordings for the current user"""
+    """
+    List the current user's recordings, newest first
+
+    Query params:
+        limit: Page size (default 50, max 200)
+        cursor: next_cursor from the previous page
+        fields: Comma-separated fields to return (default all)
+        status: Comma-separated statuses to include
+        from, to: Created-at range (ISO dates, UTC; to is exclusive)
+        title: Title prefix
+    """
     try:
         user_id = get_current_user_id()
         if not user_id:
             return jsonify({"error": "Invalid token"}), 401
 
-        recordings = (
-            Recording.query.filter_by(user_id=user_id)
-            .order_by(Recording.created_at.desc())
-            .all()
-        )
-
-        recordings_list = []
-        for rec in recordings:
-            recordings_list.append(
-                {
-                    "id": rec.id,
-                    "session_id": rec.session_id,
-                    "title": rec.title,
-                    "created_at": rec.created_at.isoformat(),
-                    "duration": rec.duration,
-                    "status": rec.status,
-                    "transcript_pdf_path": rec.transcript_pdf_path,
-                    "summary_pdf_path": rec.summary_pdf_path,
-                    "audio_file_path": rec.audio_file_path,
-                }
+        try:
+            fields = parse_fields(request.args.get("fields"))
+            limit = int(request.args.get("limit", DEFAULT_PAGE_SIZE))
+            created_from = request.args.get("from")
+            created_to = request.args.get("to")
+            statuses = [s for s in request.args.get("status", "").split(",") if s]
+
+            recordings_list, next_cursor = list_recordings(
+                user_id,
+                fields,
+                limit,
+                request.args.get("cursor"),
+                statuses,
+                parse_date(created_from, "from") if created_from else None,
+                parse_date(created_to, "to") if created_to else None,
+                request.args.get("title")
             )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
-        return jsonify({"recordings": recordings_list}), 200
+        return jsonify({"recordings": recordings_list, "next_cursor": next_cursor}), 200
 
     except Exception as e:
         import traceback
@@ -471,6 +610,94 @@ def get_recordings():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/recordings/export", methods=["GET"])
+@jwt_required()
+def export_recordings():
+    """
+    Stream a ZIP of the user's recordings
+
+    Query params:
+        ids: Comma-separated recording IDs (default: all)
+        parts: Comma-separated subset of audio,transcript,summary,pdf,metadata
+
+    Supports If-None-Match and single byte ranges (with If-Range), so
+    interrupted downloads can resume.
+    """
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        query = Recording.query.filter_by(user_id=user_id)
+        ids = request.args.get("ids")
+        if ids:
+            try:
+                query = query.filter(Recording.id.in_([int(i) for i in ids.split(",") if i.strip()]))
+            except ValueError:
+                return jsonify({"error": "ids must be comma-separated integers"}), 400
+
+        parts = request.args.get("parts")
+        parts = [p.strip() for p in parts.split(",")] if parts else list(EXPORT_PARTS)
+        if any(p not in EXPORT_PARTS for p in parts):
+            return jsonify({"error": f"parts must be a subset of {list(EXPORT_PARTS)}"}), 400
+
+        recordings = query.order_by(Recording.id).all()
+        if not recordings:
+            return jsonify({"error": "No recordings to export"}), 404
+
+        entries = zip_exporter.manifest(recordings, parts)
+        etag = zip_exporter.etag(entries)
+
+        if etag in request.if_none_match:
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+
+        byte_range = request.range
+        # A range is only valid against the archive its If-Range names;
+        # a date (or any other validator) means send the whole archive
+        if byte_range and "If-Range" in request.headers and request.if_range.etag != etag:
+            byte_range = None
+        if byte_range and (byte_range.units != "bytes" or len(byte_range.ranges) != 1):
+            byte_range = None
+
+        if byte_range:
+            length = zip_exporter.length(entries, etag)
+            bounds = byte_range.range_for_length(length)
+            if bounds is None:
+                response = app.response_class(status=416)
+                response.headers["Content-Range"] = f"bytes */{length}"
+                return response
+
+            start, stop = bounds
+            response = app.response_class(
+                zip_exporter.stream(entries, etag, start, stop),
+                status=206,
+                mimetype="application/zip",
+            )
+            response.content_range = ContentRange("bytes", start, stop, length)
+            response.content_length = stop - start
+        else:
+            response = app.response_class(
+                zip_exporter.stream(entries, etag),
+                mimetype="application/zip",
+            )
+            length = zip_exporter.known_length(etag)
+            if length is not None:
+                response.content_length = length
+
+        response.set_etag(etag)
+        response.accept_ranges = "bytes"
+        response.headers["Content-Disposition"] = 'attachment; filename="meetings_export.zip"'
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+
+    except Exception as e:
+        print("[EXPORT RECORDINGS ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/api/recordings/<recording_id>", methods=["GET"])
 @jwt_required()
 def get_recording(recording_id):
@@ -484,45 +711,185 @@ def get_recording(recording_id):
         if not recording:
             return jsonify({"error": "Recording not found"}), 404
 
-        transcript_text = None
-        summary_text = None
-
-        if recording.transcript_file_path and os.path.exists(
-            recording.transcript_file_path
+        # Recordings completed before the content store get their hashes now
+        if recording.status == "completed" and (
+            (recording.transcript_file_path and not recording.transcript_hash)
+            or (recording.summary_file_path and not recording.summary_hash)
         ):
-            with open(recording.transcript_file_path, "r", encoding="utf-8") as f:
-                transcript_text = f.read()
-
-        if recording.summary_file_path and os.path.exists(recording.summary_file_path):
-            with open(recording.summary_file_path, "r", encoding="utf-8") as f:
-                summary_text = f.read()
-
-        return (
-            jsonify(
-                {
-                    "recording": {
-                        "id": recording.id,
-                        "session_id": recording.session_id,
-                        "title": recording.title,
-                        "created_at": recording.created_at.isoformat(),
-                        "duration": recording.duration,
-                        "status": recording.status,
-                        "transcript": transcript_text,
-                        "summary": summary_text,
-                        "transcript_pdf_path": recording.transcript_pdf_path,
-                        "summary_pdf_path": recording.summary_pdf_path,
-                        "audio_file_path": recording.audio_file_path,
-                    }
+            content_store.store_recording(recording)
+
+        # Insights and chapters are written with the summary, so the summary
+        # hash covers them and a repeat view is answered from the row alone.
+        # Bodies may still change while a recording is processing.
+        etag = recording_etag(recording) if recording.status == "completed" else None
+        if etag and request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+
+        transcript_text = recording_text(recording, "transcript")
+        summary_text = recording_text(recording, "summary")
+        insights = None
+        chapters = None
+
+        if summary_text is not None:
+            insights_file = insights_file_for(recording.summary_file_path)
+            if os.path.exists(insights_file):
+                with open(insights_file, "r", encoding="utf-8") as f:
+                    insights = json.load(f)
+
+            chapters = load_chapters(recording.summary_file_path)
+
+        response = jsonify(
+            {
+                "recording": {
+                    "id": recording.id,
+                    "session_id": recording.session_id,
+                    "title": recording.title,
+                    "created_at": recording.created_at.isoformat(),
+                    "duration": recording.duration,
+                    "status": recording.status,
+                    "transcript": transcript_text,
+                    "summary": summary_text,
+                    "insights": insights,
+                    "chapters": chapters,
+                    "transcript_pdf_path": recording.transcript_pdf_path,
+                    "summary_pdf_path": recording.summary_pdf_path,
+                    "has_transcript_pdf": transcript_text is not None,
+                    "has_summary_pdf": summary_text is not None,
+                    "audio_file_path": recording.audio_file_path,
                 }
-            ),
-            200,
+            }
         )
+        if etag:
+            response.set_etag(etag, weak=True)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+        return response
 
     except Exception as e:
         print("[GET RECORDING ERROR]", e)
         return jsonify({"error": str(e)}), 500
 
 
+def recording_etag(recording):
+    """
+    Validator of a recording's detail response
+
+    Built from the row alone: the content hashes stand in for the
+    transcript and summary bodies, so no file is read to compute it.
+    """
+    parts = [
+        recording.id, recording.session_id, recording.title,
+        recording.created_at.isoformat() if recording.created_at else None,
+        recording.duration, recording.status,
+        recording.transcript_hash, recording.summary_hash,
+        recording.transcript_pdf_path, recording.summary_pdf_path,
+        recording.audio_file_path,
+    ]
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+def recording_text(recording, kind):
+    """
+    Transcript or summary text of a recording
+
+    Read from the compressed content store when the body is there,
+    otherwise (e.g. while still processing) from the source file.
+    """
+    content_hash = getattr(recording, f"{kind}_hash")
+    text = content_store.read_text(content_hash) if content_hash else None
+    if text is not None:
+        return text
+
+    source_file = getattr(recording, f"{kind}_file_path")
+    if source_file and os.path.exists(source_file):
+        with open(source_file, "r", encoding="utf-8") as f:
+            return f.read()
+    return None
+
+
+def send_cached_pdf(kind, source_file, session_name, download_name):
+    """
+    Serve a lazily rendered PDF with ETag / Last-Modified validation
+
+    The ETag is the content key, so a matching If-None-Match is answered
+    with 304 without rendering or even touching the cache.
+    """
+    if not source_file or not os.path.exists(source_file):
+        return jsonify({"error": "PDF not found"}), 404
+
+    etag = pdf_cache.make_key(kind, source_file, session_name)
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+
+    pdf_path, _ = pdf_cache.get_pdf(kind, source_file, session_name, key=etag)
+    response = send_file(
+        pdf_path,
+        as_attachment=True,
+        download_name=download_name,
+        mimetype="application/pdf",
+        etag=etag,
+        last_modified=os.path.getmtime(pdf_path),
+        conditional=True,
+    )
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+@app.route("/api/recordings/<int:recording_id>/related", methods=["GET"])
+@jwt_required()
+def get_related_recordings(recording_id):
+    """Recordings most similar to this one (cosine over term vectors)"""
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        recording = Recording.query.filter_by(id=recording_id, user_id=user_id).first()
+        if not recording:
+            return jsonify({"error": "Recording not found"}), 404
+
+        try:
+            limit = int(request.args.get("limit", DEFAULT_RELATED))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+
+        matches = related_index.related(recording.id, user_id, limit)
+        if matches is None and recording.status == "completed":
+            # Completed before the index existed: vectorize on first request
+            index_related(recording)
+            matches = related_index.related(recording.id, user_id, limit)
+        matches = matches or []
+
+        rows = {
+            row.id: row
+            for row in Recording.query.filter(Recording.id.in_([i for i, _ in matches]))
+            .with_entities(Recording.id, Recording.title, Recording.created_at)
+        }
+        related = [
+            {
+                "id": match_id,
+                "title": rows[match_id].title,
+                "created_at": rows[match_id].created_at.isoformat(),
+                "score": score,
+            }
+            for match_id, score in matches
+            if match_id in rows
+        ]
+
+        return jsonify({"related": related}), 200
+
+    except Exception as e:
+        print("[RELATED RECORDINGS ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/api/recordings/<recording_id>/pdf/transcript", methods=["GET"])
 @jwt_required()
 def download_transcript_pdf(recording_id):
@@ -536,16 +903,11 @@ def download_transcript_pdf(recording_id):
         if not recording:
             return jsonify({"error": "Recording not found"}), 404
 
-        if not recording.transcript_pdf_path or not os.path.exists(
-            recording.transcript_pdf_path
-        ):
-            return jsonify({"error": "PDF not found"}), 404
-
-        return send_file(
-            recording.transcript_pdf_path,
-            as_attachment=True,
-            download_name=f"transcript_{recording.session_id}.pdf",
-            mimetype="application/pdf",
+        return send_cached_pdf(
+            "transcript",
+            recording.transcript_file_path,
+            recording.session_id,
+            f"transcript_{recording.session_id}.pdf",
         )
 
     except Exception as e:
@@ -566,16 +928,11 @@ def download_summary_pdf(recording_id):
         if not recording:
             return jsonify({"error": "Recording not found"}), 404
 
-        if not recording.summary_pdf_path or not os.path.exists(
-            recording.summary_pdf_path
-        ):
-            return jsonify({"error": "PDF not found"}), 404
-
-        return send_file(
-            recording.summary_pdf_path,
-            as_attachment=True,
-            download_name=f"summary_{recording.session_id}.pdf",
-            mimetype="application/pdf",
+        return send_cached_pdf(
+            "summary",
+            recording.summary_file_path,
+            recording.session_id,
+            f"summary_{recording.session_id}.pdf",
         )
 
     except Exception as e:
@@ -583,6 +940,132 @@ def download_summary_pdf(recording_id):
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/recordings/pdfs/render", methods=["POST"])
+@jwt_required()
+def render_pdfs():
+    """Render PDFs for all of the user's recordings in the background"""
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        data = request.get_json(silent=True) or {}
+        kinds = data.get("kinds") or list(PDF_KINDS)
+        if any(kind not in PDF_KINDS for kind in kinds):
+            return jsonify({"error": f"kinds must be a subset of {list(PDF_KINDS)}"}), 400
+
+        # Only the three paths per row are kept, not ORM objects
+        sources = [
+            PDFSource(*row)
+            for row in Recording.query.filter_by(user_id=user_id, status="completed")
+            .with_entities(Recording.session_id, Recording.transcript_file_path, Recording.summary_file_path)
+            .order_by(Recording.id)
+        ]
+
+        # One pool per user at a time, never wider than the server allows
+        workers_limit = int(upload_config.get("pdf_batch_workers", 0)) or os.cpu_count() or 1
+        workers = data.get("workers")
+        if workers is None:
+            workers = workers_limit
+        elif not isinstance(workers, int) or isinstance(workers, bool) or workers < 1:
+            return jsonify({"error": "workers must be a positive integer"}), 400
+        workers = min(workers, workers_limit)
+
+        with pdf_batches_lock:
+            prune_pdf_batches()
+            running = running_pdf_batch(user_id)
+            if running:
+                return jsonify({"error": "A PDF render is already running", "batch_id": running}), 409
+
+            batch_id = uuid.uuid4().hex
+            progress = {"user_id": user_id, "done": False, "workers": workers}
+            pdf_batches[batch_id] = progress
+            session_registry.register("pdf_batch", batch_id, user_id)
+
+        def run():
+            try:
+                render_batch(
+                    iter_pdf_jobs(sources, kinds),
+                    pdf_cache_dir,
+                    pdf_cache_max_bytes,
+                    workers,
+                    bool(data.get("force", False)),
+                    progress,
+                )
+            except Exception as e:
+                print("[RENDER PDFS ERROR]", e)
+                progress["error"] = str(e)
+                progress["done"] = True
+            finally:
+                progress["finished_at"] = time.time()
+
+        threading.Thread(target=run, daemon=True).start()
+
+        return jsonify({"batch_id": batch_id, "recordings": len(sources)}), 202
+
+    except RouteError as e:
+        print("[RENDER PDFS ERROR]", e)
+        return jsonify({"error": str(e)}), 503
+    except Exception as e:
+        print("[RENDER PDFS ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/recordings/pdfs/render/<batch_id>", methods=["GET"])
+@jwt_required()
+def get_render_status(batch_id):
+    """Progress and throughput of a batch PDF render"""
+    user_id = get_current_user_id()
+    status = session_registry.call("pdf_batch", batch_id, "render_status", batch_id, user_id)
+    if status is None:
+        return jsonify({"error": "Batch not found"}), 404
+    return jsonify(status), 200
+
+
+def render_status(batch_id, user_id):
+    """Progress of a batch PDF render started in this process, or None"""
+    prune_pdf_batches()
+    progress = pdf_batches.get(batch_id)
+    if not progress or progress["user_id"] != user_id:
+        return None
+    return {key: value for key, value in progress.items() if key not in ("user_id", "finished_at")}
+
+
+def running_pdf_batch(user_id):
+    """
+    Id of the user's unfinished PDF render in any server worker
+
+    Args:
+        user_id: Owner user
+
+    Returns:
+        str or None: Batch id
+    """
+    batch_ids = set(session_registry.keys("pdf_batch", user_id))
+    batch_ids.update(batch_id for batch_id, progress in list(pdf_batches.items()) if progress["user_id"] == user_id)
+    for batch_id in sorted(batch_ids):
+        status = session_registry.call("pdf_batch", batch_id, "render_status", batch_id, user_id)
+        if status is not None and not status["done"]:
+            return batch_id
+    return None
+
+
+def prune_pdf_batches():
+    """Forget PDF renders of this process that finished over PDF_BATCH_TTL seconds ago"""
+    cutoff = time.time() - PDF_BATCH_TTL
+    expired = [
+        batch_id for batch_id, progress in list(pdf_batches.items())
+        if progress.get("finished_at", cutoff + 1) < cutoff
+    ]
+    for batch_id in expired:
+        pdf_batches.pop(batch_id, None)
+        session_registry.unregister("pdf_batch", batch_id)
+    return len(expired)
+
+
+session_registry.handle("render_status", render_status)
+
+
 @app.route("/api/recordings/<recording_id>/audio", methods=["GET"])
 @jwt_required()
 def get_audio_file(recording_id):
@@ -632,9 +1115,12 @@ def delete_recording(recording_id):
         # Delete files from disk
         recording_service.delete_recording_files(recording)
 
-        # Delete DB row
+        # Delete DB rows (search passages and vector first)
+        remove_from_search(recording.id, commit=False)
+        related_index.remove(recording.id, user_id, commit=False)
         db.session.delete(recording)
         db.session.commit()
+        content_store.release_recording(recording)
 
         return jsonify({"message": "Recording deleted successfully"}), 200
 
@@ -644,6 +1130,47 @@ def delete_recording(recording_id):
         return jsonify({"error": str(e)}), 500
 
 
+# -----------------------------------------------------------------------------
+# Search
+# -----------------------------------------------------------------------------
+@app.route("/api/search", methods=["GET"])
+@jwt_required()
+def search():
+    """
+    Full-text search over the current user's transcripts and summaries
+
+    Query params:
+        q: Search text (words must all match; word* matches a prefix)
+        kind: 'transcript' or 'summary' (default both)
+        limit, offset: Paging (default 20, max 100)
+    """
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        query = request.args.get("q", "").strip()
+        if not query:
+            return jsonify({"error": "Missing search query"}), 400
+
+        kind = request.args.get("kind")
+        if kind and kind not in ("transcript", "summary"):
+            return jsonify({"error": "kind must be 'transcript' or 'summary'"}), 400
+
+        try:
+            limit = int(request.args.get("limit", 20))
+            offset = int(request.args.get("offset", 0))
+        except ValueError:
+            return jsonify({"error": "limit and offset must be integers"}), 400
+
+        results = search_recordings(user_id, query, limit, offset, kind)
+        return jsonify({"query": query, "results": results}), 200
+
+    except Exception as e:
+        print("[SEARCH ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
 # -----------------------------------------------------------------------------
 # File Upload Routes
 # -----------------------------------------------------------------------------
@@ -676,26 +1203,10 @@ def upload_audio():
             file_path, 'audio', original_filename, user_id, title
         )
         
-        # Generate PDFs
-        recording = Recording.query.get(result['recording_id'])
-        if recording:
-            try:
-                transcript_pdf = pdf_generator.create_transcript_pdf(
-                    result['transcript_file'], result['session_id']
-                )
-                recording.transcript_pdf_path = transcript_pdf
-            except Exception as e:
-                print(f"[TRANSCRIPT PDF ERROR] {e}")
-            
-            try:
-                summary_pdf = pdf_generator.create_summary_pdf(
-                    result['summary_file'], result['session_id']
-                )
-                recording.summary_pdf_path = summary_pdf
-            except Exception as e:
-                print(f"[SUMMARY PDF ERROR] {e}")
-            
-            db.session.commit()
+        # PDFs are rendered on first download (or prewarmed in the background)
+        if upload_config.get('pdf_prewarm', False):
+            pdf_cache.prewarm('transcript', result['transcript_file'], result['session_id'])
+            pdf_cache.prewarm('summary', result['summary_file'], result['session_id'])
         
         return jsonify({
             "message": "Audio file uploaded and processed successfully",
@@ -743,26 +1254,10 @@ def upload_text():
             file_path, file_type, original_filename, user_id, title
         )
         
-        # Generate PDFs
-        recording = Recording.query.get(result['recording_id'])
-        if recording:
-            try:
-                transcript_pdf = pdf_generator.create_transcript_pdf(
-                    result['transcript_file'], result['session_id']
-                )
-                recording.transcript_pdf_path = transcript_pdf
-            except Exception as e:
-                print(f"[TRANSCRIPT PDF ERROR] {e}")
-            
-            try:
-                summary_pdf = pdf_generator.create_summary_pdf(
-                    result['summary_file'], result['session_id']
-                )
-                recording.summary_pdf_path = summary_pdf
-            except Exception as e:
-                print(f"[SUMMARY PDF ERROR] {e}")
-            
-            db.session.commit()
+        # PDFs are rendered on first download (or prewarmed in the background)
+        if upload_config.get('pdf_prewarm', False):
+            pdf_cache.prewarm('transcript', result['transcript_file'], result['session_id'])
+            pdf_cache.prewarm('summary', result['summary_file'], result['session_id'])
         
         return jsonify({
             "message": "Text file uploaded and processed successfully",
@@ -777,9 +1272,346 @@ def upload_text():
         return jsonify({"error": str(e)}), 500
 
 
+def process_batch_item(batch_id, recording_id, file_path, file_type, original_filename, user_id, title):
+    """Worker job: process one file of a batch upload"""
+    recording = db.session.get(Recording, recording_id)
+    try:
+        result = file_upload_service.process_uploaded_file(
+            file_path, file_type, original_filename, user_id, title, recording=recording
+        )
+        if upload_config.get('pdf_prewarm', False):
+            pdf_cache.prewarm('transcript', result['transcript_file'], result['session_id'])
+            pdf_cache.prewarm('summary', result['summary_file'], result['session_id'])
+    except Exception as e:
+        print(f"[BATCH UPLOAD ERROR] {original_filename}: {e}")
+        upload_batches[batch_id]['errors'][recording_id] = str(e)
+
+
+@app.route("/api/upload/batch", methods=["POST"])
+@jwt_required()
+def upload_batch():
+    """Upload many audio/text files at once; each becomes a queued recording"""
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        files = [f for f in request.files.getlist('files') if f.filename]
+        if not files:
+            return jsonify({"error": "No files provided"}), 400
+        titles = request.form.getlist('titles')
+
+        batch_id = uuid.uuid4().hex
+        upload_batches[batch_id] = {"user_id": user_id, "recording_ids": [], "errors": {}}
+        queued = []
+        rejected = []
+
+        for index, file in enumerate(files):
+            if file_upload_service.allowed_file(file.filename, 'audio'):
+                file_type = 'audio'
+            elif file_upload_service.allowed_file(file.filename, 'text'):
+                file_type = 'pdf' if file.filename.rsplit('.', 1)[1].lower() == 'pdf' else 'txt'
+            else:
+                rejected.append({"filename": file.filename, "error": "Invalid file type"})
+                continue
+
+            title = titles[index] if index < len(titles) and titles[index] else ''
+            file_path, original_filename = file_upload_service.save_uploaded_file(file, user_id)
+            recording = file_upload_service.create_recording(
+                file_path, file_type, original_filename, user_id, title,
+                status='queued', suffix=f"_{batch_id[:6]}{index}"
+            )
+            upload_batches[batch_id]["recording_ids"].append(recording.id)
+            queued.append({"id": recording.id, "title": recording.title, "filename": original_filename})
+
+            upload_pool.submit(
+                user_id, process_batch_item,
+                batch_id, recording.id, file_path, file_type, original_filename, user_id, title
+            )
+
+        if not queued:
+            upload_batches.pop(batch_id, None)
+            return jsonify({"error": "No supported files", "rejected": rejected}), 400
+        session_registry.register("upload_batch", batch_id, user_id)
+
+        return jsonify({
+            "batch_id": batch_id,
+            "recordings": queued,
+            "rejected": rejected
+        }), 202
+
+    except Exception as e:
+        import traceback
+        print("[UPLOAD BATCH ERROR]", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/upload/batch/<batch_id>", methods=["GET"])
+@jwt_required()
+def get_upload_batch(batch_id):
+    """Aggregate progress of a batch upload"""
+    try:
+        user_id = get_current_user_id()
+        status = session_registry.call("upload_batch", batch_id, "upload_batch_status", batch_id, user_id)
+        if status is None:
+            return jsonify({"error": "Batch not found"}), 404
+        return jsonify(status), 200
+
+    except Exception as e:
+        print("[GET UPLOAD BATCH ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
+def upload_batch_status(batch_id, user_id):
+    """Progress of a batch upload queued in this process, or None"""
+    batch = upload_batches.get(batch_id)
+    if not batch or batch["user_id"] != user_id:
+        return None
+
+    rows = (
+        Recording.query.filter(Recording.id.in_(batch["recording_ids"]))
+        .with_entities(Recording.id, Recording.title, Recording.status)
+        .order_by(Recording.id)
+        .all()
+    )
+
+    counts = {"queued": 0, "processing": 0, "completed": 0, "failed": 0}
+    recordings = []
+    for recording_id, title, status in rows:
+        counts[status] = counts.get(status, 0) + 1
+        recordings.append({
+            "id": recording_id,
+            "title": title,
+            "status": status,
+            "error": batch["errors"].get(recording_id)
+        })
+
+    finished = counts["completed"] + counts["failed"]
+    return {
+        "batch_id": batch_id,
+        "total": len(rows),
+        "counts": counts,
+        "progress": round(finished / len(rows), 3) if rows else 1.0,
+        "done": finished == len(rows),
+        "queued_for_user": upload_pool.pending(user_id),
+        "recordings": recordings
+    }
+
+
+session_registry.handle("upload_batch_status", upload_batch_status)
+
+
+def upload_error_response(error):
+    """JSON error for an UploadError, with the current offset when known"""
+    body = {"error": str(error)}
+    if error.offset is not None:
+        body["offset"] = error.offset
+    response = jsonify(body)
+    response.status_code = error.status
+    if error.offset is not None:
+        response.headers["Upload-Offset"] = str(error.offset)
+    return response
+
+
+def upload_status_response(state, status=200):
+    """Upload state as JSON plus Upload-Offset / Upload-Length headers"""
+    response = jsonify({
+        "upload_id": state["upload_id"],
+        "filename": state["filename"],
+        "offset": state["offset"],
+        "size": state["size"],
+        "chunk_size": UPLOAD_CHUNK_SIZE,
+    })
+    response.status_code = status
+    response.headers["Upload-Offset"] = str(state["offset"])
+    if state["size"] is not None:
+        response.headers["Upload-Length"] = str(state["size"])
+    return response
+
+
+@app.route("/api/uploads", methods=["POST"])
+@jwt_required()
+def create_upload():
+    """Start a chunked, resumable upload"""
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        data = request.get_json(silent=True) or {}
+        filename = data.get("filename", "")
+        if file_upload_service.allowed_file(filename, "audio"):
+            file_type = "audio"
+        elif file_upload_service.allowed_file(filename, "text"):
+            file_type = "pdf" if filename.rsplit(".", 1)[1].lower() == "pdf" else "txt"
+        else:
+            return jsonify({"error": "Invalid file type. Allowed: WAV, MP3, OGG, FLAC, M4A, WEBM, PDF, TXT"}), 400
+
+        size = data.get("size")
+        if size is not None and (not isinstance(size, int) or size < 0):
+            return jsonify({"error": "size must be a non-negative integer"}), 400
+
+        # Optionally recognize WAV audio while the rest is still arriving
+        transcribe_pcm = None
+        if (file_type == "audio" and upload_config.get("upload_early_transcription", False)
+                and file_upload_service.vosk_model):
+            transcribe_pcm = file_upload_service.transcribe_pcm
+
+        state = chunked_uploads.create(
+            user_id, filename, file_type, data.get("title", ""), size, transcribe_pcm
+        )
+        session_registry.register("upload", state["upload_id"], user_id)
+        response = upload_status_response(state, 201)
+        response.headers["Location"] = f"/api/uploads/{state['upload_id']}"
+        return response
+
+    except UploadError as e:
+        return upload_error_response(e)
+    except Exception as e:
+        print("[CREATE UPLOAD ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/uploads/<upload_id>", methods=["GET"])
+@jwt_required()
+def get_upload(upload_id):
+    """Upload offset (also answers HEAD, for resuming)"""
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        return upload_status_response(chunked_uploads.status(upload_id, user_id))
+
+    except UploadError as e:
+        return upload_error_response(e)
+    except Exception as e:
+        print("[GET UPLOAD ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/uploads/<upload_id>", methods=["PATCH"])
+@jwt_required()
+def append_upload(upload_id):
+    """Append the request body at the Upload-Offset header"""
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+        except ValueError:
+            return jsonify({"error": "Upload-Offset header required"}), 400
+
+        if session_registry.is_local("upload", upload_id):
+            # Read straight from the socket; nothing is spooled
+            offset = chunked_uploads.append(upload_id, user_id, offset, request.stream)
+        else:
+            # Started on another worker: hand it the chunk
+            offset = session_registry.call(
+                "upload", upload_id, "upload_append", upload_id, user_id, offset, request.get_data()
+            )
+
+        response = app.response_class(status=204)
+        response.headers["Upload-Offset"] = str(offset)
+        return response
+
+    except UploadError as e:
+        return upload_error_response(e)
+    except RouteError as e:
+        print("[APPEND UPLOAD ERROR]", e)
+        return jsonify({"error": f"Upload worker unavailable: {e}"}), 503
+    except Exception as e:
+        print("[APPEND UPLOAD ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/uploads/<upload_id>/finalize", methods=["POST"])
+@jwt_required()
+def finalize_upload(upload_id):
+    """Complete a chunked upload and process it like a regular upload"""
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        data = request.get_json(silent=True) or {}
+        upload = session_registry.call(
+            "upload", upload_id, "upload_finalize",
+            upload_id,
+            user_id,
+            os.path.join(app.config["UPLOAD_FOLDER"], f"user_{user_id}"),
+            data.get("sha256"),
+        )
+        session_registry.unregister("upload", upload_id)
+
+        result = file_upload_service.process_uploaded_file(
+            upload["file_path"],
+            upload["file_type"],
+            upload["filename"],
+            user_id,
+            upload["title"],
+            file_hash=upload["file_hash"],
+            transcription=upload["transcription"],
+        )
+
+        # PDFs are rendered on first download (or prewarmed in the background)
+        if upload_config.get('pdf_prewarm', False):
+            pdf_cache.prewarm('transcript', result['transcript_file'], result['session_id'])
+            pdf_cache.prewarm('summary', result['summary_file'], result['session_id'])
+
+        return jsonify({
+            "message": "File uploaded and processed successfully",
+            "recording_id": result['recording_id'],
+            "session_id": result['session_id'],
+            "sha256": upload["file_hash"]
+        }), 201
+
+    except UploadError as e:
+        return upload_error_response(e)
+    except RouteError as e:
+        print("[FINALIZE UPLOAD ERROR]", e)
+        return jsonify({"error": f"Upload worker unavailable: {e}"}), 503
+    except Exception as e:
+        import traceback
+        print("[FINALIZE UPLOAD ERROR]", e)
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/uploads/<upload_id>", methods=["DELETE"])
+@jwt_required()
+def abort_upload(upload_id):
+    """Cancel a chunked upload"""
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Invalid token"}), 401
+
+        session_registry.call("upload", upload_id, "upload_abort", upload_id, user_id)
+        session_registry.unregister("upload", upload_id)
+        return app.response_class(status=204)
+
+    except UploadError as e:
+        return upload_error_response(e)
+    except RouteError as e:
+        print("[ABORT UPLOAD ERROR]", e)
+        return jsonify({"error": f"Upload worker unavailable: {e}"}), 503
+    except Exception as e:
+        print("[ABORT UPLOAD ERROR]", e)
+        return jsonify({"error": str(e)}), 500
+
+
 # -----------------------------------------------------------------------------
 # Main
 # -----------------------------------------------------------------------------
 if __name__ == "__main__":
+    # The reloader's watcher process never serves requests; only its child warms up
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_warm_up()
+
+    # Development server only; production runs serve.py (gunicorn, no reloader)
     # Host 0.0.0.0 for cross-device testing on LAN
     app.run(debug=True, host="0.0.0.0", port=5000)
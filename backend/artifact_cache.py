@@ -0,0 +1,200 @@
+"""
+Artifact Cache
+Content-addressed on-disk cache of transcripts and summaries with LRU eviction
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path):
+    """
+    Compute the SHA-256 of a file without loading it into memory
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def link_or_copy(source, destination):
+    """
+    Hard-link a file, falling back to a copy across filesystems
+
+    Args:
+        source: Existing file
+        destination: New path
+
+    Returns:
+        str: Destination path
+    """
+    if os.path.exists(destination):
+        os.remove(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+    return destination
+
+
+class ArtifactCache:
+    def __init__(self, cache_dir, max_bytes):
+        """
+        Initialize artifact cache
+
+        Args:
+            cache_dir: Root directory for cache entries
+            max_bytes: Total size above which least recently used entries are evicted
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Running total so put() only walks the cache when it may be over the bound
+        self._size = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def make_key(self, content_hash, params):
+        """
+        Build a cache key from a content hash and the config that shaped the output
+
+        Args:
+            content_hash: Hex digest of the input (or of a parent key)
+            params: JSON-serializable dictionary of relevant settings
+
+        Returns:
+            str: Hex digest
+        """
+        material = content_hash + json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used
+
+        Returned paths are shared (hard-linked into sessions on a hit) and
+        must be treated as read-only.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            dict: Artifact name -> file path, or None on a miss
+        """
+        entry_dir = self._entry_dir(key)
+        manifest_path = os.path.join(entry_dir, 'manifest.json')
+
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        artifacts = {
+            name: os.path.join(entry_dir, filename)
+            for name, filename in manifest['artifacts'].items()
+        }
+        if not all(os.path.exists(path) for path in artifacts.values()):
+            return None
+
+        # Manifest mtime is the LRU clock
+        try:
+            os.utime(manifest_path, None)
+        except OSError:
+            pass
+
+        return artifacts
+
+    def put(self, key, artifacts, move=False):
+        """
+        Store artifacts under a key, then evict down to the size bound
+
+        Args:
+            key: Cache key
+            artifacts: Artifact name -> source file path
+            move: Move the sources into the cache instead of copying them
+                  (for scratch files the caller no longer needs)
+
+        Returns:
+            dict: Artifact name -> cached file path
+        """
+        entry_dir = self._entry_dir(key)
+        staging = f"{entry_dir}.{os.getpid()}.{threading.get_ident()}.tmp"
+        os.makedirs(staging, exist_ok=True)
+
+        manifest = {'artifacts': {}, 'created': time.time()}
+        for name, source in artifacts.items():
+            filename = name + os.path.splitext(source)[1]
+            if move:
+                shutil.move(source, os.path.join(staging, filename))
+            else:
+                # Copy rather than link so later in-place writes to the source
+                # cannot change the cached bytes
+                shutil.copyfile(source, os.path.join(staging, filename))
+            manifest['artifacts'][name] = filename
+
+        with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        added = sum(
+            os.path.getsize(os.path.join(staging, name))
+            for name in os.listdir(staging)
+        )
+
+        with self._lock:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(staging, entry_dir)
+            if self._size is not None:
+                self._size += added
+            over = self._size is None or self._size > self.max_bytes
+
+        if over:
+            self.evict()
+        return self.get(key) or {}
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+
+            for prefix in os.listdir(self.cache_dir):
+                prefix_dir = os.path.join(self.cache_dir, prefix)
+                if not os.path.isdir(prefix_dir):
+                    continue
+                for key in os.listdir(prefix_dir):
+                    entry_dir = os.path.join(prefix_dir, key)
+                    manifest_path = os.path.join(entry_dir, 'manifest.json')
+                    if not os.path.exists(manifest_path):
+                        continue
+                    size = sum(
+                        os.path.getsize(os.path.join(entry_dir, name))
+                        for name in os.listdir(entry_dir)
+                    )
+                    entries.append((os.path.getmtime(manifest_path), size, entry_dir))
+                    total += size
+
+            entries.sort()
+            for _, size, entry_dir in entries:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total -= size
+
+            self._size = total
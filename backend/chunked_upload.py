@@ -0,0 +1,474 @@
+"""
+Chunked Upload Store
+Resumable uploads (create, append at offset, finalize) written straight to disk
+"""
+
+import os
+import json
+import time
+import uuid
+import shutil
+import struct
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from werkzeug.utils import secure_filename
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: served by one process, where the per-upload thread lock suffices
+    fcntl = None
+
+
+UPLOAD_BUFFER_SIZE = 64 * 1024
+
+# Bytes of PCM handed to the recognizer per step while tailing a WAV upload
+PCM_CHUNK_SIZE = 8000
+
+
+class UploadError(Exception):
+    """Upload protocol error carrying the HTTP status to answer with"""
+
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+    def __reduce__(self):
+        # Keep status and offset when raised in another server worker
+        return (UploadError, (str(self), self.status, self.offset))
+
+
+def parse_wav_header(header):
+    """
+    Locate the PCM data in the first bytes of a WAV file
+
+    Args:
+        header: Leading bytes of the file
+
+    Returns:
+        dict: channels, sample_rate, sample_width, data_offset, data_size,
+              or None if the header is not complete yet
+    """
+    if len(header) < 12:
+        return None
+    if header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+        raise UploadError("Not a WAV file")
+
+    fmt = None
+    position = 12
+    while position + 8 <= len(header):
+        chunk_id = header[position:position + 4]
+        chunk_size = struct.unpack('<I', header[position + 4:position + 8])[0]
+        body = position + 8
+
+        if chunk_id == b'fmt ':
+            if body + 16 > len(header):
+                return None
+            _, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', header[body:body + 16])
+            fmt = {'channels': channels, 'sample_rate': sample_rate, 'sample_width': bits // 8}
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise UploadError("WAV data chunk precedes its format chunk")
+            return dict(fmt, data_offset=body, data_size=chunk_size)
+
+        position = body + chunk_size + (chunk_size & 1)
+
+    return None
+
+
+@contextmanager
+def part_file_lock(part_file, blocking=True):
+    """
+    Exclusive lock on a partial upload shared by all server processes
+
+    Args:
+        part_file: Partial upload file
+        blocking: Wait for the lock instead of failing
+
+    Yields:
+        bool: Whether the lock is held (always True when blocking)
+    """
+    if fcntl is None:
+        yield True
+        return
+
+    try:
+        f = open(part_file, 'rb')
+    except FileNotFoundError:
+        raise UploadError("Upload not found", 404)
+
+    with f:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+
+
+class IncrementalTranscriber:
+    def __init__(self, part_path, transcribe_pcm):
+        """
+        Transcribe a WAV upload while it is still arriving
+
+        A background thread tails the partial file and feeds PCM to
+        transcribe_pcm as bytes land, so by the time the upload is
+        finalized most of the audio has already been recognized.
+
+        Args:
+            part_path: Partial upload file
+            transcribe_pcm: Callable(chunks, sample_rate) -> transcription
+                            result, consuming an iterator of PCM bytes
+        """
+        self.part_path = part_path
+        self.transcribe_pcm = transcribe_pcm
+        self.received = 0
+        self.finished = False
+        self.result = None
+        self.error = None
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def notify(self, received, finished=False):
+        """Report how many bytes of the upload are on disk"""
+        with self._condition:
+            self.received = received
+            self.finished = self.finished or finished
+            self._condition.notify_all()
+
+    def _wait_for(self, needed):
+        """Block until needed bytes are on disk (or the upload ends); return the received count"""
+        with self._condition:
+            while self.received < needed and not self.finished:
+                self._condition.wait()
+            return self.received
+
+    def _pcm_chunks(self, header):
+        """Yield PCM from the growing file until the data chunk (or upload) ends"""
+        data_end = header['data_offset'] + header['data_size']
+        if header['data_size'] in (0, 0xFFFFFFFF):
+            # Streaming writers leave the size unset; read to the end of the upload
+            data_end = float('inf')
+        frame_bytes = header['channels'] * header['sample_width']
+        position = header['data_offset']
+
+        with open(self.part_path, 'rb') as f:
+            f.seek(position)
+            while position < data_end:
+                available = min(self._wait_for(position + PCM_CHUNK_SIZE), data_end)
+                # Whole frames only, unless this is the tail of the upload
+                size = available - position
+                if not self.finished:
+                    size -= size % frame_bytes
+                if size <= 0:
+                    if self.finished:
+                        return
+                    continue
+                block = f.read(size)
+                if not block:
+                    return
+                position += len(block)
+                yield block
+
+    def _run(self):
+        try:
+            header = None
+            needed = 44
+            while header is None:
+                received = self._wait_for(needed)
+                with open(self.part_path, 'rb') as f:
+                    header = parse_wav_header(f.read(received))
+                if header is None:
+                    if self.finished:
+                        raise UploadError("Incomplete WAV header")
+                    needed = received + 1
+
+            if header['channels'] != 1:
+                raise UploadError("Audio must be mono (1 channel)")
+
+            self.result = self.transcribe_pcm(self._pcm_chunks(header), header['sample_rate'])
+        except Exception as e:
+            self.error = e
+            # Let the caller fall back to transcribing the finished file
+            print(f"[ChunkedUpload] Early transcription stopped: {e}")
+
+    def wait(self, timeout=None):
+        """
+        Wait for the transcription of the whole upload
+
+        Returns:
+            dict: Transcription result, or None if it failed
+        """
+        self._thread.join(timeout)
+        return None if self._thread.is_alive() else self.result
+
+
+class ChunkedUploadStore:
+    def __init__(self, upload_dir, max_bytes, ttl_seconds=24 * 3600):
+        """
+        Initialize chunked upload store
+
+        Upload state lives next to the partial file (<id>.json / <id>.part),
+        so uploads survive a server restart; the partial file's length is
+        the authoritative offset.
+
+        Args:
+            upload_dir: Directory for partial uploads
+            max_bytes: Largest accepted upload
+            ttl_seconds: Idle time after which unfinished uploads are removed
+        """
+        self.upload_dir = upload_dir
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(upload_dir, exist_ok=True)
+
+        # Upload id -> {'lock', 'hasher', 'hashed', 'transcriber'}
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+
+    def _paths(self, upload_id):
+        # Ids are generated hex; anything else cannot name a file here
+        if not upload_id or not all(c in '0123456789abcdef' for c in upload_id):
+            raise UploadError("Upload not found", 404)
+        base = os.path.join(self.upload_dir, upload_id)
+        return base + '.json', base + '.part'
+
+    def _load(self, upload_id, user_id):
+        state_file, part_file = self._paths(upload_id)
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            raise UploadError("Upload not found", 404)
+        if state['user_id'] != user_id:
+            raise UploadError("Upload not found", 404)
+
+        state['offset'] = os.path.getsize(part_file) if os.path.exists(part_file) else 0
+        return state
+
+    def _session(self, upload_id):
+        with self._sessions_lock:
+            return self._sessions.setdefault(upload_id, {
+                'lock': threading.Lock(),
+                'hasher': None,
+                'hashed': 0,
+                'transcriber': None
+            })
+
+    def create(self, user_id, filename, file_type, title='', size=None, transcribe_pcm=None):
+        """
+        Start an upload
+
+        Args:
+            user_id: Owner
+            filename: Client file name
+            file_type: 'audio', 'pdf' or 'txt'
+            title: Recording title
+            size: Total size in bytes, if known
+            transcribe_pcm: Optional callable to transcribe WAV audio as it arrives
+
+        Returns:
+            dict: Upload state (upload_id, offset, size, ...)
+        """
+        if size is not None and size > self.max_bytes:
+            raise UploadError(f"Upload exceeds {self.max_bytes} bytes", 413)
+
+        self.cleanup_expired()
+
+        upload_id = uuid.uuid4().hex
+        state = {
+            'upload_id': upload_id,
+            'user_id': user_id,
+            'filename': secure_filename(filename) or 'upload',
+            'file_type': file_type,
+            'title': title or '',
+            'size': size,
+            'created': time.time()
+        }
+
+        state_file, part_file = self._paths(upload_id)
+        open(part_file, 'wb').close()
+        with open(state_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+
+        session = self._session(upload_id)
+        session['hasher'] = hashlib.sha256()
+        if transcribe_pcm and state['filename'].lower().endswith('.wav'):
+            session['transcriber'] = IncrementalTranscriber(part_file, transcribe_pcm)
+
+        state['offset'] = 0
+        return state
+
+    def status(self, upload_id, user_id):
+        """
+        Get upload state, including the current offset
+
+        Returns:
+            dict: Upload state
+        """
+        return self._load(upload_id, user_id)
+
+    def append(self, upload_id, user_id, offset, stream):
+        """
+        Append bytes at offset, streaming them to disk
+
+        Bytes that arrive before a dropped connection are kept, so the
+        client resumes from the offset reported by status().
+
+        Args:
+            upload_id: Upload id
+            user_id: Owner
+            offset: Client's idea of the current offset (must match)
+            stream: File-like request body
+
+        Returns:
+            int: New offset
+        """
+        state = self._load(upload_id, user_id)
+        _, part_file = self._paths(upload_id)
+        session = self._session(upload_id)
+
+        if not session['lock'].acquire(blocking=False):
+            raise UploadError("Another chunk for this upload is in progress", 409, state['offset'])
+
+        try:
+            # A retried chunk may be running in another server worker
+            with part_file_lock(part_file, blocking=False) as locked:
+                if not locked:
+                    raise UploadError("Another chunk for this upload is in progress", 409, state['offset'])
+
+                current = os.path.getsize(part_file)
+                if offset != current:
+                    raise UploadError(f"Offset mismatch: upload is at {current}", 409, current)
+
+                limit = state['size'] if state['size'] is not None else self.max_bytes
+                hasher = self._hasher(session, part_file, current)
+
+                with open(part_file, 'ab') as f:
+                    try:
+                        while True:
+                            block = stream.read(UPLOAD_BUFFER_SIZE)
+                            if not block:
+                                break
+                            if current + len(block) > limit:
+                                raise UploadError(f"Upload exceeds {limit} bytes", 413, current)
+                            f.write(block)
+                            hasher.update(block)
+                            current += len(block)
+                            session['hashed'] = current
+                            if session['transcriber']:
+                                f.flush()
+                                session['transcriber'].notify(current)
+                    finally:
+                        f.flush()
+
+            # Idle time for cleanup_expired counts from the last chunk
+            os.utime(self._paths(upload_id)[0])
+            return current
+        finally:
+            session['lock'].release()
+
+    def _hasher(self, session, part_file, size):
+        """Running SHA-256 of the partial file, rebuilt if the server restarted"""
+        if session['hasher'] is None or session['hashed'] != size:
+            hasher = hashlib.sha256()
+            with open(part_file, 'rb') as f:
+                remaining = size
+                while remaining:
+                    block = f.read(min(UPLOAD_BUFFER_SIZE, remaining))
+                    if not block:
+                        break
+                    hasher.update(block)
+                    remaining -= len(block)
+            session['hasher'] = hasher
+            session['hashed'] = size
+        return session['hasher']
+
+    def finalize(self, upload_id, user_id, destination_dir, sha256=None):
+        """
+        Complete an upload and move it into place
+
+        Args:
+            upload_id: Upload id
+            user_id: Owner
+            destination_dir: Directory for the finished file
+            sha256: Optional expected digest to verify
+
+        Returns:
+            dict: Upload state plus file_path, file_hash and transcription
+                  (early transcription result or None)
+        """
+        state = self._load(upload_id, user_id)
+        _, part_file = self._paths(upload_id)
+        session = self._session(upload_id)
+
+        with session['lock'], part_file_lock(part_file):
+            offset = os.path.getsize(part_file)
+            if state['size'] is not None and offset != state['size']:
+                raise UploadError(f"Upload incomplete: {offset} of {state['size']} bytes", 409, offset)
+            if offset == 0:
+                raise UploadError("Upload is empty", 400, offset)
+
+            file_hash = self._hasher(session, part_file, offset).hexdigest()
+            if sha256 and sha256.lower() != file_hash:
+                raise UploadError("Checksum mismatch", 422, offset)
+
+            transcription = None
+            if session['transcriber']:
+                session['transcriber'].notify(offset, finished=True)
+                transcription = session['transcriber'].wait()
+
+            os.makedirs(destination_dir, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            file_path = os.path.join(destination_dir, f"{timestamp}_{state['filename']}")
+            shutil.move(part_file, file_path)
+
+        self._discard(upload_id)
+        state.update({
+            'offset': offset,
+            'file_path': file_path,
+            'file_hash': file_hash,
+            'transcription': transcription
+        })
+        return state
+
+    def abort(self, upload_id, user_id):
+        """Cancel an upload and delete its partial file"""
+        self._load(upload_id, user_id)
+        self._discard(upload_id)
+
+    def _discard(self, upload_id):
+        with self._sessions_lock:
+            session = self._sessions.pop(upload_id, None)
+        if session and session['transcriber']:
+            session['transcriber'].notify(session['hashed'], finished=True)
+
+        for path in self._paths(upload_id):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def cleanup_expired(self):
+        """Remove uploads idle for longer than ttl_seconds"""
+        # State of uploads another worker expired or finalized
+        with self._sessions_lock:
+            gone = [upload_id for upload_id in self._sessions
+                    if not os.path.exists(self._paths(upload_id)[0])]
+        for upload_id in gone:
+            self._discard(upload_id)
+
+        cutoff = time.time() - self.ttl_seconds
+        for name in os.listdir(self.upload_dir):
+            if not name.endswith('.json'):
+                continue
+            upload_id = name[:-len('.json')]
+            try:
+                if os.path.getmtime(os.path.join(self.upload_dir, name)) < cutoff:
+                    print(f"[ChunkedUpload] Removing expired upload {upload_id}")
+                    self._discard(upload_id)
+            except (OSError, UploadError):
+                continue
@@ -0,0 +1,153 @@
+"""
+Content Store
+Gzip-compressed, content-addressed copies of transcript and summary text,
+keyed by the SHA-256 stored on the recording row
+"""
+
+import io
+import os
+import gzip
+import hashlib
+import threading
+
+from database import db, Recording
+
+
+DEFAULT_CONTENT_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'content')
+
+# Bodies are written once and read on every cold view, so favour read size over write time
+COMPRESS_LEVEL = 9
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Recording column holding the hash -> column holding the source file
+CONTENT_KINDS = {
+    'transcript': ('transcript_hash', 'transcript_file_path'),
+    'summary': ('summary_hash', 'summary_file_path'),
+}
+
+
+class ContentStore:
+    def __init__(self, store_dir=DEFAULT_CONTENT_DIR, level=COMPRESS_LEVEL):
+        """
+        Initialize content store
+
+        Identical bodies (e.g. a file uploaded twice) share one blob. Blobs
+        are never modified, so a hash doubles as an HTTP validator.
+
+        Args:
+            store_dir: Root directory for blobs
+            level: gzip compression level
+        """
+        self.store_dir = store_dir
+        self.level = level
+        self._lock = threading.Lock()
+        os.makedirs(store_dir, exist_ok=True)
+
+    def path(self, content_hash):
+        """Blob path of a hash, fanned out over 256 directories"""
+        return os.path.join(self.store_dir, content_hash[:2], f"{content_hash}.gz")
+
+    def put_file(self, file_path):
+        """
+        Store a file, compressing it while it is hashed
+
+        Args:
+            file_path: File to store
+
+        Returns:
+            str: SHA-256 hex digest of the uncompressed content
+        """
+        digest = hashlib.sha256()
+        scratch = os.path.join(self.store_dir, f".{os.getpid()}.{threading.get_ident()}.tmp")
+
+        try:
+            with open(file_path, 'rb') as source, open(scratch, 'wb') as raw:
+                # mtime=0 keeps blobs byte-identical for identical content
+                with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=self.level, mtime=0) as compressed:
+                    for chunk in iter(lambda: source.read(READ_CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                        compressed.write(chunk)
+
+            content_hash = digest.hexdigest()
+            destination = self.path(content_hash)
+            with self._lock:
+                if os.path.exists(destination):
+                    return content_hash
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                os.replace(scratch, destination)
+            return content_hash
+        finally:
+            if os.path.exists(scratch):
+                os.remove(scratch)
+
+    def has(self, content_hash):
+        """Whether a blob exists"""
+        return bool(content_hash) and os.path.exists(self.path(content_hash))
+
+    def read_text(self, content_hash):
+        """
+        Decompress a blob as text
+
+        Newlines are translated like open(..., 'r') so callers see exactly
+        what reading the source file used to return.
+
+        Args:
+            content_hash: Hash returned by put_file()
+
+        Returns:
+            str: Text, or None if the blob does not exist
+        """
+        try:
+            with gzip.open(self.path(content_hash), 'rb') as compressed:
+                return io.TextIOWrapper(compressed, encoding='utf-8').read()
+        except FileNotFoundError:
+            return None
+
+    def remove(self, content_hash):
+        """Delete a blob"""
+        with self._lock:
+            if self.has(content_hash):
+                os.remove(self.path(content_hash))
+
+    def store_recording(self, recording, commit=True):
+        """
+        Store a recording's transcript and summary and record their hashes
+
+        Args:
+            recording: Recording row
+            commit: Commit the session afterwards
+
+        Returns:
+            bool: True if any hash changed
+        """
+        changed = False
+        for hash_column, file_column in CONTENT_KINDS.values():
+            source = getattr(recording, file_column)
+            content_hash = self.put_file(source) if source and os.path.exists(source) else None
+            if getattr(recording, hash_column) != content_hash:
+                setattr(recording, hash_column, content_hash)
+                changed = True
+
+        if changed and commit:
+            db.session.commit()
+        return changed
+
+    def release_recording(self, recording):
+        """
+        Delete the blobs of a recording that no other recording shares
+
+        Call after the recording row has been deleted (or flushed as deleted).
+
+        Args:
+            recording: Recording row
+        """
+        for hash_column, _ in CONTENT_KINDS.values():
+            content_hash = getattr(recording, hash_column)
+            if not content_hash:
+                continue
+            shared = Recording.query.filter(
+                (Recording.transcript_hash == content_hash) | (Recording.summary_hash == content_hash)
+            ).first()
+            if shared is None:
+                self.remove(content_hash)
@@ -3,11 +3,15 @@ Database models and initialization
 """
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, text
 from datetime import datetime
 import os
 
 db = SQLAlchemy()
 
+# Seconds a connection waits on a locked database (and on an exhausted pool)
+BUSY_TIMEOUT = 30
+
 
 class User(db.Model):
     """User model"""
@@ -46,14 +50,171 @@ class Recording(db.Model):
     summary_pdf_path = db.Column(db.String(500))
     metadata_file_path = db.Column(db.String(500))
     
+    # SHA-256 of the transcript and summary text in the content store
+    transcript_hash = db.Column(db.String(64))
+    summary_hash = db.Column(db.String(64))
+    
+    # Serves "this user's recordings, newest first" without a scan and sort
+    __table_args__ = (
+        db.Index('ix_recordings_user_created', 'user_id', 'created_at'),
+    )
+    
     def __repr__(self):
         return f'<Recording {self.session_id}>'
 
 
+class SearchSegment(db.Model):
+    """Searchable passage of a transcript or summary (content of the FTS5 index)"""
+    __tablename__ = 'search_segments'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    recording_id = db.Column(db.Integer, db.ForeignKey('recordings.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    kind = db.Column(db.String(20), nullable=False)  # transcript, summary
+    position = db.Column(db.Integer, nullable=False)
+    start = db.Column(db.Float)  # Audio offset in seconds, None for text uploads
+    text = db.Column(db.Text, nullable=False)
+    
+    def __repr__(self):
+        return f'<SearchSegment {self.recording_id}:{self.kind}:{self.position}>'
+
+
+class RecordingVector(db.Model):
+    """Hashed term weights of a recording (rows of the related-meetings index)"""
+    __tablename__ = 'recording_vectors'
+    
+    recording_id = db.Column(db.Integer, db.ForeignKey('recordings.id'), primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False, index=True)
+    features = db.Column(db.LargeBinary, nullable=False)  # int32 feature ids, ascending
+    weights = db.Column(db.LargeBinary, nullable=False)  # float32 log-scaled term counts
+    
+    def __repr__(self):
+        return f'<RecordingVector {self.recording_id}>'
+
+
+class SessionRoute(db.Model):
+    """Server process owning a live session or batch (see session_registry)"""
+    __tablename__ = 'session_routes'
+    
+    key = db.Column(db.String(200), primary_key=True)  # '<kind>:<id>'
+    user_id = db.Column(db.Integer, nullable=False)
+    owner = db.Column(db.String(255), nullable=False, index=True)  # host:pid
+    address = db.Column(db.String(500), nullable=False)  # Unix socket of the owner
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<SessionRoute {self.key} -> {self.owner}>'
+
+
+def sqlite_engine_options(pool_size, max_overflow=10):
+    """
+    Engine options for a file-backed SQLite database shared across threads
+
+    Args:
+        pool_size: Connections kept open (one per thread that queries
+                   concurrently: request threads plus background workers)
+        max_overflow: Extra connections allowed during bursts
+
+    Returns:
+        dict: SQLALCHEMY_ENGINE_OPTIONS
+    """
+    return {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': BUSY_TIMEOUT,
+        'connect_args': {'timeout': BUSY_TIMEOUT, 'check_same_thread': False}
+    }
+
+
+def sqlite_pragmas(config):
+    """
+    Per-connection pragmas of the production profile
+
+    WAL lets readers proceed while a background job writes, and
+    synchronous=NORMAL is durable across application crashes in WAL mode
+    (only an OS crash can lose the last transactions).
+
+    Args:
+        config: recorder_config.yml settings
+
+    Returns:
+        dict: Pragma name -> value
+    """
+    return {
+        'journal_mode': 'WAL',
+        'synchronous': config.get('db_synchronous', 'NORMAL'),
+        # Negative cache_size is in KiB
+        'cache_size': -int(config.get('db_cache_mb', 64)) * 1024,
+        'mmap_size': int(config.get('db_mmap_mb', 256)) * 1024 * 1024,
+        'temp_store': 'MEMORY'
+    }
+
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """
+    Apply pragmas to every new connection of an engine
+
+    Args:
+        engine: SQLAlchemy engine
+        pragmas: sqlite_pragmas() result
+    """
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def migrate_db():
+    """
+    Create columns and indexes declared on the models but missing from the database
+
+    create_all() only builds new tables, so databases created before a
+    column or index was declared get it here. Added columns must be
+    nullable, since existing rows have no value for them.
+
+    Returns:
+        list: Names of the columns ('table.column') and indexes created
+    """
+    inspector = inspect(db.engine)
+    created = []
+
+    for table in db.metadata.sorted_tables:
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                print(f"[Database] Adding column {column.name} to {table.name}...")
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                with db.engine.begin() as connection:
+                    connection.execute(text(
+                        f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+                    ))
+                created.append(f"{table.name}.{column.name}")
+
+    for table in db.metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                print(f"[Database] Creating index {index.name} on {table.name}...")
+                index.create(db.engine)
+                created.append(index.name)
+
+    if any('.' not in name for name in created):
+        # Refresh planner statistics so the new indexes are used right away
+        with db.engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+    if created:
+        print(f"   ✓ Created {len(created)} column(s)/index(es)")
+
+    return created
+
+
 def init_db(app):
     """Initialize database with Flask app"""
     db.init_app(app)
     with app.app_context():
         db.create_all()
+        migrate_db()
     return db
 
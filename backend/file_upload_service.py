@@ -5,19 +5,31 @@ Handles audio, PDF, and text file uploads for transcription and summarization
 
 import os
 import sys
-import wave
 import json
+import shutil
 from datetime import datetime
 from pathlib import Path
-import PyPDF2
 from werkzeug.utils import secure_filename
 
 # Add parent directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
 
-from vosk import Model, KaldiRecognizer
-from summarizer import Summarizer
+from summarizer import Summarizer, insights_file_for, chapters_file_for
+import summarizer_backends
+from stt_engine import load_model
+from segmenter import segment_transcript_timed, split_sentences, iter_sentences
+from transcript_aggregator import segments_file_for
 from database import db, Recording
+from artifact_cache import ArtifactCache, hash_file, link_or_copy
+from pdf_text import extract_pdf_text, DEFAULT_PARALLEL_PAGES, DEFAULT_PAGE_TIMEOUT
+from pcm_store import PCMStore
+from content_store import ContentStore, DEFAULT_CONTENT_DIR
+from search_index import index_recording as index_for_search
+from related_index import index_recording as index_related
+
+
+# Characters read per step when streaming large text uploads
+TEXT_STREAM_CHUNK_CHARS = 1024 * 1024
 
 
 class FileUploadService:
@@ -27,18 +39,43 @@ class FileUploadService:
         self.config = config
         self.allowed_audio_extensions = {'wav', 'mp3', 'ogg', 'flac', 'm4a', 'webm'}
         self.allowed_text_extensions = {'txt', 'pdf'}
+        summarizer_backends.configure(config)
         self.summarizer = Summarizer(
             config.get('summarizer', 'textrank'),
             config.get('extractive_sentences', 5)
         )
         
-        # Load Vosk model for audio transcription
+        # Content-addressed cache of transcripts and summaries
+        self.artifact_cache = ArtifactCache(
+            config.get('artifact_cache_dir') or os.path.join(
+                os.path.dirname(__file__), '..', 'data', 'cache', 'artifacts'
+            ),
+            int(config.get('artifact_cache_max_mb', 1024)) * 1024 * 1024
+        )
+        
+        # Decoded 16 kHz mono PCM of uploaded audio, shared by every transcription pass
+        self.pcm_store = PCMStore(
+            config.get('pcm_cache_dir') or os.path.join(
+                os.path.dirname(__file__), '..', 'data', 'cache', 'pcm'
+            ),
+            int(config.get('pcm_cache_max_mb', 4096)) * 1024 * 1024,
+            config.get('ffmpeg_path', 'ffmpeg')
+        )
+        
+        # Compressed transcript and summary bodies served by the detail view
+        self.content_store = ContentStore(config.get('content_store_dir') or DEFAULT_CONTENT_DIR)
+        self._vosk_warned = False
+    
+    @property
+    def vosk_model(self):
+        """Vosk model for audio transcription, loaded on first use (None if unavailable)"""
         try:
-            self.vosk_model = Model(config['model_path'])
-            print(f"[FileUploadService] Vosk model loaded from {config['model_path']}")
+            return load_model(self.config['model_path'])
         except Exception as e:
-            print(f"[FileUploadService] Warning: Could not load Vosk model: {e}")
-            self.vosk_model = None
+            if not self._vosk_warned:
+                self._vosk_warned = True
+                print(f"[FileUploadService] Warning: Could not load Vosk model: {e}")
+            return None
     
     def allowed_file(self, filename, file_type='audio'):
         """Check if file extension is allowed"""
@@ -69,20 +106,24 @@ class FileUploadService:
         filename = f"{timestamp}_{original_filename}"
         
         file_path = os.path.join(user_upload_dir, filename)
+        # Batch uploads can carry the same name within one second
+        counter = 1
+        while os.path.exists(file_path):
+            file_path = os.path.join(user_upload_dir, f"{timestamp}_{counter}_{original_filename}")
+            counter += 1
         file.save(file_path)
         
         return file_path, original_filename
     
     def extract_text_from_pdf(self, pdf_path):
-        """Extract text from PDF file"""
+        """Extract text from PDF file (page-sharded across processes for large files)"""
         try:
-            text = ""
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            
-            return text.strip()
+            return extract_pdf_text(
+                pdf_path,
+                int(self.config.get('pdf_extract_workers', 0)),
+                int(self.config.get('pdf_extract_parallel_pages', DEFAULT_PARALLEL_PAGES)),
+                float(self.config.get('pdf_extract_page_timeout', DEFAULT_PAGE_TIMEOUT))
+            )
         except Exception as e:
             raise Exception(f"Failed to extract text from PDF: {str(e)}")
     
@@ -95,94 +136,227 @@ class FileUploadService:
         except Exception as e:
             raise Exception(f"Failed to read text file: {str(e)}")
     
-    def transcribe_audio_file(self, audio_path):
-        """Transcribe audio file using Vosk"""
+    def transcribe_audio_file(self, audio_path, file_hash=None):
+        """
+        Transcribe audio file using Vosk
+        
+        Args:
+            audio_path: Uploaded audio (any format ffmpeg can decode)
+            file_hash: SHA-256 of the file, if already computed
+        """
         if not self.vosk_model:
             raise Exception("Vosk model not loaded")
         
         try:
-            # Open audio file
-            wf = wave.open(audio_path, "rb")
-            
-            # Check audio format
-            if wf.getnchannels() != 1:
-                raise Exception("Audio must be mono (1 channel)")
-            
-            sample_rate = wf.getframerate()
-            
-            # Create recognizer
-            recognizer = KaldiRecognizer(self.vosk_model, sample_rate)
-            recognizer.SetWords(True)
-            
-            # Process audio
-            transcript_segments = []
-            full_text = ""
+            # Decoded once; later passes map the cached derivative
+            pcm = self.pcm_store.get(audio_path, file_hash)
             
             print(f"[FileUploadService] Starting transcription of {audio_path}")
             
-            while True:
-                data = wf.readframes(4000)
-                if len(data) == 0:
-                    break
-                
-                if recognizer.AcceptWaveform(data):
-                    result = json.loads(recognizer.Result())
-                    if result.get('text'):
-                        segment_text = result['text']
-                        full_text += segment_text + " "
-                        transcript_segments.append({
-                            'text': segment_text,
-                            'words': result.get('result', [])
-                        })
-                        print(f"[Transcription] {segment_text}")
-            
-            # Get final result
-            final_result = json.loads(recognizer.FinalResult())
-            if final_result.get('text'):
-                segment_text = final_result['text']
-                full_text += segment_text
-                transcript_segments.append({
-                    'text': segment_text,
-                    'words': final_result.get('result', [])
-                })
-                print(f"[Transcription] {segment_text}")
-            
-            wf.close()
-            
-            return {
-                'full_text': full_text.strip(),
-                'segments': transcript_segments
-            }
+            return self.transcribe_pcm(pcm.chunks(), pcm.sample_rate)
             
         except Exception as e:
             raise Exception(f"Transcription failed: {str(e)}")
     
-    def process_uploaded_file(self, file_path, file_type, original_filename, user_id, title):
-        """Process uploaded file and create recording entry"""
+    def transcribe_pcm(self, chunks, sample_rate):
+        """
+        Transcribe mono 16-bit PCM with Vosk
+        
+        Args:
+            chunks: Iterable of PCM byte strings (consumed lazily, so it can
+                    follow an upload that is still arriving)
+            sample_rate: Sample rate in Hz
+        
+        Returns:
+            dict: full_text and segments
+        """
+        vosk_model = self.vosk_model
+        if not vosk_model:
+            raise Exception("Vosk model not loaded")
+        
+        from vosk import KaldiRecognizer
+        
+        # Create recognizer
+        recognizer = KaldiRecognizer(vosk_model, sample_rate)
+        recognizer.SetWords(True)
+        
+        # Process audio
+        transcript_segments = []
+        full_text = ""
+        
+        for data in chunks:
+            if recognizer.AcceptWaveform(data):
+                result = json.loads(recognizer.Result())
+                if result.get('text'):
+                    segment_text = result['text']
+                    full_text += segment_text + " "
+                    transcript_segments.append({
+                        'text': segment_text,
+                        'words': result.get('result', [])
+                    })
+                    print(f"[Transcription] {segment_text}")
+        
+        # Get final result
+        final_result = json.loads(recognizer.FinalResult())
+        if final_result.get('text'):
+            segment_text = final_result['text']
+            full_text += segment_text
+            transcript_segments.append({
+                'text': segment_text,
+                'words': final_result.get('result', [])
+            })
+            print(f"[Transcription] {segment_text}")
+        
+        return {
+            'full_text': full_text.strip(),
+            'segments': transcript_segments
+        }
+    
+    def _streams_text(self, file_path, file_type):
+        """Whether a text upload is large enough for the bounded-memory path"""
+        threshold = float(self.config.get('text_stream_threshold_mb', 16)) * 1024 * 1024
+        return file_type == 'txt' and os.path.getsize(file_path) >= threshold
+    
+    def _cache_keys(self, file_hash, file_type, streaming=False):
+        """
+        Build artifact cache keys for an upload
+        
+        The transcript depends on the input bytes (and the Vosk model for
+        audio); the summary additionally depends on the summarizer settings.
+        
+        Returns:
+            tuple: (transcript_key, summary_key)
+        """
+        transcript_key = self.artifact_cache.make_key(file_hash, {
+            'file_type': file_type,
+            'model_path': self.config.get('model_path') if file_type == 'audio' else None
+        })
+        summary_params = {
+            'summarizer': self.config.get('summarizer', 'textrank'),
+            'extractive_sentences': self.config.get('extractive_sentences', 5),
+            'insights': 1,
+            'chapter_window': self.config.get('chapter_window'),
+            'chapter_min_sentences': self.config.get('chapter_min_sentences'),
+            'chapter_summary_sentences': self.config.get('chapter_summary_sentences')
+        }
+        if streaming:
+            # Streamed uploads are ranked online, so the batching shapes the summary
+            summary_params['stream'] = [
+                self.config.get('stream_batch_sentences'),
+                self.config.get('stream_pool_sentences')
+            ]
+        summary_key = self.artifact_cache.make_key(transcript_key, summary_params)
+        return transcript_key, summary_key
+    
+    def create_recording(self, file_path, file_type, original_filename, user_id, title,
+                         status='processing', suffix=''):
+        """
+        Create the recording entry for an upload
+        
+        Args:
+            suffix: Appended to the session id (keeps batch entries created
+                    within the same second unique)
+            status: Initial status ('queued' for batch uploads)
+        
+        Returns:
+            Recording: Committed recording
+        """
+        session_timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        recording = Recording(
+            user_id=user_id,
+            session_id=f"upload_{user_id}_{session_timestamp}{suffix}",
+            title=title or original_filename,
+            status=status
+        )
+        if file_type == 'audio':
+            recording.audio_file_path = file_path
+        db.session.add(recording)
+        db.session.commit()
+        return recording
+    
+    def process_uploaded_file(self, file_path, file_type, original_filename, user_id, title,
+                              file_hash=None, transcription=None, recording=None):
+        """
+        Process uploaded file and create recording entry
+        
+        Args:
+            file_hash: SHA-256 of the file, if already computed while receiving it
+            transcription: transcribe_pcm() result, if the audio was already
+                           transcribed while it was uploaded
+            recording: Recording created earlier by create_recording() (batch
+                       uploads); a new one is created otherwise
+        """
         try:
-            session_timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-            session_id = f"upload_{user_id}_{session_timestamp}"
+            if recording is None:
+                recording = self.create_recording(file_path, file_type, original_filename, user_id, title)
+            else:
+                recording.status = 'processing'
+                db.session.commit()
+            session_id = recording.session_id
             
-            # Create recording entry
-            recording = Recording(
-                user_id=user_id,
-                session_id=session_id,
-                title=title or original_filename,
-                status='processing'
-            )
-            db.session.add(recording)
-            db.session.commit()
+            session_folder = self._get_session_folder(session_id, user_id)
+            transcript_file = os.path.join(session_folder, f"{session_id}.txt")
+            summary_file = os.path.join(session_folder, f"{session_id}_summary.txt")
+            segments_file = segments_file_for(transcript_file)
+            
+            file_hash = file_hash or hash_file(file_path)
+            streaming = self._streams_text(file_path, file_type)
+            transcript_key, summary_key = self._cache_keys(file_hash, file_type, streaming)
+            
+            # Same bytes and settings as an earlier upload: link its artifacts
+            cached = self.artifact_cache.get(summary_key)
+            if cached:
+                print(f"[FileUploadService] Cache hit for {original_filename}, reusing transcript and summary")
+                self._materialize_document(cached['transcript'], transcript_file, 'Transcript', session_id)
+                self._materialize_document(cached['summary'], summary_file, 'Summary', session_id)
+                if 'segments' in cached:
+                    link_or_copy(cached['segments'], segments_file)
+                if 'insights' in cached:
+                    link_or_copy(cached['insights'], insights_file_for(summary_file))
+                if 'chapters' in cached:
+                    link_or_copy(cached['chapters'], chapters_file_for(summary_file))
+                
+                recording.transcript_file_path = transcript_file
+                recording.summary_file_path = summary_file
+                recording.status = 'completed'
+                db.session.commit()
+                self._index_recording(recording)
+                
+                return {
+                    'recording_id': recording.id,
+                    'session_id': session_id,
+                    'transcript_file': transcript_file,
+                    'summary_file': summary_file,
+                    'transcript_text': None if streaming else self._read_transcript_text(transcript_file),
+                    'summary_text': self._read_summary_text(summary_file)
+                }
+            
+            if streaming:
+                return self._process_text_stream(
+                    recording, file_path, original_filename, session_folder,
+                    transcript_file, transcript_key, summary_key
+                )
             
             transcript_text = ""
+            sentences = None
+            segments = None
+            
+            cached = self.artifact_cache.get(transcript_key)
+            if cached:
+                print(f"[FileUploadService] Cache hit for {original_filename}, reusing transcript")
+                self._materialize_document(cached['transcript'], transcript_file, 'Transcript', session_id)
+                transcript_text = self._read_transcript_text(transcript_file)
+                if 'segments' in cached:
+                    link_or_copy(cached['segments'], segments_file)
+                    with open(segments_file, 'r', encoding='utf-8') as f:
+                        segments = json.load(f)
             
             # Process based on file type
-            if file_type == 'audio':
+            elif file_type == 'audio':
                 print(f"[FileUploadService] Processing audio file: {original_filename}")
-                transcription_result = self.transcribe_audio_file(file_path)
+                transcription_result = transcription or self.transcribe_audio_file(file_path, file_hash)
                 transcript_text = transcription_result['full_text']
-                
-                # Save audio file path
-                recording.audio_file_path = file_path
+                segments = transcription_result['segments']
                 
             elif file_type == 'pdf':
                 print(f"[FileUploadService] Processing PDF file: {original_filename}")
@@ -197,23 +371,66 @@ class FileUploadService:
                 db.session.commit()
                 raise Exception("No text content extracted from file")
             
-            # Save transcript to file
-            transcript_file = self._save_transcript(transcript_text, session_id, user_id)
+            if segments is not None:
+                timed_sentences = segment_transcript_timed(
+                    segments,
+                    self.config.get('segment_pause_seconds', 0.6),
+                    self.config.get('segment_max_words', 40)
+                )
+                sentences = [sentence['text'] for sentence in timed_sentences]
+            else:
+                timed_sentences = [
+                    {'text': sentence, 'start': None}
+                    for sentence in split_sentences(transcript_text)
+                ]
+            
+            # Save transcript to file (unless it was linked from the cache)
+            if not os.path.exists(transcript_file):
+                self._save_transcript(transcript_text, session_id, user_id)
+                transcript_artifacts = {'transcript': transcript_file}
+                if segments is not None:
+                    with open(segments_file, 'w', encoding='utf-8') as f:
+                        json.dump(segments, f)
+                    transcript_artifacts['segments'] = segments_file
+                self.artifact_cache.put(transcript_key, transcript_artifacts)
             recording.transcript_file_path = transcript_file
             
             # Generate summary
             print(f"[FileUploadService] Generating summary...")
-            summary = self.summarizer.generate_summary(transcript_text)
+            summary, insights, mode = self.summarizer.generate_summary(transcript_text, sentences)
             summary_file = self.summarizer.save_summary(
                 summary,
-                os.path.dirname(transcript_file),
-                session_id
+                session_folder,
+                session_id,
+                mode
             )
             recording.summary_file_path = summary_file
+            summary_artifacts = {
+                'transcript': transcript_file,
+                'summary': summary_file
+            }
+            if os.path.exists(segments_file):
+                summary_artifacts['segments'] = segments_file
+            insights_file = self.summarizer.save_insights(
+                insights,
+                session_folder,
+                session_id
+            )
+            if insights_file:
+                summary_artifacts['insights'] = insights_file
+            chapters_file = self.summarizer.save_chapters(
+                self.summarizer.generate_chapters(timed_sentences, self._audio_duration(segments)),
+                session_folder,
+                session_id
+            )
+            if chapters_file:
+                summary_artifacts['chapters'] = chapters_file
+            self.artifact_cache.put(summary_key, summary_artifacts)
             
             # Update recording status
             recording.status = 'completed'
             db.session.commit()
+            self._index_recording(recording)
             
             return {
                 'recording_id': recording.id,
@@ -231,9 +448,122 @@ class FileUploadService:
                 db.session.commit()
             raise
     
-    def _save_transcript(self, text, session_id, user_id):
-        """Save transcript to file"""
-        # Create session folder
+    def _process_text_stream(self, recording, file_path, original_filename, session_folder,
+                             transcript_file, transcript_key, summary_key):
+        """
+        Process a large text upload in one streaming pass
+        
+        The file is read in TEXT_STREAM_CHUNK_CHARS pieces that are written
+        to the transcript as they are split into sentences for online
+        TextRank, so peak memory does not depend on the file size. Chapters
+        need the whole TF-IDF matrix and are not generated on this path.
+        
+        Returns:
+            dict: Same shape as process_uploaded_file(), with transcript_text None
+        """
+        session_id = recording.session_id
+        print(f"[FileUploadService] Streaming large text file: {original_filename}")
+        
+        cached = self.artifact_cache.get(transcript_key)
+        if cached:
+            print(f"[FileUploadService] Cache hit for {original_filename}, reusing transcript")
+            self._materialize_document(cached['transcript'], transcript_file, 'Transcript', session_id)
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as source:
+                chunks = iter(lambda: source.read(TEXT_STREAM_CHUNK_CHARS), '')
+                if not cached:
+                    chunks = self._write_transcript_chunks(chunks, transcript_file, session_id)
+                summary, insights, mode = self.summarizer.generate_summary_stream(iter_sentences(chunks))
+        except UnicodeDecodeError as e:
+            raise Exception(f"Failed to read text file: {str(e)}")
+        
+        if not summary.strip():
+            recording.status = 'failed'
+            db.session.commit()
+            raise Exception("No text content extracted from file")
+        
+        if not cached:
+            self.artifact_cache.put(transcript_key, {'transcript': transcript_file})
+        recording.transcript_file_path = transcript_file
+        
+        summary_file = self.summarizer.save_summary(summary, session_folder, session_id, mode)
+        recording.summary_file_path = summary_file
+        summary_artifacts = {
+            'transcript': transcript_file,
+            'summary': summary_file
+        }
+        insights_file = self.summarizer.save_insights(
+            insights,
+            session_folder,
+            session_id
+        )
+        if insights_file:
+            summary_artifacts['insights'] = insights_file
+        self.artifact_cache.put(summary_key, summary_artifacts)
+        
+        recording.status = 'completed'
+        db.session.commit()
+        self._index_recording(recording)
+        
+        return {
+            'recording_id': recording.id,
+            'session_id': session_id,
+            'transcript_file': transcript_file,
+            'summary_file': summary_file,
+            'transcript_text': None,
+            'summary_text': summary
+        }
+    
+    def _write_transcript_chunks(self, chunks, transcript_file, session_id):
+        """
+        Write text chunks into a transcript file while passing them through
+        
+        Produces the same file as _save_transcript() on the stripped text;
+        trailing whitespace of each chunk is held back until more text
+        follows.
+        
+        Yields:
+            str: The input chunks, unchanged
+        """
+        with open(transcript_file, 'w', encoding='utf-8') as f:
+            f.write(f"Transcript: {session_id}\n")
+            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write("=" * 60 + "\n\n")
+            
+            started = False
+            pending = ''
+            for chunk in chunks:
+                yield chunk
+                text = pending + chunk
+                if not started:
+                    text = text.lstrip()
+                    started = bool(text)
+                body = text.rstrip()
+                pending = text[len(body):]
+                f.write(body)
+            
+            f.write("\n\n" + "=" * 60 + "\n")
+    
+    def _index_recording(self, recording):
+        """Store the bodies and refresh the search and related-meetings indexes (failures do not fail the upload)"""
+        try:
+            self.content_store.store_recording(recording)
+            index_for_search(recording)
+            index_related(recording)
+        except Exception as e:
+            print(f"[FileUploadService] Warning: Could not index {recording.session_id}: {e}")
+    
+    def _audio_duration(self, segments):
+        """End time of the last recognized word, or None without word timings"""
+        for segment in reversed(segments or []):
+            words = segment.get('words') or []
+            if words and 'end' in words[-1]:
+                return words[-1]['end']
+        return None
+    
+    def _get_session_folder(self, session_id, user_id):
+        """Create (if needed) and return the session folder for an upload"""
         user_recordings_dir = os.path.join(
             os.path.dirname(__file__),
             '..',
@@ -246,6 +576,12 @@ class FileUploadService:
         session_folder = os.path.join(user_recordings_dir, session_id)
         os.makedirs(session_folder, exist_ok=True)
         
+        return session_folder
+    
+    def _save_transcript(self, text, session_id, user_id):
+        """Save transcript to file"""
+        session_folder = self._get_session_folder(session_id, user_id)
+        
         # Save transcript
         transcript_file = os.path.join(session_folder, f"{session_id}.txt")
         
@@ -258,6 +594,51 @@ class FileUploadService:
         
         return transcript_file
     
+    def _materialize_document(self, cached_file, destination, label, session_id):
+        """
+        Copy a cached transcript or summary into a session, naming that session
+
+        Only the body is shared between uploads; the header's first line
+        ('<label>: <session_id>') is rewritten for the new recording.
+        
+        Args:
+            cached_file: Cached file written by _save_transcript or Summarizer.save_summary
+            destination: Path in the session folder
+            label: 'Transcript' or 'Summary'
+            session_id: Session the copy belongs to
+            
+        Returns:
+            str: Destination path
+        """
+        # Never write through a hard link into the cache
+        if os.path.exists(destination):
+            os.remove(destination)
+        
+        # newline='' keeps the cached line endings byte for byte
+        with open(cached_file, 'r', encoding='utf-8', newline='') as source, \
+                open(destination, 'w', encoding='utf-8', newline='') as f:
+            first_line = source.readline()
+            if first_line.startswith(f"{label}: "):
+                ending = first_line[len(first_line.rstrip('\r\n')):]
+                first_line = f"{label}: {session_id}{ending}"
+            f.write(first_line)
+            shutil.copyfileobj(source, f)
+        
+        return destination
+    
+    def _read_transcript_text(self, transcript_file):
+        """Read the body of a transcript written by _save_transcript"""
+        with open(transcript_file, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # Body sits between the header and footer separator lines
+        parts = content.split("=" * 60)
+        return parts[1].strip() if len(parts) >= 3 else content.strip()
+    
+    def _read_summary_text(self, summary_file):
+        """Read the body of a summary written by Summarizer.save_summary"""
+        return self._read_transcript_text(summary_file)
+    
     def delete_uploaded_file(self, file_path):
         """Delete uploaded file from disk"""
         try:
@@ -0,0 +1,48 @@
+"""
+Lazy Service
+Module-level service handles that construct the service on first use
+"""
+
+import time
+import threading
+
+
+class LazyService:
+    def __init__(self, name, factory):
+        """
+        Initialize lazy service handle
+
+        Attribute access is forwarded to the service, which is built by
+        factory() the first time it is needed (by a request or by warm-up),
+        so importing the module that holds the handle stays cheap.
+
+        Args:
+            name: Name used in logs and readiness reports
+            factory: Callable returning the service
+        """
+        self._name = name
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        """Whether the service has been constructed"""
+        return self._instance is not None
+
+    def get(self):
+        """The service, constructed on first call"""
+        instance = self._instance
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if self._instance is None:
+                started = time.perf_counter()
+                self._instance = self._factory()
+                print(f"[Startup] {self._name} ready in {time.perf_counter() - started:.2f}s")
+            return self._instance
+
+    def __getattr__(self, attribute):
+        # Only reached for names LazyService itself does not define
+        return getattr(self.get(), attribute)
@@ -0,0 +1,202 @@
+"""
+PCM Store
+Canonical 16 kHz mono 16-bit PCM derivatives of uploaded audio, decoded once
+and memory-mapped by every later transcription pass
+"""
+
+import os
+import mmap
+import wave
+import shutil
+import threading
+import subprocess
+
+from artifact_cache import ArtifactCache, hash_file
+from chunked_upload import UploadError, parse_wav_header
+
+
+PCM_SAMPLE_RATE = 16000
+
+# Bump when the decode pipeline changes so old derivatives are not reused
+PCM_VERSION = 1
+
+# Frames per chunk handed to the recognizer (matches the recorder)
+CHUNK_FRAMES = 4000
+
+# Enough to reach the data chunk past LIST/bext metadata
+WAV_HEADER_BYTES = 64 * 1024
+
+
+class PCMAudio:
+    def __init__(self, path, offset, length, sample_rate):
+        """
+        Mono 16-bit little-endian PCM stored in a file
+
+        Args:
+            path: File holding the samples (a derivative or the upload itself)
+            offset: Byte offset of the first sample
+            length: Number of PCM bytes
+            sample_rate: Sample rate in Hz
+        """
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.sample_rate = sample_rate
+
+    @property
+    def duration(self):
+        """Length in seconds"""
+        return self.length / 2 / self.sample_rate
+
+    def chunks(self, frames=CHUNK_FRAMES):
+        """
+        Yield PCM in chunks straight from a memory map
+
+        The file is never read as a whole; pages are faulted in as the
+        recognizer consumes them and stay shared in the page cache.
+
+        Args:
+            frames: Samples per chunk
+
+        Yields:
+            bytes: PCM chunk
+        """
+        if self.length <= 0:
+            return
+
+        step = frames * 2
+        with open(self.path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                end = min(self.offset + self.length, len(mapped))
+                for position in range(self.offset, end, step):
+                    # Vosk takes bytes, so each chunk is a small copy of the mapped page
+                    yield mapped[position:min(position + step, end)]
+
+
+def read_wav_layout(audio_path):
+    """
+    Describe an uncompressed WAV file
+
+    Args:
+        audio_path: File to inspect
+
+    Returns:
+        dict: channels, sample_rate, sample_width, data_offset, data_size,
+              or None if the file is not a PCM WAV
+    """
+    try:
+        # wave only opens integer PCM, which rules out float and compressed WAVs
+        with wave.open(audio_path, 'rb'):
+            pass
+        with open(audio_path, 'rb') as f:
+            layout = parse_wav_header(f.read(WAV_HEADER_BYTES))
+    except (wave.Error, EOFError, UploadError, OSError):
+        return None
+
+    if layout is None:
+        return None
+
+    # Streamed recordings may leave a placeholder size in the header
+    available = os.path.getsize(audio_path) - layout['data_offset']
+    layout['data_size'] = max(0, min(layout['data_size'], available))
+    return layout
+
+
+class PCMStore:
+    def __init__(self, cache_dir, max_bytes, ffmpeg='ffmpeg'):
+        """
+        Initialize PCM store
+
+        Derivatives are keyed by the content hash of the upload, so a file
+        uploaded twice is decoded once, and are evicted least recently used
+        first once the store exceeds max_bytes.
+
+        Args:
+            cache_dir: Root directory for derivatives
+            max_bytes: Disk quota for derivatives
+            ffmpeg: ffmpeg executable used to decode and resample
+        """
+        self.cache = ArtifactCache(cache_dir, max_bytes)
+        self.ffmpeg = shutil.which(ffmpeg) if ffmpeg else None
+
+        # One decode per key at a time
+        self._decode_locks = {}
+        self._decode_locks_lock = threading.Lock()
+
+    def make_key(self, file_hash):
+        """Cache key of the derivative of a file"""
+        return self.cache.make_key(file_hash, {
+            'pcm': 's16le',
+            'rate': PCM_SAMPLE_RATE,
+            'channels': 1,
+            'version': PCM_VERSION
+        })
+
+    def _decode_lock(self, key):
+        with self._decode_locks_lock:
+            return self._decode_locks.setdefault(key, threading.Lock())
+
+    def get(self, audio_path, file_hash=None):
+        """
+        Canonical PCM for an audio file, decoding it on first use
+
+        A WAV that is already 16 kHz mono 16-bit is mapped in place with no
+        derivative. Without ffmpeg, other mono 16-bit WAVs are mapped at
+        their own rate (the recognizer resamples); anything else needs ffmpeg.
+
+        Args:
+            audio_path: Uploaded audio file
+            file_hash: SHA-256 of the file, if already known
+
+        Returns:
+            PCMAudio: Samples ready to chunk
+        """
+        layout = read_wav_layout(audio_path)
+        if (layout and layout['channels'] == 1 and layout['sample_width'] == 2
+                and layout['sample_rate'] == PCM_SAMPLE_RATE):
+            return PCMAudio(audio_path, layout['data_offset'], layout['data_size'], PCM_SAMPLE_RATE)
+
+        key = self.make_key(file_hash or hash_file(audio_path))
+
+        with self._decode_lock(key):
+            cached = self.cache.get(key)
+            if cached:
+                return PCMAudio(cached['pcm'], 0, os.path.getsize(cached['pcm']), PCM_SAMPLE_RATE)
+
+            if self.ffmpeg:
+                pcm_path = self._decode(audio_path, key)
+                return PCMAudio(pcm_path, 0, os.path.getsize(pcm_path), PCM_SAMPLE_RATE)
+
+        if layout and layout['channels'] == 1 and layout['sample_width'] == 2:
+            return PCMAudio(audio_path, layout['data_offset'], layout['data_size'], layout['sample_rate'])
+
+        if layout:
+            raise Exception("Audio must be mono 16-bit PCM (install ffmpeg to convert it)")
+        raise Exception(f"Decoding {os.path.splitext(audio_path)[1] or 'this'} audio requires ffmpeg")
+
+    def _decode(self, audio_path, key):
+        """Decode and resample with ffmpeg, then move the result into the store"""
+        scratch = os.path.join(self.cache.cache_dir, f"{key}.{os.getpid()}.{threading.get_ident()}.pcm")
+        command = [
+            self.ffmpeg, '-nostdin', '-v', 'error', '-y',
+            '-i', audio_path,
+            '-vn', '-ac', '1', '-ar', str(PCM_SAMPLE_RATE),
+            '-f', 's16le', '-acodec', 'pcm_s16le',
+            scratch
+        ]
+
+        print(f"[PCMStore] Decoding {os.path.basename(audio_path)} to {PCM_SAMPLE_RATE} Hz mono PCM")
+        try:
+            completed = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            if completed.returncode != 0:
+                error = completed.stderr.decode('utf-8', 'replace').strip().splitlines()
+                raise Exception(f"ffmpeg could not decode audio: {error[-1] if error else completed.returncode}")
+
+            stored = self.cache.put(key, {'pcm': scratch}, move=True)
+        finally:
+            if os.path.exists(scratch):
+                os.remove(scratch)
+
+        if 'pcm' not in stored:
+            raise Exception("Decoded audio exceeds the PCM store quota")
+        return stored['pcm']
@@ -0,0 +1,228 @@
+"""
+Batch PDF Rendering
+Renders transcript and summary PDFs for many recordings across a process pool
+
+Usage:
+    python backend/pdf_batch.py [--workers N] [--user-id ID] [--kind transcript|summary]
+                                [--force]
+"""
+
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ALL_COMPLETED, FIRST_COMPLETED, wait
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+from pdf_cache import PDFCache, PDF_KINDS
+from pdf_generator import PDFGenerator
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'cache', 'pdfs')
+DEFAULT_CACHE_MAX_MB = 256
+
+# Jobs queued per worker; bounds memory no matter how many recordings there are
+IN_FLIGHT_PER_WORKER = 2
+
+# Per-process cache, created by _init_worker
+_worker_cache = None
+
+
+def _init_worker(cache_dir, max_bytes):
+    """Create the renderer once per worker process"""
+    global _worker_cache
+    _worker_cache = PDFCache(PDFGenerator(), cache_dir, max_bytes)
+
+
+def _render_job(job):
+    """
+    Render one PDF in a worker process
+
+    Args:
+        job: (kind, source_file, session_name, key, force)
+
+    Returns:
+        tuple: (job, seconds, error message or None)
+    """
+    kind, source_file, session_name, key, force = job
+    start = time.perf_counter()
+    try:
+        _worker_cache.get_pdf(kind, source_file, session_name, key=key, force=force)
+        return job, time.perf_counter() - start, None
+    except Exception as e:
+        return job, time.perf_counter() - start, str(e)
+
+
+def iter_pdf_jobs(recordings, kinds=PDF_KINDS):
+    """
+    Expand recordings into (kind, source_file, session_name) jobs
+
+    Args:
+        recordings: Iterable of objects with session_id, transcript_file_path
+                    and summary_file_path (rows are consumed lazily)
+        kinds: PDF kinds to render
+
+    Yields:
+        tuple: (kind, source_file, session_name)
+    """
+    for recording in recordings:
+        sources = {
+            'transcript': recording.transcript_file_path,
+            'summary': recording.summary_file_path
+        }
+        for kind in kinds:
+            source_file = sources[kind]
+            if source_file and os.path.exists(source_file):
+                yield kind, source_file, recording.session_id
+
+
+def render_batch(jobs, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+                 workers=0, force=False, progress=None):
+    """
+    Render PDFs in parallel, skipping documents whose cached PDF is current
+
+    Jobs are pulled lazily and at most workers * IN_FLIGHT_PER_WORKER are
+    submitted at once, so memory stays flat for thousands of recordings.
+
+    Args:
+        jobs: Iterable of (kind, source_file, session_name)
+        cache_dir: PDF cache directory (shared with the download routes)
+        max_bytes: PDF cache size bound
+        workers: Worker processes (0 = CPU count)
+        force: Re-render even if a current PDF is cached
+        progress: Optional dictionary updated in place with running counts
+
+    Returns:
+        dict: total, rendered, skipped, failed, seconds, docs_per_second, errors
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * IN_FLIGHT_PER_WORKER
+
+    stats = progress if progress is not None else {}
+    stats.update({
+        'total': 0, 'rendered': 0, 'skipped': 0, 'failed': 0,
+        'seconds': 0.0, 'docs_per_second': 0.0, 'errors': [], 'done': False
+    })
+
+    # Keys are computed here so current PDFs never reach the pool
+    checker = PDFCache(None, cache_dir, max_bytes)
+    started = time.perf_counter()
+
+    # Spawned workers do not inherit locks or threads from a running server
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                             initargs=(cache_dir, max_bytes)) as pool:
+        pending = set()
+
+        def collect(block):
+            done, still_pending = wait(pending, return_when=FIRST_COMPLETED if block else ALL_COMPLETED)
+            for future in done:
+                job, _, error = future.result()
+                if error:
+                    stats['failed'] += 1
+                    if len(stats['errors']) < 20:
+                        stats['errors'].append({'kind': job[0], 'source': job[1], 'error': error})
+                else:
+                    stats['rendered'] += 1
+            return still_pending
+
+        for kind, source_file, session_name in jobs:
+            stats['total'] += 1
+            try:
+                key = checker.make_key(kind, source_file, session_name)
+            except OSError as e:
+                stats['failed'] += 1
+                if len(stats['errors']) < 20:
+                    stats['errors'].append({'kind': kind, 'source': source_file, 'error': str(e)})
+                continue
+
+            if not force and checker.is_current(key):
+                stats['skipped'] += 1
+                continue
+
+            pending.add(pool.submit(_render_job, (kind, source_file, session_name, key, force)))
+            if len(pending) >= max_in_flight:
+                pending = collect(block=True)
+
+        if pending:
+            pending = collect(block=False)
+
+    # Workers each tracked their own share of the cache; settle the bound once
+    checker.cache.evict()
+
+    stats['seconds'] = time.perf_counter() - started
+    if stats['seconds'] > 0:
+        stats['docs_per_second'] = stats['rendered'] / stats['seconds']
+    stats['done'] = True
+    return stats
+
+
+def create_cli_app(config=None):
+    """Minimal Flask app bound to the same database (and pragmas) as the API"""
+    from flask import Flask
+    from database import db, sqlite_engine_options, sqlite_pragmas, apply_sqlite_pragmas
+
+    app = Flask(__name__)
+    db_path = os.path.join(os.path.dirname(__file__), "..", "data", "meeting_transcriber.db")
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = sqlite_engine_options(1, 0)
+    db.init_app(app)
+    with app.app_context():
+        apply_sqlite_pragmas(db.engine, sqlite_pragmas(config or {}))
+    return app
+
+
+def load_config():
+    """Read PDF cache settings from recorder_config.yml"""
+    import yaml
+
+    config_path = os.path.join(
+        os.path.dirname(__file__), '..', 'iot-meeting-minutes', 'configs', 'recorder_config.yml'
+    )
+    with open(config_path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: pdf_batch_workers or CPU count)')
+    parser.add_argument('--user-id', type=int, help='Only this user\'s recordings')
+    parser.add_argument('--kind', choices=PDF_KINDS, action='append', help='PDF kind (repeatable; default both)')
+    parser.add_argument('--force', action='store_true', help='Re-render even if cached PDFs are current')
+    args = parser.parse_args()
+
+    from database import Recording
+
+    config = load_config()
+    app = create_cli_app(config)
+
+    with app.app_context():
+        query = Recording.query.filter(Recording.status == 'completed')
+        if args.user_id:
+            query = query.filter(Recording.user_id == args.user_id)
+        recordings = query.order_by(Recording.id).yield_per(500)
+
+        workers = args.workers if args.workers is not None else int(config.get('pdf_batch_workers', 0))
+        print(f"[PDFBatch] Rendering with {workers or os.cpu_count()} workers...")
+
+        stats = render_batch(
+            iter_pdf_jobs(recordings, args.kind or PDF_KINDS),
+            config.get('pdf_cache_dir') or DEFAULT_CACHE_DIR,
+            int(config.get('pdf_cache_max_mb', DEFAULT_CACHE_MAX_MB)) * 1024 * 1024,
+            workers,
+            args.force
+        )
+
+    print(f"   ✓ {stats['rendered']} rendered, {stats['skipped']} current, "
+          f"{stats['failed']} failed of {stats['total']} in {stats['seconds']:.1f}s "
+          f"({stats['docs_per_second']:.1f} docs/s)")
+    for error in stats['errors']:
+        print(f"   ✗ {error['kind']} {error['source']}: {error['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+PDF Cache
+Renders transcript and summary PDFs on demand and caches them by source content
+"""
+
+import os
+import queue
+import threading
+
+from artifact_cache import ArtifactCache, hash_file
+from pdf_generator import RENDERER_VERSION
+from summarizer import chapters_file_for
+from transcript_aggregator import segments_file_for
+
+
+PDF_KINDS = ('transcript', 'summary')
+
+
+class PDFCache:
+    def __init__(self, pdf_generator, cache_dir, max_bytes):
+        """
+        Initialize PDF cache
+
+        Args:
+            pdf_generator: PDFGenerator used for rendering
+            cache_dir: Root directory for cached PDFs
+            max_bytes: Total size above which least recently used PDFs are evicted
+        """
+        self.pdf_generator = pdf_generator
+        self.cache = ArtifactCache(cache_dir, max_bytes)
+
+        # Source path -> (mtime_ns, size, sha256), so unchanged files are not re-hashed
+        self._digests = {}
+        self._digest_lock = threading.Lock()
+
+        # One render per key at a time
+        self._render_locks = {}
+        self._render_locks_lock = threading.Lock()
+
+        # Background prewarm queue
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._worker = None
+
+    def _source_digest(self, path):
+        """SHA-256 of a source file, memoized on (mtime, size)"""
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._digest_lock:
+            cached = self._digests.get(path)
+            if cached and cached[:2] == signature:
+                return cached[2]
+
+        digest = hash_file(path)
+        with self._digest_lock:
+            self._digests[path] = signature + (digest,)
+        return digest
+
+    def make_key(self, kind, source_file, session_name):
+        """
+        Cache key (also used as the ETag) for a PDF
+
+        Changes whenever the source text changes (e.g. after a re-decode),
+        the segments next to a transcript or the chapters next to a summary
+        change, or the renderer changes.
+
+        Args:
+            kind: 'transcript' or 'summary'
+            source_file: Transcript or summary text file
+            session_name: Session name printed in the PDF
+
+        Returns:
+            str: Hex digest
+        """
+        if kind not in PDF_KINDS:
+            raise ValueError(f"Unknown PDF kind: {kind}")
+
+        params = {
+            'kind': kind,
+            'session_name': session_name,
+            'renderer': RENDERER_VERSION
+        }
+        if kind == 'transcript':
+            segments_file = segments_file_for(source_file)
+            if os.path.exists(segments_file):
+                params['segments'] = self._source_digest(segments_file)
+        else:
+            chapters_file = chapters_file_for(source_file)
+            if os.path.exists(chapters_file):
+                params['chapters'] = self._source_digest(chapters_file)
+
+        return self.cache.make_key(self._source_digest(source_file), params)
+
+    def _key_lock(self, key):
+        with self._render_locks_lock:
+            return self._render_locks.setdefault(key, threading.Lock())
+
+    def is_current(self, key):
+        """
+        Check whether a PDF for this key is already cached
+
+        Args:
+            key: make_key() result
+
+        Returns:
+            bool: True if no rendering is needed
+        """
+        return self.cache.get(key) is not None
+
+    def get_pdf(self, kind, source_file, session_name, key=None, force=False):
+        """
+        Return a cached PDF, rendering it first if needed
+
+        Args:
+            kind: 'transcript' or 'summary'
+            source_file: Transcript or summary text file
+            session_name: Session name printed in the PDF
+            key: Precomputed make_key() result
+            force: Re-render even if a cached PDF exists
+
+        Returns:
+            tuple: (pdf path, cache key)
+        """
+        key = key or self.make_key(kind, source_file, session_name)
+
+        cached = None if force else self.cache.get(key)
+        if cached:
+            return cached['pdf'], key
+
+        lock = self._key_lock(key)
+        try:
+            with lock:
+                # Another request may have rendered it while we waited
+                cached = None if force else self.cache.get(key)
+                if cached:
+                    return cached['pdf'], key
+
+                render_path = os.path.join(
+                    self.cache.cache_dir,
+                    f"render.{key}.{threading.get_ident()}.pdf"
+                )
+                try:
+                    if kind == 'transcript':
+                        self.pdf_generator.create_transcript_pdf(source_file, session_name, pdf_path=render_path)
+                    else:
+                        self.pdf_generator.create_summary_pdf(source_file, session_name, pdf_path=render_path)
+                    stored = self.cache.put(key, {'pdf': render_path})
+                finally:
+                    if os.path.exists(render_path):
+                        os.remove(render_path)
+        finally:
+            with self._render_locks_lock:
+                self._render_locks.pop(key, None)
+
+        if 'pdf' not in stored:
+            raise Exception("PDF cache is smaller than a single PDF; raise pdf_cache_max_mb")
+
+        return stored['pdf'], key
+
+    def prewarm(self, kind, source_file, session_name):
+        """
+        Queue a PDF for background rendering
+
+        Args:
+            kind: 'transcript' or 'summary'
+            source_file: Transcript or summary text file
+            session_name: Session name printed in the PDF
+        """
+        job = (kind, source_file, session_name)
+        with self._render_locks_lock:
+            if job in self._pending:
+                return
+            self._pending.add(job)
+
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._prewarm_loop, daemon=True)
+                self._worker.start()
+
+        self._queue.put(job)
+
+    def _prewarm_loop(self):
+        """Render queued PDFs one at a time"""
+        while True:
+            job = self._queue.get()
+            try:
+                self.get_pdf(*job)
+            except Exception as e:
+                print(f"[PDFCache] Prewarm failed for {job[1]}: {e}")
+            finally:
+                with self._render_locks_lock:
+                    self._pending.discard(job)
+                self._queue.task_done()
@@ -4,14 +4,136 @@ Creates PDF files from transcripts and summaries
 """
 
 import os
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+import re
+import sys
+import json
 from datetime import datetime
+from xml.sax.saxutils import escape
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+from summarizer import load_chapters
+from transcript_aggregator import segments_file_for
+
+
+# Bump when the PDF layout changes so cached PDFs are re-rendered
+RENDERER_VERSION = 3
+
+# Transcript page layout (points), shared by every render; reportlab is
+# imported on first render, so colours are kept as hex strings here
+TRANSCRIPT_STYLE = {
+    'font': 'Helvetica',
+    'bold_font': 'Helvetica-Bold',
+    'font_size': 11,
+    'title_size': 24,
+    'footer_size': 9,
+    'leading': 15,
+    'segment_gap': 6,
+    'label_gap': 10,
+    'margin': 72,
+    'bottom_margin': 54,
+    'label_color': '#333333',
+    'text_color': '#000000'
+}
+
+# Lines searched for the 'Generated:' header of a source file
+HEADER_LINES = 5
+
+_TIMESTAMP_LINE = re.compile(r'^\[(\d{2}:\d{2}:\d{2})\]\s*(.*)$')
+
+
+def format_offset(seconds):
+    """
+    Format an audio offset as HH:MM:SS
+    
+    Args:
+        seconds: Offset in seconds (or None)
+        
+    Returns:
+        str: Formatted offset, empty if unknown
+    """
+    if seconds is None:
+        return ''
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+def segment_label(segment):
+    """
+    HH:MM:SS label for a segment
+    
+    Args:
+        segment: Aggregator segment ('timestamp'), upload segment (word
+                 timings) or timed sentence ('start')
+        
+    Returns:
+        str: Label, empty if the segment has no timing
+    """
+    if segment.get('timestamp'):
+        return segment['timestamp']
+    words = segment.get('words') or []
+    if words and words[0].get('start') is not None:
+        return format_offset(words[0]['start'])
+    return format_offset(segment.get('start'))
+
+
+def load_transcript_segments(transcript_file_path):
+    """
+    Load structured segments for a transcript
+    
+    Args:
+        transcript_file_path: Path to '<session>.txt'
+        
+    Returns:
+        list: Segment dictionaries with 'text' and optional timing
+    """
+    segments_file = segments_file_for(transcript_file_path)
+    if os.path.exists(segments_file):
+        with open(segments_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    with open(transcript_file_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    # Body sits between the header and footer separator lines
+    parts = content.split("=" * 60)
+    body = parts[1] if len(parts) >= 3 else content
+    
+    segments = []
+    for line in body.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        match = _TIMESTAMP_LINE.match(line)
+        if match:
+            segments.append({'timestamp': match.group(1), 'text': match.group(2)})
+        else:
+            segments.append({'text': line})
+    return segments
+
+
+def source_generated(file_path):
+    """
+    Generation time printed in the PDF of a transcript or summary file
+    
+    Taken from the file's 'Generated:' header line rather than the clock,
+    so every render of the same source produces the same bytes (a ZIP
+    export may re-render an evicted PDF halfway through a resumed download).
+    
+    Args:
+        file_path: Transcript or summary text file
+        
+    Returns:
+        str: 'YYYY-MM-DD HH:MM:SS'
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for _ in range(HEADER_LINES):
+            line = f.readline()
+            if line.startswith('Generated:'):
+                return line[len('Generated:'):].strip()
+    # No header: when the file was last written
+    return datetime.fromtimestamp(os.path.getmtime(file_path)).strftime('%Y-%m-%d %H:%M:%S')
 
 
 class PDFGenerator:
@@ -26,8 +148,21 @@ class PDFGenerator:
         )
         os.makedirs(self.output_dir, exist_ok=True)
     
-    def create_transcript_pdf(self, transcript_file_path, session_name):
-        """Create PDF from transcript file"""
+    def create_transcript_pdf(self, transcript_file_path, session_name, pdf_path=None):
+        """
+        Create PDF from transcript file
+        
+        Uses the structured segments saved next to the transcript when they
+        exist, otherwise parses the '[HH:MM:SS] text' lines once.
+        
+        Args:
+            transcript_file_path: Path to transcript text file
+            session_name: Session name for the title and filename
+            pdf_path: Output path (defaults to '<output_dir>/<session>_transcript.pdf')
+            
+        Returns:
+            str: Path to PDF
+        """
         try:
             if not transcript_file_path:
                 raise ValueError("Transcript file path is None or empty")
@@ -35,121 +170,167 @@ class PDFGenerator:
             if not os.path.exists(transcript_file_path):
                 raise FileNotFoundError(f"Transcript file not found: {transcript_file_path}")
             
-            # Read transcript file
-            with open(transcript_file_path, 'r', encoding='utf-8') as f:
-                transcript_content = f.read()
-            
             # Create PDF file path
-            pdf_filename = f"{session_name}_transcript.pdf"
-            pdf_path = os.path.join(self.output_dir, pdf_filename)
-            
-            # Create PDF document
-            doc = SimpleDocTemplate(
-                pdf_path,
-                pagesize=letter,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=18
-            )
-            
-            # Container for PDF elements
-            story = []
-            
-            # Define styles
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor='#1a1a1a',
-                spaceAfter=30,
-                alignment=TA_CENTER
-            )
+            if pdf_path is None:
+                pdf_filename = f"{session_name}_transcript.pdf"
+                pdf_path = os.path.join(self.output_dir, pdf_filename)
             
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=16,
-                textColor='#333333',
-                spaceAfter=12,
-                spaceBefore=12
-            )
-            
-            normal_style = ParagraphStyle(
-                'CustomNormal',
-                parent=styles['Normal'],
-                fontSize=11,
-                textColor='#000000',
-                spaceAfter=12,
-                leading=16
+            segments = load_transcript_segments(transcript_file_path)
+            return self.render_transcript(
+                segments, session_name, pdf_path, source_generated(transcript_file_path)
             )
             
-            # Add title
-            story.append(Paragraph("Meeting Transcript", title_style))
-            story.append(Spacer(1, 0.2*inch))
-            
-            # Add metadata
-            story.append(Paragraph(f"<b>Session:</b> {session_name}", normal_style))
-            story.append(Paragraph(
-                f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                normal_style
-            ))
-            story.append(Spacer(1, 0.3*inch))
+        except Exception as e:
+            print(f"Error creating transcript PDF: {e}")
+            raise
+    
+    def render_transcript(self, segments, session_name, pdf_path, generated=None):
+        """
+        Render transcript segments straight onto a canvas
+        
+        Text is wrapped greedily with cached word widths and drawn through
+        one text object per page; each page is finished with showPage() as
+        soon as it is full, so no per-segment flowables are built or laid
+        out.
+        
+        Args:
+            segments: List of segment dictionaries ('text' plus 'timestamp',
+                      'start' or word timings; see segment_label)
+            session_name: Session name for the title
+            pdf_path: Output path
+            generated: Generation time to print (default: now)
             
-            # Process transcript content
-            lines = transcript_content.split('\n')
-            in_content = False
+        Returns:
+            str: Path to PDF
+        """
+        from reportlab.lib.colors import HexColor
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfgen import canvas
+        
+        style = TRANSCRIPT_STYLE
+        label_color, text_color = HexColor(style['label_color']), HexColor(style['text_color'])
+        font, bold_font, font_size = style['font'], style['bold_font'], style['font_size']
+        page_width, page_height = letter
+        left = style['margin']
+        right = page_width - style['margin']
+        top = page_height - style['margin']
+        bottom = style['bottom_margin']
+        leading = style['leading']
+        
+        label_width = pdfmetrics.stringWidth('[00:00:00]', bold_font, font_size) + style['label_gap']
+        
+        # Speech reuses a small vocabulary, so word widths are measured once
+        word_widths = {}
+        space_width = pdfmetrics.stringWidth(' ', font, font_size)
+        
+        def wrap(text, width):
+            lines = []
+            current = []
+            current_width = 0.0
+            for word in text.split():
+                word_width = word_widths.get(word)
+                if word_width is None:
+                    word_width = word_widths[word] = pdfmetrics.stringWidth(word, font, font_size)
+                if current and current_width + space_width + word_width > width:
+                    lines.append(' '.join(current))
+                    current = [word]
+                    current_width = word_width
+                else:
+                    current_width += (space_width if current else 0.0) + word_width
+                    current.append(word)
+            if current:
+                lines.append(' '.join(current))
+            return lines
+        
+        # invariant: fixed creation date and document id, so equal input gives equal bytes
+        pdf = canvas.Canvas(pdf_path, pagesize=letter, invariant=True)
+        pdf.setTitle(f"Meeting Transcript - {session_name}")
+        page = 1
+        
+        # Title block
+        y = top - style['title_size']
+        pdf.setFont(bold_font, style['title_size'])
+        pdf.drawCentredString(page_width / 2, y, "Meeting Transcript")
+        y -= style['title_size'] + leading
+        
+        for label, value in (
+            ("Session:", session_name),
+            ("Generated:", generated or datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        ):
+            pdf.setFont(bold_font, font_size)
+            pdf.drawString(left, y, label)
+            pdf.setFont(font, font_size)
+            pdf.drawString(left + label_width, y, value)
+            y -= leading
+        y -= leading
+        
+        def new_text():
+            text = pdf.beginText()
+            text.setFont(font, font_size)
+            return text
+        
+        def finish_page(text):
+            pdf.drawText(text)
+            pdf.setFont(font, style['footer_size'])
+            pdf.drawCentredString(page_width / 2, bottom / 2, f"Page {page}")
+            pdf.showPage()
+            return new_text()
+        
+        text = new_text()
+        
+        for segment in segments:
+            label = segment_label(segment)
+            text_left = left + label_width if label else left
+            lines = wrap(segment.get('text', ''), right - text_left)
             
-            for line in lines:
-                line = line.strip()
-                
-                if not line:
-                    continue
-                
-                # Skip header/footer markers
-                if line.startswith('=') or line.startswith('Transcript:'):
-                    if 'Transcript:' in line:
-                        in_content = True
-                    continue
+            for i, line in enumerate(lines):
+                if y < bottom:
+                    text = finish_page(text)
+                    page += 1
+                    y = top
                 
-                if not in_content:
-                    continue
+                if i == 0 and label:
+                    text.setTextOrigin(left, y)
+                    text.setFont(bold_font, font_size)
+                    text.setFillColor(label_color)
+                    text.textOut(f"[{label}]")
+                    text.setFillColor(text_color)
+                    text.setFont(font, font_size)
                 
-                # Check if line is a timestamp segment
-                if line.startswith('[') and ']' in line:
-                    # Extract timestamp and text
-                    parts = line.split(']', 1)
-                    if len(parts) == 2:
-                        timestamp = parts[0] + ']'
-                        text = parts[1].strip()
-                        
-                        if text:
-                            # Add timestamp as heading
-                            story.append(Paragraph(
-                                f"<b>{timestamp}</b>",
-                                heading_style
-                            ))
-                            # Add text
-                            story.append(Paragraph(text, normal_style))
-                            story.append(Spacer(1, 0.1*inch))
-                else:
-                    # Regular paragraph
-                    if line and not line.startswith('Total') and not line.startswith('Duration'):
-                        story.append(Paragraph(line, normal_style))
-                        story.append(Spacer(1, 0.1*inch))
-            
-            # Build PDF
-            doc.build(story)
-            
-            return pdf_path
+                text.setTextOrigin(text_left, y)
+                text.textOut(line)
+                y -= leading
             
-        except Exception as e:
-            print(f"Error creating transcript PDF: {e}")
-            raise
+            if lines:
+                y -= style['segment_gap']
+        
+        finish_page(text)
+        pdf.save()
+        
+        return pdf_path
     
-    def create_summary_pdf(self, summary_file_path, session_name):
-        """Create PDF from summary file"""
+    def create_summary_pdf(self, summary_file_path, session_name, chapters=None, pdf_path=None):
+        """
+        Create PDF from summary file
+        
+        Args:
+            summary_file_path: Path to '<session>_summary.txt'
+            session_name: Session name for the title and filename
+            chapters: Chapter list; defaults to the chapters saved next to
+                      the summary. Added as a chaptered section when there
+                      is more than one.
+            pdf_path: Output path (defaults to '<output_dir>/<session>_summary.pdf')
+            
+        Returns:
+            str: Path to PDF
+        """
+        from reportlab.lib.enums import TA_CENTER
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+        
         try:
             if not summary_file_path:
                 raise ValueError("Summary file path is None or empty")
@@ -162,8 +343,9 @@ class PDFGenerator:
                 summary_content = f.read()
             
             # Create PDF file path
-            pdf_filename = f"{session_name}_summary.pdf"
-            pdf_path = os.path.join(self.output_dir, pdf_filename)
+            if pdf_path is None:
+                pdf_filename = f"{session_name}_summary.pdf"
+                pdf_path = os.path.join(self.output_dir, pdf_filename)
             
             # Create PDF document
             doc = SimpleDocTemplate(
@@ -172,7 +354,8 @@ class PDFGenerator:
                 rightMargin=72,
                 leftMargin=72,
                 topMargin=72,
-                bottomMargin=18
+                bottomMargin=18,
+                invariant=True
             )
             
             # Container for PDF elements
@@ -205,7 +388,7 @@ class PDFGenerator:
             # Add metadata
             story.append(Paragraph(f"<b>Session:</b> {session_name}", normal_style))
             story.append(Paragraph(
-                f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                f"<b>Generated:</b> {source_generated(summary_file_path)}",
                 normal_style
             ))
             story.append(Spacer(1, 0.3*inch))
@@ -238,6 +421,30 @@ class PDFGenerator:
                     story.append(Paragraph(line, normal_style))
                     story.append(Spacer(1, 0.1*inch))
             
+            if chapters is None:
+                chapters = load_chapters(summary_file_path)
+            
+            if chapters and len(chapters) > 1:
+                chapter_style = ParagraphStyle(
+                    'ChapterHeading',
+                    parent=styles['Heading2'],
+                    fontSize=14,
+                    textColor='#333333',
+                    spaceAfter=8,
+                    spaceBefore=12
+                )
+                
+                story.append(Spacer(1, 0.2*inch))
+                story.append(Paragraph("Chapters", styles['Heading1']))
+                
+                for chapter in chapters:
+                    offset = format_offset(chapter.get('start_seconds'))
+                    heading = f"{chapter['index'] + 1}. {escape(chapter['title'])}"
+                    if offset:
+                        heading = f"[{offset}] {heading}"
+                    story.append(Paragraph(heading, chapter_style))
+                    story.append(Paragraph(escape(chapter['summary']), normal_style))
+            
             # Build PDF
             doc.build(story)
             
@@ -0,0 +1,211 @@
+"""
+PDF Text Extraction
+Page-range sharded text extraction across a process pool
+"""
+
+import os
+import signal
+import threading
+import multiprocessing
+from contextlib import contextmanager
+
+
+# Below this many pages, pool start-up costs more than it saves
+DEFAULT_PARALLEL_PAGES = 64
+
+DEFAULT_PAGE_TIMEOUT = 10
+
+# Shards per worker, so one slow shard does not leave the others idle
+SHARDS_PER_WORKER = 4
+
+# Seconds a shard may run beyond its pages' share of the timeout
+SHARD_GRACE = 30
+
+# Per-process reader, opened once by _init_worker
+_worker_reader = None
+
+
+class PageTimeout(Exception):
+    """A single page took longer than the per-page timeout"""
+
+
+def _alarm_available():
+    """Whether SIGALRM can time pages here (POSIX, main thread)"""
+    return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def _page_alarm(seconds):
+    """
+    Raise PageTimeout if the block runs longer than seconds
+
+    Uses SIGALRM, so it only arms on POSIX and in the main thread (pool
+    workers run tasks there); elsewhere the caller's deadline applies.
+    """
+    if not seconds or not _alarm_available():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise PageTimeout()
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def extract_pages(reader, start, stop, page_timeout=DEFAULT_PAGE_TIMEOUT):
+    """
+    Extract the text of pages [start, stop)
+
+    Args:
+        reader: PdfReader
+        start: First page index
+        stop: End page index (exclusive)
+        page_timeout: Seconds allowed per page (0 = no limit)
+
+    Returns:
+        tuple: (list of page texts, list of skipped page indices)
+    """
+    texts = []
+    skipped = []
+    for index in range(start, stop):
+        try:
+            with _page_alarm(page_timeout):
+                text = reader.pages[index].extract_text() or ''
+        except PageTimeout:
+            text = ''
+            skipped.append(index)
+        texts.append(text)
+    return texts, skipped
+
+
+def _init_worker(pdf_path):
+    """Open the PDF once per worker process"""
+    from PyPDF2 import PdfReader
+
+    global _worker_reader
+    _worker_reader = PdfReader(pdf_path)
+
+
+def _extract_shard(shard):
+    start, stop, page_timeout = shard
+    return extract_pages(_worker_reader, start, stop, page_timeout)
+
+
+def page_shards(page_count, workers):
+    """
+    Split pages into contiguous ranges
+
+    Args:
+        page_count: Number of pages
+        workers: Worker processes
+
+    Returns:
+        list: (start, stop) tuples in page order
+    """
+    if not page_count:
+        return []
+    shard_count = max(1, min(page_count, workers * SHARDS_PER_WORKER))
+    size = -(-page_count // shard_count)
+    return [(start, min(start + size, page_count)) for start in range(0, page_count, size)]
+
+
+def extract_pdf_text(pdf_path, workers=0, parallel_pages=DEFAULT_PARALLEL_PAGES,
+                     page_timeout=DEFAULT_PAGE_TIMEOUT):
+    """
+    Extract the text of a PDF, page order preserved
+
+    Small documents are read serially; larger ones are sharded by page
+    range across a process pool with one reader per worker. A page that
+    exceeds page_timeout contributes no text instead of stalling the job.
+    Off the main thread (e.g. in a request or upload worker) the page
+    alarm cannot arm, so small documents are read by a single worker
+    process that is killed if it overruns its deadline.
+
+    Args:
+        pdf_path: PDF file
+        workers: Worker processes (0 = CPU count)
+        parallel_pages: Page count from which the pool is used
+        page_timeout: Seconds allowed per page (0 = no limit)
+
+    Returns:
+        str: Page texts joined with newlines
+    """
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(pdf_path)
+    page_count = len(reader.pages)
+    workers = workers or os.cpu_count() or 1
+
+    if page_count < parallel_pages or workers == 1:
+        if page_timeout and not _alarm_available():
+            del reader
+            texts, skipped = _extract_parallel(pdf_path, page_count, 1, page_timeout)
+        else:
+            texts, skipped = extract_pages(reader, 0, page_count, page_timeout)
+    else:
+        del reader
+        texts, skipped = _extract_parallel(pdf_path, page_count, workers, page_timeout)
+
+    if skipped:
+        print(f"[PDFText] Skipped {len(skipped)} page(s) over the {page_timeout}s limit: "
+              f"{', '.join(str(i + 1) for i in skipped[:10])}")
+
+    return "\n".join(texts).strip()
+
+
+def _extract_parallel(pdf_path, page_count, workers, page_timeout):
+    """
+    Run page shards on a process pool and collect them in order
+
+    A shard that overruns its deadline is skipped and the pool is
+    terminated, since its worker is still stuck on the page; shards that
+    had not finished are then run again on a fresh pool.
+    """
+    results = {}
+    pending = page_shards(page_count, workers)
+
+    # Spawned workers do not inherit locks or threads from a running server
+    context = multiprocessing.get_context('spawn')
+    while pending:
+        pool = context.Pool(min(workers, len(pending)), initializer=_init_worker, initargs=(pdf_path,))
+        stuck = True
+        try:
+            submitted = [
+                ((start, stop), pool.apply_async(_extract_shard, ((start, stop, page_timeout),)))
+                for start, stop in pending
+            ]
+            pending = []
+            timed_out = False
+
+            for (start, stop), result in submitted:
+                if timed_out and not result.ready():
+                    pending.append((start, stop))
+                    continue
+                # Backstop for pages the worker's alarm could not interrupt
+                deadline = page_timeout * (stop - start) + SHARD_GRACE if page_timeout else None
+                try:
+                    results[start] = result.get(timeout=deadline)
+                except multiprocessing.TimeoutError:
+                    results[start] = ([''] * (stop - start), list(range(start, stop)))
+                    timed_out = True
+            stuck = timed_out
+        finally:
+            if stuck:
+                pool.terminate()
+            else:
+                pool.close()
+            pool.join()
+
+    texts = []
+    skipped = []
+    for start in sorted(results):
+        shard_texts, shard_skipped = results[start]
+        texts.extend(shard_texts)
+        skipped.extend(shard_skipped)
+    return texts, skipped
@@ -0,0 +1,159 @@
+"""
+Recording Listing
+Keyset-paginated, field-selectable queries over a user's recordings
+"""
+
+import json
+import base64
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+from database import Recording
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Response field -> columns it reads
+LISTING_FIELDS = {
+    'id': ('id',),
+    'session_id': ('session_id',),
+    'title': ('title',),
+    'created_at': ('created_at',),
+    'duration': ('duration',),
+    'status': ('status',),
+    'transcript_pdf_path': ('transcript_pdf_path',),
+    'summary_pdf_path': ('summary_pdf_path',),
+    'has_transcript_pdf': ('transcript_file_path',),
+    'has_summary_pdf': ('summary_file_path',),
+    'audio_file_path': ('audio_file_path',),
+}
+
+# Columns every page reads to build its cursor
+CURSOR_COLUMNS = ('created_at', 'id')
+
+
+def parse_fields(value):
+    """
+    Parse a fields= parameter
+
+    Args:
+        value: Comma-separated field names, or None/'' for all fields
+
+    Returns:
+        list: Field names in LISTING_FIELDS order
+    """
+    if not value:
+        return list(LISTING_FIELDS)
+
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = requested - set(LISTING_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+    return [name for name in LISTING_FIELDS if name in requested]
+
+
+def parse_date(value, name):
+    """Parse an ISO date or datetime query parameter (UTC, like created_at)"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        raise ValueError(f"Invalid {name} date: {value}")
+
+
+def encode_cursor(created_at, recording_id):
+    """Opaque cursor pointing just after a row"""
+    payload = json.dumps([created_at.isoformat(), recording_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode an encode_cursor() value
+
+    Returns:
+        tuple: (created_at, id)
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, recording_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(recording_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def list_recordings(user_id, fields=None, limit=DEFAULT_PAGE_SIZE, cursor=None,
+                    statuses=None, created_from=None, created_to=None, title_prefix=None):
+    """
+    One page of a user's recordings, newest first
+
+    Pages are read by seeking the (user_id, created_at) index to the
+    cursor, so every page costs the same however deep the listing goes.
+    Only the columns behind the selected fields are loaded.
+
+    Args:
+        user_id: Owner
+        fields: Field names from LISTING_FIELDS (default all)
+        limit: Page size, capped at MAX_PAGE_SIZE
+        cursor: next_cursor of the previous page
+        statuses: Only these statuses
+        created_from: Only recordings created at or after this datetime
+        created_to: Only recordings created before this datetime
+        title_prefix: Only titles starting with this text (case-insensitive)
+
+    Returns:
+        tuple: (list of recording dictionaries, next cursor or None)
+    """
+    fields = fields or list(LISTING_FIELDS)
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+    column_names = list(CURSOR_COLUMNS)
+    for field in fields:
+        for column in LISTING_FIELDS[field]:
+            if column not in column_names:
+                column_names.append(column)
+
+    query = Recording.query.filter(Recording.user_id == user_id)
+
+    if statuses:
+        query = query.filter(Recording.status.in_(statuses))
+    if created_from:
+        query = query.filter(Recording.created_at >= created_from)
+    if created_to:
+        query = query.filter(Recording.created_at < created_to)
+    if title_prefix:
+        escaped = title_prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        query = query.filter(Recording.title.like(f"{escaped}%", escape='\\'))
+    if cursor:
+        created_at, recording_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Recording.created_at, Recording.id) < (created_at, recording_id))
+
+    rows = (
+        query.with_entities(*(getattr(Recording, name) for name in column_names))
+        .order_by(Recording.created_at.desc(), Recording.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return [_serialize(row, fields) for row in rows], next_cursor
+
+
+def _serialize(row, fields):
+    """Build the response dictionary of one row"""
+    item = {}
+    for field in fields:
+        if field == 'created_at':
+            item[field] = row.created_at.isoformat()
+        elif field == 'has_transcript_pdf':
+            item[field] = bool(row.transcript_file_path)
+        elif field == 'has_summary_pdf':
+            item[field] = bool(row.summary_file_path)
+        else:
+            item[field] = getattr(row, field)
+    return item
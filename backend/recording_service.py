@@ -16,20 +16,29 @@ import yaml
 # Add parent directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
 
-from recorder import AudioRecorder
-from stt_engine import VoskSTTEngine
-from transcript_aggregator import TranscriptAggregator
-from summarizer import Summarizer
+from transcript_aggregator import TranscriptAggregator, segments_file_for
+from summarizer import Summarizer, insights_file_for, chapters_file_for
+import summarizer_backends
 from logger import SessionLogger
 
 from database import db, Recording
+from search_index import index_recording as index_for_search
+from related_index import index_recording as index_related
+from content_store import ContentStore, DEFAULT_CONTENT_DIR
 
 
 class RecordingService:
-    def __init__(self):
-        """Initialize recording service"""
+    def __init__(self, config=None):
+        """
+        Initialize recording service
+        
+        Args:
+            config: Recorder configuration (default: read recorder_config.yml)
+        """
         self.active_sessions = {}  # session_id -> session_data
-        self.config = self._load_config()
+        self.config = config or self._load_config()
+        summarizer_backends.configure(self.config)
+        self.content_store = ContentStore(self.config.get('content_store_dir') or DEFAULT_CONTENT_DIR)
         
     def _load_config(self):
         """Load configuration"""
@@ -56,8 +65,14 @@ class RecordingService:
                 'channels': 1,
                 'block_duration_ms': 500,
                 'save_dir': 'recordings',
+                'auto_summary_interval_seconds': 30,
                 'summarizer': 'textrank',
-                'extractive_sentences': 5
+                'extractive_sentences': 5,
+                'segment_pause_seconds': 0.6,
+                'segment_max_words': 40,
+                'chapter_window': 10,
+                'chapter_min_sentences': 20,
+                'chapter_summary_sentences': 2
             }
     
     def start_session(self, user_id, title):
@@ -89,6 +104,11 @@ class RecordingService:
         db.session.commit()
         
         try:
+            # Audio capture, recognition and live ranking load only once a session starts
+            from recorder import AudioRecorder
+            from stt_engine import VoskSTTEngine
+            from live_summarizer import RollingSummarizer
+            
             # Initialize components
             recorder = AudioRecorder(
                 self.config,
@@ -111,6 +131,13 @@ class RecordingService:
                 self.config['extractive_sentences']
             )
             
+            live_summarizer = RollingSummarizer(
+                self.config['extractive_sentences'],
+                self.config.get('auto_summary_interval_seconds', 30),
+                self.config.get('segment_pause_seconds', 0.6),
+                self.config.get('segment_max_words', 40)
+            )
+            
             logger = SessionLogger(session_folder, session_id)
             
             # Start recording
@@ -126,6 +153,7 @@ class RecordingService:
                 'stt_engine': stt_engine,
                 'aggregator': aggregator,
                 'summarizer': summarizer,
+                'live_summarizer': live_summarizer,
                 'logger': logger,
                 'start_time': time.time(),
                 'running': True,
@@ -191,6 +219,7 @@ class RecordingService:
                         print(f"[STT][final] {result['text']}")
                         # Add to transcript
                         session['aggregator'].add_segment(result['text'], result.get('words'))
+                        session['live_summarizer'].add_segment(result['text'], result.get('words'))
                         # Remove any matching partial and add final
                         session['transcript'] = [
                             t for t in session['transcript']
@@ -203,6 +232,9 @@ class RecordingService:
                         })
                         session['logger'].log(f"Transcribed: {result['text'][:50]}...")
                 
+                # Periodic re-rank of the live summary (auto_summary_interval_seconds)
+                session['live_summarizer'].maybe_refresh()
+                
         except Exception as e:
             print(f"[RecordingService] Error during streaming STT: {e}")
             session['logger'].log(f"Error during processing: {e}", level="ERROR")
@@ -276,13 +308,16 @@ class RecordingService:
                 if final_result and final_result.get('text'):
                     print(f"[STT][stream-final] {final_result['text']}")
                     session['aggregator'].add_segment(final_result['text'], final_result.get('words'))
+                    session['live_summarizer'].add_segment(final_result['text'], final_result.get('words'))
             except Exception as e:
                 print(f"Warning: Could not get final STT result: {e}")
                 session['logger'].log(f"Warning: Could not get final STT result: {e}", level="WARNING")
             
             # If still no transcript, run offline transcription on WAV
             transcript_text = session['aggregator'].get_full_transcript()
+            used_offline = False
             if not transcript_text.strip():
+                used_offline = True
                 print("[RecordingService] No transcript text detected from streaming STT – trying offline transcription from WAV...")
                 self._offline_transcribe_from_wav(session)
                 transcript_text = session['aggregator'].get_full_transcript()
@@ -291,17 +326,52 @@ class RecordingService:
             
             # Save transcript (whatever we have)
             transcript_file = session['aggregator'].save_transcript()
+            session['aggregator'].save_segments()
             
             # Generate summary
             transcript_text = session['aggregator'].get_full_transcript()
             summary = None
             summary_file = None
+            insights = None
+            mode = None
+            
+            live_summarizer = session['live_summarizer']
+            
+            if (transcript_text.strip() and not used_offline
+                    and session['summarizer'].mode == 'textrank'
+                    and len(transcript_text.strip()) >= 50):
+                # Sentences are already vectorized; at most one final re-rank
+                summary = live_summarizer.get_summary()
+                insights = live_summarizer.get_insights()
+            elif transcript_text.strip():
+                sentences = session['aggregator'].get_sentences(
+                    self.config.get('segment_pause_seconds', 0.6),
+                    self.config.get('segment_max_words', 40)
+                )
+                summary, insights, mode = session['summarizer'].generate_summary(transcript_text, sentences)
             
-            if transcript_text.strip():
-                summary = session['summarizer'].generate_summary(transcript_text)
+            if summary is not None:
                 summary_file = session['summarizer'].save_summary(
                     summary,
                     session['session_folder'],
+                    session['session_name'],
+                    mode
+                )
+                session['summarizer'].save_insights(
+                    insights,
+                    session['session_folder'],
+                    session['session_name']
+                )
+                chapters = session['summarizer'].generate_chapters(
+                    session['aggregator'].get_timed_sentences(
+                        self.config.get('segment_pause_seconds', 0.6),
+                        self.config.get('segment_max_words', 40)
+                    ),
+                    time.time() - session['start_time']
+                )
+                session['summarizer'].save_chapters(
+                    chapters,
+                    session['session_folder'],
                     session['session_name']
                 )
             else:
@@ -330,6 +400,13 @@ class RecordingService:
                     f"{session['session_name']}_meta.json"
                 )
                 db.session.commit()
+                
+                try:
+                    self.content_store.store_recording(recording)
+                    index_for_search(recording)
+                    index_related(recording)
+                except Exception as e:
+                    print(f"[RecordingService] Warning: Could not index recording: {e}")
             
             # Build result before removing from active sessions
             result = {
@@ -398,7 +475,8 @@ class RecordingService:
             'full_text': full_text,
             'segments': timestamped,
             'word_count': session['aggregator'].get_word_count(),
-            'segment_count': session['aggregator'].get_segment_count()
+            'segment_count': session['aggregator'].get_segment_count(),
+            'live_summary': session['live_summarizer'].get_state()
         }
     
     def delete_recording_files(self, recording):
@@ -412,6 +490,11 @@ class RecordingService:
                 recording.summary_pdf_path,
                 recording.metadata_file_path
             ]
+            if recording.transcript_file_path:
+                files_to_delete.append(segments_file_for(recording.transcript_file_path))
+            if recording.summary_file_path:
+                files_to_delete.append(insights_file_for(recording.summary_file_path))
+                files_to_delete.append(chapters_file_for(recording.summary_file_path))
             
             for file_path in files_to_delete:
                 if file_path and os.path.exists(file_path):
@@ -0,0 +1,366 @@
+"""
+Related Index
+Per-user sparse term vectors of recordings with top-k cosine "meetings like this one"
+
+Usage:
+    python backend/related_index.py [--user-id ID]
+        Compute vectors for completed recordings that do not have one yet
+"""
+
+import time
+import argparse
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import func
+
+from database import db, Recording, RecordingVector
+from search_index import recording_rows
+
+
+# Hashed feature space; stateless, so documents can be added one at a time
+N_FEATURES = 2 ** 20
+
+# Strongest terms kept per recording (bounds storage and index size)
+TERMS_PER_DOCUMENT = 256
+
+# Query terms looked up in the inverted index; documents sharing none are never scored
+QUERY_TERMS = 32
+
+DEFAULT_RELATED = 5
+MAX_RELATED = 50
+
+# Users whose index is kept in memory
+MAX_CACHED_USERS = 64
+
+# Passages hashed per step
+VECTORIZE_BATCH = 1000
+
+_vectorizer = None
+_vectorizer_lock = threading.Lock()
+
+
+def _get_vectorizer():
+    """Create the hashing vectorizer on first use"""
+    global _vectorizer
+    with _vectorizer_lock:
+        if _vectorizer is None:
+            import numpy as np
+            from sklearn.feature_extraction.text import HashingVectorizer
+
+            _vectorizer = HashingVectorizer(
+                n_features=N_FEATURES,
+                alternate_sign=False,
+                norm=None,
+                stop_words='english',
+                lowercase=True,
+                dtype=np.float32
+            )
+        return _vectorizer
+
+
+def document_vector(texts, terms=TERMS_PER_DOCUMENT):
+    """
+    Term vector of a document, hashed in batches so long transcripts stream
+
+    Args:
+        texts: Iterable of passages
+        terms: Strongest terms to keep
+
+    Returns:
+        tuple: (int32 feature ids ascending, float32 weights 1 + log(count))
+    """
+    import numpy as np
+
+    vectorizer = _get_vectorizer()
+    features = np.zeros(0, dtype=np.int64)
+    counts = np.zeros(0, dtype=np.float64)
+
+    def merge(batch):
+        matrix = vectorizer.transform(batch)
+        merged, inverse = np.unique(np.concatenate([features, matrix.indices]), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate([counts, matrix.data]))
+        return merged, totals
+
+    batch = []
+    for passage in texts:
+        batch.append(passage)
+        if len(batch) >= VECTORIZE_BATCH:
+            features, counts = merge(batch)
+            batch = []
+    if batch:
+        features, counts = merge(batch)
+
+    if len(features) > terms:
+        # Ties break on the feature id so the kept set is deterministic
+        keep = np.lexsort((features, -counts))[:terms]
+        keep.sort()
+        features, counts = features[keep], counts[keep]
+
+    return features.astype(np.int32), (1.0 + np.log(counts)).astype(np.float32)
+
+
+class _UserIndex:
+    """One user's vectors plus a lazily built inverted (CSC) matrix"""
+
+    def __init__(self):
+        self.vectors = {}
+        self._built = None
+
+    @property
+    def version(self):
+        """(count, highest recording id), comparable with RelatedIndex._stored_version()"""
+        return len(self.vectors), max(self.vectors, default=None)
+
+    def set(self, recording_id, features, weights):
+        self.vectors[recording_id] = (features, weights)
+        self._built = None
+
+    def remove(self, recording_id):
+        if self.vectors.pop(recording_id, None) is not None:
+            self._built = None
+
+    def _build(self):
+        """
+        Stack the vectors into a documents x terms CSC matrix
+
+        Columns are the user's distinct hashed features, so the matrix
+        stays small however large the hash space is. IDF and document
+        norms are recomputed here because every added document shifts them.
+        """
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        ids = np.fromiter(self.vectors.keys(), dtype=np.int64, count=len(self.vectors))
+        features = [self.vectors[i][0] for i in ids]
+        weights = [self.vectors[i][1] for i in ids]
+
+        all_features = np.concatenate(features) if features else np.zeros(0, dtype=np.int32)
+        columns = np.unique(all_features)
+        indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(f) for f in features])
+
+        matrix = csr_matrix(
+            (np.concatenate(weights) if weights else np.zeros(0, dtype=np.float32),
+             np.searchsorted(columns, all_features), indptr),
+            shape=(len(ids), len(columns))
+        ).tocsc()
+
+        # Smoothed IDF, as in scikit-learn
+        document_frequency = np.diff(matrix.indptr)
+        idf = np.log((1 + len(ids)) / (1 + document_frequency)) + 1
+        norms = np.sqrt(matrix.multiply(matrix) @ (idf ** 2))
+
+        self._built = {
+            'ids': ids,
+            'rows': {int(recording_id): row for row, recording_id in enumerate(ids)},
+            'columns': columns,
+            'matrix': matrix,
+            'idf': idf,
+            'norms': norms
+        }
+        return self._built
+
+    def related(self, recording_id, k):
+        """Top-k (recording id, cosine) pairs, best first"""
+        import numpy as np
+
+        built = self._built or self._build()
+        features, weights = self.vectors[recording_id]
+        if len(features) == 0:
+            return []
+
+        columns = np.searchsorted(built['columns'], features)
+        query = weights * built['idf'][columns]
+        query_norm = np.sqrt(np.dot(query, query))
+
+        # Only documents containing one of the query's strongest terms get a score
+        strongest = np.argsort(-query, kind='stable')[:QUERY_TERMS]
+        columns, query = columns[strongest], query[strongest]
+        scores = built['matrix'][:, columns] @ (query * built['idf'][columns])
+
+        scores[built['rows'][recording_id]] = 0.0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) == 0:
+            return []
+
+        scores = scores[candidates] / (built['norms'][candidates] * query_norm)
+        if len(candidates) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [(int(built['ids'][candidates[i]]), round(float(scores[i]), 4)) for i in top]
+
+
+class RelatedIndex:
+    def __init__(self, max_users=MAX_CACHED_USERS):
+        """
+        Initialize related-meetings index
+
+        Vectors live in the recording_vectors table; the indexes of the
+        most recently queried users are kept in memory and updated in
+        place as recordings complete or are deleted.
+
+        Args:
+            max_users: Users whose index is kept in memory
+        """
+        self.max_users = max_users
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _stored_version(self, user_id):
+        """(count, highest recording id) of a user's rows in recording_vectors"""
+        count, highest = db.session.query(
+            func.count(RecordingVector.recording_id), func.max(RecordingVector.recording_id)
+        ).filter(RecordingVector.user_id == user_id).one()
+        return count, highest
+
+    def _user(self, user_id):
+        """
+        A user's index, loaded from the database on first use (caller holds the lock)
+
+        Other server workers (and the backfill CLI) add and delete vectors
+        too, so a cached index is reloaded once its count or highest
+        recording id no longer matches the table.
+        """
+        index = self._users.get(user_id)
+        if index is not None and index.version == self._stored_version(user_id):
+            self._users.move_to_end(user_id)
+            return index
+
+        import numpy as np
+
+        index = _UserIndex()
+        rows = RecordingVector.query.filter_by(user_id=user_id).with_entities(
+            RecordingVector.recording_id, RecordingVector.features, RecordingVector.weights
+        )
+        for recording_id, features, weights in rows:
+            index.set(recording_id, np.frombuffer(features, dtype=np.int32),
+                      np.frombuffer(weights, dtype=np.float32))
+
+        self._users[user_id] = index
+        while len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        return index
+
+    def add(self, recording_id, user_id, texts):
+        """
+        Store (or replace) the vector of a recording
+
+        Args:
+            recording_id: Recording id
+            user_id: Owner
+            texts: Iterable of transcript and summary passages
+        """
+        features, weights = document_vector(texts)
+        db.session.merge(RecordingVector(
+            recording_id=recording_id,
+            user_id=user_id,
+            features=features.tobytes(),
+            weights=weights.tobytes()
+        ))
+        db.session.commit()
+
+        with self._lock:
+            index = self._users.get(user_id)
+            if index is not None:
+                index.set(recording_id, features, weights)
+
+    def remove(self, recording_id, user_id, commit=True):
+        """
+        Drop a recording from the index
+
+        Args:
+            recording_id: Recording id
+            user_id: Owner
+            commit: Commit the session afterwards
+        """
+        RecordingVector.query.filter_by(recording_id=recording_id).delete()
+        if commit:
+            db.session.commit()
+
+        with self._lock:
+            index = self._users.get(user_id)
+            if index is not None:
+                index.remove(recording_id)
+
+    def has(self, recording_id, user_id):
+        """Whether a recording has a vector"""
+        with self._lock:
+            return recording_id in self._user(user_id).vectors
+
+    def related(self, recording_id, user_id, k=DEFAULT_RELATED):
+        """
+        Recordings of the same user most similar to one recording
+
+        Args:
+            recording_id: Recording to match
+            user_id: Owner
+            k: Number of results, capped at MAX_RELATED
+
+        Returns:
+            list: (recording id, cosine similarity) best first, or None if
+                  the recording has no vector
+        """
+        k = max(1, min(int(k), MAX_RELATED))
+        with self._lock:
+            index = self._user(user_id)
+            if recording_id not in index.vectors:
+                return None
+            return index.related(recording_id, k)
+
+
+# Process-wide index shared by the services and the API
+related_index = RelatedIndex()
+
+
+def index_recording(recording):
+    """
+    Store the vector of a completed recording
+
+    Args:
+        recording: Recording row
+    """
+    rows = recording_rows(recording.id, recording.user_id,
+                          recording.transcript_file_path, recording.summary_file_path)
+    related_index.add(recording.id, recording.user_id, (row['text'] for row in rows))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--user-id', type=int, help='Only this user\'s recordings')
+    args = parser.parse_args()
+
+    from pdf_batch import create_cli_app, load_config
+
+    app = create_cli_app(load_config())
+
+    with app.app_context():
+        db.create_all()
+
+        query = (
+            Recording.query.outerjoin(RecordingVector, RecordingVector.recording_id == Recording.id)
+            .filter(Recording.status == 'completed', RecordingVector.recording_id.is_(None))
+        )
+        if args.user_id:
+            query = query.filter(Recording.user_id == args.user_id)
+        recordings = query.order_by(Recording.id).all()
+
+        print(f"[RelatedIndex] Vectorizing {len(recordings)} recordings...")
+        started = time.perf_counter()
+        failed = 0
+        for recording in recordings:
+            try:
+                index_recording(recording)
+            except Exception as e:
+                failed += 1
+                db.session.rollback()
+                print(f"   ✗ recording {recording.id}: {e}")
+
+    print(f"   ✓ {len(recordings) - failed} recordings in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Response Compression
+gzip / brotli content encoding of large JSON responses
+"""
+
+import gzip
+
+
+# Smaller bodies are sent as-is; compressing them saves less than a packet
+MIN_COMPRESS_BYTES = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+COMPRESSIBLE_MIMETYPES = {'application/json'}
+
+# None until first checked, then the brotli module or False
+_brotli = None
+
+
+def _get_brotli():
+    """The optional brotli module, or None if it is not installed"""
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = False
+    return _brotli or None
+
+
+def choose_encoding(accept_encodings):
+    """
+    Pick the content encoding for a client
+
+    Args:
+        accept_encodings: werkzeug Accept of the request's Accept-Encoding
+
+    Returns:
+        str: 'br', 'gzip', or None for identity
+    """
+    if accept_encodings.quality('br') > 0 and _get_brotli():
+        return 'br'
+    if accept_encodings.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+
+def compress_response(response, accept_encodings, min_bytes=MIN_COMPRESS_BYTES):
+    """
+    Compress a JSON response body in place when the client accepts it
+
+    Streamed, file and already-encoded responses are left alone. A strong
+    ETag is weakened, since the encoded bytes differ from the identity
+    representation it was computed for.
+
+    Args:
+        response: Flask response
+        accept_encodings: werkzeug Accept of the request's Accept-Encoding
+        min_bytes: Smallest body worth compressing
+
+    Returns:
+        Response: The same response
+    """
+    if (response.direct_passthrough or response.is_streamed
+            or response.status_code != 200
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or 'Content-Encoding' in response.headers):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    data = response.get_data()
+    if len(data) < min_bytes:
+        return response
+
+    encoding = choose_encoding(accept_encodings)
+    if encoding == 'br':
+        data = _get_brotli().compress(data, quality=BROTLI_QUALITY)
+    elif encoding == 'gzip':
+        data = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    else:
+        return response
+
+    response.set_data(data)
+    response.headers['Content-Encoding'] = encoding
+
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+    return response
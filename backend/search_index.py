@@ -0,0 +1,437 @@
+"""
+Search Index
+SQLite FTS5 full-text index over transcript passages and summaries
+
+Usage:
+    python backend/search_index.py [--workers N] [--user-id ID]
+        Rebuild the index from the transcript and summary files on disk
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+from sqlalchemy import text
+
+from database import db, SearchSegment
+from segmenter import segment_transcript_timed, iter_sentences, split_sentences, DEFAULT_MAX_WORDS
+from transcript_aggregator import segments_file_for
+
+
+# Separator line around the body of transcript and summary files
+SEPARATOR = "=" * 60
+
+# "[HH:MM:SS] text" lines of recorded transcripts
+TIMESTAMP_LINE = re.compile(r'^\[(\d+):(\d{2}):(\d{2})\]\s*(.*)$')
+
+DEFAULT_RESULTS = 20
+MAX_RESULTS = 100
+
+# Tokens of context around each highlighted match
+SNIPPET_TOKENS = 16
+HIGHLIGHT_OPEN = '<mark>'
+HIGHLIGHT_CLOSE = '</mark>'
+
+INSERT_BATCH_ROWS = 500
+
+# Recordings parsed per worker ahead of the writer
+IN_FLIGHT_PER_WORKER = 2
+
+# External-content FTS5 table over search_segments, kept in sync by triggers
+SEARCH_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+        text, content='search_segments', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS search_segments_ai AFTER INSERT ON search_segments BEGIN
+        INSERT INTO search_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_segments_ad AFTER DELETE ON search_segments BEGIN
+        INSERT INTO search_fts(search_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_segments_au AFTER UPDATE ON search_segments BEGIN
+        INSERT INTO search_fts(search_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO search_fts(rowid, text) VALUES (new.id, new.text);
+    END""",
+]
+
+
+def create_search_schema(engine):
+    """
+    Create the FTS5 table and its sync triggers if missing
+
+    Args:
+        engine: SQLAlchemy engine (search_segments must already exist)
+    """
+    with engine.begin() as connection:
+        for statement in SEARCH_SCHEMA:
+            connection.execute(text(statement))
+
+
+def _body_lines(path):
+    """Lines between the header and footer separators of a transcript or summary"""
+    with open(path, 'r', encoding='utf-8') as f:
+        first = f.readline()
+        if not first.startswith(('Transcript:', 'Summary:')):
+            # No header: the whole file is the body
+            yield first
+            yield from f
+            return
+
+        separators = 0
+        for line in f:
+            if line.rstrip('\n') == SEPARATOR:
+                separators += 1
+                if separators == 2:
+                    return
+            elif separators == 1:
+                yield line
+
+
+def transcript_passages(transcript_file, max_words=DEFAULT_MAX_WORDS):
+    """
+    Split a transcript into searchable passages with audio offsets
+
+    Uses the segments JSON next to the transcript when there is one,
+    else the "[HH:MM:SS]" line prefixes of recorded transcripts; plain
+    text is split into sentences as it is read, so large text uploads
+    are never loaded whole.
+
+    Args:
+        transcript_file: Transcript text file
+        max_words: Maximum words per passage
+
+    Yields:
+        tuple: (start seconds or None, text)
+    """
+    segments_file = segments_file_for(transcript_file)
+    if os.path.exists(segments_file):
+        with open(segments_file, 'r', encoding='utf-8') as f:
+            segments = json.load(f)
+        for sentence in segment_transcript_timed(segments, max_words=max_words):
+            yield sentence['start'], sentence['text']
+        return
+
+    lines = _body_lines(transcript_file)
+    first = next((line for line in lines if line.strip()), None)
+    if first is None:
+        return
+
+    if TIMESTAMP_LINE.match(first.strip()):
+        for line in _chain(first, lines):
+            match = TIMESTAMP_LINE.match(line.strip())
+            if match and match.group(4):
+                hours, minutes, seconds, line_text = match.groups()
+                yield int(hours) * 3600 + int(minutes) * 60 + int(seconds), line_text
+    else:
+        for sentence in iter_sentences(_chain(first, lines), max_words):
+            yield None, sentence
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+def summary_passages(summary_file, max_words=DEFAULT_MAX_WORDS):
+    """
+    Split a summary into searchable sentences
+
+    Args:
+        summary_file: Summary text file
+
+    Returns:
+        list: Sentences
+    """
+    return split_sentences(''.join(_body_lines(summary_file)), max_words)
+
+
+def recording_rows(recording_id, user_id, transcript_file, summary_file):
+    """
+    Index rows of one recording
+
+    Args:
+        recording_id: Recording id
+        user_id: Owner
+        transcript_file: Transcript path (may be None or missing)
+        summary_file: Summary path (may be None or missing)
+
+    Yields:
+        dict: search_segments row
+    """
+    if transcript_file and os.path.exists(transcript_file):
+        for position, (start, passage) in enumerate(transcript_passages(transcript_file)):
+            yield {'recording_id': recording_id, 'user_id': user_id, 'kind': 'transcript',
+                   'position': position, 'start': start, 'text': passage}
+
+    if summary_file and os.path.exists(summary_file):
+        for position, passage in enumerate(summary_passages(summary_file)):
+            yield {'recording_id': recording_id, 'user_id': user_id, 'kind': 'summary',
+                   'position': position, 'start': None, 'text': passage}
+
+
+def _write_rows(rows):
+    """Insert rows in batches (the triggers index them); returns the row count"""
+    table = SearchSegment.__table__
+    batch = []
+    count = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= INSERT_BATCH_ROWS:
+            db.session.execute(table.insert(), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(table.insert(), batch)
+        count += len(batch)
+    return count
+
+
+def index_recording(recording):
+    """
+    Replace the index rows of a recording with its current files
+
+    Args:
+        recording: Recording row
+
+    Returns:
+        int: Rows indexed
+    """
+    try:
+        remove_recording(recording.id, commit=False)
+        count = _write_rows(recording_rows(
+            recording.id, recording.user_id,
+            recording.transcript_file_path, recording.summary_file_path
+        ))
+        db.session.commit()
+        return count
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def remove_recording(recording_id, commit=True):
+    """
+    Drop a recording from the index
+
+    Args:
+        recording_id: Recording id
+        commit: Commit the session afterwards
+    """
+    db.session.execute(
+        SearchSegment.__table__.delete().where(SearchSegment.recording_id == recording_id)
+    )
+    if commit:
+        db.session.commit()
+
+
+def fts_query(query):
+    """
+    Turn user input into an FTS5 query that cannot be a syntax error
+
+    Every word becomes a quoted phrase (all must match); a trailing *
+    keeps its prefix meaning.
+
+    Args:
+        query: Search box text
+
+    Returns:
+        str: FTS5 MATCH expression, or '' if there are no words
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '""')
+        if word:
+            terms.append(f'"{word}"*' if prefix else f'"{word}"')
+    return ' '.join(terms)
+
+
+def search(user_id, query, limit=DEFAULT_RESULTS, offset=0, kind=None):
+    """
+    Rank a user's transcript and summary passages against a query (BM25)
+
+    Args:
+        user_id: Owner
+        query: Search box text
+        limit: Results per page, capped at MAX_RESULTS
+        offset: Results to skip
+        kind: Only 'transcript' or 'summary' passages
+
+    Returns:
+        list: Results with recording id/title, kind, audio offset, snippet and score
+    """
+    match = fts_query(query)
+    if not match:
+        return []
+
+    params = {
+        'match': match,
+        'user_id': user_id,
+        'limit': max(1, min(int(limit), MAX_RESULTS)),
+        'offset': max(0, int(offset)),
+        'open': HIGHLIGHT_OPEN,
+        'close': HIGHLIGHT_CLOSE,
+        'tokens': SNIPPET_TOKENS
+    }
+    kind_filter = ''
+    if kind:
+        kind_filter = 'AND s.kind = :kind'
+        params['kind'] = kind
+
+    rows = db.session.execute(text(f"""
+        SELECT s.recording_id, r.title, r.created_at, s.kind, s.position, s.start,
+               snippet(search_fts, 0, :open, :close, '…', :tokens) AS snippet,
+               bm25(search_fts) AS rank
+        FROM search_fts
+        JOIN search_segments s ON s.id = search_fts.rowid
+        JOIN recordings r ON r.id = s.recording_id
+        WHERE search_fts MATCH :match AND s.user_id = :user_id {kind_filter}
+        ORDER BY rank
+        LIMIT :limit OFFSET :offset
+    """), params).fetchall()
+
+    return [{
+        'recording_id': row.recording_id,
+        'title': row.title,
+        'created_at': _isoformat(row.created_at),
+        'kind': row.kind,
+        'position': row.position,
+        'start': row.start,
+        'snippet': row.snippet,
+        # bm25() is lower for better matches
+        'score': round(-row.rank, 4)
+    } for row in rows]
+
+
+def _isoformat(value):
+    """Raw SQL returns SQLite datetimes as text"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.isoformat()
+
+
+def _parse_job(job):
+    """
+    Build the rows of one recording in a worker process
+
+    Args:
+        job: (recording_id, user_id, transcript_file, summary_file)
+
+    Returns:
+        tuple: (recording_id, rows, error message or None)
+    """
+    try:
+        return job[0], list(recording_rows(*job)), None
+    except Exception as e:
+        return job[0], [], str(e)
+
+
+def rebuild_index(jobs, workers=0, progress=None):
+    """
+    Re-index recordings, parsing files across a process pool
+
+    Workers split transcripts into passages; this process is the only
+    writer, replacing each recording's rows as its result arrives.
+
+    Args:
+        jobs: Iterable of (recording_id, user_id, transcript_file, summary_file)
+        workers: Worker processes (0 = CPU count)
+        progress: Optional dictionary updated in place with running counts
+
+    Returns:
+        dict: recordings, rows, failed, seconds, errors
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * IN_FLIGHT_PER_WORKER
+
+    stats = progress if progress is not None else {}
+    stats.update({'recordings': 0, 'rows': 0, 'failed': 0, 'seconds': 0.0, 'errors': []})
+    started = time.perf_counter()
+
+    def store(future):
+        recording_id, rows, error = future.result()
+        if error:
+            stats['failed'] += 1
+            if len(stats['errors']) < 20:
+                stats['errors'].append({'recording_id': recording_id, 'error': error})
+            return
+        remove_recording(recording_id, commit=False)
+        stats['rows'] += _write_rows(rows)
+        db.session.commit()
+        stats['recordings'] += 1
+
+    # Spawned workers do not inherit locks or threads from a running server
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        pending = set()
+        for job in jobs:
+            pending.add(pool.submit(_parse_job, job))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    store(future)
+
+        for future in pending:
+            store(future)
+
+    # Merge the b-trees written by many small transactions
+    db.session.execute(text("INSERT INTO search_fts(search_fts) VALUES ('optimize')"))
+    db.session.commit()
+
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=0, help='Worker processes (default: CPU count)')
+    parser.add_argument('--user-id', type=int, help='Only this user\'s recordings')
+    args = parser.parse_args()
+
+    from database import Recording
+    from pdf_batch import create_cli_app, load_config
+
+    app = create_cli_app(load_config())
+
+    with app.app_context():
+        db.create_all()
+        create_search_schema(db.engine)
+
+        query = Recording.query.filter(Recording.status == 'completed')
+        if args.user_id:
+            query = query.filter(Recording.user_id == args.user_id)
+        else:
+            # Rows of deleted recordings
+            db.session.execute(text(
+                "DELETE FROM search_segments WHERE recording_id NOT IN (SELECT id FROM recordings)"
+            ))
+            db.session.commit()
+
+        jobs = [
+            (row.id, row.user_id, row.transcript_file_path, row.summary_file_path)
+            for row in query.with_entities(
+                Recording.id, Recording.user_id,
+                Recording.transcript_file_path, Recording.summary_file_path
+            ).order_by(Recording.id)
+        ]
+
+        print(f"[SearchIndex] Indexing {len(jobs)} recordings with {args.workers or os.cpu_count()} workers...")
+        stats = rebuild_index(jobs, args.workers)
+
+    print(f"   ✓ {stats['rows']} passages from {stats['recordings']} recordings, "
+          f"{stats['failed']} failed in {stats['seconds']:.1f}s")
+    for error in stats['errors']:
+        print(f"   ✗ recording {error['recording_id']}: {error['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Production Server
+Runs the API under gunicorn with several worker processes, with the
+debugger and reloader off
+
+Usage:
+    python backend/serve.py [--bind HOST:PORT] [--workers N] [--threads N] [--timeout SECONDS]
+
+Defaults come from server_* keys in recorder_config.yml. Live recording
+sessions and batch progress stay in the worker that started them; other
+workers route requests there through session_registry. Where gunicorn is
+unavailable (e.g. Windows), one threaded process is served instead.
+"""
+
+import os
+import sys
+import argparse
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+from pdf_batch import create_cli_app, load_config  # noqa: E402
+
+
+def default_workers():
+    """One worker per CPU; transcription and summarization are CPU-bound"""
+    return max(1, os.cpu_count() or 1)
+
+
+def server_options(args, config):
+    """
+    Merge command-line arguments over config values
+
+    Returns:
+        dict: bind, workers, threads, timeout
+    """
+    return {
+        'bind': args.bind or config.get('server_bind') or '0.0.0.0:5000',
+        'workers': args.workers or int(config.get('server_workers') or 0) or default_workers(),
+        'threads': args.threads or int(config.get('server_threads') or 8),
+        'timeout': args.timeout or int(config.get('server_timeout') or 600),
+    }
+
+
+def prepare_database(config):
+    """
+    Create tables and run migrations once, before any worker starts
+
+    Workers run the same idempotent steps on import; doing them here first
+    keeps them from racing each other on ALTER TABLE / CREATE INDEX.
+    """
+    from database import db, migrate_db
+    from search_index import create_search_schema
+
+    app = create_cli_app(config)
+    with app.app_context():
+        db.create_all()
+        migrate_db()
+        create_search_schema(db.engine)
+        # No connection may cross the fork into the workers
+        db.engine.dispose()
+
+
+def run_gunicorn(options):
+    """Serve with gunicorn; each worker imports the app after forking"""
+    from gunicorn.app.base import BaseApplication
+
+    class Server(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', options['bind'])
+            self.cfg.set('workers', options['workers'])
+            self.cfg.set('threads', options['threads'])
+            self.cfg.set('worker_class', 'gthread')
+            # Stopping a live session transcribes and summarizes inside the request
+            self.cfg.set('timeout', options['timeout'])
+            self.cfg.set('graceful_timeout', 30)
+            self.cfg.set('preload_app', False)
+            self.cfg.set('accesslog', '-')
+
+        def load(self):
+            from wsgi import app
+            return app
+
+    Server().run()
+
+
+def run_single_process(options):
+    """Serve one threaded process with werkzeug (no reloader, no debugger)"""
+    from werkzeug.serving import run_simple
+    from wsgi import app
+
+    host, _, port = options['bind'].rpartition(':')
+    run_simple(host or '0.0.0.0', int(port), app,
+               threaded=True, use_reloader=False, use_debugger=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bind', help='HOST:PORT to listen on')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--threads', type=int, help='Request threads per worker')
+    parser.add_argument('--timeout', type=int, help='Seconds before a silent worker is restarted')
+    args = parser.parse_args()
+
+    config = load_config()
+    options = server_options(args, config)
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        print("[Server] gunicorn is not installed; serving a single process")
+        run_single_process(options)
+        return
+
+    prepare_database(config)
+    print(f"[Server] {options['workers']} worker(s) x {options['threads']} thread(s) on {options['bind']}")
+    run_gunicorn(options)
+
+
+if __name__ == "__main__":
+    main()
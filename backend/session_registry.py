@@ -0,0 +1,295 @@
+"""
+Session Registry
+Shared directory of process-local state (live recording sessions, batch
+progress), so any server worker can route a request to the worker that owns it
+"""
+
+import os
+import atexit
+import pickle
+import socket
+import threading
+from datetime import datetime
+from multiprocessing.connection import Listener, Client, AuthenticationError
+
+from database import db, SessionRoute
+
+
+DEFAULT_SOCKET_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'run')
+
+# Seconds to wait for the owning worker; stopping a session transcribes and summarizes
+CALL_TIMEOUT = 600
+
+
+class RouteError(Exception):
+    """The owning worker could not be reached"""
+
+
+class SessionRegistry:
+    def __init__(self, socket_dir=DEFAULT_SOCKET_DIR, authkey=b'', context=None, enabled=None):
+        """
+        Initialize session registry
+
+        Routes (kind, key) -> owning process are rows in the session_routes
+        table. Each process that owns a route listens on a Unix socket in
+        socket_dir; other processes send it the operation and get the
+        result back. A single-process server only ever runs calls locally.
+
+        Args:
+            socket_dir: Directory for the per-process sockets (local disk)
+            authkey: Shared secret authenticating calls between workers
+            context: Optional callable returning a context manager entered
+                     around every routed call (e.g. app.app_context)
+            enabled: Route across processes (default: where Unix sockets exist);
+                     when False every call runs locally
+        """
+        self.enabled = hasattr(socket, 'AF_UNIX') if enabled is None else enabled
+        self.socket_dir = os.path.abspath(socket_dir)
+        self.authkey = authkey
+        self.context = context
+        self._handlers = {}
+        self._lock = threading.Lock()
+        self._listener = None
+        self._listener_pid = None
+
+    @property
+    def owner(self):
+        """Identity of this process"""
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    @property
+    def address(self):
+        """Socket this process listens on"""
+        return os.path.join(self.socket_dir, f"worker-{os.getpid()}.sock")
+
+    def handle(self, op, fn):
+        """
+        Register the local implementation of an operation
+
+        Args:
+            op: Operation name used by call()
+            fn: Callable run in the owning process
+        """
+        self._handlers[op] = fn
+
+    def _ensure_listener(self):
+        """Start this process's socket listener (again after a fork)"""
+        with self._lock:
+            if self._listener_pid == os.getpid():
+                return
+
+            os.makedirs(self.socket_dir, exist_ok=True)
+            self.prune()
+            if os.path.exists(self.address):
+                os.remove(self.address)
+
+            self._listener = Listener(self.address, family='AF_UNIX', authkey=self.authkey)
+            self._listener_pid = os.getpid()
+            threading.Thread(target=self._serve, args=(self._listener,), daemon=True).start()
+            atexit.register(self.close)
+            print(f"[SessionRegistry] Worker {self.owner} listening on {self.address}")
+
+    def _serve(self, listener):
+        while True:
+            try:
+                connection = listener.accept()
+            except AuthenticationError:
+                continue
+            except OSError:
+                # Listener closed
+                return
+            threading.Thread(target=self._answer, args=(connection,), daemon=True).start()
+
+    def _answer(self, connection):
+        """
+        Run one routed call and send back ('ok', result), ('raise', exception)
+        or, for exceptions that cannot be pickled, ('error', message)
+        """
+        with connection:
+            try:
+                op, args = connection.recv()
+                if self.context:
+                    with self.context():
+                        reply = ('ok', self._handlers[op](*args))
+                else:
+                    reply = ('ok', self._handlers[op](*args))
+            except Exception as e:
+                reply = ('raise', e) if _picklable(e) else ('error', str(e))
+            try:
+                connection.send(reply)
+            except OSError:
+                pass
+
+    def register(self, kind, key, user_id):
+        """
+        Record that this process owns a route
+
+        Args:
+            kind: Route namespace ('recording', 'upload_batch', ...)
+            key: Id within the namespace
+            user_id: Owner user
+        """
+        if not self.enabled:
+            return
+        self._ensure_listener()
+        db.session.merge(SessionRoute(
+            key=f"{kind}:{key}",
+            user_id=user_id,
+            owner=self.owner,
+            address=self.address,
+            created_at=datetime.utcnow()
+        ))
+        db.session.commit()
+
+    def unregister(self, kind, key):
+        """Forget a route"""
+        if not self.enabled:
+            return
+        SessionRoute.query.filter_by(key=f"{kind}:{key}").delete()
+        db.session.commit()
+
+    def keys(self, kind, user_id):
+        """
+        Ids of a user's routes of one kind, in every process
+
+        Args:
+            kind: Route namespace
+            user_id: Owner user
+
+        Returns:
+            list: Keys within the namespace (empty when routing is disabled)
+        """
+        if not self.enabled:
+            return []
+        prefix = f"{kind}:"
+        rows = (
+            SessionRoute.query.filter(SessionRoute.user_id == user_id, SessionRoute.key.startswith(prefix))
+            .with_entities(SessionRoute.key)
+            .order_by(SessionRoute.key)
+        )
+        return [key[len(prefix):] for key, in rows]
+
+    def is_local(self, kind, key):
+        """
+        Whether call() would run an operation in this process
+
+        Lets a caller pass process-bound arguments (e.g. a request stream)
+        when no routing is needed.
+        """
+        if not self.enabled:
+            return True
+        route = db.session.get(SessionRoute, f"{kind}:{key}")
+        return route is None or route.address == self.address or route.owner == self.owner
+
+    def call(self, kind, key, op, *args):
+        """
+        Run an operation in the process that owns a route
+
+        Unknown routes run locally, so the handler decides what a missing
+        session means (usually returning None). A route whose owner has
+        exited is removed and then also runs locally.
+
+        Args:
+            kind: Route namespace
+            key: Id within the namespace
+            op: Operation registered with handle()
+            *args: Passed to the handler (must be picklable)
+
+        Returns:
+            Handler result
+        """
+        if not self.enabled:
+            return self._handlers[op](*args)
+
+        route = db.session.get(SessionRoute, f"{kind}:{key}")
+        if route is None or route.address == self.address or route.owner == self.owner:
+            return self._handlers[op](*args)
+
+        address = route.address
+        # Release the connection before a call that may take minutes
+        db.session.rollback()
+        try:
+            return self._remote(address, op, args)
+        except (FileNotFoundError, ConnectionRefusedError):
+            print(f"[SessionRegistry] Owner of {kind}:{key} is gone, dropping route")
+            self.unregister(kind, key)
+            return self._handlers[op](*args)
+
+    def _remote(self, address, op, args):
+        """Send a call to another worker and wait for its reply"""
+        try:
+            with Client(address, family='AF_UNIX', authkey=self.authkey) as connection:
+                connection.send((op, args))
+                if not connection.poll(CALL_TIMEOUT):
+                    raise RouteError(f"Worker did not answer {op} within {CALL_TIMEOUT}s")
+                status, value = connection.recv()
+        except (EOFError, AuthenticationError) as e:
+            raise RouteError(f"Lost connection to worker during {op}: {e}")
+
+        if status == 'raise':
+            raise value
+        if status == 'error':
+            raise Exception(value)
+        return value
+
+    def prune(self):
+        """
+        Drop routes owned by processes on this host that no longer exist
+
+        Returns:
+            int: Number of routes removed
+        """
+        host = socket.gethostname()
+        stale = []
+        for route in SessionRoute.query.filter(SessionRoute.owner.like(f"{host}:%")):
+            pid = int(route.owner.rsplit(':', 1)[1])
+            if pid != os.getpid() and not _process_alive(pid):
+                stale.append(route.key)
+
+        if stale:
+            SessionRoute.query.filter(SessionRoute.key.in_(stale)).delete(synchronize_session=False)
+            db.session.commit()
+            print(f"   ✓ Dropped {len(stale)} route(s) of exited workers")
+        return len(stale)
+
+    def close(self):
+        """Stop listening and drop this process's routes (their state dies with it)"""
+        with self._lock:
+            if self._listener is None or self._listener_pid != os.getpid():
+                return
+            self._listener.close()
+            self._listener = None
+            self._listener_pid = None
+            if os.path.exists(self.address):
+                os.remove(self.address)
+
+        try:
+            if self.context:
+                with self.context():
+                    SessionRoute.query.filter_by(owner=self.owner).delete()
+                    db.session.commit()
+            else:
+                SessionRoute.query.filter_by(owner=self.owner).delete()
+                db.session.commit()
+        except Exception as e:
+            print(f"[SessionRegistry] Warning: Could not drop routes of {self.owner}: {e}")
+
+
+def _picklable(value):
+    """Whether a value can be sent to another process"""
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def _process_alive(pid):
+    """Whether a process id exists on this host"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
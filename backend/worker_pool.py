@@ -0,0 +1,119 @@
+"""
+Worker Pool
+Background threads that run upload processing jobs with per-user fairness
+"""
+
+import threading
+from collections import deque
+
+
+class FairWorkerPool:
+    def __init__(self, workers, context=None):
+        """
+        Initialize worker pool
+
+        Jobs are queued per user and workers take them round-robin across
+        users, so one user's batch of fifty files does not hold up another
+        user's single upload.
+
+        Args:
+            workers: Number of worker threads
+            context: Optional callable returning a context manager entered
+                     around every job (e.g. app.app_context)
+        """
+        self.workers = max(1, int(workers))
+        self.context = context
+
+        # User id -> deque of jobs; users with queued jobs in turn order
+        self._queues = {}
+        self._turns = deque()
+        self._condition = threading.Condition()
+        self._threads = []
+        self.active = 0
+
+    def _start(self):
+        """Start worker threads on first use (caller holds the condition)"""
+        self._threads = [t for t in self._threads if t.is_alive()]
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._run, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, user_id, fn, *args, **kwargs):
+        """
+        Queue a job for a user
+
+        Args:
+            user_id: Owner, used for fair scheduling
+            fn: Callable to run on a worker thread
+            *args, **kwargs: Passed to fn
+        """
+        with self._condition:
+            queue = self._queues.get(user_id)
+            if queue is None:
+                queue = self._queues[user_id] = deque()
+                self._turns.append(user_id)
+            queue.append((fn, args, kwargs))
+            self._start()
+            # join() waits on the same condition, so wake everyone
+            self._condition.notify_all()
+
+    def _next_job(self):
+        """Pop the next job round-robin across users (caller holds the condition)"""
+        user_id = self._turns.popleft()
+        queue = self._queues[user_id]
+        job = queue.popleft()
+        if queue:
+            self._turns.append(user_id)
+        else:
+            del self._queues[user_id]
+        return job
+
+    def pending(self, user_id=None):
+        """
+        Count queued (not yet running) jobs
+
+        Args:
+            user_id: Only this user's jobs, or None for all
+
+        Returns:
+            int: Number of queued jobs
+        """
+        with self._condition:
+            if user_id is not None:
+                return len(self._queues.get(user_id, ()))
+            return sum(len(queue) for queue in self._queues.values())
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._turns:
+                    self._condition.wait()
+                fn, args, kwargs = self._next_job()
+                self.active += 1
+
+            try:
+                if self.context:
+                    with self.context():
+                        fn(*args, **kwargs)
+                else:
+                    fn(*args, **kwargs)
+            except Exception as e:
+                print(f"[WorkerPool] Job failed: {e}")
+            finally:
+                with self._condition:
+                    self.active -= 1
+                    self._condition.notify_all()
+
+    def join(self, timeout=None):
+        """
+        Wait until no jobs are queued or running
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if the pool is idle
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._turns and not self.active, timeout)
@@ -0,0 +1,20 @@
+"""
+WSGI entry point for production servers
+
+Usage:
+    cd backend && gunicorn --workers 4 --threads 8 --timeout 600 wsgi:app
+
+Prefer python backend/serve.py, which reads these settings from the config.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import app, start_warm_up  # noqa: E402
+
+application = app
+
+# Build services and load models in the background; /api/ready reports progress
+start_warm_up()
@@ -0,0 +1,356 @@
+"""
+ZIP Export
+Streams a ZIP of recordings (audio, transcript, summary, PDFs, metadata)
+without staging it on disk
+"""
+
+import os
+import json
+import zlib
+import hashlib
+import zipfile
+import threading
+from collections import OrderedDict, namedtuple
+
+from summarizer import insights_file_for, chapters_file_for
+
+
+EXPORT_VERSION = 1
+
+EXPORT_PARTS = ('audio', 'transcript', 'summary', 'pdf', 'metadata')
+
+# Already compressed, or (PCM speech) barely compressible: stored as is
+STORED_EXTENSIONS = {'.wav', '.mp3', '.ogg', '.flac', '.m4a', '.webm', '.pdf'}
+
+CHUNK_SIZE = 64 * 1024
+
+# Remembered archive lengths, keyed by ETag
+MAX_KNOWN_LENGTHS = 256
+
+# Remembered deflated sizes of text entries, keyed by (path, size, mtime)
+MAX_KNOWN_DEFLATED = 4096
+
+# Renders of a PDF that the cache evicted before it could be opened
+PDF_OPEN_ATTEMPTS = 3
+
+# Entry in an export: bytes come from path, from data, or (for PDFs) from the
+# PDF cache as (kind, source file, session name, cache key), rendered when
+# the entry is streamed so a large export never needs all its PDFs cached at once
+ExportEntry = namedtuple('ExportEntry', ['arcname', 'path', 'data', 'date_time', 'pdf'])
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to the generator"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+
+class ZipExporter:
+    def __init__(self, pdf_cache):
+        """
+        Initialize ZIP exporter
+
+        Args:
+            pdf_cache: PDFCache used to render (or look up) PDFs
+        """
+        self.pdf_cache = pdf_cache
+        self._lengths = OrderedDict()
+        self._deflated = OrderedDict()
+        self._lock = threading.Lock()
+
+    def manifest(self, recordings, parts=EXPORT_PARTS):
+        """
+        List the entries of an export
+
+        Archive bytes depend only on the manifest, so regenerating it gives
+        the same ZIP, which is what makes range requests possible.
+
+        Args:
+            recordings: Recording rows to export
+            parts: Subset of EXPORT_PARTS to include
+
+        Returns:
+            list: ExportEntry tuples in archive order
+        """
+        entries = []
+
+        for recording in recordings:
+            folder = recording.session_id
+            created = recording.created_at
+            date_time = (max(created.year, 1980), created.month, created.day,
+                         created.hour, created.minute, created.second)
+
+            def add(name, path=None, data=None, pdf=None):
+                entries.append(ExportEntry(f"{folder}/{name}", path, data, date_time, pdf))
+
+            audio = recording.audio_file_path
+            if 'audio' in parts and audio and os.path.exists(audio):
+                add(f"audio{os.path.splitext(audio)[1].lower() or '.wav'}", audio)
+
+            transcript = recording.transcript_file_path
+            has_transcript = bool(transcript and os.path.exists(transcript))
+            if 'transcript' in parts and has_transcript:
+                add('transcript.txt', transcript)
+
+            summary = recording.summary_file_path
+            has_summary = bool(summary and os.path.exists(summary))
+            if 'summary' in parts and has_summary:
+                add('summary.txt', summary)
+                for name, sidecar in (('insights.json', insights_file_for(summary)),
+                                      ('chapters.json', chapters_file_for(summary))):
+                    if os.path.exists(sidecar):
+                        add(name, sidecar)
+
+            if 'pdf' in parts:
+                for kind, source in (('transcript', transcript if has_transcript else None),
+                                     ('summary', summary if has_summary else None)):
+                    if source:
+                        key = self.pdf_cache.make_key(kind, source, recording.session_id)
+                        add(f'{kind}.pdf', pdf=(kind, source, recording.session_id, key))
+
+            if 'metadata' in parts:
+                metadata = {
+                    'id': recording.id,
+                    'session_id': recording.session_id,
+                    'title': recording.title,
+                    'created_at': created.isoformat(),
+                    'duration': recording.duration,
+                    'status': recording.status
+                }
+                add('metadata.json', data=json.dumps(metadata, indent=2, sort_keys=True).encode('utf-8'))
+
+        return entries
+
+    def etag(self, entries):
+        """
+        Content ETag of an export
+
+        Covers entry names plus the size and mtime of every file, the bytes
+        of generated entries and the cache key of every PDF (which covers
+        its sources and the renderer), so any change yields a new ETag.
+
+        Args:
+            entries: manifest() result
+
+        Returns:
+            str: Hex digest
+        """
+        digest = hashlib.sha256(f"zip-export:{EXPORT_VERSION}".encode('utf-8'))
+        for entry in entries:
+            digest.update(entry.arcname.encode('utf-8') + b'\0')
+            if entry.pdf is not None:
+                digest.update(entry.pdf[3].encode('utf-8'))
+            elif entry.path is None:
+                digest.update(hashlib.sha256(entry.data).digest())
+            else:
+                stat = os.stat(entry.path)
+                digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _open(self, entry):
+        """
+        Open the bytes of a file entry, rendering its PDF first if needed
+
+        An open file stays readable even if the PDF cache evicts it meanwhile.
+
+        Returns:
+            file: Binary file object
+        """
+        if entry.pdf is None:
+            return open(entry.path, 'rb')
+
+        kind, source_file, session_name, key = entry.pdf
+        for _ in range(PDF_OPEN_ATTEMPTS):
+            pdf_path, _ = self.pdf_cache.get_pdf(kind, source_file, session_name, key=key)
+            try:
+                return open(pdf_path, 'rb')
+            except FileNotFoundError:
+                # Evicted by a render for another entry or request
+                continue
+        raise Exception(f"PDF for {entry.arcname} was evicted before it could be read; raise pdf_cache_max_mb")
+
+    def _generate(self, entries):
+        """Yield ZIP bytes in roughly CHUNK_SIZE pieces"""
+        sink = _ChunkSink()
+
+        # An unseekable sink makes zipfile write data descriptors after each entry
+        with zipfile.ZipFile(sink, 'w') as archive:
+            for entry in entries:
+                info = zipfile.ZipInfo(entry.arcname, entry.date_time)
+                info.external_attr = 0o644 << 16
+                info.compress_type = _compress_type(entry)
+
+                if entry.path is None and entry.pdf is None:
+                    with archive.open(info, 'w', force_zip64=len(entry.data) >= zipfile.ZIP64_LIMIT) as dest:
+                        dest.write(entry.data)
+                    yield from sink.drain()
+                    continue
+
+                with self._open(entry) as source:
+                    size = os.fstat(source.fileno()).st_size
+                    with archive.open(info, 'w', force_zip64=size >= zipfile.ZIP64_LIMIT) as dest:
+                        while True:
+                            block = source.read(CHUNK_SIZE)
+                            if not block:
+                                break
+                            dest.write(block)
+                            yield from sink.drain()
+                yield from sink.drain()
+
+        yield from sink.drain()
+
+    def _entry_sizes(self, entry):
+        """
+        (size, size in the archive) of an entry
+
+        Stored entries (audio, PDFs) are only stat'ed; deflated entries are
+        text and metadata, small enough to compress just to measure.
+        """
+        if entry.path is None and entry.pdf is None:
+            return len(entry.data), _deflated_size([entry.data])
+
+        if entry.pdf is not None:
+            with self._open(entry) as source:
+                size = os.fstat(source.fileno()).st_size
+            return size, size
+
+        stat = os.stat(entry.path)
+        if _compress_type(entry) == zipfile.ZIP_STORED:
+            return stat.st_size, stat.st_size
+
+        signature = (entry.path, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            compressed = self._deflated.get(signature)
+        if compressed is None:
+            with open(entry.path, 'rb') as source:
+                compressed = _deflated_size(iter(lambda: source.read(CHUNK_SIZE), b''))
+            with self._lock:
+                self._deflated[signature] = compressed
+                while len(self._deflated) > MAX_KNOWN_DEFLATED:
+                    self._deflated.popitem(last=False)
+        return stat.st_size, compressed
+
+    def stream(self, entries, etag=None, start=0, stop=None):
+        """
+        Stream the archive, or the byte range [start, stop) of it
+
+        Ranges are served by regenerating the archive and discarding the
+        bytes before start, so memory stays bounded by CHUNK_SIZE.
+
+        Args:
+            entries: manifest() result
+            etag: etag() result; a full pass records the archive length under it
+            start: First byte
+            stop: End byte (exclusive), or None for the end of the archive
+
+        Yields:
+            bytes: Archive chunks
+        """
+        position = 0
+        for chunk in self._generate(entries):
+            end = position + len(chunk)
+            if end > start and (stop is None or position < stop):
+                yield chunk[max(start - position, 0):(None if stop is None else stop - position)]
+            position = end
+            if stop is not None and position >= stop:
+                return
+
+        if etag and start == 0 and stop is None:
+            self._remember_length(etag, position)
+
+    def length(self, entries, etag):
+        """
+        Total archive length, computed from the entry sizes if unknown
+
+        Mirrors the layout zipfile writes to an unseekable stream: a local
+        header, the data and a data descriptor per entry, then the central
+        directory and end records, with ZIP64 fields where zipfile adds them.
+        Audio and PDFs are not read, so a resumed download on any worker
+        does not pay for a full pass first.
+
+        Args:
+            entries: manifest() result
+            etag: etag() result
+
+        Returns:
+            int: Length in bytes
+        """
+        known = self.known_length(etag)
+        if known is not None:
+            return known
+
+        offset = 0
+        directory = 0
+        for entry in entries:
+            name = len(_encoded_name(entry.arcname))
+            size, stored = self._entry_sizes(entry)
+            zip64 = size >= zipfile.ZIP64_LIMIT
+
+            header_offset = offset
+            offset += (zipfile.sizeFileHeader + name + (20 if zip64 else 0)
+                       + stored + (24 if zip64 else 16))
+
+            zip64_fields = 0
+            if size > zipfile.ZIP64_LIMIT or stored > zipfile.ZIP64_LIMIT:
+                zip64_fields += 2
+            if header_offset > zipfile.ZIP64_LIMIT:
+                zip64_fields += 1
+            directory += zipfile.sizeCentralDir + name + (4 + 8 * zip64_fields if zip64_fields else 0)
+
+        total = offset + directory + zipfile.sizeEndCentDir
+        if (len(entries) > zipfile.ZIP_FILECOUNT_LIMIT or offset > zipfile.ZIP64_LIMIT
+                or directory > zipfile.ZIP64_LIMIT):
+            total += zipfile.sizeEndCentDir64 + zipfile.sizeEndCentDir64Locator
+
+        self._remember_length(etag, total)
+        return total
+
+    def known_length(self, etag):
+        """Archive length if a previous pass recorded it, else None"""
+        with self._lock:
+            total = self._lengths.get(etag)
+            if total is not None:
+                self._lengths.move_to_end(etag)
+            return total
+
+    def _remember_length(self, etag, total):
+        with self._lock:
+            self._lengths[etag] = total
+            self._lengths.move_to_end(etag)
+            while len(self._lengths) > MAX_KNOWN_LENGTHS:
+                self._lengths.popitem(last=False)
+
+
+def _compress_type(entry):
+    """ZIP_STORED for already-compressed formats, else ZIP_DEFLATED"""
+    if os.path.splitext(entry.arcname)[1] in STORED_EXTENSIONS:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _encoded_name(arcname):
+    """Entry name as zipfile writes it (ASCII, else UTF-8)"""
+    try:
+        return arcname.encode('ascii')
+    except UnicodeEncodeError:
+        return arcname.encode('utf-8')
+
+
+def _deflated_size(blocks):
+    """Size of blocks compressed the way zipfile deflates an entry"""
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    size = sum(len(compressor.compress(block)) for block in blocks)
+    return size + len(compressor.flush())
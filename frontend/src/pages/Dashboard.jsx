@@ -2,7 +2,20 @@ import React, { useState, useEffect } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { useAuth } from '../contexts/AuthContext'
 import axios from 'axios'
-import { Mic, Plus, LogOut, FileText, Clock, Trash2, Download, Eye, Upload } from 'lucide-react'
+import { Mic, Plus, LogOut, FileText, Clock, Trash2, Download, Eye, Upload, Search } from 'lucide-react'
+
+const PAGE_SIZE = 30
+// Only what the cards show; file paths stay on the server
+const LIST_FIELDS = 'id,title,created_at,duration,status,has_transcript_pdf'
+
+// Snippets mark matches with <mark>…</mark>; render them as text, never as HTML
+const Snippet = ({ text }) => (
+  <span>
+    {text.split(/<\/?mark>/).map((part, i) =>
+      i % 2 ? <mark key={i} className="bg-yellow-200">{part}</mark> : <span key={i}>{part}</span>
+    )}
+  </span>
+)
 
 const Dashboard = () => {
   const { user, logout } = useAuth()
@@ -10,23 +23,65 @@ const Dashboard = () => {
   const [recordings, setRecordings] = useState([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState('')
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [titleFilter, setTitleFilter] = useState('')
+  const [statusFilter, setStatusFilter] = useState('')
+  const [searchQuery, setSearchQuery] = useState('')
+  const [searchResults, setSearchResults] = useState(null)
 
   useEffect(() => {
     fetchRecordings()
-  }, [])
+  }, [titleFilter, statusFilter])
 
-  const fetchRecordings = async () => {
+  const fetchRecordings = async (cursor = null) => {
     try {
-      const response = await axios.get('/api/recordings')
-      setRecordings(response.data.recordings)
+      if (cursor) setLoadingMore(true)
+      const response = await axios.get('/api/recordings', {
+        params: {
+          fields: LIST_FIELDS,
+          limit: PAGE_SIZE,
+          cursor: cursor || undefined,
+          title: titleFilter || undefined,
+          status: statusFilter || undefined,
+        },
+      })
+      setRecordings((previous) =>
+        cursor ? [...previous, ...response.data.recordings] : response.data.recordings
+      )
+      setNextCursor(response.data.next_cursor)
     } catch (error) {
       setError('Failed to load recordings')
       console.error('Error fetching recordings:', error)
     } finally {
       setLoading(false)
+      setLoadingMore(false)
+    }
+  }
+
+  const filtered = Boolean(titleFilter || statusFilter)
+
+  const handleSearch = async (e) => {
+    e.preventDefault()
+    if (!searchQuery.trim()) {
+      setSearchResults(null)
+      return
+    }
+    try {
+      const response = await axios.get('/api/search', { params: { q: searchQuery } })
+      setSearchResults(response.data.results)
+    } catch (error) {
+      setError('Search failed')
+      console.error('Error searching:', error)
     }
   }
 
+  const formatOffset = (seconds) => {
+    const mins = Math.floor(seconds / 60)
+    const secs = Math.floor(seconds % 60)
+    return `${mins}:${secs.toString().padStart(2, '0')}`
+  }
+
   const handleDelete = async (id) => {
     if (!window.confirm('Are you sure you want to delete this recording?')) {
       return
@@ -41,6 +96,22 @@ const Dashboard = () => {
     }
   }
 
+  const handleExport = async () => {
+    try {
+      const response = await axios.get('/api/recordings/export', { responseType: 'blob' })
+      const link = document.createElement('a')
+      link.href = window.URL.createObjectURL(response.data)
+      link.download = 'meetings_export.zip'
+      document.body.appendChild(link)
+      link.click()
+      link.remove()
+      window.URL.revokeObjectURL(link.href)
+    } catch (error) {
+      alert('Failed to export recordings')
+      console.error('Error exporting recordings:', error)
+    }
+  }
+
   const formatDate = (dateString) => {
     const date = new Date(dateString)
     return date.toLocaleDateString() + ' ' + date.toLocaleTimeString([], { hour: '2-digit', minute: '2-digit' })
@@ -82,6 +153,15 @@ const Dashboard = () => {
         <div className="mb-6 flex items-center justify-between">
           <h2 className="text-2xl font-semibold text-gray-900">My Recordings</h2>
           <div className="flex items-center space-x-3">
+            {recordings.length > 0 && (
+              <button
+                onClick={handleExport}
+                className="flex items-center space-x-2 bg-white border border-gray-300 text-gray-700 px-4 py-2 rounded-lg hover:bg-gray-50 transition"
+              >
+                <Download className="w-5 h-5" />
+                <span>Export All</span>
+              </button>
+            )}
             <button
               onClick={() => navigate('/upload')}
               className="flex items-center space-x-2 bg-white border border-primary-600 text-primary-600 px-4 py-2 rounded-lg hover:bg-primary-50 transition"
@@ -99,6 +179,77 @@ const Dashboard = () => {
           </div>
         </div>
 
+        <form onSubmit={handleSearch} className="mb-4 flex items-center space-x-3">
+          <input
+            type="search"
+            value={searchQuery}
+            onChange={(e) => setSearchQuery(e.target.value)}
+            placeholder="Search transcripts and summaries"
+            className="flex-1 px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-primary-500 focus:border-transparent"
+          />
+          <button
+            type="submit"
+            className="flex items-center space-x-2 bg-primary-600 text-white px-4 py-2 rounded-lg hover:bg-primary-700 transition"
+          >
+            <Search className="w-5 h-5" />
+            <span>Search</span>
+          </button>
+        </form>
+
+        {searchResults && (
+          <div className="mb-8 bg-white rounded-lg shadow divide-y">
+            {searchResults.length === 0 ? (
+              <div className="p-4 text-gray-600">No matches for “{searchQuery}”</div>
+            ) : (
+              searchResults.map((result) => (
+                <button
+                  key={`${result.recording_id}-${result.kind}-${result.position}`}
+                  onClick={() =>
+                    navigate(
+                      `/recording/${result.recording_id}` +
+                        (result.start != null ? `?t=${Math.floor(result.start)}` : '')
+                    )
+                  }
+                  className="w-full text-left p-4 hover:bg-gray-50 transition"
+                >
+                  <div className="flex items-center justify-between mb-1">
+                    <span className="font-medium text-gray-900">{result.title}</span>
+                    <span className="text-xs text-gray-500">
+                      {result.kind}
+                      {result.start != null && ` · ${formatOffset(result.start)}`}
+                    </span>
+                  </div>
+                  <p className="text-sm text-gray-700">
+                    <Snippet text={result.snippet} />
+                  </p>
+                </button>
+              ))
+            )}
+          </div>
+        )}
+
+        <div className="mb-6 flex items-center space-x-3">
+          <input
+            type="text"
+            value={titleFilter}
+            onChange={(e) => setTitleFilter(e.target.value)}
+            placeholder="Filter by title"
+            className="flex-1 px-4 py-2 border border-gray-300 rounded-lg focus:ring-2 focus:ring-primary-500 focus:border-transparent"
+          />
+          <select
+            value={statusFilter}
+            onChange={(e) => setStatusFilter(e.target.value)}
+            className="px-4 py-2 border border-gray-300 rounded-lg bg-white"
+          >
+            <option value="">All statuses</option>
+            <option value="completed">Completed</option>
+            <option value="processing">Processing</option>
+            <option value="queued">Queued</option>
+            <option value="recording">Recording</option>
+            <option value="failed">Failed</option>
+          </select>
+        </div>
+
         {loading ? (
           <div className="flex justify-center items-center py-12">
             <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-primary-600"></div>
@@ -107,6 +258,10 @@ const Dashboard = () => {
           <div className="bg-red-50 border border-red-200 text-red-700 px-4 py-3 rounded">
             {error}
           </div>
+        ) : recordings.length === 0 && filtered ? (
+          <div className="bg-white rounded-lg shadow p-12 text-center text-gray-600">
+            No recordings match these filters
+          </div>
         ) : recordings.length === 0 ? (
           <div className="bg-white rounded-lg shadow p-12 text-center">
             <FileText className="w-16 h-16 text-gray-400 mx-auto mb-4" />
@@ -137,6 +292,7 @@ const Dashboard = () => {
                       recording.status === 'completed' ? 'bg-green-100 text-green-800' :
                       recording.status === 'recording' ? 'bg-blue-100 text-blue-800' :
                       recording.status === 'processing' ? 'bg-yellow-100 text-yellow-800' :
+                      recording.status === 'queued' ? 'bg-gray-100 text-gray-800' :
                       'bg-red-100 text-red-800'
                     }`}>
                       {recording.status}
@@ -165,7 +321,7 @@ const Dashboard = () => {
                       <Eye className="w-4 h-4" />
                       <span>View</span>
                     </button>
-                    {recording.transcript_pdf_path && (
+                    {recording.has_transcript_pdf && (
                       <a
                         href={`/api/recordings/${recording.id}/pdf/transcript`}
                         onClick={(e) => e.stopPropagation()}
@@ -190,6 +346,18 @@ const Dashboard = () => {
             ))}
           </div>
         )}
+
+        {nextCursor && !loading && (
+          <div className="mt-8 flex justify-center">
+            <button
+              onClick={() => fetchRecordings(nextCursor)}
+              disabled={loadingMore}
+              className="px-6 py-2 bg-white border border-gray-300 text-gray-700 rounded-lg hover:bg-gray-50 disabled:opacity-50 transition"
+            >
+              {loadingMore ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
       </main>
     </div>
   )
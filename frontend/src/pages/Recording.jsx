@@ -10,6 +10,7 @@ const Recording = () => {
   const [isRecording, setIsRecording] = useState(false)
   const [sessionId, setSessionId] = useState(null)
   const [transcript, setTranscript] = useState('')
+  const [liveSummary, setLiveSummary] = useState('')
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
   const transcriptIntervalRef = useRef(null)
@@ -103,6 +104,7 @@ const Recording = () => {
       if (response.data.transcript) {
         const fullText = response.data.transcript.full_text || ''
         setTranscript(fullText)
+        setLiveSummary(response.data.transcript.live_summary?.text || '')
       }
     } catch (error) {
       console.error('Error fetching transcript:', error)
@@ -219,6 +221,19 @@ const Recording = () => {
               <p className="text-sm text-gray-500 mt-2">
                 Transcript updates in real-time as you speak
               </p>
+
+              {liveSummary && (
+                <div className="mt-8">
+                  <h3 className="text-lg font-semibold text-gray-900 mb-4">
+                    Live Summary
+                  </h3>
+                  <div className="bg-blue-50 rounded-lg p-6">
+                    <p className="text-gray-800 whitespace-pre-wrap leading-relaxed">
+                      {liveSummary}
+                    </p>
+                  </div>
+                </div>
+              )}
             </div>
           )}
         </div>
@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useRef } from "react";
-import { useParams, useNavigate } from "react-router-dom";
+import { useParams, useNavigate, useSearchParams } from "react-router-dom";
 import axios from "axios";
 import {
 	ArrowLeft,
@@ -15,6 +15,7 @@ import {
 const RecordingDetail = () => {
 	const { id } = useParams();
 	const navigate = useNavigate();
+	const [searchParams] = useSearchParams();
 
 	const [recording, setRecording] = useState(null);
 	const [loading, setLoading] = useState(true);
@@ -31,10 +32,21 @@ const RecordingDetail = () => {
 		useState("transcript.pdf");
 	const [summaryFilename, setSummaryFilename] = useState("summary.pdf");
 
+	// Meetings similar to this one
+	const [related, setRelated] = useState([]);
+
 	useEffect(() => {
 		fetchRecording();
 	}, [id]);
 
+	useEffect(() => {
+		if (recording?.status !== "completed") return;
+		axios
+			.get(`/api/recordings/${id}/related`)
+			.then((res) => setRelated(res.data.related))
+			.catch(() => setRelated([]));
+	}, [recording]);
+
 	// Fetch audio with token
 	useEffect(() => {
 		if (recording?.audio_file_path && audioRef.current) {
@@ -51,6 +63,18 @@ const RecordingDetail = () => {
 					const url = URL.createObjectURL(blob);
 					audioRef.current.src = url;
 					audioRef.current.load();
+
+					// Jump to a search hit (?t=seconds)
+					const start = Number(searchParams.get("t"));
+					if (start > 0) {
+						audioRef.current.addEventListener(
+							"loadedmetadata",
+							() => {
+								audioRef.current.currentTime = start;
+							},
+							{ once: true }
+						);
+					}
 				})
 				.catch((err) => {
 					console.error("Audio load error:", err);
@@ -283,7 +307,7 @@ const RecordingDetail = () => {
 
 					<div className="grid md:grid-cols-2 gap-6">
 						{/* Transcript */}
-						{recording.transcript_pdf_path && (
+						{recording.has_transcript_pdf && (
 							<div>
 								<label className="text-sm font-medium">
 									Transcript filename
@@ -306,7 +330,7 @@ const RecordingDetail = () => {
 						)}
 
 						{/* Summary */}
-						{recording.summary_pdf_path && (
+						{recording.has_summary_pdf && (
 							<div>
 								<label className="text-sm font-medium">Summary filename</label>
 								<input
@@ -328,6 +352,27 @@ const RecordingDetail = () => {
 					</div>
 				</div>
 
+				{/* RELATED MEETINGS */}
+				{related.length > 0 && (
+					<div className="bg-white shadow p-6 rounded mb-6">
+						<h2 className="text-lg font-semibold mb-4">Related Meetings</h2>
+						<ul className="divide-y">
+							{related.map((item) => (
+								<li
+									key={item.id}
+									onClick={() => navigate(`/recording/${item.id}`)}
+									className="py-2 flex justify-between cursor-pointer hover:text-primary-600"
+								>
+									<span>{item.title}</span>
+									<span className="text-sm text-gray-500">
+										{formatDate(item.created_at)}
+									</span>
+								</li>
+							))}
+						</ul>
+					</div>
+				)}
+
 				{/* TRANSCRIPT + SUMMARY TABS */}
 				<div className="bg-white rounded shadow">
 					<div className="border-b flex">
@@ -351,6 +396,18 @@ const RecordingDetail = () => {
 						>
 							Summary
 						</button>
+						{recording.insights && (
+							<button
+								className={`px-6 py-4 border-b-2 ${
+									activeTab === "insights"
+										? "border-primary-500 text-primary-600"
+										: "border-transparent text-gray-500"
+								}`}
+								onClick={() => setActiveTab("insights")}
+							>
+								Insights
+							</button>
+						)}
 					</div>
 
 					<div className="p-6">
@@ -361,9 +418,73 @@ const RecordingDetail = () => {
 						)}
 
 						{activeTab === "summary" && (
-							<pre className="whitespace-pre-wrap bg-gray-50 p-6 rounded">
-								{recording.summary || "No summary available"}
-							</pre>
+							<>
+								<pre className="whitespace-pre-wrap bg-gray-50 p-6 rounded">
+									{recording.summary || "No summary available"}
+								</pre>
+
+								{recording.chapters && recording.chapters.length > 1 && (
+									<div className="mt-6">
+										<h3 className="font-semibold text-gray-900 mb-2">Chapters</h3>
+										<ol className="space-y-4">
+											{recording.chapters.map((chapter) => (
+												<li key={chapter.index} className="bg-gray-50 p-4 rounded">
+													<div className="font-medium text-gray-900">
+														{chapter.start_seconds != null && (
+															<span className="text-primary-600 mr-2">
+																{new Date(chapter.start_seconds * 1000)
+																	.toISOString()
+																	.substring(11, 19)}
+															</span>
+														)}
+														{chapter.title}
+													</div>
+													<p className="text-gray-700 mt-1">{chapter.summary}</p>
+												</li>
+											))}
+										</ol>
+									</div>
+								)}
+							</>
+						)}
+
+						{activeTab === "insights" && recording.insights && (
+							<div className="space-y-6">
+								<div>
+									<h3 className="font-semibold text-gray-900 mb-2">Key Phrases</h3>
+									<div className="flex flex-wrap gap-2">
+										{recording.insights.keyphrases.map((k) => (
+											<span
+												key={k.phrase}
+												className="px-3 py-1 bg-primary-50 text-primary-700 rounded-full text-sm"
+											>
+												{k.phrase}
+											</span>
+										))}
+									</div>
+								</div>
+
+								<div>
+									<h3 className="font-semibold text-gray-900 mb-2">Action Items</h3>
+									{recording.insights.action_items.length === 0 ? (
+										<p className="text-gray-500">No action items detected</p>
+									) : (
+										<ul className="list-disc pl-6 space-y-1">
+											{recording.insights.action_items.map((item) => (
+												<li key={item.segment}>
+													{item.text}
+													{(item.owner || item.due) && (
+														<span className="text-gray-500 text-sm">
+															{" "}
+															({[item.owner, item.due].filter(Boolean).join(", ")})
+														</span>
+													)}
+												</li>
+											))}
+										</ul>
+									)}
+								</div>
+							</div>
 						)}
 					</div>
 				</div>
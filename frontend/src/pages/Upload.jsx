@@ -4,11 +4,16 @@ import { useAuth } from '../contexts/AuthContext'
 import axios from 'axios'
 import { Upload as UploadIcon, ArrowLeft, FileAudio, FileText, File, Loader, CheckCircle } from 'lucide-react'
 
+const MAX_CHUNK_RETRIES = 5
+const BATCH_POLL_MS = 2000
+
 const Upload = () => {
   const { user } = useAuth()
   const navigate = useNavigate()
   const [uploadType, setUploadType] = useState('audio') // 'audio' or 'text'
   const [selectedFile, setSelectedFile] = useState(null)
+  const [batchFiles, setBatchFiles] = useState([])
+  const [batchStatus, setBatchStatus] = useState(null)
   const [title, setTitle] = useState('')
   const [uploading, setUploading] = useState(false)
   const [progress, setProgress] = useState(0)
@@ -19,6 +24,7 @@ const Upload = () => {
     const file = e.target.files[0]
     if (file) {
       setSelectedFile(file)
+      setBatchFiles(Array.from(e.target.files))
       setError('')
       // Auto-fill title with filename (without extension)
       if (!title) {
@@ -28,12 +34,54 @@ const Upload = () => {
     }
   }
 
+  const handleBatchUpload = async () => {
+    try {
+      setUploading(true)
+      setError('')
+      setProgress(0)
+
+      // Each file becomes its own recording, titled after its filename
+      const formData = new FormData()
+      batchFiles.forEach((file) => formData.append('files', file))
+
+      const { data: batch } = await axios.post('/api/upload/batch', formData, {
+        headers: { 'Content-Type': 'multipart/form-data' },
+        onUploadProgress: (e) => {
+          setProgress(Math.min(99, Math.round((e.loaded * 100) / e.total)))
+        },
+      })
+      setProgress(100)
+
+      let status = null
+      while (!status || !status.done) {
+        await new Promise((resolve) => setTimeout(resolve, BATCH_POLL_MS))
+        const res = await axios.get(`/api/upload/batch/${batch.batch_id}`)
+        status = res.data
+        setBatchStatus(status)
+      }
+
+      setSuccess(true)
+      setTimeout(() => {
+        navigate('/dashboard')
+      }, 2000)
+
+    } catch (error) {
+      console.error('Batch upload error:', error)
+      setError(error.response?.data?.error || 'Failed to upload files')
+      setUploading(false)
+    }
+  }
+
   const handleUpload = async () => {
     if (!selectedFile) {
       setError('Please select a file')
       return
     }
 
+    if (batchFiles.length > 1) {
+      return handleBatchUpload()
+    }
+
     if (!title.trim()) {
       setError('Please enter a title')
       return
@@ -44,21 +92,40 @@ const Upload = () => {
       setError('')
       setProgress(0)
 
-      const formData = new FormData()
-      formData.append('file', selectedFile)
-      formData.append('title', title)
+      // Chunked, resumable upload: a dropped chunk resumes from the server's offset
+      const { data: upload } = await axios.post('/api/uploads', {
+        filename: selectedFile.name,
+        size: selectedFile.size,
+        title,
+      })
 
-      const endpoint = uploadType === 'audio' ? '/api/upload/audio' : '/api/upload/text'
+      let offset = upload.offset
+      let retries = 0
+      while (offset < selectedFile.size) {
+        const chunk = selectedFile.slice(offset, offset + upload.chunk_size)
+        try {
+          const res = await axios.patch(`/api/uploads/${upload.upload_id}`, chunk, {
+            headers: {
+              'Content-Type': 'application/offset+octet-stream',
+              'Upload-Offset': String(offset),
+            },
+          })
+          offset = Number(res.headers['upload-offset'])
+          retries = 0
+        } catch (chunkError) {
+          if (retries >= MAX_CHUNK_RETRIES || chunkError.response?.status === 413) {
+            throw chunkError
+          }
+          retries += 1
+          await new Promise((resolve) => setTimeout(resolve, 1000 * retries))
+          const status = await axios.get(`/api/uploads/${upload.upload_id}`)
+          offset = status.data.offset
+        }
+        setProgress(Math.min(99, Math.round((offset * 100) / selectedFile.size)))
+      }
 
-      const response = await axios.post(endpoint, formData, {
-        headers: {
-          'Content-Type': 'multipart/form-data',
-        },
-        onUploadProgress: (progressEvent) => {
-          const percentCompleted = Math.round((progressEvent.loaded * 100) / progressEvent.total)
-          setProgress(percentCompleted)
-        },
-      })
+      setProgress(100)
+      const response = await axios.post(`/api/uploads/${upload.upload_id}/finalize`)
 
       setSuccess(true)
       setProgress(100)
@@ -150,6 +217,7 @@ const Upload = () => {
                 onClick={() => {
                   setUploadType('audio')
                   setSelectedFile(null)
+                  setBatchFiles([])
                   setError('')
                 }}
                 className={`p-4 border-2 rounded-lg transition ${
@@ -173,6 +241,7 @@ const Upload = () => {
                 onClick={() => {
                   setUploadType('text')
                   setSelectedFile(null)
+                  setBatchFiles([])
                   setError('')
                 }}
                 className={`p-4 border-2 rounded-lg transition ${
@@ -233,6 +302,7 @@ const Upload = () => {
                   className="hidden"
                   accept={getAcceptedFileTypes()}
                   onChange={handleFileSelect}
+                  multiple
                   disabled={uploading}
                 />
               </label>
@@ -241,12 +311,20 @@ const Upload = () => {
                 <div className="flex items-center space-x-4">
                   {getFileIcon()}
                   <div className="flex-1">
-                    <p className="text-sm font-medium text-gray-900">{selectedFile.name}</p>
-                    <p className="text-xs text-gray-500">{formatFileSize(selectedFile.size)}</p>
+                    <p className="text-sm font-medium text-gray-900">
+                      {selectedFile.name}
+                      {batchFiles.length > 1 && ` + ${batchFiles.length - 1} more`}
+                    </p>
+                    <p className="text-xs text-gray-500">
+                      {formatFileSize(batchFiles.reduce((total, file) => total + file.size, 0) || selectedFile.size)}
+                    </p>
                   </div>
                   {!uploading && (
                     <button
-                      onClick={() => setSelectedFile(null)}
+                      onClick={() => {
+                        setSelectedFile(null)
+                        setBatchFiles([])
+                      }}
                       className="text-sm text-red-600 hover:text-red-700"
                     >
                       Remove
@@ -268,6 +346,12 @@ const Upload = () => {
                         style={{ width: `${progress}%` }}
                       ></div>
                     </div>
+                    {batchStatus && (
+                      <p className="mt-2 text-xs text-gray-500">
+                        {batchStatus.counts.completed} completed, {batchStatus.counts.processing} processing,{' '}
+                        {batchStatus.counts.queued} queued, {batchStatus.counts.failed} failed
+                      </p>
+                    )}
                   </div>
                 )}
               </div>
@@ -301,7 +385,7 @@ const Upload = () => {
           {/* Upload Button */}
           <button
             onClick={handleUpload}
-            disabled={!selectedFile || !title.trim() || uploading}
+            disabled={!selectedFile || (batchFiles.length <= 1 && !title.trim()) || uploading}
             className="w-full flex items-center justify-center space-x-2 bg-primary-600 text-white px-6 py-3 rounded-lg hover:bg-primary-700 disabled:opacity-50 disabled:cursor-not-allowed transition text-lg font-medium"
           >
             {uploading ? (
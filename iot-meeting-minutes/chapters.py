@@ -0,0 +1,210 @@
+"""
+Chapters Module
+TextTiling-style topic segmentation of long transcripts into chapters
+"""
+
+import bisect
+
+import numpy as np
+from scipy import sparse
+
+
+# Pseudo-sentences on each side of a candidate boundary
+DEFAULT_WINDOW = 10
+
+# Shortest chapter, in pseudo-sentences
+DEFAULT_MIN_SENTENCES = 20
+
+# Extractive sentences per chapter summary
+DEFAULT_SUMMARY_SENTENCES = 2
+
+# Keywords used as the chapter title
+TITLE_KEYWORDS = 3
+
+
+def _block_matrix(n_rows, lo_offsets, hi_offsets):
+    """
+    Sparse (n_gaps x n_rows) 0/1 matrix selecting a window per gap
+
+    Gap g (boundary before row g, for g in 1..n_rows-1) selects rows
+    [g + lo, g + hi) clipped to the valid range.
+    """
+    gaps = np.arange(1, n_rows)
+    rows = []
+    cols = []
+    for offset in range(lo_offsets, hi_offsets):
+        col = gaps + offset
+        valid = (col >= 0) & (col < n_rows)
+        rows.append(gaps[valid] - 1)
+        cols.append(col[valid])
+    rows = np.concatenate(rows)
+    cols = np.concatenate(cols)
+    data = np.ones(len(rows), dtype=np.float64)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(n_rows - 1, n_rows))
+
+
+def gap_similarities(tfidf_matrix, window=DEFAULT_WINDOW):
+    """
+    Cosine similarity between the windows on either side of every gap
+
+    Window vectors are sums of rows, built for all gaps at once by
+    multiplying with banded selector matrices, so the cost is
+    O(rows * window * terms per row).
+
+    Args:
+        tfidf_matrix: Sparse (sentences x terms) TF-IDF matrix
+        window: Sentences per window
+
+    Returns:
+        numpy.ndarray: Similarity for gaps 1..n-1
+    """
+    matrix = sparse.csr_matrix(tfidf_matrix)
+    n_rows = matrix.shape[0]
+    if n_rows < 2:
+        return np.zeros(0)
+
+    left = _block_matrix(n_rows, -window, 0) @ matrix
+    right = _block_matrix(n_rows, 0, window) @ matrix
+
+    dots = np.asarray(left.multiply(right).sum(axis=1)).ravel()
+    left_norms = np.sqrt(np.asarray(left.multiply(left).sum(axis=1)).ravel())
+    right_norms = np.sqrt(np.asarray(right.multiply(right).sum(axis=1)).ravel())
+
+    denominator = left_norms * right_norms
+    similarities = np.zeros(n_rows - 1)
+    nonzero = denominator > 0
+    similarities[nonzero] = dots[nonzero] / denominator[nonzero]
+    return similarities
+
+
+def depth_scores(similarities):
+    """
+    TextTiling depth of each valley: how far it sits below the peaks around it
+
+    The peak reached by climbing left (or right) from a gap is carried
+    along in one pass each way, so this is linear rather than a climb per
+    gap. Gaps that are not local minima get depth 0.
+
+    Args:
+        similarities: Gap similarity array
+
+    Returns:
+        numpy.ndarray: Depth per gap
+    """
+    n = len(similarities)
+    left_peak = np.empty(n)
+    right_peak = np.empty(n)
+
+    for i in range(n):
+        if i > 0 and similarities[i - 1] >= similarities[i]:
+            left_peak[i] = left_peak[i - 1]
+        else:
+            left_peak[i] = similarities[i]
+
+    for i in range(n - 1, -1, -1):
+        if i < n - 1 and similarities[i + 1] >= similarities[i]:
+            right_peak[i] = right_peak[i + 1]
+        else:
+            right_peak[i] = similarities[i]
+
+    depths = (left_peak - similarities) + (right_peak - similarities)
+
+    previous = np.concatenate(([np.inf], similarities[:-1]))
+    following = np.concatenate((similarities[1:], [np.inf]))
+    depths[(similarities > previous) | (similarities > following)] = 0.0
+    return depths
+
+
+def find_boundaries(similarities, min_sentences=DEFAULT_MIN_SENTENCES):
+    """
+    Pick chapter boundaries at deep, well-separated similarity valleys
+
+    Args:
+        similarities: Gap similarity array (gap g is before sentence g + 1)
+        min_sentences: Shortest allowed chapter
+
+    Returns:
+        list: Sentence indices where new chapters start, ascending
+    """
+    n_sentences = len(similarities) + 1
+    if n_sentences < 2 * min_sentences:
+        return []
+
+    # Light smoothing, as in TextTiling
+    if len(similarities) >= 3:
+        padded = np.concatenate(([similarities[0]], similarities, [similarities[-1]]))
+        similarities = np.convolve(padded, np.ones(3) / 3, mode='valid')
+
+    depths = depth_scores(similarities)
+    valleys = depths[depths > 0]
+    if not len(valleys):
+        return []
+
+    # Conservative cutoff: only valleys clearly deeper than the typical one
+    cutoff = valleys.mean() + valleys.std() / 2
+
+    chosen = [0, n_sentences]
+    for gap in np.argsort(-depths, kind='stable'):
+        if depths[gap] < cutoff:
+            break
+        start = int(gap) + 1
+        position = bisect.bisect_left(chosen, start)
+        if (start - chosen[position - 1] >= min_sentences
+                and chosen[position] - start >= min_sentences):
+            chosen.insert(position, start)
+
+    return chosen[1:-1]
+
+
+def detect_chapters(sentences, tfidf_matrix, terms, window=DEFAULT_WINDOW,
+                    min_sentences=DEFAULT_MIN_SENTENCES,
+                    summary_sentences=DEFAULT_SUMMARY_SENTENCES, duration=None):
+    """
+    Split a transcript into chapters with offsets, titles and summaries
+
+    Args:
+        sentences: List of {'text', 'start'} dictionaries (see
+                   segment_transcript_timed); 'start' may be None
+        tfidf_matrix: Sparse TF-IDF matrix with one row per sentence
+        terms: Term for each column
+        window: Sentences per comparison window
+        min_sentences: Shortest allowed chapter
+        summary_sentences: Extractive sentences per chapter
+        duration: Recording length in seconds (end of the last chapter)
+
+    Returns:
+        list: Chapter dictionaries in order
+    """
+    from insights import extract_keyphrases
+    from textrank import rank_sentences, top_sentence_indices
+
+    if not sentences:
+        return []
+
+    matrix = sparse.csr_matrix(tfidf_matrix)
+    boundaries = find_boundaries(gap_similarities(matrix, window), min_sentences)
+    starts = [0] + boundaries
+    ends = boundaries + [len(sentences)]
+
+    chapters = []
+    for index, (start, end) in enumerate(zip(starts, ends)):
+        block = matrix[start:end]
+        texts = [sentence['text'] for sentence in sentences[start:end]]
+
+        scores = rank_sentences(block)
+        keep = top_sentence_indices(scores, summary_sentences)
+        keywords = [k['phrase'] for k in extract_keyphrases(block, terms, scores, TITLE_KEYWORDS)]
+
+        end_seconds = sentences[end]['start'] if end < len(sentences) else duration
+        chapters.append({
+            'index': index,
+            'title': ', '.join(keywords) or f"Chapter {index + 1}",
+            'keywords': keywords,
+            'start_sentence': start,
+            'end_sentence': end,
+            'start_seconds': sentences[start]['start'],
+            'end_seconds': end_seconds,
+            'summary': ' '.join(texts[i] for i in keep)
+        })
+
+    return chapters
@@ -0,0 +1,155 @@
+"""
+Insights Module
+Keyphrases, per-segment topic tags and action-item candidates built from the
+summarizer's TF-IDF matrix
+"""
+
+import re
+
+import numpy as np
+
+
+DEFAULT_NUM_KEYPHRASES = 10
+DEFAULT_TOPICS_PER_SEGMENT = 3
+
+# Cues that usually mark a commitment or task in spoken meetings
+ACTION_CUE = re.compile(
+    r"\b(?:action items?|to[- ]?do|follow[- ]up|(?:will|shall|should|must|needs? to|"
+    r"have to|has to|going to|gonna|let's|lets|let us|make sure|assign(?:ed)? to|"
+    r"responsible for|take care of|get back to|by (?:then|tomorrow|tonight|eod))\b)",
+    re.IGNORECASE
+)
+
+# Who is on the hook: "<Name> will ...", "I'll ...", "we need to ..."
+ACTION_OWNER = re.compile(
+    r"\b((?i:i|we|you|they)|(?!(?:It|This|That|There|What|Who)\b)[A-Z][a-z]+)"
+    r"(?:'ll|\s+(?i:will|shall|should|must|needs? to|has to|have to|(?:is|are|am) going to))\b"
+)
+
+ACTION_DUE = re.compile(
+    r"\b(?:by|before|until|on|next)\s+(today|tonight|tomorrow|eod|end of (?:day|week|month)|"
+    r"(?:this|next) (?:week|month|quarter|sprint)|week|month|sprint|"
+    r"monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
+    re.IGNORECASE
+)
+
+
+def extract_keyphrases(tfidf_matrix, terms, scores=None, count=DEFAULT_NUM_KEYPHRASES):
+    """
+    Rank vocabulary terms by their TF-IDF mass, weighted by sentence centrality
+
+    Args:
+        tfidf_matrix: Sparse (sentences x terms) TF-IDF matrix
+        terms: Term for each column
+        scores: Optional TextRank score per sentence
+        count: Number of keyphrases to return
+
+    Returns:
+        list: [{'phrase': str, 'score': float}] best first
+    """
+    if tfidf_matrix is None or tfidf_matrix.shape[1] == 0:
+        return []
+
+    if scores is None:
+        weights = np.asarray(tfidf_matrix.sum(axis=0)).ravel()
+    else:
+        weights = np.asarray(tfidf_matrix.T @ np.asarray(scores, dtype=np.float64)).ravel()
+
+    # Ties break on the term itself so column order does not matter
+    terms = np.asarray(terms)
+    top = np.lexsort((terms, -np.round(weights, 12)))[:count]
+
+    total = weights.sum() or 1.0
+    return [
+        {'phrase': str(terms[i]), 'score': round(float(weights[i] / total), 4)}
+        for i in top if weights[i] > 0
+    ]
+
+
+def tag_segments(tfidf_matrix, terms, per_segment=DEFAULT_TOPICS_PER_SEGMENT):
+    """
+    Tag each sentence with its highest-weighted terms
+
+    Args:
+        tfidf_matrix: Sparse (sentences x terms) TF-IDF matrix
+        terms: Term for each column
+        per_segment: Tags per sentence
+
+    Returns:
+        list: [{'segment': index, 'topics': [str]}] for sentences with any terms
+    """
+    if tfidf_matrix is None:
+        return []
+
+    matrix = tfidf_matrix.tocsr()
+    terms = np.asarray(terms)
+    tagged = []
+
+    for row in range(matrix.shape[0]):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        if start == end:
+            continue
+        columns = matrix.indices[start:end]
+        values = matrix.data[start:end]
+        order = np.lexsort((terms[columns], -np.round(values, 12)))[:per_segment]
+        tagged.append({
+            'segment': row,
+            'topics': [str(terms[columns[i]]) for i in order]
+        })
+
+    return tagged
+
+
+def find_action_items(sentences):
+    """
+    Pattern-match action-item candidates in transcript sentences
+
+    Args:
+        sentences: List of sentences
+
+    Returns:
+        list: [{'segment': index, 'text': str, 'owner': str|None, 'due': str|None}]
+    """
+    items = []
+
+    for index, sentence in enumerate(sentences):
+        if not ACTION_CUE.search(sentence):
+            continue
+
+        owner = ACTION_OWNER.search(sentence)
+        due = ACTION_DUE.search(sentence)
+        items.append({
+            'segment': index,
+            'text': sentence,
+            'owner': owner.group(1) if owner else None,
+            'due': due.group(0) if due else None
+        })
+
+    return items
+
+
+def build_insights(tfidf_matrix, terms, sentences, scores=None,
+                   num_keyphrases=DEFAULT_NUM_KEYPHRASES,
+                   topics_per_segment=DEFAULT_TOPICS_PER_SEGMENT):
+    """
+    Build meeting insights from an existing TF-IDF matrix
+
+    Everything is linear in the matrix's non-zeros plus one regex scan of
+    the sentences, so it adds a small constant factor to summarization.
+
+    Args:
+        tfidf_matrix: Sparse (sentences x terms) TF-IDF matrix, or None
+        terms: Term for each column
+        sentences: Sentences the matrix rows were built from
+        scores: Optional TextRank score per sentence
+        num_keyphrases: Number of keyphrases
+        topics_per_segment: Topic tags per sentence
+
+    Returns:
+        dict: keyphrases, topics and action_items
+    """
+    return {
+        'keyphrases': extract_keyphrases(tfidf_matrix, terms, scores, num_keyphrases),
+        'topics': tag_segments(tfidf_matrix, terms, topics_per_segment),
+        'action_items': find_action_items(sentences)
+    }
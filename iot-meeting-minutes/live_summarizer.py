@@ -0,0 +1,220 @@
+"""
+Live Summarizer Module
+Incrementally maintained extractive (TextRank) summary for live sessions
+"""
+
+import re
+import time
+import threading
+
+import numpy as np
+
+from segmenter import segment_transcript, DEFAULT_PAUSE_SECONDS, DEFAULT_MAX_WORDS
+
+
+# Same token rule as sklearn's TfidfVectorizer default
+_TOKEN = re.compile(r'(?u)\b\w\w+\b')
+
+
+class RollingSummarizer:
+    def __init__(self, num_sentences=5, interval_seconds=0,
+                 pause_seconds=DEFAULT_PAUSE_SECONDS, max_words=DEFAULT_MAX_WORDS):
+        """
+        Initialize rolling summarizer
+
+        Sentences are tokenized and vectorized once as they arrive (the
+        vocabulary, document frequencies and per-sentence term counts are
+        kept), so re-ranking only rebuilds the sparse TF-IDF matrix and runs
+        TextRank.
+
+        Args:
+            num_sentences: Number of sentences in the summary
+            interval_seconds: Minimum time between periodic re-ranks (0 = only on demand)
+            pause_seconds: Gap between words that starts a new sentence
+            max_words: Maximum words per sentence
+        """
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+        self.num_sentences = num_sentences
+        self.interval_seconds = interval_seconds
+        self.pause_seconds = pause_seconds
+        self.max_words = max_words
+        self._stop_words = ENGLISH_STOP_WORDS
+
+        self.sentences = []
+        self.vocabulary = {}
+        self._terms = []
+        self._doc_freq = []
+
+        # Raw term counts per sentence, CSR style
+        self._indptr = [0]
+        self._indices = []
+        self._counts = []
+
+        self.summary = ''
+        self._scores = None
+        self.ranked_count = 0
+        self.last_ranked = None
+        self._lock = threading.Lock()
+
+    def add_segment(self, text, words=None):
+        """
+        Add a final transcript segment
+
+        Args:
+            text: Transcribed text
+            words: Optional list of word dictionaries with timestamps
+        """
+        sentences = segment_transcript(
+            [{'text': text, 'words': words or []}],
+            self.pause_seconds,
+            self.max_words
+        )
+        self.add_sentences(sentences)
+
+    def add_sentences(self, sentences):
+        """
+        Vectorize and append sentences
+
+        Args:
+            sentences: List of sentences
+        """
+        with self._lock:
+            for sentence in sentences:
+                counts = {}
+                for token in _TOKEN.findall(sentence.lower()):
+                    if token in self._stop_words:
+                        continue
+                    column = self.vocabulary.get(token)
+                    if column is None:
+                        column = len(self.vocabulary)
+                        self.vocabulary[token] = column
+                        self._terms.append(token)
+                        self._doc_freq.append(0)
+                    counts[column] = counts.get(column, 0) + 1
+
+                for column in counts:
+                    self._doc_freq[column] += 1
+
+                self.sentences.append(sentence)
+                self._indices.extend(counts.keys())
+                self._counts.extend(counts.values())
+                self._indptr.append(len(self._indices))
+
+    def maybe_refresh(self, now=None):
+        """
+        Re-rank if the interval elapsed and new sentences arrived
+
+        Args:
+            now: Current time.monotonic() value (for testing)
+
+        Returns:
+            bool: True if the summary was refreshed
+        """
+        if not self.interval_seconds:
+            return False
+
+        now = time.monotonic() if now is None else now
+        if self.last_ranked is not None and now - self.last_ranked < self.interval_seconds:
+            return False
+        if len(self.sentences) == self.ranked_count:
+            return False
+
+        self.refresh(now)
+        return True
+
+    def refresh(self, now=None):
+        """
+        Re-rank all sentences and update the summary
+
+        Args:
+            now: Current time.monotonic() value (for testing)
+
+        Returns:
+            str: Summary
+        """
+        from textrank import rank_sentences, top_sentence_indices
+
+        with self._lock:
+            count = len(self.sentences)
+            sentences = self.sentences[:count]
+
+            if count <= self.num_sentences:
+                summary = ' '.join(sentences)
+                scores = None
+            else:
+                scores = rank_sentences(self._matrix(count))
+                top_indices = top_sentence_indices(scores, self.num_sentences)
+                summary = ' '.join(sentences[i] for i in top_indices)
+
+            self.summary = summary
+            self._scores = scores
+            self.ranked_count = count
+            self.last_ranked = time.monotonic() if now is None else now
+
+        return summary
+
+    def get_insights(self):
+        """
+        Build meeting insights from the accumulated TF-IDF vectors
+
+        Returns:
+            dict: keyphrases, topics and action_items
+        """
+        from insights import build_insights
+
+        with self._lock:
+            count = len(self.sentences)
+            scores = self._scores if self.ranked_count == count else None
+            tfidf_matrix = self._matrix(count) if self._terms else None
+            return build_insights(tfidf_matrix, list(self._terms), self.sentences[:count], scores)
+
+    def _matrix(self, count):
+        """TF-IDF matrix of the first count sentences (caller holds the lock)"""
+        from scipy import sparse
+
+        counts = sparse.csr_matrix(
+            (
+                np.asarray(self._counts[:self._indptr[count]], dtype=np.float64),
+                np.asarray(self._indices[:self._indptr[count]], dtype=np.int64),
+                np.asarray(self._indptr[:count + 1], dtype=np.int64)
+            ),
+            shape=(count, len(self.vocabulary))
+        )
+        return self._tfidf(counts, count)
+
+    def _tfidf(self, counts, n_sentences):
+        """Smoothed IDF weighting with L2-normalized rows (as TfidfVectorizer)"""
+        from scipy import sparse
+
+        doc_freq = np.asarray(self._doc_freq, dtype=np.float64)
+        idf = np.log((1.0 + n_sentences) / (1.0 + doc_freq)) + 1.0
+
+        weighted = counts @ sparse.diags(idf)
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.diags(1.0 / norms) @ weighted
+
+    def get_summary(self):
+        """
+        Get the summary, re-ranking only if sentences arrived since the last rank
+
+        Returns:
+            str: Summary
+        """
+        if len(self.sentences) != self.ranked_count:
+            return self.refresh()
+        return self.summary
+
+    def get_state(self):
+        """
+        Get the last computed summary without re-ranking
+
+        Returns:
+            dict: Summary text and bookkeeping for live display
+        """
+        return {
+            'text': self.summary,
+            'sentence_count': len(self.sentences),
+            'ranked_sentences': self.ranked_count
+        }
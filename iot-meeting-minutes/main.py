@@ -17,6 +17,7 @@ from recorder import AudioRecorder
 from stt_engine import VoskSTTEngine
 from transcript_aggregator import TranscriptAggregator
 from summarizer import Summarizer
+import summarizer_backends
 from logger import SessionLogger
 
 
@@ -24,6 +25,7 @@ class SessionController:
     def __init__(self, config_path='configs/recorder_config.yml'):
         """Initialize the session controller"""
         self.config = self.load_config(config_path)
+        summarizer_backends.configure(self.config)
         self.session_timestamp = None
         self.session_folder = None
         self.recorder = None
@@ -61,8 +63,21 @@ class SessionController:
             'wav_format': 'PCM_16',
             'save_dir': 'recordings',
             'summarizer': 'textrank',
+            't5_model': 't5-small',
+            't5_chunk_tokens': 512,
+            't5_batch_size': 4,
+            't5_num_beams': 4,
+            't5_token_budget': 16384,
+            't5_max_seconds': 120,
+            't5_onnx_threads': 0,
+            't5_onnx_quantize': True,
             'extractive_sentences': 5,
-            'auto_summary_interval_seconds': 0,
+            'segment_pause_seconds': 0.6,
+            'segment_max_words': 40,
+            'auto_summary_interval_seconds': 30,
+            'chapter_window': 10,
+            'chapter_min_sentences': 20,
+            'chapter_summary_sentences': 2,
             'mic_device_name': None
         }
         
@@ -274,13 +289,37 @@ class SessionController:
                 transcript_text = self.aggregator.get_full_transcript()
                 
                 if transcript_text.strip():
-                    summary = self.summarizer.generate_summary(transcript_text)
+                    sentences = self.aggregator.get_sentences(
+                        self.config.get('segment_pause_seconds', 0.6),
+                        self.config.get('segment_max_words', 40)
+                    )
+                    summary, insights, mode = self.summarizer.generate_summary(transcript_text, sentences)
                     summary_file = self.summarizer.save_summary(
                         summary,
                         self.session_folder,
-                        f"session_{self.session_timestamp}"
+                        f"session_{self.session_timestamp}",
+                        mode
                     )
                     print(f"   ✓ Saved: {summary_file}")
+                    insights_file = self.summarizer.save_insights(
+                        insights,
+                        self.session_folder,
+                        f"session_{self.session_timestamp}"
+                    )
+                    if insights_file:
+                        print(f"   ✓ Saved: {insights_file}")
+                    chapters_file = self.summarizer.save_chapters(
+                        self.summarizer.generate_chapters(
+                            self.aggregator.get_timed_sentences(
+                                self.config.get('segment_pause_seconds', 0.6),
+                                self.config.get('segment_max_words', 40)
+                            )
+                        ),
+                        self.session_folder,
+                        f"session_{self.session_timestamp}"
+                    )
+                    if chapters_file:
+                        print(f"   ✓ Saved: {chapters_file}")
                     
                     print("\n" + "=" * 60)
                     print("📋 SUMMARY")
@@ -0,0 +1,242 @@
+"""
+Segmenter Module
+Splits unpunctuated ASR output into pseudo-sentences for summarization
+"""
+
+import re
+
+
+# Silence between two words that ends a pseudo-sentence
+DEFAULT_PAUSE_SECONDS = 0.6
+
+# Hard cap on words per pseudo-sentence when no pause is found
+DEFAULT_MAX_WORDS = 40
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+_TERMINAL_PUNCTUATION = ('.', '!', '?')
+
+
+def _finish(words):
+    """
+    Join words into a readable pseudo-sentence
+
+    Args:
+        words: List of word strings
+
+    Returns:
+        str: Capitalized sentence ending in punctuation
+    """
+    sentence = ' '.join(words)
+    sentence = sentence[:1].upper() + sentence[1:]
+    if not sentence.endswith(_TERMINAL_PUNCTUATION):
+        sentence += '.'
+    return sentence
+
+
+def _cap_words(words, max_words):
+    """
+    Split a word list into chunks of at most max_words
+
+    Args:
+        words: List of word strings
+        max_words: Maximum words per chunk
+
+    Returns:
+        list: Pseudo-sentences
+    """
+    return [
+        _finish(words[i:i + max_words])
+        for i in range(0, len(words), max_words)
+    ]
+
+
+def _split_words(words, pause_seconds, max_words):
+    """
+    Group Vosk words at pauses, keeping the start time of each group
+
+    Returns:
+        list: (word strings, start seconds) tuples
+    """
+    groups = []
+    current = []
+    current_start = None
+    last_end = None
+
+    for word in words:
+        start = word.get('start')
+        gap = start - last_end if start is not None and last_end is not None else 0.0
+
+        if current and (gap >= pause_seconds or len(current) >= max_words):
+            groups.append((current, current_start))
+            current = []
+
+        if not current:
+            current_start = start
+        current.append(word['word'])
+        last_end = word.get('end', start)
+
+    if current:
+        groups.append((current, current_start))
+
+    return groups
+
+
+def segment_words(words, pause_seconds=DEFAULT_PAUSE_SECONDS,
+                  max_words=DEFAULT_MAX_WORDS):
+    """
+    Split Vosk word results at pauses between consecutive words
+
+    Args:
+        words: List of word dictionaries with 'word', 'start' and 'end' keys
+        pause_seconds: Gap between words that starts a new sentence
+        max_words: Maximum words per sentence
+
+    Returns:
+        list: Pseudo-sentences
+    """
+    return [_finish(group) for group, _ in _split_words(words, pause_seconds, max_words)]
+
+
+def _raw_sentences(text):
+    """Split text at sentence punctuation with NLTK, or a regex without punkt data"""
+    try:
+        from nltk.tokenize import sent_tokenize
+        return sent_tokenize(text)
+    except (ImportError, LookupError):
+        return _SENTENCE_END.split(text.strip())
+
+
+def _cap_sentence(sentence, max_words):
+    """A sentence as is, or cut into max_words pseudo-sentences if longer"""
+    words = sentence.split()
+    if not words:
+        return []
+    if len(words) <= max_words:
+        return [sentence.strip()]
+    return _cap_words(words, max_words)
+
+
+def split_sentences(text, max_words=DEFAULT_MAX_WORDS):
+    """
+    Split plain text into sentences, capping over-long ones
+
+    Punctuated text is split with NLTK (or a regex when the punkt data is
+    unavailable); anything still longer than max_words, such as
+    unpunctuated ASR text, is cut into fixed-length pseudo-sentences.
+
+    Args:
+        text: Input text
+        max_words: Maximum words per sentence
+
+    Returns:
+        list: Sentences
+    """
+    result = []
+    for sentence in _raw_sentences(text):
+        result.extend(_cap_sentence(sentence, max_words))
+    return result
+
+
+def iter_sentences(chunks, max_words=DEFAULT_MAX_WORDS):
+    """
+    Split a stream of text chunks into sentences
+
+    Same splitting as split_sentences(), but only the unfinished last
+    sentence of each chunk is carried over, and at most max_words words
+    of it, so memory stays bounded by the chunk size even for text
+    without any punctuation.
+
+    Args:
+        chunks: Iterable of text pieces (e.g. successive file reads)
+        max_words: Maximum words per sentence
+
+    Yields:
+        str: Sentences
+    """
+    carry = ''
+    # Carry is the rest of a sentence already partly emitted as capped pieces
+    continued = False
+
+    for chunk in chunks:
+        text = carry + chunk
+        pieces = _raw_sentences(text)
+        if not pieces:
+            carry = text if text.strip() else ''
+            continue
+
+        for sentence in pieces[:-1]:
+            if continued:
+                yield from _cap_words(sentence.split(), max_words)
+                continued = False
+            else:
+                yield from _cap_sentence(sentence, max_words)
+
+        # The last sentence may continue in the next chunk (its last word may be cut)
+        carry = pieces[-1]
+        words = carry.split()
+        if len(words) > max_words:
+            keep = (len(words) - 1) // max_words * max_words
+            yield from _cap_words(words[:keep], max_words)
+            carry = ' '.join(words[keep:])
+            continued = True
+        carry += text[len(text.rstrip()):]
+
+    if continued:
+        yield from _cap_words(carry.split(), max_words)
+    else:
+        yield from _cap_sentence(carry, max_words)
+
+
+def segment_transcript(segments, pause_seconds=DEFAULT_PAUSE_SECONDS,
+                       max_words=DEFAULT_MAX_WORDS):
+    """
+    Split transcript segments into pseudo-sentences
+
+    Every segment boundary (a Vosk final result) ends a sentence. Inside a
+    segment, word timestamps are used when present; otherwise the segment
+    text falls back to the length cap. Runs in time linear in word count.
+
+    Args:
+        segments: List of dictionaries with 'text' and optional 'words'
+        pause_seconds: Gap between words that starts a new sentence
+        max_words: Maximum words per sentence
+
+    Returns:
+        list: Pseudo-sentences
+    """
+    return [
+        sentence['text']
+        for sentence in segment_transcript_timed(segments, pause_seconds, max_words)
+    ]
+
+
+def segment_transcript_timed(segments, pause_seconds=DEFAULT_PAUSE_SECONDS,
+                             max_words=DEFAULT_MAX_WORDS):
+    """
+    Split transcript segments into pseudo-sentences with audio offsets
+
+    Same sentences as segment_transcript(). The offset is the first word's
+    start time when word timestamps exist, else the segment's 'start' or
+    'elapsed_seconds' (None for text without timing).
+
+    Args:
+        segments: List of dictionaries with 'text' and optional 'words'
+        pause_seconds: Gap between words that starts a new sentence
+        max_words: Maximum words per sentence
+
+    Returns:
+        list: [{'text': str, 'start': float or None}]
+    """
+    sentences = []
+
+    for segment in segments:
+        words = segment.get('words') or []
+        if words and all('start' in w for w in words):
+            for group, start in _split_words(words, pause_seconds, max_words):
+                sentences.append({'text': _finish(group), 'start': start})
+        elif segment.get('text', '').strip():
+            start = segment.get('start', segment.get('elapsed_seconds'))
+            for sentence in _cap_words(segment['text'].split(), max_words):
+                sentences.append({'text': sentence, 'start': start})
+
+    return sentences
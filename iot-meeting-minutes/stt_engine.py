@@ -4,7 +4,44 @@ Handles speech-to-text transcription using Vosk
 """
 
 import json
-from vosk import Model, KaldiRecognizer
+import threading
+
+
+# Model path -> loaded vosk.Model, or the exception that prevented loading
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_model(model_path):
+    """
+    Process-wide Vosk model for a path, loaded on first use
+    
+    A loaded model is read-only, so every recognizer in the process shares
+    it instead of loading its own copy. A failed load is remembered and
+    raised again rather than retried on every call.
+    
+    Args:
+        model_path: Path to Vosk model directory
+        
+    Returns:
+        vosk.Model: Loaded model
+    """
+    with _models_lock:
+        model = _models.get(model_path)
+        if model is None:
+            from vosk import Model
+            
+            print(f"   Loading Vosk model from: {model_path}")
+            try:
+                model = Model(model_path)
+                print(f"   ✓ Vosk model loaded successfully")
+            except Exception as e:
+                model = Exception(f"Failed to load Vosk model: {e}")
+            _models[model_path] = model
+    
+    if isinstance(model, Exception):
+        raise model
+    return model
 
 
 class VoskSTTEngine:
@@ -16,16 +53,13 @@ class VoskSTTEngine:
             model_path: Path to Vosk model directory
             sample_rate: Audio sample rate (must match recorder)
         """
+        from vosk import KaldiRecognizer
+        
         self.model_path = model_path
         self.sample_rate = sample_rate
         
-        # Load Vosk model
-        print(f"   Loading Vosk model from: {model_path}")
-        try:
-            self.model = Model(model_path)
-            print(f"   ✓ Vosk model loaded successfully")
-        except Exception as e:
-            raise Exception(f"Failed to load Vosk model: {e}")
+        # Shared Vosk model (loaded by the first engine, or by warm-up)
+        self.model = load_model(model_path)
         
         # Create recognizer
         self.recognizer = KaldiRecognizer(self.model, sample_rate)
@@ -99,6 +133,8 @@ class VoskSTTEngine:
     
     def reset(self):
         """Reset recognizer state"""
+        from vosk import KaldiRecognizer
+        
         self.recognizer = KaldiRecognizer(self.model, self.sample_rate)
         self.recognizer.SetWords(True)
     
@@ -4,13 +4,61 @@ Generates summaries using TextRank (extractive) or T5 (abstractive)
 """
 
 import os
+import json
 from datetime import datetime
-import nltk
-from nltk.tokenize import sent_tokenize
-from nltk.corpus import stopwords
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+
+from segmenter import split_sentences
+from summarizer_backends import get_backend, get_option
+
+
+def _sidecar_file(summary_file, suffix):
+    """Path of a file stored next to '<session>_summary.txt' as '<session><suffix>'"""
+    base = summary_file[:-len('_summary.txt')] if summary_file.endswith('_summary.txt') \
+        else os.path.splitext(summary_file)[0]
+    return base + suffix
+
+
+def insights_file_for(summary_file):
+    """
+    Path of the insights JSON stored next to a summary file
+    
+    Args:
+        summary_file: Path to '<session>_summary.txt'
+        
+    Returns:
+        str: Path to '<session>_insights.json'
+    """
+    return _sidecar_file(summary_file, '_insights.json')
+
+
+def chapters_file_for(summary_file):
+    """
+    Path of the chapters JSON stored next to a summary file
+    
+    Args:
+        summary_file: Path to '<session>_summary.txt'
+        
+    Returns:
+        str: Path to '<session>_chapters.json'
+    """
+    return _sidecar_file(summary_file, '_chapters.json')
+
+
+def load_chapters(summary_file):
+    """
+    Load the chapters stored next to a summary file
+    
+    Args:
+        summary_file: Path to '<session>_summary.txt'
+        
+    Returns:
+        list: Chapter dictionaries, or None if there are none
+    """
+    chapters_file = chapters_file_for(summary_file)
+    if not os.path.exists(chapters_file):
+        return None
+    with open(chapters_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
 
 
 class Summarizer:
@@ -18,168 +66,120 @@ class Summarizer:
         """
         Initialize summarizer
         
+        This is a cheap per-session handle; the models behind it are
+        process-wide backends created on first use (see summarizer_backends).
+        
         Args:
-            mode: 'textrank' for extractive or 't5_small' for abstractive
+            mode: 'textrank' for extractive, 't5_small' (PyTorch) or 't5_onnx'
+                  (ONNX Runtime) for abstractive
             num_sentences: Number of sentences for extractive summary
         """
         self.mode = mode
         self.num_sentences = num_sentences
-        
-        # Download required NLTK data
-        self._download_nltk_data()
-        
-        # Initialize based on mode
-        if mode == 't5_small':
-            self._init_t5()
-        
-        print(f"   ✓ Summarizer initialized (mode: {mode})")
-    
-    def _download_nltk_data(self):
-        """Download required NLTK data"""
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            print("   Downloading NLTK punkt tokenizer...")
-            nltk.download('punkt', quiet=True)
-        
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            print("   Downloading NLTK stopwords...")
-            nltk.download('stopwords', quiet=True)
-    
-    def _init_t5(self):
-        """Initialize T5 model for abstractive summarization"""
-        try:
-            from transformers import T5Tokenizer, T5ForConditionalGeneration
-            
-            print("   Loading T5 model (this may take a moment)...")
-            self.t5_tokenizer = T5Tokenizer.from_pretrained('t5-small')
-            self.t5_model = T5ForConditionalGeneration.from_pretrained('t5-small')
-            print("   ✓ T5 model loaded")
-            
-        except ImportError:
-            print("   Warning: transformers not installed. Install with: pip install transformers")
-            print("   Falling back to TextRank mode")
-            self.mode = 'textrank'
-        except Exception as e:
-            print(f"   Warning: Could not load T5 model: {e}")
-            print("   Falling back to TextRank mode")
-            self.mode = 'textrank'
     
-    def generate_summary(self, text):
+    def generate_summary(self, text, sentences=None):
         """
         Generate summary of the text
         
         Args:
             text: Input text to summarize
+            sentences: Optional pre-segmented sentences (e.g. pause-based
+                       pseudo-sentences from the transcript aggregator)
             
         Returns:
-            str: Summary text
+            tuple: (summary text, insights dictionary or None, mode used);
+                   the mode differs from self.mode after a fallback (e.g. T5
+                   unavailable) and belongs in the saved summary header
         """
         if not text or len(text.strip()) < 50:
-            return "Text too short to summarize."
-        
-        if self.mode == 'textrank':
-            return self._textrank_summary(text)
-        elif self.mode == 't5_small':
-            return self._t5_summary(text)
-        else:
-            return self._textrank_summary(text)
+            return "Text too short to summarize.", None, self.mode
+        
+        backend = get_backend(self.mode)
+        
+        if not sentences:
+            sentences = split_sentences(text)
+        
+        if backend.mode == 'textrank':
+            # Insights come from the same TF-IDF matrix as the ranking
+            summary, insights = backend.summarize_with_insights(sentences, self.num_sentences)
+            return summary, insights, backend.mode
+        
+        textrank = get_backend('textrank')
+        insights = textrank.insights(sentences)
+        
+        try:
+            return backend.summarize(sentences, self.num_sentences), insights, backend.mode
+        except Exception as e:
+            print(f"   Warning: {backend.mode} summarization failed: {e}")
+            print("   Falling back to TextRank...")
+            return textrank.summarize(sentences, self.num_sentences), insights, textrank.mode
     
-    def _textrank_summary(self, text):
+    def generate_summary_stream(self, sentences):
         """
-        Generate extractive summary using TextRank algorithm
+        Generate an extractive summary of a sentence stream in bounded memory
+        
+        Uses online TextRank (see TextRankBackend.summarize_stream) whatever
+        the configured mode, since abstractive models cannot take
+        arbitrarily long input either.
         
         Args:
-            text: Input text
+            sentences: Iterable of sentences, consumed once
             
         Returns:
-            str: Extractive summary
+            tuple: (summary text, insights dictionary, mode used); the
+                   summary is empty if there were no sentences
         """
-        # Tokenize into sentences
-        sentences = sent_tokenize(text)
+        from summarizer_backends import DEFAULT_STREAM_BATCH_SENTENCES, DEFAULT_STREAM_POOL_SENTENCES
         
-        if len(sentences) <= self.num_sentences:
-            return text
+        backend = get_backend('textrank')
         
-        # Create TF-IDF matrix
-        try:
-            vectorizer = TfidfVectorizer(
-                stop_words='english',
-                lowercase=True,
-                max_features=1000
-            )
-            
-            tfidf_matrix = vectorizer.fit_transform(sentences)
-            
-            # Calculate similarity matrix
-            similarity_matrix = cosine_similarity(tfidf_matrix, tfidf_matrix)
-            
-            # Calculate scores (sum of similarities)
-            scores = similarity_matrix.sum(axis=1)
-            
-            # Get top sentences
-            ranked_indices = np.argsort(scores)[::-1]
-            top_indices = sorted(ranked_indices[:self.num_sentences])
-            
-            # Build summary maintaining original order
-            summary_sentences = [sentences[i] for i in top_indices]
-            summary = ' '.join(summary_sentences)
-            
-            return summary
-            
-        except Exception as e:
-            print(f"   Warning: TextRank failed: {e}")
-            # Fallback: return first N sentences
-            return ' '.join(sentences[:self.num_sentences])
+        summary, insights, _ = backend.summarize_stream(
+            sentences,
+            self.num_sentences,
+            int(get_option('stream_batch_sentences', DEFAULT_STREAM_BATCH_SENTENCES)),
+            int(get_option('stream_pool_sentences', DEFAULT_STREAM_POOL_SENTENCES))
+        )
+        return summary, insights, backend.mode
     
-    def _t5_summary(self, text):
+    def generate_chapters(self, sentences, duration=None):
         """
-        Generate abstractive summary using T5 model
+        Split a transcript into chapters with per-chapter summaries
         
         Args:
-            text: Input text
+            sentences: List of {'text', 'start'} dictionaries
+                       (see segmenter.segment_transcript_timed)
+            duration: Recording length in seconds, if known
             
         Returns:
-            str: Abstractive summary
+            list: Chapter dictionaries
         """
+        from chapters import (
+            detect_chapters, DEFAULT_WINDOW, DEFAULT_MIN_SENTENCES,
+            DEFAULT_SUMMARY_SENTENCES
+        )
+        
+        if not sentences:
+            return []
+        
         try:
-            # Prepare input
-            input_text = "summarize: " + text
-            
-            # Tokenize
-            inputs = self.t5_tokenizer.encode(
-                input_text,
-                return_tensors='pt',
-                max_length=512,
-                truncation=True
-            )
-            
-            # Generate summary
-            summary_ids = self.t5_model.generate(
-                inputs,
-                max_length=150,
-                min_length=40,
-                length_penalty=2.0,
-                num_beams=4,
-                early_stopping=True
-            )
-            
-            # Decode summary
-            summary = self.t5_tokenizer.decode(
-                summary_ids[0],
-                skip_special_tokens=True
+            tfidf_matrix, terms = get_backend('textrank').vectorize(
+                [sentence['text'] for sentence in sentences]
             )
-            
-            return summary
-            
-        except Exception as e:
-            print(f"   Warning: T5 summarization failed: {e}")
-            print("   Falling back to TextRank...")
-            return self._textrank_summary(text)
+        except ValueError:
+            # Only stop words
+            return []
+        
+        return detect_chapters(
+            sentences,
+            tfidf_matrix,
+            terms,
+            int(get_option('chapter_window', DEFAULT_WINDOW)),
+            int(get_option('chapter_min_sentences', DEFAULT_MIN_SENTENCES)),
+            int(get_option('chapter_summary_sentences', DEFAULT_SUMMARY_SENTENCES)),
+            duration
+        )
     
-    def save_summary(self, summary, session_folder, session_name):
+    def save_summary(self, summary, session_folder, session_name, mode=None):
         """
         Save summary to file
         
@@ -187,6 +187,7 @@ class Summarizer:
             summary: Summary text
             session_folder: Path to session folder
             session_name: Session name for filename
+            mode: Mode that produced the summary (default: self.mode)
             
         Returns:
             str: Path to saved summary file
@@ -200,7 +201,7 @@ class Summarizer:
             # Write header
             f.write(f"Summary: {session_name}\n")
             f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Mode: {self.mode}\n")
+            f.write(f"Mode: {mode or self.mode}\n")
             f.write("=" * 60 + "\n\n")
             
             # Write summary
@@ -211,6 +212,54 @@ class Summarizer:
         
         return summary_file
     
+    def save_insights(self, insights, session_folder, session_name):
+        """
+        Save meeting insights next to the summary
+        
+        Args:
+            insights: Insights dictionary (keyphrases, topics, action_items)
+            session_folder: Path to session folder
+            session_name: Session name for filename
+            
+        Returns:
+            str: Path to saved insights file, or None if there are no insights
+        """
+        if not insights:
+            return None
+        
+        insights_file = insights_file_for(
+            os.path.join(session_folder, f"{session_name}_summary.txt")
+        )
+        
+        with open(insights_file, 'w', encoding='utf-8') as f:
+            json.dump(insights, f, indent=2)
+        
+        return insights_file
+    
+    def save_chapters(self, chapters, session_folder, session_name):
+        """
+        Save chapters next to the summary
+        
+        Args:
+            chapters: List of chapter dictionaries
+            session_folder: Path to session folder
+            session_name: Session name for filename
+            
+        Returns:
+            str: Path to saved chapters file, or None if there are no chapters
+        """
+        if not chapters:
+            return None
+        
+        chapters_file = chapters_file_for(
+            os.path.join(session_folder, f"{session_name}_summary.txt")
+        )
+        
+        with open(chapters_file, 'w', encoding='utf-8') as f:
+            json.dump(chapters, f, indent=2)
+        
+        return chapters_file
+    
     def get_summary_stats(self, original_text, summary):
         """
         Get statistics about the summary
@@ -225,8 +274,8 @@ class Summarizer:
         orig_words = len(original_text.split())
         summ_words = len(summary.split())
         
-        orig_sentences = len(sent_tokenize(original_text))
-        summ_sentences = len(sent_tokenize(summary))
+        orig_sentences = len(split_sentences(original_text))
+        summ_sentences = len(split_sentences(summary))
         
         compression_ratio = summ_words / orig_words if orig_words > 0 else 0
         
@@ -0,0 +1,621 @@
+"""
+Summarizer Backends Module
+Process-wide, lazily created summarization backends shared across sessions
+"""
+
+import threading
+import time
+
+
+# Map-reduce T5 defaults (overridable through configure())
+DEFAULT_T5_MODEL = 't5-small'
+DEFAULT_T5_CHUNK_TOKENS = 512
+DEFAULT_T5_BATCH_SIZE = 4
+DEFAULT_T5_NUM_BEAMS = 4
+DEFAULT_T5_TOKEN_BUDGET = 16384
+DEFAULT_T5_MAX_SECONDS = 120
+
+# Generated lengths (tokens) for chunk summaries and the final summary
+CHUNK_SUMMARY_MAX_TOKENS = 96
+CHUNK_SUMMARY_MIN_TOKENS = 16
+FINAL_SUMMARY_MAX_TOKENS = 150
+FINAL_SUMMARY_MIN_TOKENS = 40
+
+T5_PREFIX = "summarize: "
+
+# Online TextRank for streamed text: sentences ranked per batch, best kept in a bounded pool
+DEFAULT_STREAM_BATCH_SENTENCES = 2000
+DEFAULT_STREAM_POOL_SENTENCES = 400
+STREAM_KEYPHRASE_TERMS = 5000
+STREAM_MAX_ACTION_ITEMS = 200
+
+
+class TextRankBackend:
+    """Extractive summarization with TF-IDF + TextRank"""
+
+    mode = 'textrank'
+
+    def __init__(self):
+        """Make sure NLTK sentence tokenizer data is available"""
+        import nltk
+
+        try:
+            nltk.data.find('tokenizers/punkt')
+        except LookupError:
+            print("   Downloading NLTK punkt tokenizer...")
+            nltk.download('punkt', quiet=True)
+
+    def vectorize(self, sentences):
+        """
+        Build the TF-IDF matrix shared by ranking and insights
+
+        Args:
+            sentences: List of sentences
+
+        Returns:
+            tuple: (sparse TF-IDF matrix, term for each column)
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer(
+            stop_words='english',
+            lowercase=True,
+            max_features=1000
+        )
+
+        tfidf_matrix = vectorizer.fit_transform(sentences)
+        return tfidf_matrix, vectorizer.get_feature_names_out()
+
+    def rank(self, sentences):
+        """
+        Score sentences with TF-IDF + TextRank
+
+        Args:
+            sentences: List of sentences
+
+        Returns:
+            numpy.ndarray: Score per sentence
+        """
+        from textrank import rank_sentences
+
+        tfidf_matrix, _ = self.vectorize(sentences)
+
+        # PageRank over the sparse k-NN similarity graph
+        return rank_sentences(tfidf_matrix)
+
+    def summarize(self, sentences, num_sentences):
+        """
+        Generate extractive summary using TextRank algorithm
+
+        Args:
+            sentences: List of sentences
+            num_sentences: Number of sentences to keep
+
+        Returns:
+            str: Extractive summary
+        """
+        if len(sentences) <= num_sentences:
+            return ' '.join(sentences)
+
+        try:
+            from textrank import top_sentence_indices
+
+            top_indices = top_sentence_indices(self.rank(sentences), num_sentences)
+
+            # Build summary maintaining original order
+            return ' '.join(sentences[i] for i in top_indices)
+
+        except Exception as e:
+            print(f"   Warning: TextRank failed: {e}")
+            # Fallback: return first N sentences
+            return ' '.join(sentences[:num_sentences])
+
+    def summarize_with_insights(self, sentences, num_sentences):
+        """
+        Generate the extractive summary and meeting insights from one TF-IDF pass
+
+        Args:
+            sentences: List of sentences
+            num_sentences: Number of sentences to keep
+
+        Returns:
+            tuple: (summary, insights dictionary)
+        """
+        from insights import build_insights
+        from textrank import rank_sentences, top_sentence_indices
+
+        try:
+            tfidf_matrix, terms = self.vectorize(sentences)
+            scores = rank_sentences(tfidf_matrix)
+        except Exception as e:
+            print(f"   Warning: TextRank failed: {e}")
+            summary = ' '.join(sentences[:num_sentences])
+            return summary, build_insights(None, [], sentences)
+
+        if len(sentences) <= num_sentences:
+            summary = ' '.join(sentences)
+        else:
+            top_indices = top_sentence_indices(scores, num_sentences)
+            summary = ' '.join(sentences[i] for i in top_indices)
+
+        return summary, build_insights(tfidf_matrix, terms, sentences, scores)
+
+    def summarize_stream(self, sentences, num_sentences,
+                         batch_sentences=DEFAULT_STREAM_BATCH_SENTENCES,
+                         pool_sentences=DEFAULT_STREAM_POOL_SENTENCES):
+        """
+        Extractive summary and insights over a sentence stream in bounded memory
+
+        Sentences are ranked one batch at a time; each batch's best
+        sentences join a candidate pool, which is re-ranked and halved
+        whenever it outgrows pool_sentences. The summary is the top of a
+        final ranking of the pool, in document order. Keyphrase weights
+        are accumulated per term and action items are matched as
+        sentences pass, so nothing grows with the input size.
+
+        Args:
+            sentences: Iterable of sentences (consumed once)
+            num_sentences: Number of sentences to keep
+            batch_sentences: Sentences ranked together
+            pool_sentences: Candidate pool bound
+
+        Returns:
+            tuple: (summary, insights dictionary, sentence count)
+        """
+        import numpy as np
+        from insights import find_action_items, tag_segments, DEFAULT_NUM_KEYPHRASES
+        from textrank import rank_sentences, top_sentence_indices
+
+        per_batch = max(num_sentences, pool_sentences // 4)
+        pool = []
+        term_weights = {}
+        action_items = []
+        count = 0
+
+        def rank(texts):
+            try:
+                tfidf_matrix, terms = self.vectorize(texts)
+            except ValueError:
+                # Only stop words
+                return None, [], np.full(len(texts), 1.0 / len(texts))
+            return tfidf_matrix, terms, rank_sentences(tfidf_matrix)
+
+        def shrink(keep):
+            _, _, scores = rank([text for _, text in pool])
+            return [pool[i] for i in top_sentence_indices(scores, keep)]
+
+        def add_batch(batch, first_index):
+            tfidf_matrix, terms, scores = rank(batch)
+            if tfidf_matrix is not None:
+                weights = np.asarray(tfidf_matrix.T @ scores).ravel()
+                for term, weight in zip(terms, weights):
+                    term_weights[term] = term_weights.get(term, 0.0) + float(weight)
+
+            for item in find_action_items(batch):
+                if len(action_items) < STREAM_MAX_ACTION_ITEMS:
+                    item['segment'] += first_index
+                    action_items.append(item)
+
+            pool.extend((first_index + i, batch[i]) for i in top_sentence_indices(scores, per_batch))
+
+        batch = []
+        for sentence in sentences:
+            batch.append(sentence)
+            if len(batch) == batch_sentences:
+                add_batch(batch, count)
+                count += len(batch)
+                batch = []
+                if len(pool) > pool_sentences:
+                    pool[:] = shrink(pool_sentences // 2)
+                if len(term_weights) > STREAM_KEYPHRASE_TERMS:
+                    kept = sorted(term_weights.items(), key=lambda item: (-item[1], item[0]))
+                    term_weights = dict(kept[:STREAM_KEYPHRASE_TERMS // 2])
+        if batch:
+            add_batch(batch, count)
+            count += len(batch)
+
+        # Final ranking over the candidates (already in document order)
+        texts = [text for _, text in pool]
+        if len(texts) <= num_sentences:
+            summary = ' '.join(texts)
+            tfidf_matrix = terms = None
+        else:
+            tfidf_matrix, terms, scores = rank(texts)
+            summary = ' '.join(texts[i] for i in top_sentence_indices(scores, num_sentences))
+
+        total = sum(term_weights.values()) or 1.0
+        ranked_terms = sorted(term_weights.items(), key=lambda item: (-item[1], item[0]))
+        topics = tag_segments(tfidf_matrix, terms) if tfidf_matrix is not None else []
+        for topic in topics:
+            topic['segment'] = pool[topic['segment']][0]
+
+        insights = {
+            'keyphrases': [
+                {'phrase': term, 'score': round(weight / total, 4)}
+                for term, weight in ranked_terms[:DEFAULT_NUM_KEYPHRASES] if weight > 0
+            ],
+            'topics': topics,
+            'action_items': action_items
+        }
+        return summary, insights, count
+
+    def insights(self, sentences):
+        """
+        Build meeting insights without ranking (for abstractive summaries)
+
+        Args:
+            sentences: List of sentences
+
+        Returns:
+            dict: Insights dictionary
+        """
+        from insights import build_insights
+
+        try:
+            tfidf_matrix, terms = self.vectorize(sentences)
+        except ValueError:
+            # Only stop words
+            return build_insights(None, [], sentences)
+        return build_insights(tfidf_matrix, terms, sentences)
+
+
+class T5Backend:
+    """
+    Abstractive summarization with a T5 model
+
+    Long transcripts are summarized map-reduce style: sentences are packed
+    into token-bounded windows, windows are summarized in padded batches,
+    and the chunk summaries are summarized again until one remains.
+    """
+
+    mode = 't5_small'
+
+    def __init__(self, model_name=None):
+        """
+        Load T5 tokenizer and model
+
+        Args:
+            model_name: Hugging Face model name or local model directory
+                        (defaults to the 't5_model' option)
+        """
+        from transformers import T5Tokenizer, T5ForConditionalGeneration
+
+        model_name = model_name or get_option('t5_model', DEFAULT_T5_MODEL)
+
+        print("   Loading T5 model (this may take a moment)...")
+        self.tokenizer = T5Tokenizer.from_pretrained(model_name)
+        self.model = T5ForConditionalGeneration.from_pretrained(model_name)
+        self.model.eval()
+        print("   ✓ T5 model loaded")
+
+        # One generation at a time; concurrent calls would only fight for cores
+        self._generate_lock = threading.Lock()
+
+    def summarize(self, sentences, num_sentences):
+        """
+        Generate abstractive summary using T5 model
+
+        Args:
+            sentences: List of sentences
+            num_sentences: Unused, kept for a uniform backend interface
+
+        Returns:
+            str: Abstractive summary
+        """
+        chunk_tokens = int(get_option('t5_chunk_tokens', DEFAULT_T5_CHUNK_TOKENS))
+        token_budget = int(get_option('t5_token_budget', DEFAULT_T5_TOKEN_BUDGET))
+        max_seconds = float(get_option('t5_max_seconds', DEFAULT_T5_MAX_SECONDS))
+
+        started = time.monotonic()
+        deadline = started + max_seconds
+
+        with self._generate_lock:
+            lengths = self._token_lengths(sentences)
+
+            if sum(lengths) > token_budget:
+                sentences, lengths = self._fit_budget(sentences, lengths, token_budget)
+
+            windows = self._pack_windows(sentences, lengths, chunk_tokens)
+
+            # Reduce until everything fits in a single window
+            while len(windows) > 1:
+                partials = self._summarize_windows(
+                    windows, CHUNK_SUMMARY_MAX_TOKENS, CHUNK_SUMMARY_MIN_TOKENS,
+                    started, deadline
+                )
+                reduced = self._pack_windows(partials, self._token_lengths(partials), chunk_tokens)
+                if len(reduced) >= len(windows):
+                    # Chunk summaries did not shrink; keep the first window's worth
+                    reduced = reduced[:1]
+                windows = reduced
+
+            return self._summarize_windows(
+                windows, FINAL_SUMMARY_MAX_TOKENS, FINAL_SUMMARY_MIN_TOKENS,
+                started, deadline
+            )[0]
+
+    def _token_lengths(self, sentences):
+        """Token count of each sentence, without special tokens"""
+        if not sentences:
+            return []
+        encoded = self.tokenizer(list(sentences), add_special_tokens=False)
+        return [len(ids) for ids in encoded['input_ids']]
+
+    def _fit_budget(self, sentences, lengths, token_budget):
+        """
+        Keep the highest TextRank-scored sentences that fit the token budget
+
+        Returns:
+            tuple: (sentences, lengths) in original order
+        """
+        import numpy as np
+
+        scores = get_backend('textrank').rank(sentences)
+
+        keep = []
+        used = 0
+        for i in np.argsort(-scores, kind='stable'):
+            if used + lengths[i] > token_budget:
+                continue
+            keep.append(int(i))
+            used += lengths[i]
+
+        if not keep:
+            keep = [int(np.argmax(scores))]
+
+        keep.sort()
+        print(f"   T5 input over token budget; kept {len(keep)}/{len(sentences)} sentences")
+        return [sentences[i] for i in keep], [lengths[i] for i in keep]
+
+    def _pack_windows(self, sentences, lengths, chunk_tokens):
+        """
+        Greedily pack consecutive sentences into token-bounded windows
+
+        Returns:
+            list: Windows, each a list of sentences
+        """
+        # Room for the task prefix and the end-of-sequence token
+        capacity = max(1, chunk_tokens - len(self.tokenizer.encode(T5_PREFIX)) - 1)
+
+        windows = []
+        current = []
+        used = 0
+        for sentence, length in zip(sentences, lengths):
+            if current and used + length > capacity:
+                windows.append(current)
+                current = []
+                used = 0
+            current.append(sentence)
+            used += length
+
+        if current or not windows:
+            windows.append(current)
+
+        return windows
+
+    def _summarize_windows(self, windows, max_tokens, min_tokens, started, deadline):
+        """
+        Summarize windows in padded batches within the wall-time cap
+
+        Beam search is used while less than half the time budget is spent,
+        greedy decoding after that, and windows reached after the deadline
+        get a cheap extractive summary instead.
+
+        Returns:
+            list: One summary per window
+        """
+        batch_size = max(1, int(get_option('t5_batch_size', DEFAULT_T5_BATCH_SIZE)))
+        num_beams = max(1, int(get_option('t5_num_beams', DEFAULT_T5_NUM_BEAMS)))
+        chunk_tokens = int(get_option('t5_chunk_tokens', DEFAULT_T5_CHUNK_TOKENS))
+
+        summaries = []
+        for start in range(0, len(windows), batch_size):
+            batch = windows[start:start + batch_size]
+            now = time.monotonic()
+
+            if now >= deadline:
+                summaries.extend(
+                    get_backend('textrank').summarize(window, 2) for window in batch
+                )
+                continue
+
+            beams = num_beams if now - started < (deadline - started) / 2 else 1
+            texts = [T5_PREFIX + ' '.join(window) for window in batch]
+
+            try:
+                summaries.extend(self._generate(texts, chunk_tokens, max_tokens, min_tokens, beams))
+            except RuntimeError as e:
+                if beams == 1:
+                    raise
+                print(f"   Warning: T5 beam search failed ({e}); retrying greedily")
+                summaries.extend(self._generate(texts, chunk_tokens, max_tokens, min_tokens, 1))
+
+        return summaries
+
+    def _generate(self, texts, chunk_tokens, max_tokens, min_tokens, beams):
+        """Run one batched generate call"""
+        import torch
+
+        inputs = self.tokenizer(
+            texts,
+            return_tensors='pt',
+            padding=True,
+            truncation=True,
+            max_length=chunk_tokens
+        )
+
+        with torch.inference_mode():
+            summary_ids = self.model.generate(
+                **inputs,
+                max_length=max_tokens,
+                min_length=min_tokens,
+                length_penalty=2.0,
+                num_beams=beams,
+                early_stopping=beams > 1
+            )
+
+        return self.tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
+
+
+class OnnxT5Backend(T5Backend):
+    """
+    T5 summarization through ONNX Runtime on CPU
+
+    The model is exported once to int8-quantized ONNX graphs cached next to
+    the weights (see t5_onnx); map-reduce windowing is shared with T5Backend.
+    """
+
+    mode = 't5_onnx'
+
+    def __init__(self, model_name=None):
+        """
+        Export (if needed) and load the ONNX graphs
+
+        Args:
+            model_name: Hugging Face model name or local model directory
+                        (defaults to the 't5_model' option)
+        """
+        from transformers import T5Tokenizer
+        from t5_onnx import OnnxT5Generator, ensure_exported
+
+        model_name = model_name or get_option('t5_model', DEFAULT_T5_MODEL)
+
+        print("   Loading ONNX T5 model...")
+        cache_dir = ensure_exported(
+            model_name,
+            get_option('t5_onnx_dir'),
+            bool(get_option('t5_onnx_quantize', True))
+        )
+        self.tokenizer = T5Tokenizer.from_pretrained(cache_dir)
+        self.generator = OnnxT5Generator(cache_dir, int(get_option('t5_onnx_threads', 0)))
+        print("   ✓ ONNX T5 model loaded")
+
+        self._generate_lock = threading.Lock()
+
+    def _generate(self, texts, chunk_tokens, max_tokens, min_tokens, beams):
+        """Run one batched generation through ONNX Runtime"""
+        inputs = self.tokenizer(
+            texts,
+            return_tensors='np',
+            padding=True,
+            truncation=True,
+            max_length=chunk_tokens
+        )
+
+        summary_ids = self.generator.generate(
+            inputs['input_ids'],
+            inputs['attention_mask'],
+            max_length=max_tokens,
+            min_length=min_tokens,
+            num_beams=beams,
+            length_penalty=2.0
+        )
+
+        return self.tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
+
+
+_BACKEND_FACTORIES = {
+    'textrank': TextRankBackend,
+    't5_small': T5Backend,
+    't5_onnx': OnnxT5Backend,
+}
+
+# Where a backend that fails to load falls back to
+_FALLBACKS = {
+    't5_onnx': 't5_small',
+}
+
+_backends = {}
+_options = {}
+_failed = set()
+_lock = threading.Lock()
+_mode_locks = {mode: threading.Lock() for mode in _BACKEND_FACTORIES}
+
+
+def configure(config):
+    """
+    Set process-wide backend options from the recorder config
+
+    Model choice ('t5_model') applies when a backend is first created;
+    budgets such as 't5_num_beams' or 't5_max_seconds' apply per call.
+
+    Args:
+        config: Configuration dictionary
+    """
+    with _lock:
+        _options.update(config or {})
+
+
+def get_option(key, default=None):
+    """
+    Get a process-wide backend option
+
+    Args:
+        key: Option name
+        default: Value when the option is not set
+
+    Returns:
+        Option value
+    """
+    value = _options.get(key)
+    return default if value is None else value
+
+
+def get_backend(mode):
+    """
+    Get the shared backend for a summarizer mode, creating it on first use
+
+    Unknown modes and backends that fail to load (e.g. transformers not
+    installed) fall back to TextRank, except ONNX which first falls back to
+    PyTorch T5; a failed load is not retried.
+
+    Args:
+        mode: 'textrank', 't5_small' or 't5_onnx'
+
+    Returns:
+        Backend instance with a summarize(sentences, num_sentences) method
+    """
+    while mode not in _BACKEND_FACTORIES or mode in _failed:
+        mode = _FALLBACKS.get(mode, 'textrank')
+
+    backend = _backends.get(mode)
+    if backend is not None:
+        return backend
+
+    # Per-mode lock so a slow T5 load does not block TextRank callers
+    with _mode_locks[mode]:
+        backend = _backends.get(mode)
+        if backend is not None:
+            return backend
+
+        try:
+            backend = _BACKEND_FACTORIES[mode]()
+        except ImportError as e:
+            print(f"   Warning: {mode} summarizer dependencies not installed: {e}")
+        except Exception as e:
+            print(f"   Warning: Could not load {mode} summarizer: {e}")
+
+        if backend is None:
+            if mode == 'textrank':
+                raise RuntimeError("TextRank summarizer backend could not be created")
+            fallback = _FALLBACKS.get(mode, 'textrank')
+            print(f"   Falling back to {fallback} mode")
+            with _lock:
+                _failed.add(mode)
+            return get_backend(fallback)
+
+        with _lock:
+            _backends[mode] = backend
+        print(f"   ✓ Summarizer backend ready (mode: {mode})")
+        return backend
+
+
+def get_loaded_modes():
+    """
+    Get modes whose backends have already been created
+
+    Returns:
+        list: Mode names
+    """
+    with _lock:
+        return sorted(_backends)
@@ -0,0 +1,507 @@
+"""
+T5 ONNX Module
+Exports T5 to (int8-quantized) ONNX graphs and generates with ONNX Runtime
+"""
+
+import os
+import json
+import shutil
+
+import numpy as np
+
+
+ENCODER_FILE = 'encoder.onnx'
+DECODER_FILE = 'decoder.onnx'
+DECODER_WITH_PAST_FILE = 'decoder_with_past.onnx'
+MANIFEST_FILE = 'export.json'
+ONNX_OPSET = 17
+
+# Bumped when the set or signature of exported graphs changes
+EXPORT_FORMAT = 2
+
+# Files whose size/mtime identify a local model's weights
+_WEIGHT_FILES = ('config.json', 'model.safetensors', 'pytorch_model.bin')
+
+
+def default_cache_dir(model_name):
+    """
+    Get the directory exported graphs are cached in
+
+    Local models keep their graphs in an 'onnx' folder next to the weights;
+    hub models use models/onnx/<name> in the repository.
+
+    Args:
+        model_name: Hugging Face model name or local model directory
+
+    Returns:
+        str: Cache directory
+    """
+    if os.path.isdir(model_name):
+        return os.path.join(model_name, 'onnx')
+
+    return os.path.join(
+        os.path.dirname(__file__),
+        '..',
+        'models',
+        'onnx',
+        model_name.replace('/', '__')
+    )
+
+
+def _fingerprint(model_name, quantize):
+    """Describe the source weights so stale exports can be detected"""
+    files = {}
+    if os.path.isdir(model_name):
+        for name in _WEIGHT_FILES:
+            path = os.path.join(model_name, name)
+            if os.path.exists(path):
+                stat = os.stat(path)
+                files[name] = [stat.st_size, int(stat.st_mtime)]
+
+    return {
+        'model': os.path.abspath(model_name) if os.path.isdir(model_name) else model_name,
+        'files': files,
+        'quantized': bool(quantize),
+        'opset': ONNX_OPSET,
+        'format': EXPORT_FORMAT
+    }
+
+
+def export_t5_onnx(model_name, cache_dir, quantize=True):
+    """
+    Export a T5 model to encoder/decoder ONNX graphs
+
+    The decoder is exported twice: an initial graph that runs the start
+    token and returns the self- and cross-attention keys/values of every
+    layer, and a with-past graph that takes those keys/values and feeds
+    one new token per step, returning logits for it and the extended
+    self-attention keys/values. Each generated token therefore costs one
+    position instead of re-running the whole prefix. With quantize=True
+    every graph gets int8 dynamic quantization of its weights.
+
+    Args:
+        model_name: Hugging Face model name or local model directory
+        cache_dir: Output directory
+        quantize: Apply int8 dynamic quantization
+
+    Returns:
+        str: Cache directory
+    """
+    import torch
+    from transformers import T5ForConditionalGeneration, T5Tokenizer
+    from transformers.cache_utils import EncoderDecoderCache
+
+    print(f"   Exporting T5 to ONNX ({'int8' if quantize else 'fp32'}): {cache_dir}")
+
+    model = T5ForConditionalGeneration.from_pretrained(
+        model_name,
+        attn_implementation='eager'
+    ).eval()
+    config = model.config
+    scale = getattr(config, 'scale_decoder_outputs', config.tie_word_embeddings)
+    layers = config.num_decoder_layers
+
+    class Encoder(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.encoder = model.get_encoder()
+
+        def forward(self, input_ids, attention_mask):
+            return self.encoder(
+                input_ids=input_ids,
+                attention_mask=attention_mask
+            ).last_hidden_state
+
+    class Decoder(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def logits(self, hidden):
+            if scale:
+                hidden = hidden * (self.model.model_dim ** -0.5)
+            return self.model.lm_head(hidden)
+
+        def forward(self, decoder_input_ids, encoder_hidden_states, encoder_attention_mask):
+            output = self.model.decoder(
+                input_ids=decoder_input_ids,
+                encoder_hidden_states=encoder_hidden_states,
+                encoder_attention_mask=encoder_attention_mask,
+                use_cache=True
+            )
+            cache = output.past_key_values
+            present = []
+            for layer in range(layers):
+                present += [
+                    cache.self_attention_cache.layers[layer].keys,
+                    cache.self_attention_cache.layers[layer].values,
+                    cache.cross_attention_cache.layers[layer].keys,
+                    cache.cross_attention_cache.layers[layer].values
+                ]
+            return (self.logits(output.last_hidden_state[:, -1, :]), *present)
+
+    class DecoderWithPast(Decoder):
+        def forward(self, decoder_input_ids, encoder_hidden_states, encoder_attention_mask, *past):
+            # Cross-attention keys/values are marked as filled, so
+            # encoder_hidden_states is only read for its shape
+            cache = EncoderDecoderCache([tuple(past[4 * layer:4 * layer + 4]) for layer in range(layers)])
+            output = self.model.decoder(
+                input_ids=decoder_input_ids,
+                encoder_hidden_states=encoder_hidden_states,
+                encoder_attention_mask=encoder_attention_mask,
+                past_key_values=cache,
+                use_cache=True
+            )
+            present = []
+            for layer in range(layers):
+                present += [
+                    cache.self_attention_cache.layers[layer].keys,
+                    cache.self_attention_cache.layers[layer].values
+                ]
+            return (self.logits(output.last_hidden_state[:, -1, :]), *present)
+
+    staging = cache_dir + '.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    input_ids = torch.ones((2, 8), dtype=torch.long)
+    attention_mask = torch.ones((2, 8), dtype=torch.long)
+    decoder_input_ids = torch.zeros((2, 1), dtype=torch.long)
+
+    past_names = []
+    present_names = []
+    cache_axes = {}
+    for layer in range(layers):
+        for part in ('decoder', 'encoder'):
+            for tensor in ('key', 'value'):
+                past_names.append(f'past_key_values.{layer}.{part}.{tensor}')
+                present_names.append(f'present.{layer}.{part}.{tensor}')
+                # (batch, heads, length, head size); cross-attention spans the input
+                cache_axes[past_names[-1]] = {0: 'batch', 2: 'past' if part == 'decoder' else 'sequence'}
+                cache_axes[present_names[-1]] = {0: 'batch', 2: 'present' if part == 'decoder' else 'sequence'}
+    self_present_names = [name for name in present_names if '.decoder.' in name]
+
+    # The exporter restores the wrapper's training flag onto the model,
+    # so the wrappers themselves must be in eval mode
+    encoder = Encoder().eval()
+    decoder = Decoder().eval()
+    decoder_with_past = DecoderWithPast().eval()
+
+    with torch.no_grad():
+        hidden_states = encoder(input_ids, attention_mask)
+        # Two steps of history, so the past length is traced as dynamic
+        _, *present = decoder(decoder_input_ids, hidden_states, attention_mask)
+        _, *self_present = decoder_with_past(decoder_input_ids, hidden_states, attention_mask, *present)
+        past = list(present)
+        past[0::4], past[1::4] = self_present[0::2], self_present[1::2]
+
+        torch.onnx.export(
+            encoder,
+            (input_ids, attention_mask),
+            os.path.join(staging, 'encoder.fp32.onnx'),
+            input_names=['input_ids', 'attention_mask'],
+            output_names=['last_hidden_state'],
+            dynamic_axes={
+                'input_ids': {0: 'batch', 1: 'sequence'},
+                'attention_mask': {0: 'batch', 1: 'sequence'},
+                'last_hidden_state': {0: 'batch', 1: 'sequence'}
+            },
+            opset_version=ONNX_OPSET,
+            dynamo=False
+        )
+
+        decoder_axes = {
+            'decoder_input_ids': {0: 'batch'},
+            'encoder_hidden_states': {0: 'batch', 1: 'sequence'},
+            'encoder_attention_mask': {0: 'batch', 1: 'sequence'},
+            'logits': {0: 'batch'}
+        }
+
+        torch.onnx.export(
+            decoder,
+            (decoder_input_ids, hidden_states, attention_mask),
+            os.path.join(staging, 'decoder.fp32.onnx'),
+            input_names=['decoder_input_ids', 'encoder_hidden_states', 'encoder_attention_mask'],
+            output_names=['logits'] + present_names,
+            dynamic_axes=dict(decoder_axes, **{name: cache_axes[name] for name in present_names}),
+            opset_version=ONNX_OPSET,
+            dynamo=False
+        )
+
+        torch.onnx.export(
+            decoder_with_past,
+            (decoder_input_ids, hidden_states, attention_mask, *past),
+            os.path.join(staging, 'decoder_with_past.fp32.onnx'),
+            input_names=['decoder_input_ids', 'encoder_hidden_states', 'encoder_attention_mask'] + past_names,
+            output_names=['logits'] + self_present_names,
+            dynamic_axes=dict(decoder_axes, **{
+                name: cache_axes[name] for name in past_names + self_present_names
+            }),
+            opset_version=ONNX_OPSET,
+            dynamo=False
+        )
+
+    for name in (ENCODER_FILE, DECODER_FILE, DECODER_WITH_PAST_FILE):
+        source = os.path.join(staging, name.replace('.onnx', '.fp32.onnx'))
+        target = os.path.join(staging, name)
+        if quantize:
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            quantize_dynamic(source, target, weight_type=QuantType.QInt8)
+            os.remove(source)
+        else:
+            os.replace(source, target)
+
+    # Keep the tokenizer with the graphs so inference does not need torch
+    T5Tokenizer.from_pretrained(model_name).save_pretrained(staging)
+
+    manifest = _fingerprint(model_name, quantize)
+    manifest.update({
+        'decoder_start_token_id': config.decoder_start_token_id,
+        'eos_token_id': config.eos_token_id,
+        'pad_token_id': config.pad_token_id
+    })
+    with open(os.path.join(staging, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(staging, cache_dir)
+
+    print("   ✓ ONNX export complete")
+    return cache_dir
+
+
+def ensure_exported(model_name, cache_dir=None, quantize=True):
+    """
+    Return a current ONNX export for the model, exporting if needed
+
+    Args:
+        model_name: Hugging Face model name or local model directory
+        cache_dir: Optional cache directory (see default_cache_dir)
+        quantize: Apply int8 dynamic quantization
+
+    Returns:
+        str: Cache directory
+    """
+    cache_dir = cache_dir or default_cache_dir(model_name)
+    manifest_path = os.path.join(cache_dir, MANIFEST_FILE)
+
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        expected = _fingerprint(model_name, quantize)
+        if all(manifest.get(key) == value for key, value in expected.items()):
+            return cache_dir
+
+    return export_t5_onnx(model_name, cache_dir, quantize)
+
+
+def _log_softmax(logits):
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    return shifted - np.log(np.exp(shifted).sum(axis=-1, keepdims=True))
+
+
+class OnnxT5Generator:
+    def __init__(self, cache_dir, num_threads=0):
+        """
+        Load exported encoder/decoder graphs into ONNX Runtime sessions
+
+        Args:
+            cache_dir: Directory produced by export_t5_onnx
+            num_threads: Intra-op threads per session (0 = runtime default)
+        """
+        import onnxruntime as ort
+
+        with open(os.path.join(cache_dir, MANIFEST_FILE), 'r') as f:
+            manifest = json.load(f)
+
+        self.decoder_start_token_id = manifest['decoder_start_token_id']
+        self.eos_token_id = manifest['eos_token_id']
+        self.pad_token_id = manifest['pad_token_id']
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.inter_op_num_threads = 1
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        providers = ['CPUExecutionProvider']
+        self.encoder = ort.InferenceSession(
+            os.path.join(cache_dir, ENCODER_FILE), options, providers=providers
+        )
+        self.decoder = ort.InferenceSession(
+            os.path.join(cache_dir, DECODER_FILE), options, providers=providers
+        )
+        self.decoder_with_past = ort.InferenceSession(
+            os.path.join(cache_dir, DECODER_WITH_PAST_FILE), options, providers=providers
+        )
+
+        # The initial decoder returns keys/values in the order the
+        # with-past decoder takes them; only self-attention ones grow
+        self.past_names = [
+            graph_input.name for graph_input in self.decoder_with_past.get_inputs()
+            if graph_input.name.startswith('past_key_values.')
+        ]
+        self.self_past_names = [name for name in self.past_names if '.decoder.' in name]
+
+    def generate(self, input_ids, attention_mask, max_length=150, min_length=0,
+                 num_beams=1, length_penalty=1.0):
+        """
+        Generate token ids (greedy or beam search)
+
+        Lengths follow transformers conventions: they count the decoder
+        start token, which is not included in the output.
+
+        Args:
+            input_ids: (batch x sequence) int64 array
+            attention_mask: (batch x sequence) int64 array
+            max_length: Maximum decoder length
+            min_length: Length before which end-of-sequence is suppressed
+            num_beams: Beam width (1 = greedy)
+            length_penalty: Exponent applied to length when ranking beams
+
+        Returns:
+            list: Token id lists, one per input row
+        """
+        input_ids = np.asarray(input_ids, dtype=np.int64)
+        attention_mask = np.asarray(attention_mask, dtype=np.int64)
+
+        hidden_states = self.encoder.run(
+            ['last_hidden_state'],
+            {'input_ids': input_ids, 'attention_mask': attention_mask}
+        )[0]
+
+        if num_beams <= 1:
+            return self._greedy(hidden_states, attention_mask, max_length, min_length)
+        return self._beam_search(
+            hidden_states, attention_mask, max_length, min_length,
+            num_beams, length_penalty
+        )
+
+    def _start(self, hidden_states, attention_mask, min_length):
+        """Run the decoder start token; returns its logits and the key/value cache"""
+        batch = hidden_states.shape[0]
+        logits, *present = self.decoder.run(None, {
+            'decoder_input_ids': np.full((batch, 1), self.decoder_start_token_id, dtype=np.int64),
+            'encoder_hidden_states': hidden_states,
+            'encoder_attention_mask': attention_mask
+        })
+        return self._mask_eos(logits, 1, min_length), dict(zip(self.past_names, present))
+
+    def _step(self, tokens, hidden_states, attention_mask, past, step, min_length):
+        """Feed one token per row; extends past in place and returns the next logits"""
+        feed = dict(past)
+        feed.update({
+            'decoder_input_ids': tokens.reshape(-1, 1),
+            'encoder_hidden_states': hidden_states,
+            'encoder_attention_mask': attention_mask
+        })
+        logits, *present = self.decoder_with_past.run(None, feed)
+        past.update(zip(self.self_past_names, present))
+        return self._mask_eos(logits, step, min_length)
+
+    def _mask_eos(self, logits, step, min_length):
+        if step < min_length:
+            logits[:, self.eos_token_id] = -np.inf
+        return logits
+
+    def _greedy(self, hidden_states, attention_mask, max_length, min_length):
+        batch = hidden_states.shape[0]
+        sequences = np.full((batch, 1), self.decoder_start_token_id, dtype=np.int64)
+        finished = np.zeros(batch, dtype=bool)
+        logits, past = self._start(hidden_states, attention_mask, min_length)
+
+        for step in range(1, max_length):
+            if step > 1:
+                logits = self._step(tokens, hidden_states, attention_mask, past, step, min_length)
+            tokens = logits.argmax(axis=-1)
+            tokens[finished] = self.pad_token_id
+            sequences = np.concatenate([sequences, tokens[:, None]], axis=1)
+            finished |= tokens == self.eos_token_id
+            if finished.all():
+                break
+
+        return [row[1:].tolist() for row in sequences]
+
+    def _beam_search(self, hidden_states, attention_mask, max_length, min_length,
+                     num_beams, length_penalty):
+        batch = hidden_states.shape[0]
+        hidden_states = np.repeat(hidden_states, num_beams, axis=0)
+        attention_mask = np.repeat(attention_mask, num_beams, axis=0)
+
+        sequences = np.full((batch * num_beams, 1), self.decoder_start_token_id, dtype=np.int64)
+        # Only the first beam is live at the start so beams do not duplicate
+        beam_scores = np.full((batch, num_beams), -1e9)
+        beam_scores[:, 0] = 0.0
+
+        hypotheses = [[] for _ in range(batch)]
+        done = np.zeros(batch, dtype=bool)
+        logits, past = self._start(hidden_states, attention_mask, min_length)
+
+        for step in range(1, max_length):
+            if step > 1:
+                logits = self._step(sequences[:, -1], hidden_states, attention_mask, past, step, min_length)
+            log_probs = _log_softmax(logits)
+            vocab = log_probs.shape[1]
+            candidates = (beam_scores.reshape(-1, 1) + log_probs).reshape(batch, -1)
+
+            width = 2 * num_beams
+            top = np.argpartition(-candidates, width - 1, axis=1)[:, :width]
+            order = np.take_along_axis(candidates, top, axis=1).argsort(axis=1)[:, ::-1]
+            top = np.take_along_axis(top, order, axis=1)
+
+            next_tokens = np.full((batch, num_beams), self.pad_token_id, dtype=np.int64)
+            next_sources = np.repeat(np.arange(batch) * num_beams, num_beams).reshape(batch, num_beams)
+            next_scores = np.full((batch, num_beams), -1e9)
+
+            for b in range(batch):
+                if done[b]:
+                    continue
+
+                filled = 0
+                for rank, index in enumerate(top[b]):
+                    beam, token = divmod(int(index), vocab)
+                    score = candidates[b, index]
+                    source = b * num_beams + beam
+
+                    if token == self.eos_token_id:
+                        if rank < num_beams:
+                            hypotheses[b].append(
+                                (score / (step ** length_penalty), sequences[source, 1:].tolist())
+                            )
+                        continue
+
+                    next_tokens[b, filled] = token
+                    next_sources[b, filled] = source
+                    next_scores[b, filled] = score
+                    filled += 1
+                    if filled == num_beams:
+                        break
+
+                hypotheses[b] = sorted(hypotheses[b], key=lambda h: -h[0])[:num_beams]
+                if len(hypotheses[b]) >= num_beams:
+                    done[b] = True
+
+            if done.all():
+                break
+
+            sources = next_sources.ravel()
+            sequences = np.concatenate([sequences[sources], next_tokens.reshape(-1, 1)], axis=1)
+            beam_scores = next_scores
+            # Surviving beams carry their parents' self-attention history;
+            # cross-attention is the same for every beam of an input
+            for name in self.self_past_names:
+                past[name] = past[name][sources]
+
+        results = []
+        length = sequences.shape[1] - 1
+        for b in range(batch):
+            candidates = list(hypotheses[b])
+            if not done[b]:
+                for beam in range(num_beams):
+                    candidates.append((
+                        beam_scores[b, beam] / (length ** length_penalty),
+                        sequences[b * num_beams + beam, 1:].tolist()
+                    ))
+            results.append(max(candidates, key=lambda h: h[0])[1])
+
+        return results
@@ -0,0 +1,152 @@
+"""
+TextRank Module
+Ranks sentences with PageRank over a sparse k-nearest-neighbour similarity graph
+"""
+
+import numpy as np
+from scipy import sparse
+
+
+# Neighbours kept per sentence in the similarity graph
+DEFAULT_NEIGHBOURS = 10
+
+# PageRank parameters
+DEFAULT_DAMPING = 0.85
+DEFAULT_TOLERANCE = 1e-6
+DEFAULT_MAX_ITER = 100
+
+# Upper bound on dense similarity cells materialized at once (float32)
+BLOCK_CELLS = 1_000_000
+
+
+def build_similarity_graph(tfidf_matrix, k=DEFAULT_NEIGHBOURS):
+    """
+    Build a symmetric sparse k-nearest-neighbour cosine similarity graph
+
+    Similarities are computed in row blocks so at most BLOCK_CELLS dense
+    values exist at any time; only the top-k neighbours of each sentence
+    are kept.
+
+    Args:
+        tfidf_matrix: Sparse (n_sentences x n_terms) matrix with L2-normalized rows
+        k: Number of neighbours to keep per sentence
+
+    Returns:
+        scipy.sparse.csr_matrix: Symmetric (n x n) weighted adjacency matrix
+    """
+    matrix = sparse.csr_matrix(tfidf_matrix, dtype=np.float32)
+    n = matrix.shape[0]
+
+    if n < 2 or k < 1:
+        return sparse.csr_matrix((n, n), dtype=np.float32)
+
+    k = min(k, n - 1)
+    block_size = max(1, BLOCK_CELLS // n)
+
+    rows = []
+    cols = []
+    vals = []
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        # Sparse (n x terms) @ dense (terms x block) avoids a sparse n x n product
+        block = np.ascontiguousarray(
+            (matrix @ matrix[start:stop].T.toarray()).T
+        )
+
+        # A sentence is never its own neighbour
+        block[np.arange(stop - start), np.arange(start, stop)] = 0.0
+
+        neighbours = np.argpartition(block, -k, axis=1)[:, -k:]
+        weights = np.take_along_axis(block, neighbours, axis=1)
+
+        keep = weights > 0
+        rows.append(np.repeat(np.arange(start, stop), k)[keep.ravel()])
+        cols.append(neighbours[keep])
+        vals.append(weights[keep])
+
+    graph = sparse.csr_matrix(
+        (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+        shape=(n, n),
+        dtype=np.float32
+    )
+
+    # Undirected graph: keep an edge if either endpoint selected it
+    return graph.maximum(graph.T).tocsr()
+
+
+def pagerank(graph, damping=DEFAULT_DAMPING, tol=DEFAULT_TOLERANCE,
+             max_iter=DEFAULT_MAX_ITER):
+    """
+    Score graph nodes with damped power iteration
+
+    Args:
+        graph: Sparse (n x n) weighted adjacency matrix
+        damping: Damping factor
+        tol: L1 convergence tolerance between iterations
+        max_iter: Maximum number of iterations
+
+    Returns:
+        numpy.ndarray: Scores summing to 1
+    """
+    n = graph.shape[0]
+    if n == 0:
+        return np.zeros(0)
+
+    graph = sparse.csr_matrix(graph, dtype=np.float64)
+    out_weight = np.asarray(graph.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+
+    inv_out = np.zeros(n)
+    inv_out[~dangling] = 1.0 / out_weight[~dangling]
+
+    # Column-oriented transition matrix: scores flow along outgoing edges
+    transition = (sparse.diags(inv_out) @ graph).T.tocsr()
+
+    scores = np.full(n, 1.0 / n)
+    teleport = (1.0 - damping) / n
+
+    for _ in range(max_iter):
+        dangling_mass = scores[dangling].sum() / n
+        updated = teleport + damping * (transition @ scores + dangling_mass)
+        delta = np.abs(updated - scores).sum()
+        scores = updated
+        if delta < tol:
+            break
+
+    return scores / scores.sum()
+
+
+def rank_sentences(tfidf_matrix, k=DEFAULT_NEIGHBOURS, damping=DEFAULT_DAMPING,
+                   tol=DEFAULT_TOLERANCE, max_iter=DEFAULT_MAX_ITER):
+    """
+    Compute TextRank scores for sentences
+
+    Args:
+        tfidf_matrix: Sparse (n_sentences x n_terms) TF-IDF matrix
+        k: Number of neighbours to keep per sentence
+        damping: PageRank damping factor
+        tol: PageRank convergence tolerance
+        max_iter: Maximum PageRank iterations
+
+    Returns:
+        numpy.ndarray: Score per sentence
+    """
+    graph = build_similarity_graph(tfidf_matrix, k)
+    return pagerank(graph, damping, tol, max_iter)
+
+
+def top_sentence_indices(scores, count):
+    """
+    Pick the highest scoring sentences, returned in document order
+
+    Args:
+        scores: Score per sentence
+        count: Number of sentences to select
+
+    Returns:
+        list: Sorted sentence indices
+    """
+    # Stable sort so ties favour earlier sentences
+    ranked = np.argsort(-np.asarray(scores), kind='stable')
+    return sorted(int(i) for i in ranked[:count])
@@ -4,8 +4,26 @@ Collects and manages transcript segments with timestamps
 """
 
 import os
+import json
 from datetime import datetime, timedelta
 
+from segmenter import (
+    segment_transcript, segment_transcript_timed, DEFAULT_PAUSE_SECONDS, DEFAULT_MAX_WORDS
+)
+
+
+def segments_file_for(transcript_file):
+    """
+    Path of the structured segments JSON stored next to a transcript
+    
+    Args:
+        transcript_file: Path to '<session>.txt'
+        
+    Returns:
+        str: Path to '<session>_segments.json'
+    """
+    return os.path.splitext(transcript_file)[0] + '_segments.json'
+
 
 class TranscriptAggregator:
     def __init__(self, session_folder, session_name):
@@ -105,6 +123,18 @@ class TranscriptAggregator:
         
         return self.transcript_file
     
+    def save_segments(self):
+        """
+        Save structured segments (timestamps, text, word timings) next to the transcript
+        
+        Returns:
+            str: Path to saved segments file
+        """
+        segments_file = segments_file_for(self.transcript_file)
+        with open(segments_file, 'w', encoding='utf-8') as f:
+            json.dump(self.segments, f)
+        return segments_file
+    
     def _write_transcript(self, filepath):
         """
         Write transcript to file
@@ -140,6 +170,34 @@ class TranscriptAggregator:
         """
         return ' '.join(segment['text'] for segment in self.segments)
     
+    def get_sentences(self, pause_seconds=DEFAULT_PAUSE_SECONDS,
+                      max_words=DEFAULT_MAX_WORDS):
+        """
+        Get transcript split into pause-based pseudo-sentences
+        
+        Args:
+            pause_seconds: Gap between words that starts a new sentence
+            max_words: Maximum words per sentence
+            
+        Returns:
+            list: Pseudo-sentences
+        """
+        return segment_transcript(self.segments, pause_seconds, max_words)
+    
+    def get_timed_sentences(self, pause_seconds=DEFAULT_PAUSE_SECONDS,
+                            max_words=DEFAULT_MAX_WORDS):
+        """
+        Get pseudo-sentences with their audio offsets (for chapters)
+        
+        Args:
+            pause_seconds: Gap between words that starts a new sentence
+            max_words: Maximum words per sentence
+            
+        Returns:
+            list: [{'text': str, 'start': float or None}]
+        """
+        return segment_transcript_timed(self.segments, pause_seconds, max_words)
+    
     def get_timestamped_transcript(self):
         """
         Get transcript with timestamps
@@ -0,0 +1,88 @@
+"""
+Benchmark: related-meetings lookup at library scale
+Builds one user's index of synthetic recordings, then compares the
+inverted-index top-k search with brute-force cosine over every document
+
+Usage:
+    python tests/bench_related.py [recording counts...]
+"""
+import os
+import sys
+import time
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+import numpy as np
+
+from related_index import _UserIndex, document_vector
+
+
+TOPICS = [
+    ["budget", "forecast", "finance", "spending", "quarter", "revenue", "costs"],
+    ["hiring", "candidate", "interview", "offer", "recruiter", "onboarding", "salary"],
+    ["release", "deploy", "server", "rollback", "incident", "monitoring", "latency"],
+    ["lecture", "students", "exam", "grading", "syllabus", "assignment", "campus"],
+    ["customer", "support", "ticket", "churn", "feedback", "renewal", "contract"],
+    ["design", "prototype", "mockup", "usability", "research", "persona", "layout"],
+]
+FILLER = ["team", "update", "plan", "week", "discuss", "agree", "next", "review", "item", "follow"]
+
+
+def make_meeting(rng, sentences=60):
+    """Synthetic meeting mostly about one or two topics"""
+    topics = rng.sample(range(len(TOPICS)), 2)
+    vocabulary = TOPICS[topics[0]] * 3 + TOPICS[topics[1]] + FILLER
+    # Rare per-meeting words make vocabularies realistic in size
+    vocabulary += [f"name{rng.randint(0, 20000)}" for _ in range(10)]
+    return [" ".join(rng.choice(vocabulary) for _ in range(12)) for _ in range(sentences)]
+
+
+def brute_force(index, recording_id, k):
+    """Dense cosine against every document"""
+    built = index._build() if index._built is None else index._built
+    matrix = built['matrix'].tocsr().multiply(built['idf']).tocsr()
+    row = built['rows'][recording_id]
+    scores = (matrix @ matrix[row].T).toarray().ravel() / (built['norms'] * built['norms'][row])
+    scores[row] = 0
+    return list(np.argsort(-scores)[:k])
+
+
+def main():
+    counts = [int(c) for c in sys.argv[1:]] or [1000, 10000]
+    rng = random.Random(0)
+
+    print(f"{'recordings':>10} | {'vectorize ms/doc':>16} | {'build s':>7} | "
+          f"{'topk p50 ms':>11} {'p95 ms':>7} | {'brute p50 ms':>12} | {'overlap':>7}")
+    print("-" * 90)
+
+    for count in counts:
+        index = _UserIndex()
+        start = time.perf_counter()
+        for recording_id in range(count):
+            index.set(recording_id, *document_vector(make_meeting(rng)))
+        vectorize_ms = (time.perf_counter() - start) * 1000 / count
+
+        start = time.perf_counter()
+        index._build()
+        build_seconds = time.perf_counter() - start
+
+        queries = rng.sample(range(count), 50)
+        fast, slow, overlap = [], [], []
+        for recording_id in queries:
+            start = time.perf_counter()
+            top = [i for i, _ in index.related(recording_id, 10)]
+            fast.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            exact = brute_force(index, recording_id, 10)
+            slow.append((time.perf_counter() - start) * 1000)
+            overlap.append(len(set(top) & {int(index._built['ids'][i]) for i in exact}) / 10)
+
+        print(f"{count:>10} | {vectorize_ms:>16.2f} | {build_seconds:>7.2f} | "
+              f"{np.percentile(fast, 50):>11.2f} {np.percentile(fast, 95):>7.2f} | "
+              f"{np.percentile(slow, 50):>12.2f} | {np.mean(overlap):>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: PyTorch T5 vs int8 ONNX Runtime T5 summarization
+Reports latency per summary and unigram overlap (F1) between the two outputs
+
+Usage:
+    python tests/bench_t5_onnx.py [--model DIR_OR_NAME] [--sentences N]
+                                  [--runs N] [--threads N] [--beams N]
+
+Without --model a tiny randomly initialized T5 is built in a temp folder,
+which exercises the pipeline but says little about summary quality.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import warnings
+from collections import Counter
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+sys.path.append(os.path.dirname(__file__))
+
+import summarizer_backends
+from tiny_t5 import build_tiny_t5, make_sentences
+
+
+def overlap_f1(a, b):
+    """Unigram F1 between two summaries"""
+    a_counts = Counter(a.lower().split())
+    b_counts = Counter(b.lower().split())
+    common = sum((a_counts & b_counts).values())
+    if not common:
+        return 0.0
+    precision = common / sum(a_counts.values())
+    recall = common / sum(b_counts.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def time_backend(backend, sentences, runs):
+    backend.summarize(sentences, 5)  # warm-up
+    start = time.perf_counter()
+    for _ in range(runs):
+        summary = backend.summarize(sentences, 5)
+    return (time.perf_counter() - start) / runs, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', help='T5 model name or local directory')
+    parser.add_argument('--sentences', type=int, default=60)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--threads', type=int, default=0)
+    parser.add_argument('--beams', type=int, default=4)
+    args = parser.parse_args()
+
+    warnings.filterwarnings('ignore')
+    workdir = tempfile.mkdtemp(prefix='bench_t5_')
+    model = args.model or build_tiny_t5(os.path.join(workdir, 'tiny_t5'))
+
+    summarizer_backends.configure({
+        't5_model': model,
+        't5_num_beams': args.beams,
+        't5_onnx_threads': args.threads,
+        't5_onnx_dir': os.path.join(workdir, 'onnx'),
+        't5_max_seconds': 3600
+    })
+
+    sentences = make_sentences(args.sentences)
+
+    torch_backend = summarizer_backends.T5Backend(model)
+    onnx_backend = summarizer_backends.OnnxT5Backend(model)
+
+    torch_time, torch_summary = time_backend(torch_backend, sentences, args.runs)
+    onnx_time, onnx_summary = time_backend(onnx_backend, sentences, args.runs)
+
+    print()
+    print(f"model: {model}")
+    print(f"sentences: {args.sentences}, beams: {args.beams}, runs: {args.runs}")
+    print(f"{'backend':>12} | {'seconds':>8}")
+    print("-" * 25)
+    print(f"{'pytorch':>12} | {torch_time:>8.3f}")
+    print(f"{'onnx int8':>12} | {onnx_time:>8.3f}")
+    print(f"speedup: {torch_time / onnx_time:.2f}x")
+    print(f"summary overlap (unigram F1): {overlap_f1(torch_summary, onnx_summary):.2f}")
+
+
+if __name__ == "__main__":
+    main()
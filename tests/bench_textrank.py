@@ -0,0 +1,74 @@
+"""
+Benchmark: dense similarity-sum ranking vs sparse k-NN TextRank
+Reports wall time and peak traced memory per sentence count
+
+Usage:
+    python tests/bench_textrank.py [sentence counts...]
+"""
+import os
+import sys
+import time
+import random
+import tracemalloc
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from textrank import rank_sentences
+
+
+VOCABULARY = [
+    "budget", "network", "campus", "lecture", "students", "exam", "project",
+    "deadline", "server", "database", "meeting", "schedule", "report", "design",
+    "review", "testing", "deploy", "audio", "transcript", "summary", "model",
+    "research", "grant", "hiring", "contract", "vendor", "security", "policy",
+    "training", "feedback", "roadmap", "release", "customer", "support", "sales",
+]
+
+
+def make_sentences(count, seed=0):
+    """Generate synthetic sentences drawn from a small topical vocabulary"""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(8, 20)))
+        for _ in range(count)
+    ]
+
+
+def dense_rank(tfidf_matrix):
+    """Previous implementation: row sums of the full cosine matrix"""
+    similarity_matrix = cosine_similarity(tfidf_matrix, tfidf_matrix)
+    return similarity_matrix.sum(axis=1)
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024)
+
+
+def main():
+    counts = [int(c) for c in sys.argv[1:]] or [500, 1000, 2000, 5000, 10000]
+
+    print(f"{'sentences':>10} | {'dense s':>8} {'dense MB':>9} | {'sparse s':>8} {'sparse MB':>9}")
+    print("-" * 56)
+
+    for count in counts:
+        sentences = make_sentences(count)
+        tfidf_matrix = TfidfVectorizer(max_features=1000).fit_transform(sentences)
+
+        dense_time, dense_mem = measure(dense_rank, tfidf_matrix)
+        sparse_time, sparse_mem = measure(rank_sentences, tfidf_matrix)
+
+        print(f"{count:>10} | {dense_time:>8.3f} {dense_mem:>9.1f} | {sparse_time:>8.3f} {sparse_mem:>9.1f}")
+
+
+if __name__ == "__main__":
+    np.random.seed(0)
+    main()
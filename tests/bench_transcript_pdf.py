@@ -0,0 +1,131 @@
+"""
+Benchmark: transcript PDF rendering, platypus flowables vs direct canvas
+Reports seconds, pages/sec and peak Python memory (tracemalloc, separate run)
+
+Usage:
+    python tests/bench_transcript_pdf.py [--hours H] [--segment-seconds S]
+
+The "platypus" column reproduces the previous layout (a heading Paragraph,
+a text Paragraph and a Spacer per segment); "canvas" is
+PDFGenerator.create_transcript_pdf reading the structured segments JSON.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+from PyPDF2 import PdfReader
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+from pdf_generator import PDFGenerator, format_offset
+from transcript_aggregator import segments_file_for
+
+WORDS = (
+    "we need to review the budget for next quarter and the dashboard team "
+    "will present the new design while hiring continues for two roles"
+).split()
+
+
+def make_transcript(folder, hours, segment_seconds):
+    """Write '<session>.txt' and its segments JSON, return the transcript path"""
+    rng = random.Random(0)
+    segments = []
+    for i in range(int(hours * 3600 / segment_seconds)):
+        text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(15, 45)))
+        segments.append({
+            'timestamp': format_offset(i * segment_seconds),
+            'elapsed_seconds': i * segment_seconds,
+            'text': text
+        })
+
+    transcript_file = os.path.join(folder, 'session_bench.txt')
+    with open(transcript_file, 'w', encoding='utf-8') as f:
+        f.write("Transcript: session_bench\n" + "=" * 60 + "\n\n")
+        for segment in segments:
+            f.write(f"[{segment['timestamp']}] {segment['text']}\n")
+        f.write("\n" + "=" * 60 + "\n")
+    with open(segments_file_for(transcript_file), 'w', encoding='utf-8') as f:
+        json.dump(segments, f)
+    return transcript_file
+
+
+def platypus_transcript_pdf(transcript_file, session_name, pdf_path):
+    """Previous layout: one heading + paragraph + spacer per segment"""
+    with open(transcript_file, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+
+    doc = SimpleDocTemplate(pdf_path, pagesize=letter, rightMargin=72,
+                            leftMargin=72, topMargin=72, bottomMargin=18)
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=24,
+                                 textColor='#1a1a1a', spaceAfter=30, alignment=TA_CENTER)
+    heading_style = ParagraphStyle('CustomHeading', parent=styles['Heading2'], fontSize=16,
+                                   textColor='#333333', spaceAfter=12, spaceBefore=12)
+    normal_style = ParagraphStyle('CustomNormal', parent=styles['Normal'], fontSize=11,
+                                  textColor='#000000', spaceAfter=12, leading=16)
+
+    story = [Paragraph("Meeting Transcript", title_style), Spacer(1, 0.2 * inch),
+             Paragraph(f"<b>Session:</b> {session_name}", normal_style), Spacer(1, 0.3 * inch)]
+    for line in lines:
+        line = line.strip()
+        if line.startswith('[') and ']' in line:
+            timestamp, text = line.split(']', 1)
+            story.append(Paragraph(f"<b>{timestamp}]</b>", heading_style))
+            story.append(Paragraph(text.strip(), normal_style))
+            story.append(Spacer(1, 0.1 * inch))
+    doc.build(story)
+    return pdf_path
+
+
+def measure(render):
+    """Time one render, then repeat it under tracemalloc for peak memory"""
+    start = time.perf_counter()
+    pdf_path = render()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pages = len(PdfReader(pdf_path).pages)
+    return seconds, pages, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--hours', type=float, default=3.0)
+    parser.add_argument('--segment-seconds', type=float, default=8.0)
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp(prefix='bench_pdf_')
+    transcript_file = make_transcript(folder, args.hours, args.segment_seconds)
+
+    generator = PDFGenerator()
+    results = {
+        'platypus': measure(lambda: platypus_transcript_pdf(
+            transcript_file, 'session_bench', os.path.join(folder, 'platypus.pdf'))),
+        'canvas': measure(lambda: generator.create_transcript_pdf(
+            transcript_file, 'session_bench', pdf_path=os.path.join(folder, 'canvas.pdf'))),
+    }
+
+    print()
+    print(f"{args.hours:g} h transcript, one segment every {args.segment_seconds:g} s")
+    print(f"{'renderer':>10} | {'seconds':>8} | {'pages':>6} | {'pages/s':>8} | {'peak MB':>8}")
+    print("-" * 52)
+    for name, (seconds, pages, peak) in results.items():
+        print(f"{name:>10} | {seconds:>8.2f} | {pages:>6} | {pages / seconds:>8.1f} | {peak:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Tests for the content-addressed artifact cache
+"""
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+import pytest
+
+from artifact_cache import ArtifactCache, hash_file
+
+
+def _write(path, content):
+    with open(path, 'w') as f:
+        f.write(content)
+    return str(path)
+
+
+def test_put_then_get_returns_artifacts(tmp_path):
+    cache = ArtifactCache(str(tmp_path / 'cache'), 10_000)
+    source = _write(tmp_path / 'a.txt', 'transcript body')
+
+    key = cache.make_key(hash_file(source), {'mode': 'textrank'})
+    cache.put(key, {'transcript': source})
+
+    hit = cache.get(key)
+    assert open(hit['transcript']).read() == 'transcript body'
+
+
+def test_key_depends_on_config(tmp_path):
+    cache = ArtifactCache(str(tmp_path), 10_000)
+
+    assert cache.make_key('abc', {'mode': 'textrank'}) != cache.make_key('abc', {'mode': 't5_small'})
+    assert cache.make_key('abc', {'a': 1, 'b': 2}) == cache.make_key('abc', {'b': 2, 'a': 1})
+
+
+def test_cached_copy_is_independent_of_source(tmp_path):
+    cache = ArtifactCache(str(tmp_path / 'cache'), 10_000)
+    source = _write(tmp_path / 'a.txt', 'original')
+
+    cache.put('k' * 64, {'transcript': source})
+    _write(tmp_path / 'a.txt', 'overwritten')
+
+    assert open(cache.get('k' * 64)['transcript']).read() == 'original'
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ArtifactCache(str(tmp_path / 'cache'), 2500)
+    source = _write(tmp_path / 'a.txt', 'x' * 1000)
+
+    for key in ('a' * 64, 'b' * 64):
+        cache.put(key, {'transcript': source})
+        time.sleep(0.01)
+
+    # Touch the older entry so the other one becomes least recently used
+    time.sleep(0.01)
+    assert cache.get('a' * 64)
+    cache.put('c' * 64, {'transcript': source})
+
+    assert cache.get('a' * 64)
+    assert cache.get('b' * 64) is None
+    assert cache.get('c' * 64)
+
+
+def test_duplicate_upload_reuses_artifacts(tmp_path, monkeypatch):
+    pytest.importorskip('flask_sqlalchemy')
+    pytest.importorskip('vosk')
+    from flask import Flask
+    from database import db, User
+    import file_upload_service as fus
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'test.db'}"
+    db.init_app(app)
+
+    config = {
+        'model_path': str(tmp_path / 'no-model'),
+        'summarizer': 'textrank',
+        'extractive_sentences': 2,
+        'artifact_cache_dir': str(tmp_path / 'cache')
+    }
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(username='u', email='u@x', password_hash='x'))
+        db.session.commit()
+
+        service = fus.FileUploadService(str(tmp_path / 'uploads'), config)
+
+        def session_folder(session_id, user_id):
+            folder = tmp_path / session_id
+            folder.mkdir(exist_ok=True)
+            return str(folder)
+
+        monkeypatch.setattr(service, '_get_session_folder', session_folder)
+
+        body = ' '.join(f"Sentence {i} covers the quarterly budget review." for i in range(12))
+        upload = _write(tmp_path / 'notes.txt', body)
+
+        first = service.process_uploaded_file(upload, 'txt', 'notes.txt', 1, 'first')
+
+        calls = []
+        monkeypatch.setattr(service.summarizer, 'generate_summary', lambda *a: calls.append(a))
+        # Distinct session id for the second upload
+        time.sleep(1.1)
+        second = service.process_uploaded_file(upload, 'txt', 'notes.txt', 1, 'second')
+
+        assert calls == []
+        assert second['recording_id'] != first['recording_id']
+        assert second['summary_text'] == first['summary_text']
+        assert second['transcript_text'] == first['transcript_text']
+        # Reused files name the new session, not the one they were cached from
+        for kind, label in (('transcript_file', 'Transcript'), ('summary_file', 'Summary')):
+            with open(second[kind]) as f:
+                assert f.readline() == f"{label}: {second['session_id']}\n"
+            with open(first[kind]) as f:
+                assert f.readline() == f"{label}: {first['session_id']}\n"
@@ -0,0 +1,113 @@
+"""
+Tests for TextTiling chapter detection
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import random
+
+import numpy as np
+
+from chapters import depth_scores, find_boundaries, gap_similarities
+from segmenter import segment_transcript, segment_transcript_timed
+from summarizer import Summarizer, chapters_file_for, load_chapters
+
+
+TOPICS = [
+    ["budget", "travel", "costs", "quarter", "finance", "spending", "forecast"],
+    ["dashboard", "design", "colors", "layout", "frontend", "react", "charts"],
+    ["hiring", "interview", "candidates", "recruiter", "offer", "salary", "onboarding"],
+]
+FILLER = ["we", "think", "the", "really", "maybe", "about", "some", "more"]
+
+
+def make_meeting(per_topic=40, seed=0):
+    rng = random.Random(seed)
+    sentences = []
+    for topic in TOPICS:
+        for _ in range(per_topic):
+            words = rng.sample(topic, 3) + rng.sample(FILLER, 3)
+            rng.shuffle(words)
+            sentences.append({
+                'text': ' '.join(words).capitalize() + '.',
+                'start': 5.0 * len(sentences)
+            })
+    return sentences
+
+
+def test_depth_only_at_valleys():
+    similarities = np.array([0.9, 0.5, 0.2, 0.6, 0.8, 0.7, 0.75])
+    depths = depth_scores(similarities)
+    assert depths[2] == (0.9 - 0.2) + (0.8 - 0.2)
+    assert depths[5] == (0.8 - 0.7) + (0.75 - 0.7)
+    assert depths[[0, 1, 3, 4, 6]].tolist() == [0, 0, 0, 0, 0]
+
+
+def test_gap_similarities_match_explicit_windows():
+    from summarizer_backends import TextRankBackend
+
+    sentences = [s['text'] for s in make_meeting(per_topic=8)]
+    matrix, _ = TextRankBackend().vectorize(sentences)
+    window = 3
+
+    dense = matrix.toarray()
+    expected = []
+    for gap in range(1, len(sentences)):
+        left = dense[max(0, gap - window):gap].sum(axis=0)
+        right = dense[gap:gap + window].sum(axis=0)
+        expected.append(left @ right / (np.linalg.norm(left) * np.linalg.norm(right)))
+
+    assert np.allclose(gap_similarities(matrix, window), expected)
+
+
+def test_short_transcript_is_one_chapter():
+    assert find_boundaries(np.random.rand(10), min_sentences=20) == []
+
+
+def test_topic_shifts_become_chapters():
+    summarizer = Summarizer()
+    for seed in range(3):
+        meeting = make_meeting(seed=seed)
+        chapters = summarizer.generate_chapters(meeting, duration=600.0)
+
+        assert [c['start_sentence'] for c in chapters] == [0, 40, 80]
+        assert [c['start_seconds'] for c in chapters] == [0.0, 200.0, 400.0]
+        assert [c['end_seconds'] for c in chapters] == [200.0, 400.0, 600.0]
+        for chapter, topic in zip(chapters, TOPICS):
+            assert set(chapter['keywords']) <= set(topic)
+            assert len(chapter['summary'].split('. ')) == 2
+
+
+def test_timed_sentences_match_plain_segmentation():
+    segments = [
+        {'text': 'hello team lets start', 'words': [
+            {'word': 'hello', 'start': 0.0, 'end': 0.3},
+            {'word': 'team', 'start': 0.35, 'end': 0.6},
+            {'word': 'lets', 'start': 1.5, 'end': 1.7},
+            {'word': 'start', 'start': 1.75, 'end': 2.0},
+        ]},
+        {'text': 'no word timings here', 'elapsed_seconds': 4.0},
+    ]
+    timed = segment_transcript_timed(segments, 0.5)
+    assert [s['text'] for s in timed] == segment_transcript(segments, 0.5)
+    assert [s['start'] for s in timed] == [0.0, 1.5, 4.0]
+
+
+def test_chaptered_summary_pdf(tmp_path):
+    from pdf_generator import PDFGenerator
+
+    summarizer = Summarizer()
+    meeting = make_meeting()
+    summary_file = summarizer.save_summary("Overall summary.", str(tmp_path), 'session_x')
+    chapters_file = summarizer.save_chapters(
+        summarizer.generate_chapters(meeting), str(tmp_path), 'session_x'
+    )
+    assert chapters_file == chapters_file_for(summary_file)
+    assert len(load_chapters(summary_file)) == 3
+
+    generator = PDFGenerator()
+    generator.output_dir = str(tmp_path)
+    pdf_path = generator.create_summary_pdf(summary_file, 'session_x')
+    assert os.path.getsize(pdf_path) > 0
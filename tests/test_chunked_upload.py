@@ -0,0 +1,140 @@
+"""
+Tests for chunked, resumable uploads
+"""
+import io
+import os
+import sys
+import wave
+import hashlib
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import pytest
+
+import chunked_upload
+from chunked_upload import ChunkedUploadStore, UploadError, parse_wav_header, part_file_lock
+
+
+class DroppingStream(io.BytesIO):
+    """Request body whose connection drops after limit bytes"""
+
+    def __init__(self, data, limit):
+        super().__init__(data)
+        self.limit = limit
+
+    def read(self, size=-1):
+        if self.tell() >= self.limit:
+            raise IOError("client disconnected")
+        return super().read(min(size, self.limit - self.tell()))
+
+
+def _wav_bytes(frames, rate=16000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(frames)
+    return buffer.getvalue()
+
+
+def test_resume_after_dropped_chunk(tmp_path):
+    store = ChunkedUploadStore(str(tmp_path / 'partial'), 10 * 1024 * 1024)
+    payload = os.urandom(300 * 1024)
+    upload = store.create(1, 'talk.mp3', 'audio', 'Talk', len(payload))
+
+    with pytest.raises(IOError):
+        store.append(upload['upload_id'], 1, 0, DroppingStream(payload, 100 * 1024))
+
+    # Bytes before the drop are kept; the client resumes from the reported offset
+    offset = store.status(upload['upload_id'], 1)['offset']
+    assert offset == 100 * 1024
+
+    with pytest.raises(UploadError) as error:
+        store.append(upload['upload_id'], 1, 0, io.BytesIO(payload))
+    assert (error.value.status, error.value.offset) == (409, offset)
+
+    assert store.append(upload['upload_id'], 1, offset, io.BytesIO(payload[offset:])) == len(payload)
+
+    done = store.finalize(upload['upload_id'], 1, str(tmp_path / 'user_1'),
+                          hashlib.sha256(payload).hexdigest())
+    assert done['file_hash'] == hashlib.sha256(payload).hexdigest()
+    with open(done['file_path'], 'rb') as f:
+        assert f.read() == payload
+    assert os.listdir(tmp_path / 'partial') == []
+
+
+def test_limits_and_ownership(tmp_path):
+    store = ChunkedUploadStore(str(tmp_path / 'partial'), 1024)
+
+    with pytest.raises(UploadError) as error:
+        store.create(1, 'big.wav', 'audio', size=4096)
+    assert error.value.status == 413
+
+    upload = store.create(1, 'notes.txt', 'txt', size=10)
+    with pytest.raises(UploadError) as error:
+        store.append(upload['upload_id'], 1, 0, io.BytesIO(b'x' * 11))
+    assert error.value.status == 413
+
+    with pytest.raises(UploadError) as error:
+        store.status(upload['upload_id'], 2)
+    assert error.value.status == 404
+
+    with pytest.raises(UploadError) as error:
+        store.finalize(upload['upload_id'], 1, str(tmp_path / 'user_1'))
+    assert error.value.status == 409
+
+
+@pytest.mark.skipif(chunked_upload.fcntl is None, reason="needs fcntl")
+def test_chunk_in_another_worker_is_rejected(tmp_path):
+    payload = b'x' * 4096
+    store = ChunkedUploadStore(str(tmp_path / 'partial'), 1024 * 1024)
+    # Another server process with its own view of the same directory
+    other = ChunkedUploadStore(str(tmp_path / 'partial'), 1024 * 1024)
+    upload = store.create(1, 'notes.txt', 'txt', size=len(payload))
+    part_file = os.path.join(str(tmp_path / 'partial'), upload['upload_id'] + '.part')
+
+    with part_file_lock(part_file):
+        with pytest.raises(UploadError) as error:
+            other.append(upload['upload_id'], 1, 0, io.BytesIO(payload))
+    assert (error.value.status, error.value.offset) == (409, 0)
+
+    assert other.append(upload['upload_id'], 1, 0, io.BytesIO(payload)) == len(payload)
+    assert store.status(upload['upload_id'], 1)['offset'] == len(payload)
+
+
+def test_hash_survives_restart(tmp_path):
+    payload = b'meeting notes ' * 1000
+    store = ChunkedUploadStore(str(tmp_path / 'partial'), 1024 * 1024)
+    upload = store.create(1, 'notes.txt', 'txt')
+    store.append(upload['upload_id'], 1, 0, io.BytesIO(payload[:5000]))
+
+    restarted = ChunkedUploadStore(str(tmp_path / 'partial'), 1024 * 1024)
+    restarted.append(upload['upload_id'], 1, 5000, io.BytesIO(payload[5000:]))
+    done = restarted.finalize(upload['upload_id'], 1, str(tmp_path / 'user_1'))
+
+    assert done['file_hash'] == hashlib.sha256(payload).hexdigest()
+
+
+def test_early_transcription_sees_all_pcm(tmp_path):
+    frames = os.urandom(16000 * 2 * 3)
+    data = _wav_bytes(frames)
+    header = parse_wav_header(data[:64])
+    assert (header['channels'], header['sample_rate'], header['data_size']) == (1, 16000, len(frames))
+
+    received = []
+
+    def transcribe_pcm(chunks, sample_rate):
+        for chunk in chunks:
+            received.append(chunk)
+        return {'full_text': f'{sample_rate}', 'segments': []}
+
+    store = ChunkedUploadStore(str(tmp_path / 'partial'), 1024 * 1024)
+    upload = store.create(1, 'talk.wav', 'audio', size=len(data), transcribe_pcm=transcribe_pcm)
+    offset = 0
+    for start in range(0, len(data), 7001):
+        offset = store.append(upload['upload_id'], 1, offset, io.BytesIO(data[start:start + 7001]))
+
+    done = store.finalize(upload['upload_id'], 1, str(tmp_path / 'user_1'))
+
+    assert done['transcription'] == {'full_text': '16000', 'segments': []}
+    assert b''.join(received) == frames
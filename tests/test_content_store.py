@@ -0,0 +1,80 @@
+"""
+Tests for the compressed content store and recording hashes
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from flask import Flask
+
+from database import db, User, Recording
+from content_store import ContentStore
+
+
+def _write(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return str(path)
+
+
+def test_put_file_deduplicates_and_round_trips(tmp_path):
+    store = ContentStore(str(tmp_path / 'store'))
+    text = "Transcript: s\n" + "the budget was approved. " * 2000 + "\nnon-ascii: café\n"
+    first = store.put_file(_write(tmp_path / 'a.txt', text))
+    second = store.put_file(_write(tmp_path / 'b.txt', text))
+
+    assert first == second and len(first) == 64
+    assert store.read_text(first) == text
+    assert os.path.getsize(store.path(first)) < len(text.encode('utf-8')) / 10
+    assert store.read_text('0' * 64) is None
+    assert not [name for name in os.listdir(store.store_dir) if name.endswith('.tmp')]
+
+
+def test_read_text_translates_newlines_like_open(tmp_path):
+    store = ContentStore(str(tmp_path / 'store'))
+    source = tmp_path / 'crlf.txt'
+    source.write_bytes(b"line one\r\nline two\r\n")
+    with open(source, 'r', encoding='utf-8') as f:
+        expected = f.read()
+
+    assert store.read_text(store.put_file(str(source))) == expected
+
+
+def test_store_and_release_recording(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'c.db'}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    store = ContentStore(str(tmp_path / 'store'))
+
+    with app.app_context():
+        db.create_all()
+        user = User(username='u', email='u@x', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+
+        transcript = _write(tmp_path / 't.txt', "shared transcript")
+        summary = _write(tmp_path / 's.txt', "summary")
+        first = Recording(user_id=user.id, session_id='a', title='a', status='completed',
+                          transcript_file_path=transcript, summary_file_path=summary)
+        second = Recording(user_id=user.id, session_id='b', title='b', status='completed',
+                           transcript_file_path=transcript)
+        db.session.add_all([first, second])
+        db.session.commit()
+
+        assert store.store_recording(first) and store.store_recording(second)
+        assert not store.store_recording(first)
+        assert first.transcript_hash == second.transcript_hash
+        assert second.summary_hash is None
+
+        # The transcript blob is still used by the second recording
+        db.session.delete(first)
+        db.session.commit()
+        store.release_recording(first)
+        assert store.has(second.transcript_hash)
+        assert not store.has(first.summary_hash)
+
+        db.session.delete(second)
+        db.session.commit()
+        store.release_recording(second)
+        assert not store.has(second.transcript_hash)
@@ -0,0 +1,111 @@
+"""
+Tests for the SQLite production profile and startup migration
+"""
+import os
+import sys
+import sqlite3
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from flask import Flask
+from sqlalchemy import inspect, text
+
+from database import (
+    db, User, Recording,
+    sqlite_engine_options, sqlite_pragmas, apply_sqlite_pragmas, migrate_db,
+)
+
+
+def _create_app(db_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = sqlite_engine_options(4, 2)
+    db.init_app(app)
+    with app.app_context():
+        apply_sqlite_pragmas(db.engine, sqlite_pragmas({'db_cache_mb': 8, 'db_mmap_mb': 16}))
+    return app
+
+
+def test_pragmas_applied_on_connect(tmp_path):
+    app = _create_app(tmp_path / 'a.db')
+    with app.app_context():
+        db.create_all()
+        with db.engine.connect() as connection:
+            pragma = lambda name: connection.execute(text(f"PRAGMA {name}")).scalar()
+            assert pragma('journal_mode') == 'wal'
+            assert pragma('synchronous') == 1  # NORMAL
+            assert pragma('cache_size') == -8 * 1024
+            assert pragma('mmap_size') == 16 * 1024 * 1024
+        assert db.engine.pool.size() == 4
+
+
+def test_migration_adds_index_to_existing_database(tmp_path):
+    db_path = tmp_path / 'old.db'
+
+    # A database created before the composite index was declared
+    app = _create_app(db_path)
+    with app.app_context():
+        db.create_all()
+        db.engine.dispose()
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("DROP INDEX ix_recordings_user_created")
+
+    with app.app_context():
+        db.engine.dispose()
+        assert 'ix_recordings_user_created' not in {
+            index['name'] for index in inspect(db.engine).get_indexes('recordings')
+        }
+
+        assert migrate_db() == ['ix_recordings_user_created']
+        assert migrate_db() == []
+
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM recordings WHERE user_id = 1 ORDER BY created_at DESC"
+        )).fetchall()
+        detail = ' '.join(row[-1] for row in plan)
+        assert 'ix_recordings_user_created' in detail
+        assert 'TEMP B-TREE' not in detail
+
+
+def test_user_listing_query_uses_index(tmp_path):
+    app = _create_app(tmp_path / 'b.db')
+    with app.app_context():
+        db.create_all()
+        user = User(username='u', email='u@x', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        for i in range(5):
+            db.session.add(Recording(user_id=user.id, session_id=f"s{i}", title=f"t{i}"))
+        db.session.commit()
+
+        query = Recording.query.filter_by(user_id=user.id).order_by(Recording.created_at.desc())
+        sql = str(query.statement.compile(compile_kwargs={'literal_binds': True}))
+        plan = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+
+        assert 'ix_recordings_user_created' in ' '.join(row[-1] for row in plan)
+        assert len(query.all()) == 5
+
+
+def test_migration_adds_columns_to_existing_database(tmp_path):
+    db_path = tmp_path / 'c.db'
+
+    # A recordings table from before the content hashes were declared
+    app = _create_app(db_path)
+    with app.app_context():
+        db.create_all()
+        db.engine.dispose()
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("INSERT INTO users (id, username, email, password_hash) VALUES (1, 'u', 'u@x', 'x')")
+        connection.execute("INSERT INTO recordings (user_id, session_id, title) VALUES (1, 's', 't')")
+        connection.execute("ALTER TABLE recordings DROP COLUMN transcript_hash")
+        connection.execute("ALTER TABLE recordings DROP COLUMN summary_hash")
+
+    with app.app_context():
+        db.engine.dispose()
+        assert migrate_db() == ['recordings.transcript_hash', 'recordings.summary_hash']
+        assert migrate_db() == []
+
+        recording = Recording.query.one()
+        assert recording.transcript_hash is None
+        recording.summary_hash = 'a' * 64
+        db.session.commit()
@@ -0,0 +1,109 @@
+"""
+Tests for meeting insights (keyphrases, topics, action items)
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+import json
+import threading
+
+from insights import find_action_items, build_insights
+from live_summarizer import RollingSummarizer
+from summarizer import Summarizer, insights_file_for
+from summarizer_backends import TextRankBackend
+
+
+SENTENCES = [
+    "We reviewed the quarterly budget and agreed to cut travel costs.",
+    "The budget for travel is already over plan this quarter.",
+    "Priya will send the revised budget by Friday.",
+    "The dashboard redesign is almost finished.",
+    "We need to fix dashboard loading times before the launch.",
+    "Marketing wants the launch moved to next month.",
+    "Rahul is going to follow up with marketing next week.",
+    "Everyone liked the new dashboard colors.",
+]
+
+
+def test_action_items_owner_and_due():
+    items = find_action_items(SENTENCES)
+    by_segment = {item['segment']: item for item in items}
+
+    assert by_segment[2]['owner'] == 'Priya'
+    assert by_segment[2]['due'] == 'by Friday'
+    assert by_segment[4]['owner'] == 'We'
+    assert by_segment[6]['owner'] == 'Rahul'
+    assert by_segment[6]['due'] == 'next week'
+    assert 7 not in by_segment
+    assert 3 not in by_segment
+
+
+def test_summary_unchanged_and_insights_from_same_pass():
+    backend = TextRankBackend()
+    summary, insights = backend.summarize_with_insights(SENTENCES, 3)
+
+    assert summary == backend.summarize(SENTENCES, 3)
+
+    phrases = [k['phrase'] for k in insights['keyphrases']]
+    assert 'budget' in phrases[:3]
+    assert 'dashboard' in phrases[:3]
+
+    topics = {t['segment']: t['topics'] for t in insights['topics']}
+    assert len(topics) == len(SENTENCES)
+    assert all(1 <= len(tags) <= 3 for tags in topics.values())
+    assert 'dashboard' in topics[3]
+
+
+def test_stop_word_only_input():
+    backend = TextRankBackend()
+    summary, insights = backend.summarize_with_insights(["It is what it is."], 3)
+    assert summary == "It is what it is."
+    assert insights == {'keyphrases': [], 'topics': [], 'action_items': []}
+    assert build_insights(None, [], []) == insights
+
+
+def test_live_insights_match_batch():
+    live = RollingSummarizer(num_sentences=3)
+    live.add_sentences(SENTENCES)
+    live.refresh()
+
+    _, batch = TextRankBackend().summarize_with_insights(SENTENCES, 3)
+    assert live.get_insights() == batch
+
+
+def test_saved_next_to_summary(tmp_path):
+    summarizer = Summarizer('textrank', 3)
+    summary, insights, _ = summarizer.generate_summary(' '.join(SENTENCES), SENTENCES)
+    summary_file = summarizer.save_summary(summary, str(tmp_path), 'session_x')
+    insights_file = summarizer.save_insights(insights, str(tmp_path), 'session_x')
+
+    assert insights_file == insights_file_for(summary_file)
+    assert insights_file.endswith('session_x_insights.json')
+    with open(insights_file) as f:
+        assert json.load(f)['action_items']
+
+    assert summarizer.generate_summary('too short') == ("Text too short to summarize.", None, 'textrank')
+
+
+def test_shared_handle_keeps_insights_per_call():
+    summarizer = Summarizer('textrank', 2)
+    texts = {
+        'budget': [f"We reviewed the budget line {i} for the marketing campaign." for i in range(12)],
+        'hiring': [f"The hiring panel interviewed candidate {i} for the backend role." for i in range(12)],
+    }
+    expected = {name: summarizer.generate_summary(' '.join(s), s)[1] for name, s in texts.items()}
+    results = []
+
+    def worker(name):
+        for _ in range(20):
+            results.append((name, summarizer.generate_summary(' '.join(texts[name]), texts[name])[1]))
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in texts for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert expected['budget'] != expected['hiring']
+    assert all(insights == expected[name] for name, insights in results)
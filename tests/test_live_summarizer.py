@@ -0,0 +1,84 @@
+"""
+Tests for the rolling live summarizer
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from live_summarizer import RollingSummarizer
+from textrank import rank_sentences, top_sentence_indices
+
+
+SENTENCES = [
+    "We reviewed the quarterly budget and agreed to cut travel costs.",
+    "The design team will ship the new dashboard next sprint.",
+    "Travel costs rose sharply because of the customer visits.",
+    "Marketing asked for a budget increase for the product launch.",
+    "The launch date moves to the first week of March.",
+    "Dashboard performance issues must be fixed before the launch.",
+    "Everyone agreed the customer visits were worth the travel budget.",
+    "Next meeting will cover hiring plans for the design team.",
+]
+
+
+def fresh_summary(sentences, count):
+    tfidf = TfidfVectorizer(stop_words='english').fit_transform(sentences)
+    indices = top_sentence_indices(rank_sentences(tfidf), count)
+    return ' '.join(sentences[i] for i in indices)
+
+
+def test_incremental_matches_batch_textrank():
+    live = RollingSummarizer(num_sentences=3)
+    for sentence in SENTENCES:
+        live.add_sentences([sentence])
+
+    assert live.get_summary() == fresh_summary(SENTENCES, 3)
+
+
+def test_short_transcript_returned_whole():
+    live = RollingSummarizer(num_sentences=5)
+    live.add_sentences(SENTENCES[:2])
+    assert live.get_summary() == ' '.join(SENTENCES[:2])
+
+
+def test_refresh_honours_interval():
+    live = RollingSummarizer(num_sentences=3, interval_seconds=30)
+    live.add_sentences(SENTENCES[:4])
+
+    assert live.maybe_refresh(now=100.0)
+    assert live.get_state()['ranked_sentences'] == 4
+
+    live.add_sentences(SENTENCES[4:])
+    assert not live.maybe_refresh(now=110.0)
+    assert live.get_state()['ranked_sentences'] == 4
+
+    assert live.maybe_refresh(now=131.0)
+    assert live.get_state() == {
+        'text': fresh_summary(SENTENCES, 3),
+        'sentence_count': len(SENTENCES),
+        'ranked_sentences': len(SENTENCES)
+    }
+
+    # Nothing new: no re-rank even after the interval
+    assert not live.maybe_refresh(now=200.0)
+
+
+def test_zero_interval_disables_periodic_refresh():
+    live = RollingSummarizer(num_sentences=3, interval_seconds=0)
+    live.add_sentences(SENTENCES)
+    assert not live.maybe_refresh(now=1000.0)
+    assert live.get_state()['text'] == ''
+
+
+def test_add_segment_uses_pauses():
+    live = RollingSummarizer(num_sentences=3, pause_seconds=0.5)
+    words = [
+        {'word': 'hello', 'start': 0.0, 'end': 0.3},
+        {'word': 'team', 'start': 0.35, 'end': 0.6},
+        {'word': 'lets', 'start': 1.5, 'end': 1.7},
+        {'word': 'start', 'start': 1.75, 'end': 2.0},
+    ]
+    live.add_segment('hello team lets start', words)
+    assert live.sentences == ['Hello team.', 'Lets start.']
@@ -0,0 +1,108 @@
+"""
+Tests for the canonical PCM store
+"""
+import os
+import sys
+import wave
+import struct
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import pytest
+
+from pcm_store import PCMStore, PCM_SAMPLE_RATE
+
+
+def _write_wav(path, frames, rate=16000, channels=1):
+    with wave.open(str(path), 'wb') as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(frames)
+    return str(path)
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path):
+    """Executable standing in for ffmpeg: writes the input bytes reversed and logs each call"""
+    log = tmp_path / 'ffmpeg.log'
+    script = tmp_path / 'ffmpeg'
+    script.write_text(
+        "#!" + sys.executable + "\n"
+        "import sys\n"
+        "args = sys.argv[1:]\n"
+        "source = args[args.index('-i') + 1]\n"
+        f"open({str(log)!r}, 'a').write(source + '\\n')\n"
+        "data = open(source, 'rb').read()\n"
+        "open(args[-1], 'wb').write(data[::-1])\n"
+    )
+    script.chmod(0o755)
+    return str(script), log
+
+
+def test_canonical_wav_is_mapped_in_place(tmp_path):
+    frames = struct.pack('<9000h', *range(9000))
+    wav = _write_wav(tmp_path / 'a.wav', frames)
+    store = PCMStore(str(tmp_path / 'pcm'), 1024 * 1024, ffmpeg=None)
+
+    pcm = store.get(wav)
+
+    assert pcm.path == wav
+    assert pcm.sample_rate == PCM_SAMPLE_RATE
+    assert pcm.duration == pytest.approx(9000 / 16000)
+    chunks = list(pcm.chunks(frames=4000))
+    assert [len(chunk) for chunk in chunks] == [8000, 8000, 2000]
+    assert b''.join(chunks) == frames
+    assert not os.listdir(tmp_path / 'pcm')
+
+
+def test_without_ffmpeg_mono_wav_keeps_its_rate(tmp_path):
+    wav = _write_wav(tmp_path / 'b.wav', b'\x01\x00' * 800, rate=8000)
+    pcm = PCMStore(str(tmp_path / 'pcm'), 1024 * 1024, ffmpeg=None).get(wav)
+    assert pcm.sample_rate == 8000
+    assert b''.join(pcm.chunks()) == b'\x01\x00' * 800
+
+
+def test_without_ffmpeg_other_audio_is_rejected(tmp_path):
+    store = PCMStore(str(tmp_path / 'pcm'), 1024 * 1024, ffmpeg=None)
+    stereo = _write_wav(tmp_path / 'c.wav', b'\x00' * 400, channels=2)
+    mp3 = tmp_path / 'd.mp3'
+    mp3.write_bytes(b'ID3' + b'\x00' * 100)
+
+    with pytest.raises(Exception, match='mono'):
+        store.get(stereo)
+    with pytest.raises(Exception, match='ffmpeg'):
+        store.get(str(mp3))
+
+
+def test_decoded_once_then_reused(tmp_path, fake_ffmpeg):
+    ffmpeg, log = fake_ffmpeg
+    audio = tmp_path / 'talk.mp3'
+    audio.write_bytes(bytes(range(200)))
+    copy = tmp_path / 'same-talk.m4a'
+    copy.write_bytes(bytes(range(200)))
+    store = PCMStore(str(tmp_path / 'pcm'), 1024 * 1024, ffmpeg=ffmpeg)
+
+    first = store.get(str(audio))
+    again = store.get(str(audio))
+    duplicate = store.get(str(copy))
+
+    assert log.read_text().splitlines() == [str(audio)]
+    assert first.path == again.path == duplicate.path
+    assert b''.join(first.chunks()) == bytes(range(200))[::-1]
+    # Scratch output was moved into the store, not left behind
+    assert not [name for name in os.listdir(tmp_path / 'pcm') if name.endswith('.pcm')]
+
+
+def test_least_recently_used_derivatives_are_evicted(tmp_path, fake_ffmpeg):
+    ffmpeg, log = fake_ffmpeg
+    store = PCMStore(str(tmp_path / 'pcm'), 2500, ffmpeg=ffmpeg)
+    paths = []
+    for i in range(3):
+        audio = tmp_path / f'{i}.mp3'
+        audio.write_bytes(bytes([i]) * 1000)
+        paths.append(str(audio))
+        store.get(paths[-1])
+
+    # Quota holds two; the oldest derivative is decoded again
+    store.get(paths[0])
+    assert log.read_text().splitlines() == paths + [paths[0]]
@@ -0,0 +1,52 @@
+"""
+Tests for parallel batch PDF rendering
+"""
+import os
+import sys
+from collections import namedtuple
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+from pdf_batch import iter_pdf_jobs, render_batch
+
+
+Source = namedtuple('Source', ['session_id', 'transcript_file_path', 'summary_file_path'])
+
+
+def _make_sources(tmp_path, count):
+    sources = []
+    for i in range(count):
+        transcript = tmp_path / f'session_{i}.txt'
+        transcript.write_text(
+            f"Transcript: session_{i}\n" + "=" * 60 + "\n\n"
+            f"[00:00:0{i}] meeting number {i} about the budget\n\n" + "=" * 60 + "\n",
+            encoding='utf-8'
+        )
+        summary = tmp_path / f'session_{i}_summary.txt'
+        summary.write_text(f"Meeting {i} covered the budget.", encoding='utf-8')
+        sources.append(Source(f'session_{i}', str(transcript), str(summary)))
+    return sources
+
+
+def test_iter_pdf_jobs_skips_missing_sources(tmp_path):
+    sources = _make_sources(tmp_path, 1)
+    sources.append(Source('session_gone', str(tmp_path / 'missing.txt'), None))
+
+    jobs = list(iter_pdf_jobs(sources, ('transcript',)))
+
+    assert jobs == [('transcript', sources[0].transcript_file_path, 'session_0')]
+
+
+def test_render_batch_then_skip_current(tmp_path):
+    sources = _make_sources(tmp_path, 3)
+    cache_dir = str(tmp_path / 'cache')
+
+    first = render_batch(iter_pdf_jobs(sources), cache_dir, 50 * 1024 * 1024, workers=2)
+    assert (first['total'], first['rendered'], first['skipped'], first['failed']) == (6, 6, 0, 0)
+    assert first['done'] and first['docs_per_second'] > 0
+
+    second = render_batch(iter_pdf_jobs(sources), cache_dir, 50 * 1024 * 1024, workers=2)
+    assert (second['rendered'], second['skipped']) == (0, 6)
+
+    forced = render_batch(iter_pdf_jobs(sources[:1]), cache_dir, 50 * 1024 * 1024, workers=1, force=True)
+    assert forced['rendered'] == 2
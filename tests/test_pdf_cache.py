@@ -0,0 +1,97 @@
+"""
+Tests for lazily rendered, content-keyed PDFs
+"""
+import os
+import sys
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+from pdf_cache import PDFCache
+from pdf_generator import PDFGenerator
+
+
+class CountingGenerator(PDFGenerator):
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.renders = 0
+
+    def create_transcript_pdf(self, *args, **kwargs):
+        self.renders += 1
+        return super().create_transcript_pdf(*args, **kwargs)
+
+    def create_summary_pdf(self, *args, **kwargs):
+        self.renders += 1
+        return super().create_summary_pdf(*args, **kwargs)
+
+
+def _write_transcript(path, body):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("Transcript: session_x\n" + "=" * 60 + "\n\n")
+        f.write(body + "\n\n" + "=" * 60 + "\n")
+    return str(path)
+
+
+def _make_cache(tmp_path):
+    generator = CountingGenerator(str(tmp_path / 'pdfs'))
+    return PDFCache(generator, str(tmp_path / 'cache'), 50 * 1024 * 1024), generator
+
+
+def test_renders_once_then_serves_from_cache(tmp_path):
+    cache, generator = _make_cache(tmp_path)
+    source = _write_transcript(tmp_path / 'session_x.txt', '[00:00:01] hello team')
+
+    first_path, first_key = cache.get_pdf('transcript', source, 'session_x')
+    second_path, second_key = cache.get_pdf('transcript', source, 'session_x')
+
+    assert generator.renders == 1
+    assert (first_path, first_key) == (second_path, second_key)
+    with open(first_path, 'rb') as f:
+        assert f.read(5) == b'%PDF-'
+
+
+def test_source_change_invalidates(tmp_path):
+    cache, generator = _make_cache(tmp_path)
+    source = _write_transcript(tmp_path / 'session_x.txt', '[00:00:01] hello team')
+    _, old_key = cache.get_pdf('transcript', source, 'session_x')
+
+    # Re-decode rewrites the transcript
+    time.sleep(0.01)
+    _write_transcript(tmp_path / 'session_x.txt', '[00:00:01] hello whole team')
+    _, new_key = cache.get_pdf('transcript', source, 'session_x')
+
+    assert new_key != old_key
+    assert generator.renders == 2
+
+
+def test_key_is_stable_without_rendering(tmp_path):
+    cache, generator = _make_cache(tmp_path)
+    source = _write_transcript(tmp_path / 'session_x.txt', '[00:00:01] hello team')
+
+    key = cache.make_key('transcript', source, 'session_x')
+    assert key == cache.make_key('transcript', source, 'session_x')
+    assert key != cache.make_key('transcript', source, 'session_y')
+    assert key != cache.make_key('summary', source, 'session_x')
+    assert generator.renders == 0
+
+
+def test_summary_key_follows_chapters(tmp_path):
+    cache, _ = _make_cache(tmp_path)
+    summary = tmp_path / 'session_x_summary.txt'
+    summary.write_text("Summary: session_x\n" + "=" * 60 + "\n\nShort summary.\n")
+
+    before = cache.make_key('summary', str(summary), 'session_x')
+    (tmp_path / 'session_x_chapters.json').write_text('[]')
+    assert cache.make_key('summary', str(summary), 'session_x') != before
+
+
+def test_prewarm_renders_in_background(tmp_path):
+    cache, generator = _make_cache(tmp_path)
+    source = _write_transcript(tmp_path / 'session_x.txt', '[00:00:01] hello team')
+
+    cache.prewarm('transcript', source, 'session_x')
+    cache._queue.join()
+    assert generator.renders == 1
+
+    cache.get_pdf('transcript', source, 'session_x')
+    assert generator.renders == 1
@@ -0,0 +1,93 @@
+"""
+Tests for page-sharded PDF text extraction
+"""
+import os
+import sys
+import time
+import threading
+import multiprocessing
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+import pdf_text
+from pdf_text import extract_pdf_text, extract_pages, page_shards
+
+
+def _make_pdf(path, pages):
+    pdf = canvas.Canvas(str(path), pagesize=letter)
+    for i in range(pages):
+        pdf.drawString(72, 720, f"Board pack page {i + 1}")
+        pdf.showPage()
+    pdf.save()
+    return str(path)
+
+
+def test_page_shards_cover_pages_in_order():
+    shards = page_shards(10, 2)
+    assert shards[0][0] == 0 and shards[-1][1] == 10
+    assert all(a[1] == b[0] for a, b in zip(shards, shards[1:]))
+    assert page_shards(3, 8) == [(0, 1), (1, 2), (2, 3)]
+    assert page_shards(0, 2) == []
+
+
+def test_parallel_matches_serial(tmp_path):
+    pdf_path = _make_pdf(tmp_path / 'pack.pdf', 12)
+
+    serial = extract_pdf_text(pdf_path, workers=2, parallel_pages=100)
+    parallel = extract_pdf_text(pdf_path, workers=2, parallel_pages=1)
+
+    assert parallel == serial
+    assert [line for line in serial.splitlines() if line] == [f"Board pack page {i + 1}" for i in range(12)]
+
+
+def test_slow_page_is_skipped():
+    class Page:
+        def __init__(self, text, delay=0):
+            self.text = text
+            self.delay = delay
+
+        def extract_text(self):
+            time.sleep(self.delay)
+            return self.text
+
+    class Reader:
+        pages = [Page('one'), Page('stuck', delay=5), Page('three')]
+
+    started = time.time()
+    texts, skipped = extract_pages(Reader(), 0, 3, page_timeout=0.2)
+
+    assert texts == ['one', '', 'three']
+    assert skipped == [1]
+    assert time.time() - started < 2
+
+
+def test_small_pdf_off_main_thread_uses_a_worker(tmp_path, monkeypatch):
+    pdf_path = _make_pdf(tmp_path / 'notes.pdf', 3)
+    calls = []
+    original = pdf_text._extract_parallel
+
+    def spy(*args):
+        calls.append(args)
+        return original(*args)
+    monkeypatch.setattr(pdf_text, '_extract_parallel', spy)
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(extract_pdf_text(pdf_path, workers=2)))
+    thread.start()
+    thread.join(60)
+
+    assert results == [extract_pdf_text(pdf_path, workers=2)]
+    assert [call[2] for call in calls] == [1]
+
+
+def test_overrunning_shards_are_skipped_and_workers_killed(tmp_path, monkeypatch):
+    pdf_path = _make_pdf(tmp_path / 'pack.pdf', 12)
+    # No worker can even start within the deadline, so every shard overruns
+    monkeypatch.setattr(pdf_text, 'SHARD_GRACE', 0)
+
+    started = time.time()
+    assert extract_pdf_text(pdf_path, workers=2, parallel_pages=1, page_timeout=0.001) == ''
+    assert time.time() - started < 30
+    assert multiprocessing.active_children() == []
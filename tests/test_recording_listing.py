@@ -0,0 +1,117 @@
+"""
+Tests for keyset-paginated recording listings
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import pytest
+from flask import Flask
+from sqlalchemy import text
+
+from database import db, User, Recording
+from recording_listing import list_recordings, parse_fields, decode_cursor, LISTING_FIELDS
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'list.db'}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        owner = User(username='owner', email='o@x', password_hash='x')
+        other = User(username='other', email='t@x', password_hash='x')
+        db.session.add_all([owner, other])
+        db.session.commit()
+
+        start = datetime(2024, 1, 1)
+        for i in range(25):
+            db.session.add(Recording(
+                user_id=owner.id,
+                session_id=f"owner_{i}",
+                title=f"{'Standup' if i % 2 else 'Review'} {i}",
+                # Pairs share a timestamp, so ordering must fall back to id
+                created_at=start + timedelta(hours=i // 2),
+                status='completed' if i % 3 else 'failed',
+                audio_file_path=f"/audio/{i}.wav",
+                transcript_file_path=f"/t/{i}.txt" if i % 4 else None
+            ))
+        db.session.add(Recording(user_id=other.id, session_id='other_0', title='Standup x',
+                                 created_at=start))
+        db.session.commit()
+        yield app
+
+
+def _all_pages(user_id, limit, **filters):
+    items, cursor, pages = [], None, 0
+    while True:
+        page, cursor = list_recordings(user_id, limit=limit, cursor=cursor, **filters)
+        assert len(page) <= limit
+        items.extend(page)
+        pages += 1
+        if not cursor:
+            return items, pages
+
+
+def test_pages_cover_everything_once_newest_first(app):
+    with app.app_context():
+        items, pages = _all_pages(1, 10)
+        assert pages == 3
+        assert len(items) == 25
+        keys = [(item['created_at'], item['id']) for item in items]
+        assert keys == sorted(keys, reverse=True)
+        assert len(set(keys)) == 25
+
+
+def test_fields_projection(app):
+    with app.app_context():
+        page, cursor = list_recordings(1, parse_fields('id,title,has_transcript_pdf'), limit=4)
+        assert set(page[0]) == {'id', 'title', 'has_transcript_pdf'}
+        assert [item['has_transcript_pdf'] for item in page] == [False, True, True, True]
+        assert decode_cursor(cursor)[1] == page[-1]['id']
+
+        full, _ = list_recordings(1, limit=1)
+        assert set(full[0]) == set(LISTING_FIELDS)
+
+    with pytest.raises(ValueError):
+        parse_fields('id,password_hash')
+
+
+def test_filters(app):
+    with app.app_context():
+        failed, _ = _all_pages(1, 3, statuses=['failed'])
+        assert {item['status'] for item in failed} == {'failed'}
+        assert len(failed) == 9
+
+        standups, _ = _all_pages(1, 5, title_prefix='stand')
+        assert len(standups) == 12
+        assert all(item['title'].startswith('Standup') for item in standups)
+
+        # A literal % in the prefix does not act as a wildcard
+        assert list_recordings(1, title_prefix='%')[0] == []
+
+        window, _ = list_recordings(1, created_from=datetime(2024, 1, 1, 2),
+                                    created_to=datetime(2024, 1, 1, 4))
+        assert sorted(item['id'] for item in window) == [5, 6, 7, 8]
+
+
+def test_invalid_cursor(app):
+    with app.app_context():
+        with pytest.raises(ValueError):
+            list_recordings(1, cursor='not-a-cursor')
+
+
+def test_next_page_seeks_the_index(app):
+    with app.app_context():
+        _, cursor = list_recordings(1, limit=5)
+        created_at, recording_id = decode_cursor(cursor)
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM recordings WHERE user_id = 1 "
+            "AND (created_at, id) < (:created_at, :id) ORDER BY created_at DESC, id DESC LIMIT 6"
+        ), {'created_at': created_at, 'id': recording_id}).fetchall()
+        detail = ' '.join(row[-1] for row in plan)
+        assert 'ix_recordings_user_created' in detail
+        assert 'TEMP B-TREE' not in detail
@@ -0,0 +1,106 @@
+"""
+Tests for the related-meetings index
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+import numpy as np
+import pytest
+from flask import Flask
+
+from database import db, User, Recording, RecordingVector
+from related_index import RelatedIndex, document_vector, TERMS_PER_DOCUMENT
+
+
+TOPICS = {
+    'budget': "The quarterly budget needs cuts. Finance reviewed spending and the budget forecast.",
+    'hiring': "We are hiring two engineers. Interviews and candidate offers go out next week.",
+    'budget2': "Spending is over budget this quarter. Finance wants a new budget forecast.",
+    'launch': "The product launch moves to May. Marketing prepares the launch campaign.",
+}
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'related.db'}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([User(username='a', email='a@x', password_hash='x'),
+                            User(username='b', email='b@x', password_hash='x')])
+        for i, name in enumerate(TOPICS, start=1):
+            db.session.add(Recording(id=i, user_id=1, session_id=name, title=name))
+        db.session.add(Recording(id=10, user_id=2, session_id='other', title='other'))
+        db.session.commit()
+        yield app
+
+
+def test_document_vector_keeps_strongest_terms():
+    features, weights = document_vector(["budget budget budget forecast", "budget and the plan"])
+    assert features.dtype == np.int32 and weights.dtype == np.float32
+    assert list(features) == sorted(features)
+    assert weights.max() == pytest.approx(1 + np.log(4))
+
+    many = document_vector([" ".join(f"term{i}" for i in range(1000))], terms=50)[0]
+    assert len(many) == 50
+    assert len(document_vector([" ".join(f"term{i}" for i in range(1000))])[0]) == TERMS_PER_DOCUMENT
+
+
+def test_related_ranks_by_topic_and_updates_incrementally(app):
+    with app.app_context():
+        index = RelatedIndex()
+        for i, text in enumerate(TOPICS.values(), start=1):
+            index.add(i, 1, [text])
+        index.add(10, 2, [TOPICS['budget']])
+
+        related = index.related(1, 1, k=3)
+        assert related[0][0] == 3
+        assert 0 < related[0][1] <= 1
+        # Other users' recordings never appear
+        assert all(recording_id != 10 for recording_id, _ in related)
+        # Nothing shares a term with the hiring meeting
+        assert index.related(2, 1) == []
+
+        # A new budget meeting joins the loaded index without a reload
+        db.session.add(Recording(id=5, user_id=1, session_id='budget3', title='budget3'))
+        db.session.commit()
+        index.add(5, 1, [TOPICS['budget'] + " Budget approval pending."])
+        assert index.related(1, 1, k=1)[0][0] == 5
+
+        index.remove(5, 1)
+        assert index.related(1, 1, k=1)[0][0] == 3
+        assert db.session.get(RecordingVector, 5) is None
+
+
+def test_index_loads_from_database(app):
+    with app.app_context():
+        writer = RelatedIndex()
+        for i, text in enumerate(TOPICS.values(), start=1):
+            writer.add(i, 1, [text])
+
+        reader = RelatedIndex()
+        assert reader.related(3, 1, k=1)[0][0] == 1
+        assert reader.related(99, 1) is None
+        assert reader.has(3, 1) and not reader.has(99, 1)
+
+
+def test_cached_index_follows_other_workers(app):
+    with app.app_context():
+        # Two server workers, each with its own in-memory index
+        worker_a, worker_b = RelatedIndex(), RelatedIndex()
+        for i, text in enumerate(TOPICS.values(), start=1):
+            worker_a.add(i, 1, [text])
+        assert worker_b.related(1, 1, k=1)[0][0] == 3
+
+        db.session.add(Recording(id=5, user_id=1, session_id='budget3', title='budget3'))
+        db.session.commit()
+        worker_a.add(5, 1, [TOPICS['budget'] + " Budget approval pending."])
+        assert worker_b.related(1, 1, k=1)[0][0] == 5
+
+        worker_a.remove(3, 1)
+        assert worker_b.has(5, 1) and not worker_b.has(3, 1)
+        assert all(recording_id != 3 for recording_id, _ in worker_b.related(1, 1))
@@ -0,0 +1,69 @@
+"""
+Tests for gzip / brotli compression of JSON responses
+"""
+import os
+import sys
+import gzip
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from flask import Flask, jsonify, request
+
+import response_compression
+from response_compression import compress_response
+
+
+def _client():
+    app = Flask(__name__)
+
+    @app.route('/big')
+    def big():
+        response = jsonify({'text': 'the same words again ' * 500})
+        response.set_etag('abc')
+        return response
+
+    @app.route('/small')
+    def small():
+        return jsonify({'ok': True})
+
+    @app.after_request
+    def compress(response):
+        return compress_response(response, request.accept_encodings)
+
+    return app.test_client()
+
+
+def test_large_json_is_gzipped_for_accepting_clients():
+    client = _client()
+    response = client.get('/big', headers={'Accept-Encoding': 'gzip, deflate'})
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.headers['ETag'] == 'W/"abc"'
+    assert int(response.headers['Content-Length']) == len(response.data)
+    assert gzip.decompress(response.data).startswith(b'{"text":"the same words again')
+
+    plain = client.get('/big')
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['ETag'] == '"abc"'
+
+
+def test_small_bodies_are_not_compressed():
+    response = _client().get('/small', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.json == {'ok': True}
+
+
+def test_brotli_preferred_when_installed(monkeypatch):
+    class FakeBrotli:
+        @staticmethod
+        def compress(data, quality):
+            return b'br:' + data[:10]
+
+    monkeypatch.setattr(response_compression, '_brotli', FakeBrotli)
+    response = _client().get('/big', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert response.data.startswith(b'br:')
+
+    monkeypatch.setattr(response_compression, '_brotli', False)
+    response = _client().get('/big', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'gzip'
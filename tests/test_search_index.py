@@ -0,0 +1,130 @@
+"""
+Tests for the FTS5 search index
+"""
+import os
+import sys
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+import pytest
+from flask import Flask
+
+from database import db, User, Recording, SearchSegment
+from search_index import (
+    create_search_schema, index_recording, remove_recording, search,
+    fts_query, transcript_passages, rebuild_index
+)
+
+SEPARATOR = "=" * 60
+
+
+def _write(path, header, body):
+    path.write_text(f"{header}\nGenerated: 2024-01-01\n{SEPARATOR}\n\n{body}\n\n{SEPARATOR}\n", encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'search.db'}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        create_search_schema(db.engine)
+        db.session.add_all([
+            User(username='a', email='a@x', password_hash='x'),
+            User(username='b', email='b@x', password_hash='x')
+        ])
+        db.session.commit()
+        yield app
+
+
+def _recording(tmp_path, user_id, name, transcript_body, summary_body, segments=None):
+    transcript = _write(tmp_path / f'{name}.txt', f"Transcript: {name}", transcript_body)
+    summary = _write(tmp_path / f'{name}_summary.txt', f"Summary: {name}", summary_body)
+    if segments is not None:
+        (tmp_path / f'{name}_segments.json').write_text(json.dumps(segments), encoding='utf-8')
+    recording = Recording(user_id=user_id, session_id=name, title=name.title(), status='completed',
+                          transcript_file_path=transcript, summary_file_path=summary)
+    db.session.add(recording)
+    db.session.commit()
+    return recording
+
+
+def test_passages_keep_audio_offsets(tmp_path):
+    timed = _write(tmp_path / 'rec.txt', "Transcript: rec",
+                   "[00:00:05] we opened the meeting\n[00:01:10] the budget is too high")
+    assert list(transcript_passages(timed)) == [(5, 'we opened the meeting'), (70, 'the budget is too high')]
+
+    _write(tmp_path / 'up.txt', "Transcript: up", "ignored when segments exist")
+    (tmp_path / 'up_segments.json').write_text(json.dumps([{'text': 'hello there', 'words': [
+        {'word': 'hello', 'start': 1.5, 'end': 1.9}, {'word': 'there', 'start': 2.0, 'end': 2.4}
+    ]}]))
+    assert list(transcript_passages(str(tmp_path / 'up.txt'))) == [(1.5, 'Hello there.')]
+
+    plain = _write(tmp_path / 'doc.txt', "Transcript: doc", "First point here. Second point\nspans lines.")
+    assert [start for start, _ in transcript_passages(plain)] == [None, None]
+
+
+def test_search_ranks_highlights_and_isolates_users(app, tmp_path):
+    with app.app_context():
+        first = _recording(tmp_path, 1, 'planning',
+                           "[00:00:03] welcome everyone\n[00:02:00] the budget for budget planning is approved",
+                           "The budget was approved.")
+        second = _recording(tmp_path, 1, 'retro', "[00:00:01] we discussed hiring and the budget", "Hiring plans.")
+        other = _recording(tmp_path, 2, 'private', "[00:00:01] secret budget numbers", "Budget.")
+        for recording in (first, second, other):
+            assert index_recording(recording) > 0
+
+        results = search(1, 'budget')
+        assert {r['recording_id'] for r in results} == {first.id, second.id}
+        assert results[0]['recording_id'] == first.id
+        assert results[0]['score'] >= results[-1]['score']
+        assert all('<mark>' in r['snippet'] for r in results)
+
+        transcript_hit = next(r for r in results if r['kind'] == 'transcript' and r['recording_id'] == first.id)
+        assert transcript_hit['start'] == 120
+        assert transcript_hit['title'] == 'Planning'
+
+        # Porter stemming and prefixes
+        assert search(1, 'approve')
+        assert search(1, 'hir*')
+        assert [r['kind'] for r in search(1, 'budget', kind='summary')] == ['summary']
+
+
+def test_reindex_replaces_and_remove_drops(app, tmp_path):
+    with app.app_context():
+        recording = _recording(tmp_path, 1, 'weekly', "[00:00:01] quarterly roadmap review", "Roadmap.")
+        index_recording(recording)
+        count = SearchSegment.query.count()
+        index_recording(recording)
+        assert SearchSegment.query.count() == count
+
+        remove_recording(recording.id)
+        assert SearchSegment.query.count() == 0
+        assert search(1, 'roadmap') == []
+
+
+def test_query_syntax_is_neutralized(app):
+    with app.app_context():
+        assert fts_query('budget "AND" NEAR( OR') == '"budget" """AND""" "NEAR(" "OR"'
+        assert fts_query('plan*') == '"plan"*'
+        assert fts_query('  * ') == ''
+        assert search(1, 'NEAR( "unbalanced') == []
+
+
+def test_rebuild_in_parallel(app, tmp_path):
+    with app.app_context():
+        jobs = []
+        for i in range(4):
+            recording = _recording(tmp_path, 1, f'meeting{i}', f"[00:00:0{i}] topic number{i} discussed", "Summary.")
+            jobs.append((recording.id, 1, recording.transcript_file_path, recording.summary_file_path))
+        jobs.append((999, 1, str(tmp_path / 'missing.txt'), None))
+
+        stats = rebuild_index(jobs, workers=2)
+
+        assert stats['recordings'] == 5 and stats['failed'] == 0
+        assert stats['rows'] == SearchSegment.query.count() == 8
+        assert search(1, 'number3')[0]['start'] == 3
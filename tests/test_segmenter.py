@@ -0,0 +1,59 @@
+"""
+Tests for pause-based ASR segmentation
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+from segmenter import segment_words, segment_transcript, split_sentences, iter_sentences
+
+
+def _words(spec):
+    """Build Vosk-style word results from (word, start, end) tuples"""
+    return [{'word': w, 'start': s, 'end': e, 'conf': 1.0} for w, s, e in spec]
+
+
+def test_splits_on_pauses():
+    words = _words([
+        ('the', 0.0, 0.2), ('budget', 0.25, 0.6), ('is', 0.65, 0.7), ('approved', 0.75, 1.2),
+        ('next', 2.5, 2.8), ('item', 2.85, 3.1),
+    ])
+
+    assert segment_words(words, pause_seconds=0.6) == ["The budget is approved.", "Next item."]
+
+
+def test_caps_sentence_length_without_pauses():
+    words = _words([(f"w{i}", i * 0.1, i * 0.1 + 0.05) for i in range(25)])
+
+    sentences = segment_words(words, pause_seconds=1.0, max_words=10)
+
+    assert [len(s.split()) for s in sentences] == [10, 10, 5]
+
+
+def test_unpunctuated_text_falls_back_to_length_cap():
+    text = " ".join(["word"] * 95)
+
+    sentences = split_sentences(text, max_words=40)
+
+    assert [len(s.split()) for s in sentences] == [40, 40, 15]
+
+
+def test_segments_without_words_use_text():
+    segments = [
+        {'text': 'hello everyone', 'words': []},
+        {'text': 'lets begin', 'words': _words([('lets', 5.0, 5.2), ('begin', 5.3, 5.6)])},
+    ]
+
+    assert segment_transcript(segments) == ["Hello everyone.", "Lets begin."]
+
+
+def test_chunked_sentences_match_whole_text():
+    text = (
+        "The budget is approved. " + "we talked about hiring " * 30 + "and then stopped.  "
+        "Next item!\nAre we done? " + "no punctuation at all " * 25
+    )
+
+    for size in (1, 7, 64, len(text)):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert list(iter_sentences(chunks, max_words=20)) == split_sentences(text, max_words=20)
+
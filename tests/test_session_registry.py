@@ -0,0 +1,117 @@
+"""
+Tests for routing calls to the process that owns a session
+"""
+import os
+import sys
+import socket
+import multiprocessing
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import pytest
+from flask import Flask
+
+from database import db, SessionRoute
+from session_registry import SessionRegistry
+from chunked_upload import UploadError
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason="needs Unix sockets")
+
+AUTHKEY = b'test-secret'
+
+
+def _create_app(db_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_path}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    db.init_app(app)
+    return app
+
+
+def _registry(app, socket_dir):
+    registry = SessionRegistry(socket_dir, AUTHKEY, app.app_context, enabled=True)
+    registry.handle('whoami', lambda key: (os.getpid(), key))
+
+    def fail(key):
+        raise Exception(f"no session {key}")
+    registry.handle('fail', fail)
+
+    def reject(key):
+        raise UploadError(f"Offset mismatch on {key}", 409, 7)
+    registry.handle('reject', reject)
+    return registry
+
+
+def _own_session(db_path, socket_dir, ready, stop):
+    """Child process: start a session and serve calls for it"""
+    app = _create_app(db_path)
+    registry = _registry(app, socket_dir)
+    with app.app_context():
+        registry.register('recording', 's1', 1)
+    ready.set()
+    stop.wait(30)
+
+
+def test_calls_are_routed_to_the_owning_process(tmp_path):
+    db_path = tmp_path / 'r.db'
+    socket_dir = str(tmp_path / 'run')
+    app = _create_app(db_path)
+    with app.app_context():
+        db.create_all()
+        db.engine.dispose()
+
+    context = multiprocessing.get_context('fork')
+    ready, stop = context.Event(), context.Event()
+    owner = context.Process(target=_own_session, args=(db_path, socket_dir, ready, stop))
+    owner.start()
+    try:
+        assert ready.wait(30)
+        registry = _registry(app, socket_dir)
+
+        with app.app_context():
+            # Owned elsewhere: runs in the child
+            assert registry.call('recording', 's1', 'whoami', 's1') == (owner.pid, 's1')
+            with pytest.raises(Exception, match="no session s1"):
+                registry.call('recording', 's1', 'fail', 's1')
+            # Picklable exceptions arrive as themselves
+            with pytest.raises(UploadError) as error:
+                registry.call('recording', 's1', 'reject', 's1')
+            assert (error.value.status, error.value.offset) == (409, 7)
+            assert not registry.is_local('recording', 's1')
+            assert registry.is_local('recording', 'other')
+
+            # Unknown routes run locally
+            assert registry.call('recording', 'other', 'whoami', 'other') == (os.getpid(), 'other')
+
+            # Registering here takes the route over
+            registry.register('recording', 's2', 1)
+            assert registry.call('recording', 's2', 'whoami', 's2') == (os.getpid(), 's2')
+            # A user's routes are listed whichever process owns them
+            assert registry.keys('recording', 1) == ['s1', 's2']
+            assert registry.keys('recording', 2) == []
+            assert registry.keys('upload', 1) == []
+    finally:
+        stop.set()
+        owner.join(30)
+
+    with app.app_context():
+        # The owner exited: its route is dropped and the call runs locally
+        assert registry.call('recording', 's1', 'whoami', 's1') == (os.getpid(), 's1')
+        assert db.session.get(SessionRoute, 'recording:s1') is None
+
+        registry.close()
+        assert SessionRoute.query.count() == 0
+        assert not os.path.exists(registry.address)
+
+
+def test_disabled_registry_runs_everything_locally(tmp_path):
+    app = _create_app(tmp_path / 'd.db')
+    registry = SessionRegistry(str(tmp_path / 'run'), AUTHKEY, app.app_context, enabled=False)
+    registry.handle('whoami', lambda key: key)
+
+    with app.app_context():
+        db.create_all()
+        registry.register('recording', 's1', 1)
+        assert SessionRoute.query.count() == 0
+        assert registry.keys('recording', 1) == []
+        assert registry.call('recording', 's1', 'whoami', 's1') == 's1'
+    assert not os.path.exists(str(tmp_path / 'run'))
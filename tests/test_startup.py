@@ -0,0 +1,103 @@
+"""
+Startup budget: importing the app must stay fast and must not load models
+or heavy libraries; /api/ready reports warm-up separately from /api/health
+"""
+import os
+import sys
+import json
+import subprocess
+import textwrap
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend')
+
+# Seconds allowed for `import app` (about 0.7 s on a laptop; flask and
+# SQLAlchemy are most of it). Raise only with a reason.
+IMPORT_BUDGET_SECONDS = 2.5
+
+# Loaded on first use or by warm-up, never at import
+DEFERRED_MODULES = [
+    'vosk', 'pyaudio', 'nltk', 'sklearn', 'scipy', 'numpy',
+    'PyPDF2', 'reportlab', 'torch', 'transformers', 'onnxruntime',
+]
+
+
+def _run(script, tmp_path):
+    """Run a script in a fresh interpreter against a scratch database"""
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'startup.db'}")
+    completed = subprocess.run(
+        [sys.executable, '-c', textwrap.dedent(script)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_import_stays_within_budget_and_defers_heavy_modules(tmp_path):
+    result = _run(f"""
+        import sys, json, time
+        started = time.perf_counter()
+        import app
+        import_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        response = app.app.test_client().get('/api/health')
+        health_seconds = time.perf_counter() - started
+
+        print(json.dumps({{
+            'import_seconds': import_seconds,
+            'health_status': response.status_code,
+            'health_seconds': health_seconds,
+            'loaded': [m for m in {DEFERRED_MODULES!r} if m in sys.modules],
+            'services': [app.recording_service.loaded, app.file_upload_service.loaded],
+        }}))
+    """, tmp_path)
+
+    assert result['loaded'] == []
+    assert result['services'] == [False, False]
+    assert result['health_status'] == 200
+    assert result['health_seconds'] < 1.0
+    assert result['import_seconds'] < IMPORT_BUDGET_SECONDS, result
+
+
+def test_readiness_reports_warm_up(tmp_path):
+    result = _run("""
+        import json, time, threading
+        import app
+
+        # Stand-ins for the model loads: the Vosk model waits, then fails
+        release = threading.Event()
+        def load_model(path):
+            release.wait(30)
+            raise Exception("no model at " + path)
+        app.load_model = load_model
+        app.summarizer_backends.get_backend = lambda mode: None
+
+        client = app.app.test_client()
+        warming = client.get('/api/ready')
+
+        release.set()
+        for _ in range(300):
+            ready = client.get('/api/ready')
+            if ready.status_code == 200:
+                break
+            time.sleep(0.05)
+
+        print(json.dumps({
+            'warming': [warming.status_code, warming.json['ready']],
+            'ready': [ready.status_code, ready.json],
+            'health': client.get('/api/health').status_code,
+        }))
+    """, tmp_path)
+
+    assert result['warming'] == [503, False]
+    status, body = result['ready']
+    assert status == 200 and body['ready'] and body['degraded']
+    states = {name: component['state'] for name, component in body['components'].items()}
+    assert states == {
+        'recording_service': 'ready',
+        'file_upload_service': 'ready',
+        'summarizer': 'ready',
+        'vosk_model': 'failed',
+    }
+    assert 'no model' in body['components']['vosk_model']['error']
+    assert result['health'] == 200
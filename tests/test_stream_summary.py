@@ -0,0 +1,62 @@
+"""
+Tests for bounded-memory summarization of streamed text
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+import summarizer_backends
+from summarizer import Summarizer
+
+TOPICS = [
+    "the quarterly budget needs another review before the board meeting",
+    "hiring for the data team is behind schedule this quarter",
+    "the new dashboard design was shown to customers last week",
+    "Maria will send the revised budget report by friday",
+]
+
+
+def _sentences(count):
+    for i in range(count):
+        yield f"Item {i}: {TOPICS[i % len(TOPICS)]}."
+
+
+def test_stream_summary_picks_input_sentences_in_order():
+    backend = summarizer_backends.get_backend('textrank')
+    sentences = list(_sentences(500))
+
+    summary, insights, count = backend.summarize_stream(
+        iter(sentences), 5, batch_sentences=60, pool_sentences=40
+    )
+
+    assert count == 500
+    picked = [s for s in sentences if s in summary]
+    assert len(picked) == 5
+    assert ' '.join(picked) == summary
+    assert insights['keyphrases'] and insights['topics']
+    assert len(insights['action_items']) <= summarizer_backends.STREAM_MAX_ACTION_ITEMS
+    assert {item['text'] for item in insights['action_items']} <= set(sentences)
+    assert all(sentences[item['segment']] == item['text'] for item in insights['action_items'])
+
+
+def test_stream_summary_handles_short_input():
+    backend = summarizer_backends.get_backend('textrank')
+
+    summary, _, count = backend.summarize_stream(iter(["Only one sentence here."]), 5)
+    assert (summary, count) == ("Only one sentence here.", 1)
+
+    summary, insights, count = backend.summarize_stream(iter([]), 5)
+    assert (summary, count) == ('', 0)
+    assert insights['keyphrases'] == []
+
+
+def test_stream_summary_leaves_handle_mode_alone(tmp_path):
+    summarizer = Summarizer('t5_small', 3)
+
+    summary, insights, mode = summarizer.generate_summary_stream(_sentences(50))
+    summary_file = summarizer.save_summary(summary, str(tmp_path), 'session_x', mode)
+
+    assert mode == 'textrank'
+    assert summarizer.mode == 't5_small'
+    with open(summary_file) as f:
+        assert 'Mode: textrank\n' in f.read()
@@ -11,7 +11,7 @@ print("🧠 Testing summarizer...")
 
 summarizer = Summarizer(mode="textrank", num_sentences=2)
 
-summary = summarizer.generate_summary(text)
+summary, _, _ = summarizer.generate_summary(text)
 
 print("\n✔ Summary:")
 print(summary)
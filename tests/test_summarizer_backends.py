@@ -0,0 +1,46 @@
+"""
+Tests for shared summarizer backends
+"""
+import os
+import sys
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+import summarizer_backends
+from summarizer import Summarizer
+
+
+def test_backend_is_created_once_across_threads():
+    results = []
+
+    def worker():
+        results.append(summarizer_backends.get_backend('textrank'))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(b) for b in results}) == 1
+
+
+def test_unknown_mode_falls_back_to_textrank():
+    assert summarizer_backends.get_backend('no_such_mode').mode == 'textrank'
+
+
+def test_summarizer_handle_is_cheap():
+    summarizer = Summarizer('textrank', 3)
+
+    assert vars(summarizer) == {'mode': 'textrank', 'num_sentences': 3}
+
+
+def test_handles_share_backend():
+    sentences = [f"Sentence number {i} about the project budget." for i in range(10)]
+    text = ' '.join(sentences)
+
+    first = Summarizer('textrank', 2).generate_summary(text, sentences)
+    second = Summarizer('textrank', 2).generate_summary(text, sentences)
+
+    assert first == second
+    assert summarizer_backends.get_loaded_modes().count('textrank') == 1
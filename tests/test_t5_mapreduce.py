@@ -0,0 +1,84 @@
+"""
+Tests for map-reduce T5 summarization (tiny random model)
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+sys.path.append(os.path.dirname(__file__))
+
+import pytest
+
+pytest.importorskip('torch')
+pytest.importorskip('transformers')
+pytest.importorskip('sentencepiece')
+
+import summarizer_backends
+from tiny_t5 import build_tiny_t5, make_sentences
+
+
+@pytest.fixture(scope='module')
+def backend(tmp_path_factory):
+    model_dir = build_tiny_t5(str(tmp_path_factory.mktemp('tiny_t5')))
+    return summarizer_backends.T5Backend(model_dir)
+
+
+@pytest.fixture
+def options():
+    saved = dict(summarizer_backends._options)
+    yield summarizer_backends.configure
+    summarizer_backends._options.clear()
+    summarizer_backends._options.update(saved)
+
+
+def test_windows_cover_every_sentence_within_capacity(backend):
+    sentences = make_sentences(60)
+    lengths = backend._token_lengths(sentences)
+
+    windows = backend._pack_windows(sentences, lengths, 64)
+
+    assert [s for w in windows for s in w] == sentences
+    for window in windows:
+        assert len(window) == 1 or sum(backend._token_lengths(window)) <= 64
+
+
+def test_long_input_is_summarized_in_batches(backend, options, monkeypatch):
+    options({'t5_chunk_tokens': 64, 't5_batch_size': 3, 't5_num_beams': 2})
+    calls = []
+
+    def fake_generate(texts, chunk_tokens, max_tokens, min_tokens, beams):
+        calls.append((len(texts), beams))
+        return ["short chunk summary."] * len(texts)
+
+    monkeypatch.setattr(backend, '_generate', fake_generate)
+
+    assert backend.summarize(make_sentences(80), 5) == "short chunk summary."
+    assert max(size for size, _ in calls) == 3
+    assert len(calls) > 2
+    # Final reduce call is a single window
+    assert calls[-1][0] == 1
+
+
+def test_wall_time_cap_falls_back_to_extractive(backend, options, monkeypatch):
+    options({'t5_chunk_tokens': 64, 't5_max_seconds': 0})
+    monkeypatch.setattr(backend, '_generate', lambda *args: pytest.fail("generate called"))
+
+    summary = backend.summarize(make_sentences(40), 5)
+
+    assert summary
+
+
+def test_token_budget_keeps_top_sentences_in_order(backend):
+    sentences = make_sentences(200)
+    lengths = backend._token_lengths(sentences)
+
+    kept, kept_lengths = backend._fit_budget(sentences, lengths, 100)
+
+    assert sum(kept_lengths) <= 100
+    positions = [sentences.index(s) for s in kept]
+    assert positions == sorted(positions)
+
+
+def test_real_generation_runs(backend, options):
+    options({'t5_chunk_tokens': 64, 't5_num_beams': 2})
+
+    assert isinstance(backend.summarize(make_sentences(30), 5), str)
@@ -0,0 +1,127 @@
+"""
+Tests for the ONNX Runtime T5 inference path (tiny random model)
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+sys.path.append(os.path.dirname(__file__))
+
+import pytest
+
+pytest.importorskip('torch')
+pytest.importorskip('transformers')
+pytest.importorskip('onnxruntime')
+pytest.importorskip('sentencepiece')
+
+import numpy as np
+import torch
+from transformers import T5ForConditionalGeneration, T5Tokenizer
+
+import summarizer_backends
+from t5_onnx import MANIFEST_FILE, OnnxT5Generator, ensure_exported
+from tiny_t5 import build_tiny_t5, make_sentences
+
+
+@pytest.fixture(scope='module')
+def model_dir(tmp_path_factory):
+    return build_tiny_t5(str(tmp_path_factory.mktemp('tiny_t5')))
+
+
+@pytest.fixture(scope='module')
+def fp32_export(model_dir, tmp_path_factory):
+    return ensure_exported(model_dir, str(tmp_path_factory.mktemp('onnx') / 'fp32'), quantize=False)
+
+
+def _inputs(model_dir, count=3):
+    tokenizer = T5Tokenizer.from_pretrained(model_dir)
+    texts = ["summarize: " + ' '.join(make_sentences(4, seed=i)) for i in range(count)]
+    return tokenizer(texts, return_tensors='np', padding=True)
+
+
+def _torch_generate(model_dir, inputs, **kwargs):
+    model = T5ForConditionalGeneration.from_pretrained(model_dir).eval()
+    with torch.no_grad():
+        output = model.generate(
+            input_ids=torch.tensor(inputs['input_ids']),
+            attention_mask=torch.tensor(inputs['attention_mask']),
+            do_sample=False,
+            **kwargs
+        )
+    return [[t for t in row[1:] if t != 0] for row in output.tolist()]
+
+
+def _strip_pad(rows):
+    return [[t for t in row if t != 0] for row in rows]
+
+
+def test_greedy_matches_pytorch(model_dir, fp32_export):
+    inputs = _inputs(model_dir)
+    generator = OnnxT5Generator(fp32_export, num_threads=1)
+
+    onnx_ids = generator.generate(inputs['input_ids'], inputs['attention_mask'], max_length=12)
+
+    assert _strip_pad(onnx_ids) == _torch_generate(model_dir, inputs, max_length=12, num_beams=1)
+
+
+def test_cached_decoder_matches_full_prefix(model_dir, fp32_export):
+    inputs = _inputs(model_dir)
+    generator = OnnxT5Generator(fp32_export, num_threads=1)
+    model = T5ForConditionalGeneration.from_pretrained(model_dir).eval()
+    tokens = np.random.RandomState(0).randint(3, 80, size=(3, 6))
+
+    hidden_states = generator.encoder.run(['last_hidden_state'], {
+        'input_ids': inputs['input_ids'], 'attention_mask': inputs['attention_mask']
+    })[0]
+    logits, past = generator._start(hidden_states, inputs['attention_mask'], 0)
+
+    for step in range(1, 7):
+        if step > 1:
+            logits = generator._step(tokens[:, step - 2], hidden_states, inputs['attention_mask'], past, step, 0)
+        start = np.full((3, 1), generator.decoder_start_token_id, dtype=np.int64)
+        prefix = np.concatenate([start, tokens[:, :step - 1]], axis=1)
+        with torch.no_grad():
+            expected = model(
+                input_ids=torch.tensor(inputs['input_ids']),
+                attention_mask=torch.tensor(inputs['attention_mask']),
+                decoder_input_ids=torch.tensor(prefix)
+            ).logits[:, -1].numpy()
+        assert np.allclose(logits, expected, atol=1e-4)
+        assert past['past_key_values.0.decoder.key'].shape[2] == step
+
+
+def test_beam_search_returns_one_sequence_per_input(model_dir, fp32_export):
+    inputs = _inputs(model_dir)
+    generator = OnnxT5Generator(fp32_export)
+
+    onnx_ids = generator.generate(
+        inputs['input_ids'], inputs['attention_mask'],
+        max_length=10, min_length=4, num_beams=3, length_penalty=2.0
+    )
+
+    assert len(onnx_ids) == 3
+    assert all(3 <= len(row) <= 9 for row in onnx_ids)
+
+
+def test_export_is_cached(model_dir, fp32_export):
+    manifest = os.path.join(fp32_export, MANIFEST_FILE)
+    before = os.stat(manifest).st_mtime_ns
+
+    assert ensure_exported(model_dir, fp32_export, quantize=False) == fp32_export
+    assert os.stat(manifest).st_mtime_ns == before
+
+
+def test_quantized_backend_summarizes(model_dir, tmp_path):
+    saved = dict(summarizer_backends._options)
+    summarizer_backends.configure({
+        't5_onnx_dir': str(tmp_path / 'int8'),
+        't5_onnx_threads': 1,
+        't5_chunk_tokens': 64,
+        't5_num_beams': 2
+    })
+    try:
+        backend = summarizer_backends.OnnxT5Backend(model_dir)
+        assert isinstance(backend.summarize(make_sentences(30), 5), str)
+        assert os.path.exists(tmp_path / 'int8' / 'decoder_with_past.onnx')
+    finally:
+        summarizer_backends._options.clear()
+        summarizer_backends._options.update(saved)
@@ -0,0 +1,64 @@
+"""
+Tests for the sparse TextRank ranking
+"""
+import os
+import sys
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from textrank import build_similarity_graph, pagerank, rank_sentences, top_sentence_indices
+
+
+SENTENCES = [
+    "The budget for the new campus network was approved.",
+    "The network upgrade will replace every campus switch.",
+    "Lunch will be served in the main hall.",
+    "The campus network budget covers switches and cabling.",
+    "Parking permits are renewed in March.",
+    "Network cabling work starts after the budget review.",
+]
+
+
+def _tfidf(sentences):
+    return TfidfVectorizer(stop_words='english').fit_transform(sentences)
+
+
+def test_graph_is_symmetric_and_sparse():
+    graph = build_similarity_graph(_tfidf(SENTENCES), k=2)
+
+    assert graph.shape == (6, 6)
+    assert abs(graph - graph.T).max() == 0
+    assert graph.diagonal().sum() == 0
+    # Each node selects at most k neighbours; symmetrization can at most double that
+    assert graph.nnz <= 2 * 2 * len(SENTENCES)
+
+
+def test_pagerank_is_a_distribution():
+    scores = pagerank(build_similarity_graph(_tfidf(SENTENCES), k=3))
+
+    assert np.isclose(scores.sum(), 1.0)
+    assert (scores > 0).all()
+
+
+def test_pagerank_handles_dangling_nodes():
+    graph = build_similarity_graph(_tfidf(["alpha beta", "gamma delta", "alpha beta gamma"]))
+    scores = pagerank(graph)
+
+    assert np.isclose(scores.sum(), 1.0)
+
+
+def test_central_sentences_rank_highest():
+    scores = rank_sentences(_tfidf(SENTENCES), k=3)
+    top = top_sentence_indices(scores, 2)
+
+    assert 2 not in top
+    assert 4 not in top
+    assert top == sorted(top)
+
+
+def test_single_sentence():
+    scores = rank_sentences(_tfidf(["only one sentence here"]))
+
+    assert scores.tolist() == [1.0]
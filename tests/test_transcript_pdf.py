@@ -0,0 +1,74 @@
+"""
+Tests for the canvas transcript PDF renderer
+"""
+import os
+import sys
+import json
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+from PyPDF2 import PdfReader
+
+from pdf_generator import PDFGenerator, load_transcript_segments, segment_label
+from transcript_aggregator import segments_file_for
+
+
+def _write_transcript(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("Transcript: s\nStarted: 2024-01-01 10:00:00\n" + "=" * 60 + "\n\n")
+        f.write('\n'.join(lines))
+        f.write("\n\n" + "=" * 60 + "\nTotal segments: 2\nDuration: 00:00:09\n")
+    return str(path)
+
+
+def test_text_fallback_parses_timestamps(tmp_path):
+    transcript = _write_transcript(tmp_path / 's.txt', ["[00:00:01] hello team", "[00:00:09] lets start"])
+    assert load_transcript_segments(transcript) == [
+        {'timestamp': '00:00:01', 'text': 'hello team'},
+        {'timestamp': '00:00:09', 'text': 'lets start'},
+    ]
+
+
+def test_segments_json_preferred(tmp_path):
+    transcript = _write_transcript(tmp_path / 's.txt', ["[00:00:01] from text"])
+    segments = [{'text': 'from json', 'words': [{'word': 'from', 'start': 3725.2}]}]
+    with open(segments_file_for(transcript), 'w') as f:
+        json.dump(segments, f)
+
+    assert load_transcript_segments(transcript) == segments
+    assert segment_label(segments[0]) == '01:02:05'
+    assert segment_label({'text': 'plain'}) == ''
+
+
+def test_renders_all_text_across_pages(tmp_path):
+    lines = [f"[00:{i // 60:02d}:{i % 60:02d}] segment {i} " + "words & <markup> " * 20 for i in range(200)]
+    transcript = _write_transcript(tmp_path / 's.txt', lines)
+
+    generator = PDFGenerator()
+    pdf_path = generator.create_transcript_pdf(transcript, 's', pdf_path=str(tmp_path / 's.pdf'))
+
+    reader = PdfReader(pdf_path)
+    assert len(reader.pages) > 5
+    text = ''.join(page.extract_text() for page in reader.pages)
+    assert 'segment 0 ' in text and 'segment 199 ' in text
+    assert '<markup>' in text
+    assert 'Page %d' % len(reader.pages) in text
+
+
+def test_rerender_is_byte_identical(tmp_path):
+    transcript = _write_transcript(tmp_path / 's.txt', ["[00:00:01] hello team", "[00:00:09] lets start"])
+    summary = tmp_path / 's_summary.txt'
+    summary.write_text("Summary: s\nGenerated: 2024-01-01 10:05:00\n" + "=" * 60 + "\n\nWe met.\n", encoding='utf-8')
+
+    generator = PDFGenerator()
+    for render in (
+        lambda path: generator.create_transcript_pdf(transcript, 's', pdf_path=path),
+        lambda path: generator.create_summary_pdf(str(summary), 's', pdf_path=path),
+    ):
+        first = render(str(tmp_path / 'first.pdf'))
+        second = render(str(tmp_path / 'second.pdf'))
+        with open(first, 'rb') as a, open(second, 'rb') as b:
+            assert a.read() == b.read()
+
+    text = PdfReader(str(tmp_path / 'second.pdf')).pages[0].extract_text()
+    assert '2024-01-01 10:05:00' in text
@@ -0,0 +1,69 @@
+"""
+Tests for the fair upload worker pool
+"""
+import os
+import sys
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from worker_pool import FairWorkerPool
+
+
+def test_jobs_alternate_between_users():
+    pool = FairWorkerPool(1)
+    started = threading.Event()
+    gate = threading.Event()
+    order = []
+
+    def block():
+        started.set()
+        gate.wait()
+
+    # Hold the single worker so every job below is queued before any runs
+    pool.submit('blocker', block)
+    assert started.wait(timeout=5)
+    for i in range(5):
+        pool.submit('alice', order.append, ('alice', i))
+    pool.submit('bob', order.append, ('bob', 0))
+    pool.submit('bob', order.append, ('bob', 1))
+
+    assert pool.pending('alice') == 5
+    assert pool.pending() == 7
+
+    gate.set()
+    assert pool.join(timeout=5)
+
+    # Bob waits behind one of Alice's files, not all five
+    assert order[:4] == [('alice', 0), ('bob', 0), ('alice', 1), ('bob', 1)]
+    assert [job for job in order if job[0] == 'alice'] == [('alice', i) for i in range(5)]
+    assert pool.pending() == 0
+
+
+def test_failed_job_does_not_stop_worker():
+    pool = FairWorkerPool(2)
+    done = []
+
+    def fail():
+        raise ValueError("bad file")
+
+    pool.submit(1, fail)
+    pool.submit(1, done.append, 'next')
+    assert pool.join(timeout=5)
+    assert done == ['next']
+
+
+def test_context_wraps_every_job():
+    entered = []
+
+    class Context:
+        def __enter__(self):
+            entered.append(True)
+
+        def __exit__(self, *exc):
+            return False
+
+    pool = FairWorkerPool(2, Context)
+    for i in range(3):
+        pool.submit(i, lambda: None)
+    assert pool.join(timeout=5)
+    assert len(entered) == 3
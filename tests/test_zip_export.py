@@ -0,0 +1,123 @@
+"""
+Tests for streaming ZIP export
+"""
+import io
+import os
+import sys
+import zipfile
+from collections import namedtuple
+from datetime import datetime
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'iot-meeting-minutes'))
+
+from pdf_cache import PDFCache
+from pdf_generator import PDFGenerator
+from zip_export import ZipExporter
+
+
+Row = namedtuple('Row', ['id', 'session_id', 'title', 'created_at', 'duration', 'status',
+                         'audio_file_path', 'transcript_file_path', 'summary_file_path'])
+
+
+def _make_recording(tmp_path, index):
+    audio = tmp_path / f'session_{index}.wav'
+    audio.write_bytes(os.urandom(200 * 1024))
+    transcript = tmp_path / f'session_{index}.txt'
+    transcript.write_text(
+        f"Transcript: session_{index}\n" + "=" * 60 + "\n\n"
+        + "[00:00:01] we reviewed the budget again\n" * 50 + "\n" + "=" * 60 + "\n",
+        encoding='utf-8'
+    )
+    summary = tmp_path / f'session_{index}_summary.txt'
+    summary.write_text("We reviewed the budget.", encoding='utf-8')
+    return Row(index, f'session_{index}', f'Meeting {index}', datetime(2024, 1, 2, 3, 4, 5),
+               12.5, 'completed', str(audio), str(transcript), str(summary))
+
+
+def _exporter(tmp_path):
+    return ZipExporter(PDFCache(PDFGenerator(), str(tmp_path / 'cache'), 50 * 1024 * 1024))
+
+
+def test_archive_contents_and_compression(tmp_path):
+    exporter = _exporter(tmp_path)
+    entries = exporter.manifest([_make_recording(tmp_path, 1)])
+    data = b''.join(exporter.stream(entries))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        infos = {info.filename: info for info in archive.infolist()}
+        assert sorted(infos) == [
+            'session_1/audio.wav', 'session_1/metadata.json', 'session_1/summary.pdf',
+            'session_1/summary.txt', 'session_1/transcript.pdf', 'session_1/transcript.txt'
+        ]
+        assert infos['session_1/audio.wav'].compress_type == zipfile.ZIP_STORED
+        assert infos['session_1/transcript.pdf'].compress_type == zipfile.ZIP_STORED
+        assert infos['session_1/transcript.txt'].compress_type == zipfile.ZIP_DEFLATED
+        assert archive.testzip() is None
+        with open(entries[0].path, 'rb') as f:
+            assert archive.read('session_1/audio.wav') == f.read()
+
+
+def test_ranges_are_consistent_with_full_stream(tmp_path):
+    exporter = _exporter(tmp_path)
+    entries = exporter.manifest([_make_recording(tmp_path, i) for i in range(2)])
+    etag = exporter.etag(entries)
+
+    full = b''.join(exporter.stream(entries, etag))
+    assert exporter.known_length(etag) == len(full)
+    assert exporter.length(entries, etag) == len(full)
+
+    cut = len(full) // 3
+    resumed = b''.join(exporter.stream(entries, etag, cut))
+    middle = b''.join(exporter.stream(entries, etag, 100, 70000))
+    assert full[:cut] + resumed == full
+    assert middle == full[100:70000]
+
+
+def test_length_is_computed_without_a_full_pass(tmp_path):
+    recordings = [_make_recording(tmp_path, i) for i in range(3)]
+    unicode_name = recordings[0]._replace(session_id='réunion_0')
+
+    for rows, parts in (
+        (recordings, ['audio', 'transcript', 'summary', 'pdf', 'metadata']),
+        ([unicode_name], ['transcript', 'metadata']),
+        (recordings, ['metadata']),
+    ):
+        exporter = _exporter(tmp_path)
+        entries = exporter.manifest(rows, parts)
+        etag = exporter.etag(entries)
+        full = b''.join(exporter.stream(entries))
+
+        # Another worker: nothing memoized, and no audio is read
+        other = _exporter(tmp_path)
+        assert other.known_length(etag) is None
+        assert other.length(entries, etag) == len(full)
+
+
+def test_export_larger_than_pdf_cache(tmp_path):
+    recordings = [_make_recording(tmp_path, i) for i in range(3)]
+    pdf_size = os.path.getsize(
+        _exporter(tmp_path).pdf_cache.get_pdf('transcript', recordings[0].transcript_file_path, 'session_0')[0]
+    )
+    # Room for about one PDF; the export needs six
+    exporter = ZipExporter(PDFCache(PDFGenerator(), str(tmp_path / 'small'), int(pdf_size * 1.5)))
+
+    entries = exporter.manifest(recordings, ['pdf'])
+    etag = exporter.etag(entries)
+    data = b''.join(exporter.stream(entries))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert len(archive.namelist()) == 6
+        assert archive.testzip() is None
+    assert exporter.etag(entries) == etag
+    assert ZipExporter(exporter.pdf_cache).length(entries, etag) == len(data)
+
+
+def test_etag_changes_with_content(tmp_path):
+    exporter = _exporter(tmp_path)
+    recording = _make_recording(tmp_path, 1)
+    before = exporter.etag(exporter.manifest([recording], ['summary']))
+
+    with open(recording.summary_file_path, 'a', encoding='utf-8') as f:
+        f.write(" And the roadmap.")
+
+    assert exporter.etag(exporter.manifest([recording], ['summary'])) != before
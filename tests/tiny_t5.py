@@ -0,0 +1,83 @@
+"""
+Helper: build a tiny randomly initialized T5 model for tests and benchmarks
+"""
+import os
+import random
+
+
+WORDS = [
+    "budget", "network", "campus", "lecture", "students", "exam", "project",
+    "deadline", "server", "database", "meeting", "schedule", "report", "design",
+    "review", "testing", "deploy", "audio", "transcript", "summary", "model",
+    "the", "we", "will", "need", "to", "and", "next", "week", "team",
+]
+
+
+def make_sentences(count, seed=0):
+    """Generate synthetic sentences from a small vocabulary"""
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+def build_tiny_t5(directory, seed=0):
+    """
+    Save a tiny T5 model plus SentencePiece tokenizer to a directory
+
+    Args:
+        directory: Output directory
+        seed: Random seed for weights
+
+    Returns:
+        str: Model directory
+    """
+    import sentencepiece as spm
+    import torch
+    from transformers import T5Config, T5ForConditionalGeneration, T5Tokenizer
+
+    os.makedirs(directory, exist_ok=True)
+
+    corpus = os.path.join(directory, 'corpus.txt')
+    with open(corpus, 'w') as f:
+        f.write("\n".join(make_sentences(500, seed)) + "\nsummarize:\n")
+
+    spm.SentencePieceTrainer.train(
+        input=corpus,
+        model_prefix=os.path.join(directory, 'spiece'),
+        vocab_size=80,
+        pad_id=0,
+        eos_id=1,
+        unk_id=2,
+        bos_id=-1,
+        minloglevel=2
+    )
+
+    model_file = os.path.join(directory, 'spiece.model')
+    try:
+        # transformers >= 5 builds the tokenizer from (piece, score) pairs
+        processor = spm.SentencePieceProcessor(model_file=model_file)
+        vocab = [(processor.id_to_piece(i), processor.get_score(i))
+                 for i in range(processor.get_piece_size())]
+        tokenizer = T5Tokenizer(vocab=vocab, extra_ids=0)
+    except TypeError:
+        tokenizer = T5Tokenizer(vocab_file=model_file, extra_ids=0)
+    tokenizer.save_pretrained(directory)
+
+    torch.manual_seed(seed)
+    config = T5Config(
+        vocab_size=len(tokenizer),
+        d_model=32,
+        d_kv=8,
+        d_ff=64,
+        num_layers=2,
+        num_decoder_layers=2,
+        num_heads=4,
+        pad_token_id=0,
+        eos_token_id=1,
+        decoder_start_token_id=0
+    )
+    T5ForConditionalGeneration(config).save_pretrained(directory)
+
+    return directory